@@ -203,6 +203,17 @@ export const ChunkInspector: React.FC = () => {
                   <span>File: {chunk.filename}</span>
                 </>
               )}
+              {chunk.page_start != null && (
+                <>
+                  <span>•</span>
+                  <span>
+                    Pages: {chunk.page_start}
+                    {chunk.page_end != null && chunk.page_end !== chunk.page_start
+                      ? `-${chunk.page_end}`
+                      : ''}
+                  </span>
+                </>
+              )}
             </div>
             <div className="mt-3 whitespace-pre-wrap text-sm text-gray-800 dark:text-gray-200">
               {chunk.content}
@@ -443,7 +443,12 @@ export const DocumentManager: React.FC<DocumentManagerProps> = ({ kbId, onDocume
                         {t(status.labelKey)}
                       </span>
                     </td>
-                    <td className="hidden px-4 py-3 text-sm text-gray-500 dark:text-gray-400 sm:table-cell">{doc.chunk_count || '-'}</td>
+                    <td
+                      className="hidden px-4 py-3 text-sm text-gray-500 dark:text-gray-400 sm:table-cell"
+                      title={doc.chunk_count ? t('documents.chunkEmbeddingStats', { embedded: doc.embedded_chunk_count ?? 0, reused: doc.reused_chunk_count ?? 0 }) : undefined}
+                    >
+                      {doc.chunk_count || '-'}
+                    </td>
                     <td className="px-4 py-3 text-right">
                       <div className="flex items-center justify-end space-x-2">
                         <button
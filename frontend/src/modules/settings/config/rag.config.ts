@@ -91,6 +91,63 @@ export const ragConfig: SimpleConfigSettingsConfig = {
       get helpText() { return i18n.t('settings:rag.field.vectorSqlitePath.help'); },
       condition: (formData) => formData.vector_store_backend === 'sqlite_vec',
     },
+    {
+      type: 'select',
+      name: 'vector_index',
+      get label() { return i18n.t('settings:rag.field.vectorIndex'); },
+      defaultValue: 'exact',
+      options: [
+        { value: 'exact', label: i18n.t('settings:rag.opt.vectorIndexExact') },
+        { value: 'ivf', label: i18n.t('settings:rag.opt.vectorIndexIvf') }
+      ],
+      get helpText() { return i18n.t('settings:rag.field.vectorIndex.help'); },
+      condition: (formData) => formData.vector_store_backend === 'sqlite_vec',
+    },
+    {
+      type: 'number',
+      name: 'vector_ivf_nprobe',
+      get label() { return i18n.t('settings:rag.field.vectorIvfNprobe'); },
+      min: 1,
+      max: 4096,
+      defaultValue: 16,
+      get helpText() { return i18n.t('settings:rag.field.vectorIvfNprobe.help'); },
+      condition: (formData) =>
+        formData.vector_store_backend === 'sqlite_vec' && formData.vector_index === 'ivf',
+    },
+    {
+      type: 'number',
+      name: 'vector_ivf_min_rows',
+      get label() { return i18n.t('settings:rag.field.vectorIvfMinRows'); },
+      min: 1000,
+      defaultValue: 50000,
+      get helpText() { return i18n.t('settings:rag.field.vectorIvfMinRows.help'); },
+      condition: (formData) =>
+        formData.vector_store_backend === 'sqlite_vec' && formData.vector_index === 'ivf',
+    },
+    {
+      type: 'select',
+      name: 'vector_quantization',
+      get label() { return i18n.t('settings:rag.field.vectorQuantization'); },
+      defaultValue: 'none',
+      options: [
+        { value: 'none', label: i18n.t('settings:rag.opt.vectorQuantizationNone') },
+        { value: 'int8', label: i18n.t('settings:rag.opt.vectorQuantizationInt8') },
+        { value: 'binary', label: i18n.t('settings:rag.opt.vectorQuantizationBinary') }
+      ],
+      get helpText() { return i18n.t('settings:rag.field.vectorQuantization.help'); },
+      condition: (formData) => formData.vector_store_backend === 'sqlite_vec',
+    },
+    {
+      type: 'number',
+      name: 'vector_rescore_multiplier',
+      get label() { return i18n.t('settings:rag.field.vectorRescoreMultiplier'); },
+      min: 1,
+      max: 64,
+      defaultValue: 4,
+      get helpText() { return i18n.t('settings:rag.field.vectorRescoreMultiplier.help'); },
+      condition: (formData) =>
+        formData.vector_store_backend === 'sqlite_vec' && formData.vector_quantization !== 'none',
+    },
     {
       type: 'text',
       name: 'persist_directory',
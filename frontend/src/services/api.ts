@@ -268,6 +268,7 @@ export interface ChatContextDiagnostics {
   reasoning_effort?: string | null;
   system_prompt?: string | null;
   context_segments?: Record<string, string | null>;
+  context_timings?: Record<string, number | string[]> | null;
   assistant_params?: Record<string, unknown>;
   context_capabilities?: string[];
   context_capability_args?: Record<string, Record<string, unknown>>;
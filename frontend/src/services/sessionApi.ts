@@ -12,6 +12,9 @@ export interface SearchResult {
   message_count: number;
   match_type: 'title' | 'content';
   match_context: string;
+  score?: number;
+  message_id?: string;
+  hits?: Array<{ message_id: string | null; role: string; score: number }>;
 }
 
 /**
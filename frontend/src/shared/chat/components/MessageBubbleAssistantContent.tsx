@@ -83,6 +83,8 @@ export function MessageBubbleAssistantContent({
               vector_raw {latestRagDiagnostics.vector_raw_count ?? '-'}
               {' | '}bm25_raw {latestRagDiagnostics.bm25_raw_count ?? '-'}
               {' | '}bm25_cov {latestRagDiagnostics.bm25_min_term_coverage != null ? latestRagDiagnostics.bm25_min_term_coverage.toFixed(2) : '-'}
+              {' | '}embed_ms {latestRagDiagnostics.query_embedding_ms != null ? latestRagDiagnostics.query_embedding_ms.toFixed(1) : '-'}
+              {' | '}model_load_ms {latestRagDiagnostics.embedding_model_load_ms != null ? latestRagDiagnostics.embedding_model_load_ms.toFixed(1) : '-'}
             </div>
             <div>
               tool_search {latestRagDiagnostics.tool_search_count ?? 0}
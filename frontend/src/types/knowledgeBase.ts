@@ -22,6 +22,8 @@ export interface KnowledgeBaseDocument {
   file_size: number;
   status: 'pending' | 'processing' | 'ready' | 'error';
   chunk_count: number;
+  embedded_chunk_count?: number;
+  reused_chunk_count?: number;
   error_message?: string;
   created_at: string;
 }
@@ -33,6 +35,8 @@ export interface KnowledgeBaseChunk {
   filename?: string;
   chunk_index: number;
   content: string;
+  page_start?: number | null;
+  page_end?: number | null;
 }
 
 export interface KnowledgeBaseCreate {
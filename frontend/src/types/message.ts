@@ -92,6 +92,8 @@ export interface SearchSource {
   rerank_applied?: boolean;
   rerank_weight?: number;
   rerank_model?: string;
+  query_embedding_ms?: number;
+  embedding_model_load_ms?: number;
   tool_search_count?: number;
   tool_search_unique_count?: number;
   tool_search_duplicate_count?: number;
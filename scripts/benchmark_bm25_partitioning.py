@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Benchmark BM25 search on 20 knowledge bases of mixed sizes.
+
+Compares the previous single shared FTS5 table (filtered by kb_id after the
+MATCH) with the per-KB partitioned index used by Bm25Service.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.infrastructure.retrieval.bm25_service import Bm25Service
+
+_WORDS = [f"term{index}" for index in range(2000)]
+_COMMON = ["report", "policy", "system", "account", "payment", "service"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark per-KB BM25 partitions.")
+    parser.add_argument("--kbs", type=int, default=20, help="Number of knowledge bases.")
+    parser.add_argument(
+        "--largest",
+        type=int,
+        default=40000,
+        help="Chunk count of the largest KB; sizes shrink geometrically to ~50.",
+    )
+    parser.add_argument("--queries", type=int, default=50, help="Timed queries per KB.")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def kb_sizes(count: int, largest: int) -> list[int]:
+    smallest = min(50, largest)
+    if count <= 1:
+        return [largest]
+    ratio = (smallest / largest) ** (1.0 / (count - 1))
+    return [max(1, int(largest * ratio**index)) for index in range(count)]
+
+
+def build_chunks(rng: random.Random, kb_index: int, size: int) -> list[dict]:
+    chunks = []
+    for index in range(size):
+        words = rng.choices(_WORDS, k=40) + rng.choices(_COMMON, k=4) + [f"kbword{kb_index}"]
+        chunks.append(
+            {"chunk_id": f"kb{kb_index}_{index}", "chunk_index": index, "content": " ".join(words)}
+        )
+    return chunks
+
+
+def build_legacy_index(db_path: Path, corpora: dict[str, list[dict]]) -> sqlite3.Connection:
+    """Previous layout: one FTS table for every KB, kb_id filtered after the JOIN."""
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    conn.execute(
+        """
+        CREATE TABLE rag_bm25_chunks (
+            chunk_id TEXT PRIMARY KEY,
+            kb_id TEXT NOT NULL,
+            doc_id TEXT NOT NULL,
+            filename TEXT NOT NULL,
+            chunk_index INTEGER NOT NULL,
+            content TEXT NOT NULL,
+            tokenized TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        "CREATE VIRTUAL TABLE rag_bm25_fts USING fts5(chunk_id, tokenized, tokenize='unicode61')"
+    )
+    for kb_id, chunks in corpora.items():
+        rows = [
+            (
+                chunk["chunk_id"],
+                kb_id,
+                "doc",
+                "doc.md",
+                chunk["chunk_index"],
+                chunk["content"],
+                Bm25Service._to_tokenized_text(chunk["content"]),
+            )
+            for chunk in chunks
+        ]
+        conn.executemany("INSERT INTO rag_bm25_chunks VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        conn.executemany(
+            "INSERT INTO rag_bm25_fts (chunk_id, tokenized) VALUES (?, ?)",
+            [(row[0], row[6]) for row in rows],
+        )
+    conn.commit()
+    return conn
+
+
+def legacy_search(conn: sqlite3.Connection, kb_id: str, query: str, top_k: int) -> list[str]:
+    rows = conn.execute(
+        """
+        SELECT c.chunk_id, bm25(rag_bm25_fts) AS bm25_score
+        FROM rag_bm25_fts
+        JOIN rag_bm25_chunks c ON c.chunk_id = rag_bm25_fts.chunk_id
+        WHERE rag_bm25_fts.tokenized MATCH ? AND c.kb_id = ?
+        ORDER BY bm25_score ASC
+        LIMIT ?
+        """,
+        (Bm25Service._build_match_expression(query), kb_id, top_k),
+    ).fetchall()
+    return [str(row["chunk_id"]) for row in rows]
+
+
+def _median_ms(timings: list[float]) -> float:
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    args = parse_args()
+    rng = random.Random(args.seed)
+    sizes = kb_sizes(args.kbs, args.largest)
+    corpora = {f"kb{index}": build_chunks(rng, index, size) for index, size in enumerate(sizes)}
+    queries = [
+        " ".join(rng.choices(_COMMON, k=1) + rng.choices(_WORDS, k=2)) for _ in range(args.queries)
+    ]
+
+    work_dir = Path(tempfile.mkdtemp(prefix="bm25_partition_bench_"))
+    try:
+        started = time.perf_counter()
+        legacy_conn = build_legacy_index(work_dir / "legacy.sqlite3", corpora)
+        legacy_build_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        service = Bm25Service(db_path=str(work_dir / "partitioned.sqlite3"))
+        for kb_id, chunks in corpora.items():
+            service.upsert_document_chunks(
+                kb_id=kb_id, doc_id="doc", filename="doc.md", chunks=chunks
+            )
+        partitioned_build_s = time.perf_counter() - started
+
+        print(f"kbs={len(sizes)} chunks={sum(sizes)} queries/kb={len(queries)} top_k={args.top_k}")
+        print(f"build legacy {legacy_build_s:.1f}s  partitioned {partitioned_build_s:.1f}s")
+        print(f"{'kb':>6} {'chunks':>8} {'legacy ms':>10} {'partitioned ms':>15} {'speedup':>8}")
+        legacy_total: list[float] = []
+        partitioned_total: list[float] = []
+        for kb_id, size in zip(corpora, sizes, strict=True):
+            legacy_times: list[float] = []
+            partitioned_times: list[float] = []
+            for query in queries:
+                start = time.perf_counter()
+                legacy_search(legacy_conn, kb_id, query, args.top_k)
+                legacy_times.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                service.search(kb_id=kb_id, query=query, top_k=args.top_k)
+                partitioned_times.append(time.perf_counter() - start)
+            legacy_total.extend(legacy_times)
+            partitioned_total.extend(partitioned_times)
+            legacy_ms = _median_ms(legacy_times)
+            partitioned_ms = _median_ms(partitioned_times)
+            print(
+                f"{kb_id:>6} {size:>8} {legacy_ms:>10.2f} {partitioned_ms:>15.2f} "
+                f"{legacy_ms / max(partitioned_ms, 1e-9):>7.1f}x"
+            )
+        print(
+            f"{'all':>6} {sum(sizes):>8} {_median_ms(legacy_total):>10.2f} "
+            f"{_median_ms(partitioned_total):>15.2f}"
+        )
+        legacy_conn.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
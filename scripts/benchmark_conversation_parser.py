@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Benchmark conversation markdown parsing on a large synthetic session."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import statistics
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.infrastructure.storage.conversation_markdown import parse_messages
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark conversation markdown parsing.")
+    parser.add_argument(
+        "--size-mb",
+        type=float,
+        default=5.0,
+        help="Approximate size of the generated session body.",
+    )
+    parser.add_argument(
+        "--session-file",
+        type=Path,
+        default=None,
+        help="Parse an existing session .md file instead of a generated body.",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per parser.")
+    parser.add_argument(
+        "--last-n",
+        type=int,
+        default=20,
+        help="Message count for the lazy recent-history parse.",
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def legacy_parse_messages(content: str, session_id: str) -> list[dict]:
+    """Previous line-by-line parser, kept here as the comparison baseline."""
+    messages: list[dict[str, Any]] = []
+    current_message: dict[str, Any] | None = None
+
+    for line in content.split("\n"):
+        if (
+            line.startswith("## User (")
+            or line.startswith("## Assistant (")
+            or line.startswith("## Separator (")
+            or line.startswith("## Summary (")
+        ):
+            if current_message:
+                messages.append(current_message)
+            if line.startswith("## User"):
+                role = "user"
+            elif line.startswith("## Assistant"):
+                role = "assistant"
+            elif line.startswith("## Summary"):
+                role = "summary"
+            else:
+                role = "separator"
+            ts_match = re.search(r"\((\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\)", line)
+            created_at = ts_match.group(1) if ts_match else None
+            current_message = {"role": role, "content": "", "created_at": created_at}
+        elif current_message is not None:
+            usage_match = re.match(r"^<!-- usage: (.+) -->$", line.strip())
+            cost_match = re.match(r"^<!-- cost: (.+) -->$", line.strip())
+            attachment_match = re.match(r"^<!-- attachment: (.+) -->$", line.strip())
+            message_id_match = re.match(r'^<!-- message_id: "(.+)" -->$', line.strip())
+            assistant_id_match = re.match(r'^<!-- assistant_id: "(.+)" -->$', line.strip())
+            sources_match = re.match(r"^<!-- sources: (.+) -->$", line.strip())
+            compression_meta_match = re.match(r"^<!-- compression_meta: (.+) -->$", line.strip())
+
+            if usage_match:
+                try:
+                    current_message["usage"] = json.loads(usage_match.group(1))
+                except json.JSONDecodeError:
+                    pass
+            elif cost_match:
+                try:
+                    current_message["cost"] = json.loads(cost_match.group(1))
+                except json.JSONDecodeError:
+                    pass
+            elif attachment_match:
+                try:
+                    current_message.setdefault("attachments", []).append(
+                        json.loads(attachment_match.group(1))
+                    )
+                except json.JSONDecodeError:
+                    pass
+            elif message_id_match:
+                current_message["message_id"] = message_id_match.group(1)
+            elif assistant_id_match:
+                current_message["assistant_id"] = assistant_id_match.group(1)
+            elif sources_match:
+                try:
+                    current_message["sources"] = json.loads(sources_match.group(1))
+                except json.JSONDecodeError:
+                    pass
+            elif compression_meta_match:
+                try:
+                    current_message["compression_meta"] = json.loads(
+                        compression_meta_match.group(1)
+                    )
+                except json.JSONDecodeError:
+                    pass
+            else:
+                content_value = current_message.get("content") or ""
+                if content_value or line.strip():
+                    current_message["content"] = content_value + line + "\n"
+
+    if current_message:
+        messages.append(current_message)
+
+    for index, msg in enumerate(messages):
+        msg["content"] = str(msg.get("content", "")).strip()
+        if "message_id" not in msg:
+            msg["message_id"] = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{session_id}:{index}"))
+    return messages
+
+
+def build_session_body(target_bytes: int, seed: int) -> str:
+    rng = random.Random(seed)
+    words = ["storage", "parser", "session", "markdown", "latency", "token", "cache", "index"]
+    parts: list[str] = []
+    size = 0
+    turn = 0
+    while size < target_bytes:
+        user_text = " ".join(rng.choices(words, k=rng.randint(8, 40)))
+        # Long assistant replies are where repeated concatenation hurt most.
+        reply_lines = [
+            " ".join(rng.choices(words, k=rng.randint(6, 18))) for _ in range(rng.randint(20, 400))
+        ]
+        usage = {"prompt_tokens": 120, "completion_tokens": 480, "total_tokens": 600}
+        block = (
+            f"## User (2026-01-01 00:00:{turn % 60:02d})\n{user_text}\n\n"
+            f'<!-- message_id: "u-{turn}" -->\n\n'
+            f"## Assistant (2026-01-01 00:00:{turn % 60:02d})\n" + "\n".join(reply_lines) + "\n\n"
+            f"<!-- usage: {json.dumps(usage)} -->\n"
+            f'<!-- cost: {{"total_cost": 0.0012}} -->\n'
+            f'<!-- message_id: "a-{turn}" -->\n\n'
+        )
+        parts.append(block)
+        size += len(block.encode("utf-8"))
+        turn += 1
+    return "".join(parts)
+
+
+def _time_runs(fn: Callable[[], list[dict]], repeat: int) -> tuple[float, int]:
+    timings: list[float] = []
+    count = 0
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        count = len(fn())
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), count
+
+
+def main() -> None:
+    args = parse_args()
+    if args.session_file:
+        import frontmatter
+
+        body = frontmatter.load(args.session_file).content
+    else:
+        body = build_session_body(int(args.size_mb * 1024 * 1024), args.seed)
+    session_id = "benchmark-session"
+
+    if legacy_parse_messages(body, session_id) != parse_messages(body, session_id):
+        raise RuntimeError("Parser outputs differ; benchmark aborted.")
+
+    legacy_s, total = _time_runs(lambda: legacy_parse_messages(body, session_id), args.repeat)
+    full_s, _ = _time_runs(lambda: parse_messages(body, session_id), args.repeat)
+    recent_s, recent = _time_runs(
+        lambda: parse_messages(body, session_id, last_n=args.last_n), args.repeat
+    )
+
+    print(f"body_bytes={len(body.encode('utf-8'))} messages={total} repeat={args.repeat}")
+    print(f"legacy_full      {legacy_s * 1000:9.1f} ms")
+    print(f"single_pass_full {full_s * 1000:9.1f} ms  speedup={legacy_s / full_s:5.2f}x")
+    print(f"last_{recent:<11} {recent_s * 1000:9.1f} ms  speedup={legacy_s / recent_s:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
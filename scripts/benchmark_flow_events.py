@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Benchmark the token -> flow event -> replay runtime -> SSE path of chat streams."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from collections.abc import AsyncIterator, Callable
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.application.flow.flow_delta_coalescer import coalesce_text_deltas
+from src.application.flow.flow_event_mapper import FlowEventMapper
+from src.application.flow.flow_events import new_flow_event
+from src.application.flow.flow_stream_runtime import FlowStreamRuntime
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark flow event throughput.")
+    parser.add_argument("--tokens", type=int, default=20000, help="Token chunks per stream.")
+    parser.add_argument("--subscribers", type=int, default=1, help="Live subscriber queues.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per mode.")
+    parser.add_argument("--coalesce-ms", type=float, default=16.0)
+    parser.add_argument("--coalesce-chars", type=int, default=256)
+    return parser.parse_args()
+
+
+class ValidatedMapper(FlowEventMapper):
+    """Previous mapper behaviour (pydantic-validated text deltas), kept as the baseline."""
+
+    def _create_event(self, *, event_type, stage, payload, turn_id=None) -> dict[str, Any]:
+        event = new_flow_event(
+            seq=self._next_seq(),
+            stream_id=self.stream_id,
+            conversation_id=self.conversation_id,
+            turn_id=turn_id or self.default_turn_id,
+            event_type=event_type,
+            stage=stage,
+            payload=payload,
+        )
+        return event.model_dump(exclude_none=True)
+
+
+async def _token_stream(count: int) -> AsyncIterator[dict[str, Any]]:
+    # Cached/local models hand over several chunks per loop iteration.
+    for index in range(count):
+        yield {"type": "assistant_chunk", "chunk": f"tok{index % 97} ", "assistant_id": "a1"}
+        if index % 8 == 0:
+            await asyncio.sleep(0)
+
+
+async def _run_stream(
+    *,
+    tokens: int,
+    subscribers: int,
+    mapper_cls: type[FlowEventMapper],
+    coalesce_ms: float,
+    coalesce_chars: int,
+) -> tuple[float, int]:
+    runtime = FlowStreamRuntime(max_events_per_stream=tokens + 10)
+    runtime.create_stream(
+        stream_id="bench", conversation_id="bench-session", context_type="chat", project_id=None
+    )
+    queues = [runtime.subscribe("bench")[1] for _ in range(subscribers)]
+    mapper = mapper_cls(
+        stream_id="bench",
+        conversation_id="bench-session",
+        seq_provider=lambda: runtime.next_seq("bench"),
+    )
+    source = coalesce_text_deltas(
+        _token_stream(tokens), max_delay_ms=coalesce_ms, max_chars=coalesce_chars
+    )
+
+    start = time.perf_counter()
+    events = 0
+    async for chunk in source:
+        runtime.append_payload("bench", mapper.to_sse_payload(chunk))
+        events += 1
+        # One SSE writer per subscriber serialises every event it receives.
+        for queue in queues:
+            payload = queue.get_nowait()
+            json.dumps(payload, ensure_ascii=False, default=str)
+    return time.perf_counter() - start, events
+
+
+def _time_runs(run: Callable[[], tuple[float, int]], repeat: int) -> tuple[float, int]:
+    timings: list[float] = []
+    events = 0
+    for _ in range(max(1, repeat)):
+        elapsed, events = run()
+        timings.append(elapsed)
+    return statistics.median(timings), events
+
+
+def main() -> None:
+    args = parse_args()
+    modes = [
+        ("validated", ValidatedMapper, 0.0),
+        ("light", FlowEventMapper, 0.0),
+        ("light+coalesced", FlowEventMapper, args.coalesce_ms),
+    ]
+
+    print(
+        f"tokens={args.tokens} subscribers={args.subscribers} repeat={args.repeat} "
+        f"window={args.coalesce_ms:g}ms/{args.coalesce_chars}chars"
+    )
+    baseline_s = None
+    for name, mapper_cls, coalesce_ms in modes:
+        elapsed, events = _time_runs(
+            lambda mapper_cls=mapper_cls, coalesce_ms=coalesce_ms: asyncio.run(
+                _run_stream(
+                    tokens=args.tokens,
+                    subscribers=args.subscribers,
+                    mapper_cls=mapper_cls,
+                    coalesce_ms=coalesce_ms,
+                    coalesce_chars=args.coalesce_chars,
+                )
+            ),
+            args.repeat,
+        )
+        baseline_s = baseline_s or elapsed
+        print(
+            f"{name:<16} {elapsed * 1000:8.1f} ms  events={events:<6} "
+            f"events/s={events / elapsed:10.0f}  tokens/s={args.tokens / elapsed:10.0f}  "
+            f"speedup={baseline_s / elapsed:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,7 @@ if str(REPO_ROOT) not in sys.path:
 from src.domain.models.knowledge_base import KnowledgeBaseDocument
 from src.infrastructure.config.rag_config_service import RagConfigService
 from src.infrastructure.knowledge.document_processing_service import DocumentProcessingService
+from src.infrastructure.knowledge.ingestion_queue import IngestionJob, IngestionQueue
 from src.infrastructure.knowledge.knowledge_base_service import KnowledgeBaseService
 from src.infrastructure.web.webpage_service import WebpageService
 
@@ -83,6 +84,12 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Allow local embedding without GPU offload.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="Number of documents processed concurrently.",
+    )
     parser.add_argument(
         "--continue-on-error",
         action="store_true",
@@ -207,7 +214,7 @@ def _check_embedding_runtime(
 async def _import_file_item(
     *,
     kb_service: KnowledgeBaseService,
-    processor: DocumentProcessingService,
+    queue: IngestionQueue,
     kb_id: str,
     source_path: Path,
     ext: str,
@@ -232,14 +239,21 @@ async def _import_file_item(
         status="pending",
     )
     await kb_service.add_document(doc)
-    await processor.process_document(kb_id, doc_id, filename, ext, str(storage_path))
-    print(f"[ok] file imported: {filename}")
+    await queue.enqueue(
+        kb_id=kb_id,
+        doc_id=doc_id,
+        filename=filename,
+        file_type=ext,
+        storage_path=str(storage_path),
+        file_size=file_size,
+    )
+    print(f"[queued] file: {filename}")
 
 
 async def _import_url_item(
     *,
     kb_service: KnowledgeBaseService,
-    processor: DocumentProcessingService,
+    queue: IngestionQueue,
     webpage_service: WebpageService,
     kb_id: str,
     url: str,
@@ -274,8 +288,15 @@ async def _import_url_item(
         status="pending",
     )
     await kb_service.add_document(doc)
-    await processor.process_document(kb_id, doc_id, filename, ".md", str(storage_path))
-    print(f"[ok] url imported: {url}")
+    await queue.enqueue(
+        kb_id=kb_id,
+        doc_id=doc_id,
+        filename=filename,
+        file_type=".md",
+        storage_path=str(storage_path),
+        file_size=doc.file_size,
+    )
+    print(f"[queued] url: {url}")
 
 
 async def _main() -> None:
@@ -292,6 +313,18 @@ async def _main() -> None:
 
     processor = DocumentProcessingService()
     webpage_service = WebpageService()
+    processing_errors: list[str] = []
+
+    async def _process(job: IngestionJob) -> None:
+        try:
+            await processor.process_document(
+                job.kb_id, job.doc_id, job.filename, job.file_type, job.storage_path
+            )
+        except Exception as exc:
+            processing_errors.append(job.filename)
+            print(f"[error] processing failed: {job.filename} -> {exc}")
+            raise
+        print(f"[ok] imported: {job.filename}")
 
     existing_docs = await kb_service.get_documents(args.kb_id)
     existing_names = {str(doc.filename or "").strip() for doc in existing_docs}
@@ -327,6 +360,9 @@ async def _main() -> None:
         print("[plan] nothing to import")
         return
 
+    # Same queue the API uses: bounded concurrency, small files first.
+    queue = IngestionQueue(_process, workers=args.workers, max_pending=stats.planned)
+
     for source_path, ext, filename in file_candidates:
         if args.skip_existing and filename in existing_names:
             stats.skipped += 1
@@ -335,7 +371,7 @@ async def _main() -> None:
         try:
             await _import_file_item(
                 kb_service=kb_service,
-                processor=processor,
+                queue=queue,
                 kb_id=args.kb_id,
                 source_path=source_path,
                 ext=ext,
@@ -360,7 +396,7 @@ async def _main() -> None:
         try:
             await _import_url_item(
                 kb_service=kb_service,
-                processor=processor,
+                queue=queue,
                 webpage_service=webpage_service,
                 kb_id=args.kb_id,
                 url=url,
@@ -380,6 +416,19 @@ async def _main() -> None:
         print("[done] dry-run only, no files were ingested")
         return
 
+    await queue.join()
+    await queue.stop()
+    queue_stats = queue.stats()
+    stats.imported -= len(processing_errors)
+    stats.failed += len(processing_errors)
+    print(
+        f"[queue] workers={queue_stats['workers']} "
+        f"avg_job_seconds={queue_stats['avg_job_seconds']} "
+        f"docs_per_minute={queue_stats['docs_per_minute']}"
+    )
+    if processing_errors and not args.continue_on_error:
+        raise RuntimeError(f"{len(processing_errors)} document(s) failed to process")
+
     print(
         f"[done] planned={stats.planned} imported={stats.imported} skipped={stats.skipped} failed={stats.failed}"
     )
@@ -1,5 +1,10 @@
 #!/usr/bin/env python3
-"""Profile import pipeline hotspots (YAML metadata IO vs processing)."""
+"""Profile import pipeline hotspots (YAML metadata IO vs processing) and throughput.
+
+Each ``--workers`` value imports the samples into a fresh KB through the
+ingestion queue, so ``--workers 1 4`` compares one-at-a-time processing with
+the pipelined path (overlapping extraction, shared embedding batches).
+"""
 
 from __future__ import annotations
 
@@ -24,7 +29,12 @@ from src.domain.models.knowledge_base import (
     KnowledgeBaseDocument,
     KnowledgeBasesConfig,
 )
-from src.infrastructure.knowledge.document_processing_service import DocumentProcessingService
+from src.infrastructure.knowledge.document_processing_service import (
+    DocumentProcessingService,
+    shutdown_extraction_pool,
+)
+from src.infrastructure.knowledge.embedding_batcher import embedding_batcher_stats
+from src.infrastructure.knowledge.ingestion_queue import IngestionJob, IngestionQueue
 from src.infrastructure.knowledge.knowledge_base_service import KnowledgeBaseService
 
 
@@ -47,6 +57,13 @@ def parse_args() -> argparse.Namespace:
         default=20,
         help="Number of documents to profile.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, 4],
+        help="Ingestion worker counts to compare (one fresh KB per value).",
+    )
     parser.add_argument(
         "--profile-out",
         type=Path,
@@ -109,8 +126,6 @@ async def _run_profile(args: argparse.Namespace) -> None:
     metrics = Metrics()
     kb_service = KnowledgeBaseService()
     processor = DocumentProcessingService()
-    kb_id = f"kb_profile_{uuid.uuid4().hex[:8]}"
-    kb = KnowledgeBase(id=kb_id, name="tmp profile kb")
 
     # monkeypatches for deep timings
     orig_load_config = KnowledgeBaseService.load_config
@@ -156,6 +171,74 @@ async def _run_profile(args: argparse.Namespace) -> None:
         metrics.add("pydantic.model_dump.total", time.perf_counter() - t0)
         return out
 
+    async def process_job(job: IngestionJob) -> None:
+        t2 = time.perf_counter()
+        chunk_count = await processor.process_document(
+            job.kb_id,
+            job.doc_id,
+            job.filename,
+            job.file_type,
+            job.storage_path,
+            track_status=False,
+        )
+        metrics.add("rag.process_document.total", time.perf_counter() - t2)
+
+        t3 = time.perf_counter()
+        await kb_service.update_document_status(
+            job.kb_id,
+            job.doc_id,
+            "ready",
+            chunk_count=int(chunk_count or 0),
+        )
+        metrics.add("kb.update_document_status.total", time.perf_counter() - t3)
+
+    async def run_config(workers: int) -> float:
+        kb_id = f"kb_profile_{uuid.uuid4().hex[:8]}"
+        await kb_service.add_knowledge_base(KnowledgeBase(id=kb_id, name="tmp profile kb"))
+        queue = IngestionQueue(process_job, workers=workers, max_pending=len(samples))
+        try:
+            started = time.perf_counter()
+            for index, sample in enumerate(samples):
+                doc_id = f"prof_{index:04d}_{int(sample['line_no']):06d}"
+                filename = f"{doc_id}.txt"
+                content = str(sample["content"])
+                path = kb_service.get_document_storage_path(kb_id, doc_id, filename)
+
+                t0 = time.perf_counter()
+                path.write_text(content + "\n", encoding="utf-8")
+                size = int(path.stat().st_size)
+                metrics.add("io.write_file.total", time.perf_counter() - t0)
+
+                doc = KnowledgeBaseDocument(
+                    id=doc_id,
+                    kb_id=kb_id,
+                    filename=filename,
+                    file_type=".txt",
+                    file_size=size,
+                    status="pending",
+                )
+
+                t1 = time.perf_counter()
+                await kb_service.add_document(doc)
+                metrics.add("kb.add_document.total", time.perf_counter() - t1)
+                await queue.enqueue(
+                    kb_id=kb_id,
+                    doc_id=doc_id,
+                    filename=filename,
+                    file_type=".txt",
+                    storage_path=str(path),
+                    file_size=size,
+                )
+            await queue.join()
+            elapsed = time.perf_counter() - started
+            failed = queue.stats()["failed"]
+            if failed:
+                raise RuntimeError(f"{failed} document(s) failed with workers={workers}")
+            return elapsed
+        finally:
+            await queue.stop()
+            await kb_service.delete_knowledge_base(kb_id)
+
     KnowledgeBaseService.load_config = wrap_load_config
     KnowledgeBaseService.save_config = wrap_save_config
     KnowledgeBaseService.get_knowledge_base = wrap_get_kb
@@ -164,65 +247,22 @@ async def _run_profile(args: argparse.Namespace) -> None:
     KnowledgeBasesConfig.model_dump = wrap_model_dump
 
     profiler = cProfile.Profile()
-    await kb_service.add_knowledge_base(kb)
-
+    throughput: list[tuple[int, float]] = []
     try:
         profiler.enable()
-        for index, sample in enumerate(samples):
-            doc_id = f"prof_{index:04d}_{int(sample['line_no']):06d}"
-            filename = f"{doc_id}.txt"
-            content = str(sample["content"])
-            path = kb_service.get_document_storage_path(kb_id, doc_id, filename)
-
-            t0 = time.perf_counter()
-            path.write_text(content + "\n", encoding="utf-8")
-            size = int(path.stat().st_size)
-            metrics.add("io.write_file.total", time.perf_counter() - t0)
-
-            doc = KnowledgeBaseDocument(
-                id=doc_id,
-                kb_id=kb_id,
-                filename=filename,
-                file_type=".txt",
-                file_size=size,
-                status="pending",
-            )
-
-            t1 = time.perf_counter()
-            await kb_service.add_document(doc)
-            metrics.add("kb.add_document.total", time.perf_counter() - t1)
-
-            t2 = time.perf_counter()
-            chunk_count = await processor.process_document(
-                kb_id,
-                doc_id,
-                filename,
-                ".txt",
-                str(path),
-                track_status=False,
-            )
-            metrics.add("rag.process_document.total", time.perf_counter() - t2)
-
-            t3 = time.perf_counter()
-            await kb_service.update_document_status(
-                kb_id,
-                doc_id,
-                "ready",
-                chunk_count=int(chunk_count or 0),
-            )
-            metrics.add("kb.update_document_status.total", time.perf_counter() - t3)
+        for workers in args.workers:
+            elapsed = await run_config(max(1, int(workers)))
+            throughput.append((workers, elapsed))
         profiler.disable()
     finally:
-        try:
-            await kb_service.delete_knowledge_base(kb_id)
-        finally:
-            # restore monkeypatches
-            KnowledgeBaseService.load_config = orig_load_config
-            KnowledgeBaseService.save_config = orig_save_config
-            KnowledgeBaseService.get_knowledge_base = orig_get_kb
-            yaml.safe_load = orig_yaml_load
-            yaml.safe_dump = orig_yaml_dump
-            KnowledgeBasesConfig.model_dump = orig_model_dump
+        # restore monkeypatches
+        KnowledgeBaseService.load_config = orig_load_config
+        KnowledgeBaseService.save_config = orig_save_config
+        KnowledgeBaseService.get_knowledge_base = orig_get_kb
+        yaml.safe_load = orig_yaml_load
+        yaml.safe_dump = orig_yaml_dump
+        KnowledgeBasesConfig.model_dump = orig_model_dump
+        shutdown_extraction_pool()
 
     args.profile_out.parent.mkdir(parents=True, exist_ok=True)
     profiler.dump_stats(str(args.profile_out))
@@ -231,6 +271,18 @@ async def _run_profile(args: argparse.Namespace) -> None:
     for line in metrics.summary_lines():
         print(line)
 
+    print("throughput:")
+    baseline = throughput[0][1] if throughput else 0.0
+    for workers, elapsed in throughput:
+        docs_per_second = len(samples) / elapsed if elapsed > 0 else 0.0
+        speedup = baseline / elapsed if elapsed > 0 else 0.0
+        print(
+            f"workers={workers}: elapsed_s={elapsed:.2f} docs_per_s={docs_per_second:.2f} "
+            f"speedup={speedup:.2f}x"
+        )
+    for stats in embedding_batcher_stats():
+        print(f"embedding_batcher: {stats}")
+
     print("top_cumulative:")
     stats = pstats.Stats(profiler)
     stats.sort_stats("cumulative")
@@ -55,6 +55,18 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--runtime-model-id", type=str, default=None, help="Optional runtime model id."
     )
+    parser.add_argument(
+        "--vector-index",
+        choices=["exact", "ivf"],
+        default=None,
+        help="sqlite_vec index mode (default: exact, the ground-truth ranking).",
+    )
+    parser.add_argument(
+        "--vector-quantization",
+        choices=["none", "int8", "binary"],
+        default=None,
+        help="sqlite_vec first-pass quantization (default: none, exact float32).",
+    )
     parser.add_argument(
         "--dry-run", action="store_true", help="Only convert dataset and write manifest."
     )
@@ -98,6 +110,8 @@ def main() -> None:
     score_threshold = float(cfg.get("score_threshold") or 0.0)
     bm25_min_term_coverage = float(cfg.get("bm25_min_term_coverage") or 0.0)
     benchmark_strict = bool(cfg.get("benchmark_strict", False))
+    vector_index = args.vector_index or str(cfg.get("vector_index") or "exact")
+    vector_quantization = args.vector_quantization or str(cfg.get("vector_quantization") or "none")
     max_cases = args.max_cases if args.max_cases is not None else cfg.get("max_cases")
     runtime_model_id = (
         args.runtime_model_id or str(cfg.get("runtime_model_id") or "").strip() or None
@@ -138,6 +152,10 @@ def main() -> None:
         str(bm25_min_term_coverage),
         "--top-k",
         str(top_k),
+        "--vector-index",
+        vector_index,
+        "--vector-quantization",
+        vector_quantization,
     ]
     if runtime_model_id:
         cmd.extend(["--runtime-model-id", runtime_model_id])
@@ -155,6 +173,8 @@ def main() -> None:
         "score_threshold": score_threshold,
         "bm25_min_term_coverage": bm25_min_term_coverage,
         "benchmark_strict": benchmark_strict,
+        "vector_index": vector_index,
+        "vector_quantization": vector_quantization,
         "max_cases": max_cases,
         "runtime_model_id": runtime_model_id,
         "converted_dataset_path": str(dataset_path),
@@ -40,7 +40,10 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+from src.infrastructure.retrieval.embedding_service import get_embedding_instance_cache
+from src.infrastructure.retrieval.query_embedding_cache import get_query_embedding_cache
 from src.infrastructure.retrieval.rag_service import RagResult, RagService
+from src.infrastructure.retrieval.sqlite_connection_pool import sqlite_pool_stats
 
 
 @dataclass
@@ -295,6 +298,7 @@ def _build_report(
     dataset_path: Path,
     summaries: Sequence[dict[str, Any]],
     output_dir: Path,
+    vector_store: dict[str, Any] | None = None,
 ) -> str:
     lines = [
         "# RAG Retrieval Evaluation Report",
@@ -332,6 +336,23 @@ def _build_report(
             "{no_answer_success_rate:.3f} | {overall_pass_rate:.3f} |".format(**item)
         )
 
+    if vector_store and "rows" in vector_store:
+        mib = 1024 * 1024
+        lines.extend(
+            [
+                "",
+                "## Vector Store",
+                "",
+                f"- Index: `{vector_store['vector_index']}`, quantization: "
+                f"`{vector_store['quantization']}` (rescore x{vector_store['rescore_multiplier']})",
+                f"- Rows: {vector_store['rows']}, DB file: {vector_store['db_file_bytes'] / mib:.1f} MiB",
+                f"- float32: {vector_store['float32_bytes'] / mib:.1f} MiB, "
+                f"int8: {vector_store['int8_bytes'] / mib:.1f} MiB, "
+                f"binary: {vector_store['binary_bytes'] / mib:.1f} MiB, "
+                f"content: {vector_store['content_bytes'] / mib:.1f} MiB",
+            ]
+        )
+
     if summaries:
         best_mode = max(summaries, key=lambda row: (row["mean_mrr"], row["mean_recall_at_k"]))
         lines.extend(
@@ -347,6 +368,27 @@ def _build_report(
     return "\n".join(lines) + "\n"
 
 
+def _collect_vector_store_stats(
+    cases: Sequence[EvalCase],
+    *,
+    vector_index: str | None,
+    vector_quantization: str | None,
+) -> dict[str, Any] | None:
+    """Size of the sqlite_vec store for the evaluated KBs (None for other backends)."""
+    from src.infrastructure.config.rag_config_service import RagConfigService
+    from src.infrastructure.retrieval.sqlite_vec_service import SqliteVecService
+
+    storage_cfg = RagConfigService().config.storage
+    if str(getattr(storage_cfg, "vector_store_backend", "")) != "sqlite_vec":
+        return None
+    kb_ids = sorted({kb_id for case in cases for kb_id in case.kb_ids})
+    try:
+        service = SqliteVecService(vector_index=vector_index, quantization=vector_quantization)
+        return service.storage_stats(kb_ids=kb_ids)
+    except Exception as exc:
+        return {"error": str(exc)}
+
+
 async def _evaluate_mode(
     *,
     mode: str,
@@ -356,10 +398,16 @@ async def _evaluate_mode(
     bm25_min_term_coverage_override: float | None,
     runtime_model_id: str | None,
     benchmark_strict: bool,
+    vector_index_override: str | None = None,
+    vector_quantization_override: str | None = None,
 ) -> dict[str, Any]:
     service = RagService()
     retrieval_cfg = service.rag_config_service.config.retrieval
     retrieval_cfg.retrieval_mode = mode
+    if vector_index_override is not None:
+        service.rag_config_service.config.storage.vector_index = vector_index_override
+    if vector_quantization_override is not None:
+        service.rag_config_service.config.storage.vector_quantization = vector_quantization_override
 
     if top_k_override is not None:
         retrieval_cfg.top_k = max(1, int(top_k_override))
@@ -460,6 +508,18 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Optional BM25 lexical coverage threshold override (0-1).",
     )
+    parser.add_argument(
+        "--vector-index",
+        choices=["exact", "ivf"],
+        default=None,
+        help="Optional sqlite_vec index override; 'exact' gives ground-truth vector ranking.",
+    )
+    parser.add_argument(
+        "--vector-quantization",
+        choices=["none", "int8", "binary"],
+        default=None,
+        help="Optional sqlite_vec first-pass quantization override ('none' is exact float32).",
+    )
     parser.add_argument(
         "--max-cases",
         type=int,
@@ -524,6 +584,8 @@ async def _main() -> None:
             bm25_min_term_coverage_override=args.bm25_min_term_coverage,
             runtime_model_id=args.runtime_model_id,
             benchmark_strict=bool(args.benchmark_strict),
+            vector_index_override=args.vector_index,
+            vector_quantization_override=args.vector_quantization,
         )
         mode_outputs.append(mode_result)
         (output_dir / f"mode_{mode}_cases.json").write_text(
@@ -532,11 +594,17 @@ async def _main() -> None:
         )
 
     summaries = [item["summary"] for item in mode_outputs]
+    vector_store = _collect_vector_store_stats(
+        cases,
+        vector_index=args.vector_index,
+        vector_quantization=args.vector_quantization,
+    )
     report = _build_report(
         dataset_name=str(raw_dataset.get("name", "unnamed-dataset")),
         dataset_path=dataset_path,
         summaries=summaries,
         output_dir=output_dir,
+        vector_store=vector_store,
     )
 
     summary_payload = {
@@ -552,9 +620,15 @@ async def _main() -> None:
             "top_k_override": args.top_k,
             "score_threshold_override": args.score_threshold,
             "bm25_min_term_coverage_override": args.bm25_min_term_coverage,
+            "vector_index_override": args.vector_index,
+            "vector_quantization_override": args.vector_quantization,
             "runtime_model_id": args.runtime_model_id,
         },
         "summaries": summaries,
+        "vector_store": vector_store,
+        "sqlite_pools": sqlite_pool_stats(),
+        "query_embedding_cache": get_query_embedding_cache().stats(),
+        "embedding_instances": get_embedding_instance_cache().stats(),
     }
     (output_dir / "summary.json").write_text(
         json.dumps(summary_payload, ensure_ascii=False, indent=2),
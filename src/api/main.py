@@ -1,5 +1,6 @@
 """FastAPI application entry point."""
 
+import asyncio
 import logging
 import os
 from pathlib import Path
@@ -176,6 +177,16 @@ async def startup_event():
     if cleaned:
         logger.info("Cleaned up %s temporary session(s)", cleaned)
 
+    # Fold append-only sidecar counters back into session frontmatter.
+    compacted = await storage.compact_sessions()
+    if compacted:
+        logger.info("Compacted %s conversation sidecar(s)", compacted)
+
+    # Catch the session catalog up with files changed while the backend was down.
+    cataloged = await storage.sync_session_catalog()
+    if cataloged:
+        logger.info("Session catalog refreshed %s file(s)", cataloged)
+
     # Ensure vector-store paths exist.
     from src.infrastructure.config.rag_config_service import RagConfigService
 
@@ -188,6 +199,9 @@ async def startup_event():
             from src.infrastructure.retrieval.sqlite_vec_service import SqliteVecService
 
             sqlite_vec = SqliteVecService()
+            migrated = await asyncio.to_thread(sqlite_vec.migrate_legacy_storage)
+            if migrated:
+                logger.info("Migrated %s legacy vector row(s) to quantized storage", migrated)
             logger.info("SQLite vector storage ready: %s", sqlite_vec.db_path)
         else:
             persist_dir = Path(rag_cfg.config.storage.persist_directory)
@@ -198,6 +212,93 @@ async def startup_event():
     except Exception as e:
         logger.warning("Failed to initialize vector storage: %s", e)
 
+    # Split a legacy shared BM25 index before the first chat turn searches it.
+    try:
+        from src.infrastructure.retrieval.bm25_service import Bm25Service
+
+        split = await asyncio.to_thread(Bm25Service().migrate_shared_fts_index)
+        if split:
+            logger.info("Split the BM25 index into %s per-KB FTS table(s)", split)
+    except Exception as e:
+        logger.warning("Failed to migrate BM25 index: %s", e)
+
+    # Load the embedding model off the request path so the first query is not cold.
+    if settings.embedding_warmup_on_startup:
+        task = asyncio.create_task(_warm_up_embeddings())
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    # Documents left pending/processing by the previous run go back on the queue.
+    task = asyncio.create_task(_resume_document_ingestion())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+_background_tasks: set[asyncio.Task] = set()
+
+
+async def _warm_up_embeddings() -> None:
+    from src.infrastructure.retrieval.embedding_service import EmbeddingService
+
+    try:
+        elapsed = await asyncio.to_thread(EmbeddingService().warm_up)
+        logger.info("Embedding model warmed up in %.1f ms", elapsed * 1000)
+    except Exception as e:
+        logger.warning("Embedding warm-up skipped: %s", e)
+
+
+async def _resume_document_ingestion() -> None:
+    from src.infrastructure.knowledge.ingestion_queue import get_ingestion_queue
+    from src.infrastructure.knowledge.knowledge_base_service import KnowledgeBaseService
+
+    try:
+        resumed = await get_ingestion_queue().resume_unfinished(KnowledgeBaseService())
+        if resumed:
+            logger.info("Resumed ingestion of %s document(s)", resumed)
+    except Exception as e:
+        logger.warning("Failed to resume document ingestion: %s", e)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release pooled resources held by long-lived services."""
+    from src.infrastructure.knowledge.document_processing_service import (
+        shutdown_extraction_pool,
+    )
+    from src.infrastructure.knowledge.embedding_batcher import embedding_batcher_stats
+    from src.infrastructure.knowledge.ingestion_queue import get_ingestion_queue
+    from src.infrastructure.retrieval.chroma_registry import (
+        close_chroma_clients,
+        get_chroma_registry,
+    )
+    from src.infrastructure.retrieval.embedding_service import (
+        close_embedding_http_clients,
+        get_embedding_instance_cache,
+    )
+    from src.infrastructure.retrieval.query_embedding_cache import get_query_embedding_cache
+    from src.infrastructure.retrieval.sqlite_connection_pool import (
+        close_sqlite_pools,
+        sqlite_pool_stats,
+    )
+    from src.providers.client_cache import close_provider_http_clients, provider_client_stats
+
+    ingestion_queue = get_ingestion_queue()
+    logger.info("Ingestion queue: %s", ingestion_queue.stats())
+    await ingestion_queue.stop()
+    shutdown_extraction_pool()
+    for stats in embedding_batcher_stats():
+        logger.info("Embedding batcher: %s", stats)
+    logger.info("Embedding instances: %s", get_embedding_instance_cache().stats())
+    logger.info("Chroma registry: %s", get_chroma_registry().stats())
+    logger.info("Query embedding cache: %s", get_query_embedding_cache().stats())
+    for db_path, stats in sqlite_pool_stats().items():
+        logger.info("SQLite pool %s: %s", db_path, stats)
+    logger.info("Provider clients: %s", provider_client_stats())
+    close_sqlite_pools()
+    close_chroma_clients()
+    await close_embedding_http_clients()
+    await close_provider_http_clients()
+
 
 @app.get("/api/health")
 async def health_check():
@@ -205,6 +306,31 @@ async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/api/debug/config-snapshots")
+async def config_snapshot_stats():
+    """Config file parses per minute and snapshot cache counters."""
+    from src.infrastructure.config.config_file_snapshots import config_parse_meter
+    from src.infrastructure.config.config_snapshot_registry import config_snapshots
+    from src.infrastructure.config.model_config_snapshot import (
+        api_key_snapshots,
+        model_config_snapshots,
+    )
+
+    return {
+        "parses": config_parse_meter.stats(),
+        "config_services": config_snapshots.stats(),
+        "model_config": [model_config_snapshots.stats(), api_key_snapshots.stats()],
+    }
+
+
+@app.get("/api/debug/provider-clients")
+async def provider_client_debug_stats():
+    """LLM instance reuse and provider helper connection reuse."""
+    from src.providers.client_cache import provider_client_stats
+
+    return provider_client_stats()
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information or packaged frontend."""
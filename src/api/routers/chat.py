@@ -4,6 +4,7 @@ import asyncio
 import json
 import logging
 import uuid
+from collections.abc import AsyncIterable
 from typing import Any
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
@@ -14,6 +15,7 @@ from src.application.chat import ChatApplicationService
 from src.application.chat.client_tool_call_coordinator import (
     get_client_tool_call_coordinator,
 )
+from src.application.flow.flow_delta_coalescer import coalesce_text_deltas
 from src.application.flow.flow_event_emitter import FlowEventEmitter
 from src.application.flow.flow_event_mapper import FlowEventMapper
 from src.application.flow.flow_event_types import (
@@ -29,6 +31,7 @@ from src.application.flow.flow_stream_runtime import (
     FlowStreamRuntime,
 )
 from src.application.flow.flow_stream_runtime_provider import get_flow_stream_runtime
+from src.core.config import settings
 from src.domain.models.search import SearchSource
 from src.infrastructure.files.file_service import FileService
 
@@ -226,6 +229,14 @@ async def _build_stream_fn(
     )
 
 
+def _coalesce_deltas(stream: AsyncIterable[Any]) -> AsyncIterable[Any]:
+    return coalesce_text_deltas(
+        stream,
+        max_delay_ms=settings.flow_delta_coalesce_ms,
+        max_chars=settings.flow_delta_coalesce_max_chars,
+    )
+
+
 async def _run_chat_stream_producer(
     *,
     request: ChatRequest,
@@ -248,7 +259,7 @@ async def _run_chat_stream_producer(
         )
 
         stream_fn = await _build_stream_fn(request, agent)
-        async for chunk in stream_fn:
+        async for chunk in _coalesce_deltas(stream_fn):
             runtime.append_payload(stream_id, mapper.to_sse_payload(chunk))
 
         runtime.append_payload(stream_id, mapper.to_sse_payload({"done": True}))
@@ -970,7 +981,7 @@ async def chat_compare(
         started_payload = mapper.make_stream_started_payload(context_type=request.context_type)
         yield f"data: {json.dumps(started_payload, ensure_ascii=False, default=str)}\n\n"
         try:
-            async for event in agent.process_compare_stream(
+            compare_stream = agent.process_compare_stream(
                 request.session_id,
                 request.message,
                 request.model_ids,
@@ -981,7 +992,8 @@ async def chat_compare(
                 context_capabilities=request.context_capabilities,
                 context_capability_args=request.context_capability_args,
                 file_references=request.file_references,
-            ):
+            )
+            async for event in _coalesce_deltas(compare_stream):
                 mapped_payload = mapper.to_sse_payload(event)
                 yield f"data: {json.dumps(mapped_payload, ensure_ascii=False, default=str)}\n\n"
                 if _is_terminal_payload(mapped_payload):
@@ -4,10 +4,11 @@ Knowledge Base API Router
 Provides CRUD endpoints for knowledge bases and document management.
 """
 
-import asyncio
 import logging
 import os
 import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Protocol
 
@@ -23,7 +24,13 @@ from src.domain.models.knowledge_base import (
     KnowledgeBaseDocument,
     KnowledgeBaseUpdate,
 )
+from src.infrastructure.knowledge.embedding_batcher import embedding_batcher_stats
+from src.infrastructure.knowledge.ingestion_queue import (
+    IngestionQueueFullError,
+    get_ingestion_queue,
+)
 from src.infrastructure.knowledge.knowledge_base_service import KnowledgeBaseService
+from src.infrastructure.retrieval.sqlite_vec_service import optional_int
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/knowledge-bases", tags=["knowledge-bases"])
@@ -125,6 +132,15 @@ async def create_knowledge_base(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/ingestion/status")
+async def get_ingestion_status():
+    """Ingestion queue depth, running documents, throughput and embedding batches."""
+    return {
+        **get_ingestion_queue().stats(),
+        "embedding_batchers": embedding_batcher_stats(),
+    }
+
+
 @router.get("/{kb_id}", response_model=KnowledgeBase)
 async def get_knowledge_base(kb_id: str, service: KnowledgeBaseService = Depends(get_kb_service)):
     """Get a specific knowledge base"""
@@ -204,28 +220,28 @@ async def upload_document(
             detail=f"Unsupported file type '{ext}'. Allowed: {', '.join(ALLOWED_EXTENSIONS)}",
         )
 
-    # Generate document ID
-    doc_id = str(uuid.uuid4())[:8]
-
-    # Save file to storage
-    storage_path = service.get_document_storage_path(kb_id, doc_id, filename)
-    file_size = await _persist_upload_file(file, storage_path)
-
-    # Create document record with pending status
-    doc = KnowledgeBaseDocument(
-        id=doc_id,
-        kb_id=kb_id,
-        filename=filename,
-        file_type=ext,
-        file_size=file_size,
-        status="pending",
-        error_message=None,
-    )
-    await service.add_document(doc)
-
-    # Trigger async processing
-    asyncio.create_task(_process_document_async(kb_id, doc_id, filename, ext, storage_path))
+    # Hold a queue slot before anything is stored, so a 429 never strands a document.
+    with _reserve_queue_slot():
+        # Generate document ID
+        doc_id = str(uuid.uuid4())[:8]
+
+        # Save file to storage
+        storage_path = service.get_document_storage_path(kb_id, doc_id, filename)
+        file_size = await _persist_upload_file(file, storage_path)
+
+        # Create document record with pending status
+        doc = KnowledgeBaseDocument(
+            id=doc_id,
+            kb_id=kb_id,
+            filename=filename,
+            file_type=ext,
+            file_size=file_size,
+            status="pending",
+            error_message=None,
+        )
+        await service.add_document(doc)
 
+        await _enqueue_document(doc, storage_path, reserved=True)
     return doc
 
 
@@ -256,24 +272,14 @@ async def reprocess_document(
     if not doc:
         raise HTTPException(status_code=404, detail=f"Document '{doc_id}' not found")
 
-    # Find the stored file
-    doc_dir = service.storage_dir / kb_id / "documents"
-    storage_path = None
-    for file_path in doc_dir.glob(f"{doc_id}_*"):
-        storage_path = file_path
-        break
-
-    if not storage_path or not storage_path.exists():
+    storage_path = service.find_document_file(kb_id, doc_id)
+    if storage_path is None:
         raise HTTPException(status_code=404, detail="Document file not found on disk")
+    with _reserve_queue_slot():
+        # Reset status to pending
+        await service.update_document_status(kb_id, doc_id, "pending")
 
-    # Reset status to pending
-    await service.update_document_status(kb_id, doc_id, "pending")
-
-    # Trigger async processing
-    asyncio.create_task(
-        _process_document_async(kb_id, doc_id, doc.filename, doc.file_type, storage_path)
-    )
-
+        await _enqueue_document(doc, storage_path, reserved=True)
     return {"message": f"Document '{doc_id}' queued for reprocessing"}
 
 
@@ -310,6 +316,8 @@ async def list_chunks(
                         filename=str(row.get("filename") or ""),
                         chunk_index=int(row.get("chunk_index", 0) or 0),
                         content=str(row.get("content") or ""),
+                        page_start=row.get("page_start"),
+                        page_end=row.get("page_end"),
                     )
                 )
         else:
@@ -317,9 +325,9 @@ async def list_chunks(
             if not persist_dir.is_absolute():
                 persist_dir = resolve_user_data_path(persist_dir)
 
-            import chromadb
+            from src.infrastructure.retrieval.chroma_registry import get_chroma_registry
 
-            client = chromadb.PersistentClient(path=str(persist_dir))
+            client = get_chroma_registry().get_client(persist_dir)
             collection_name = f"kb_{kb_id}"
             collection = client.get_collection(collection_name)
             if doc_id:
@@ -353,6 +361,8 @@ async def list_chunks(
                         ),
                         chunk_index=chunk_index,
                         content=str(content or ""),
+                        page_start=optional_int(meta.get("page_start")),
+                        page_end=optional_int(meta.get("page_end")),
                     )
                 )
 
@@ -363,21 +373,32 @@ async def list_chunks(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def _process_document_async(
-    kb_id: str, doc_id: str, filename: str, file_type: str, storage_path
-):
-    """Background task to process a document"""
+@contextmanager
+def _reserve_queue_slot() -> Iterator[None]:
+    """Hold an ingestion queue slot, answering 429 when none is free."""
     try:
-        from src.infrastructure.knowledge.document_processing_service import (
-            DocumentProcessingService,
+        with get_ingestion_queue().reserve():
+            yield
+    except IngestionQueueFullError:
+        raise HTTPException(
+            status_code=429, detail="Too many documents waiting for processing; retry later"
         )
 
-        processor = DocumentProcessingService()
-        await processor.process_document(kb_id, doc_id, filename, file_type, str(storage_path))
-    except Exception as e:
-        logger.error(f"Background document processing failed for {doc_id}: {e}")
-        try:
-            service = KnowledgeBaseService()
-            await service.update_document_status(kb_id, doc_id, "error", error_message=str(e))
-        except Exception as e2:
-            logger.error(f"Failed to update document status to error: {e2}")
+
+async def _enqueue_document(
+    doc: KnowledgeBaseDocument, storage_path: Path, *, reserved: bool = False
+) -> None:
+    """Hand a pending document to the ingestion queue."""
+    try:
+        await get_ingestion_queue().enqueue(
+            kb_id=doc.kb_id,
+            doc_id=doc.id,
+            filename=doc.filename,
+            file_type=doc.file_type,
+            storage_path=str(storage_path),
+            file_size=doc.file_size,
+            reserved=reserved,
+        )
+    except IngestionQueueFullError as e:
+        # The document stays pending and is picked up again on the next start.
+        raise HTTPException(status_code=429, detail=str(e))
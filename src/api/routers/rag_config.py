@@ -75,6 +75,11 @@ class RagConfigResponse(BaseModel):
     rerank_weight: float
     vector_store_backend: str
     vector_sqlite_path: str
+    vector_index: str = "exact"
+    vector_ivf_nprobe: int = 16
+    vector_ivf_min_rows: int = 50000
+    vector_quantization: str = "none"
+    vector_rescore_multiplier: int = 4
     persist_directory: str
     bm25_sqlite_path: str
 
@@ -137,6 +142,11 @@ class RagConfigUpdate(BaseModel):
     rerank_weight: float | None = Field(default=None, ge=0.0, le=1.0)
     vector_store_backend: Literal["sqlite_vec", "chroma"] | None = None
     vector_sqlite_path: str | None = None
+    vector_index: Literal["exact", "ivf"] | None = None
+    vector_ivf_nprobe: int | None = Field(default=None, ge=1, le=4096)
+    vector_ivf_min_rows: int | None = Field(default=None, ge=1000)
+    vector_quantization: Literal["none", "int8", "binary"] | None = None
+    vector_rescore_multiplier: int | None = Field(default=None, ge=1, le=64)
     persist_directory: str | None = None
     bm25_sqlite_path: str | None = None
 
@@ -227,6 +237,12 @@ async def update_config(
                 )
 
         service.save_flat_config(update_dict)
+        if any(key.startswith("embedding_") for key in update_dict):
+            from src.infrastructure.retrieval.embedding_service import (
+                invalidate_embedding_instances,
+            )
+
+            invalidate_embedding_instances()
         return {"message": "RAG configuration updated successfully"}
     except HTTPException:
         raise
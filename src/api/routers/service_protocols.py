@@ -88,6 +88,9 @@ class ConversationQueryStorageLike(Protocol):
         *,
         context_type: str = "chat",
         project_id: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        sort_by: str = "updated_at",
     ) -> list[dict[str, Any]]: ...
 
     async def search_sessions(
@@ -96,6 +99,8 @@ class ConversationQueryStorageLike(Protocol):
         *,
         context_type: str = "chat",
         project_id: str | None = None,
+        limit: int = 20,
+        offset: int = 0,
     ) -> list[dict[str, Any]]: ...
 
     async def get_session(
@@ -172,6 +172,11 @@ async def create_session(
 async def list_sessions(
     context_type: str = Query("chat", description="Session context: 'chat' or 'project'"),
     project_id: str | None = Query(None, description="Project ID (required for project context)"),
+    limit: int | None = Query(None, ge=1, description="Page size (omit to list all sessions)"),
+    offset: int = Query(0, ge=0, description="Number of sessions to skip"),
+    sort_by: Literal["updated_at", "created_at"] = Query(
+        "updated_at", description="Sort key, newest first"
+    ),
     storage: ConversationQueryStorageLike = Depends(get_storage),
 ):
     """List all conversation sessions.
@@ -179,6 +184,9 @@ async def list_sessions(
     Args:
         context_type: Context type ("chat" or "project")
         project_id: Project ID (required when context_type="project")
+        limit: Optional page size
+        offset: Pagination offset
+        sort_by: "updated_at" or "created_at"
 
     Returns:
         {
@@ -202,7 +210,13 @@ async def list_sessions(
 
     logger.info("📋 列出所有会话...")
     try:
-        sessions = await storage.list_sessions(context_type=context_type, project_id=project_id)
+        sessions = await storage.list_sessions(
+            context_type=context_type,
+            project_id=project_id,
+            limit=limit,
+            offset=offset,
+            sort_by=sort_by,
+        )
         logger.info(f"✅ 找到 {len(sessions)} 个会话")
         return {"sessions": sessions}
     except ValueError as e:
@@ -215,6 +229,8 @@ async def search_sessions(
     q: str = Query(""),
     context_type: str = Query("chat", description="Session context: 'chat' or 'project'"),
     project_id: str | None = Query(None, description="Project ID (required for project context)"),
+    limit: int = Query(20, ge=1, le=200, description="Maximum number of results"),
+    offset: int = Query(0, ge=0, description="Number of ranked results to skip"),
     storage: ConversationQueryStorageLike = Depends(get_storage),
 ):
     """Search sessions by title and message content.
@@ -223,6 +239,8 @@ async def search_sessions(
         q: Search query string
         context_type: Context type ("chat" or "project")
         project_id: Project ID (required when context_type="project")
+        limit: Maximum number of results
+        offset: Pagination offset
 
     Returns:
         {"results": [...]}
@@ -231,7 +249,9 @@ async def search_sessions(
         raise HTTPException(status_code=400, detail="project_id is required for project context")
 
     try:
-        results = await storage.search_sessions(q, context_type=context_type, project_id=project_id)
+        results = await storage.search_sessions(
+            q, context_type=context_type, project_id=project_id, limit=limit, offset=offset
+        )
         return {"results": results}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -123,6 +123,7 @@ def build_default_chat_application_service(
         source_context_service=source_context_service,
         rag_config_service=rag_config_service,
         rag_context_builder=rag_context_builder_service.build_context_and_sources,
+        context_deadline_seconds=settings.context_deadline_seconds,
     )
 
     group_orchestration_support_service = GroupOrchestrationSupportService(
@@ -76,6 +76,7 @@ class ContextInfoEvent(_EventBase):
     estimated_prompt_tokens: int | None = None
     remaining_tokens: int | None = None
     context_truncated: bool | None = None
+    context_timings: dict[str, Any] | None = None
 
 
 class ThinkingDurationEvent(_EventBase):
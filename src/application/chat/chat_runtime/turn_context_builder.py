@@ -96,13 +96,26 @@ class GroupTurnContextBuilder:
         system_prompt = "\n\n".join(prompt_parts)
 
         assistant_memory_enabled = bool(getattr(assistant_obj, "memory_enabled", True))
+        retrieval_cache = execution.retrieval_cache
         memory_sources: list[dict[str, Any]] = []
         try:
+            # Global memories are searched once per group turn; each participant
+            # only adds its own assistant-scoped memories on top.
+            shared_memory = retrieval_cache.get_or_compute(
+                ("memory", execution.raw_user_message),
+                lambda: self.memory_service.collect_memory_items(
+                    query=execution.raw_user_message,
+                    assistant_id=None,
+                    include_global=True,
+                    include_assistant=False,
+                ),
+            )
             memory_context, memory_sources = self.memory_service.build_memory_context(
                 query=execution.raw_user_message,
                 assistant_id=assistant_id,
                 include_global=True,
                 include_assistant=assistant_memory_enabled,
+                shared_items=shared_memory,
             )
             if memory_context:
                 system_prompt = (
@@ -118,6 +131,7 @@ class GroupTurnContextBuilder:
             assistant_id=assistant_id,
             assistant_obj=assistant_obj,
             runtime_model_id=model_id,
+            retrieval_cache=retrieval_cache,
         )
         if rag_context:
             system_prompt = f"{system_prompt}\n\n{rag_context}" if system_prompt else rag_context
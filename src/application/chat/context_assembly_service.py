@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from collections.abc import Awaitable, Callable
 from typing import Any
 
@@ -16,10 +18,12 @@ from src.application.chat.service_contracts import (
     SourcePayload,
 )
 from src.application.chat.source_diagnostics import merge_source_groups
-from src.tools.registry import get_tool_registry
+from src.tools.registry import ToolRegistry, get_tool_registry
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CONTEXT_DEADLINE_SECONDS = 20.0
+
 
 class ContextAssemblyService:
     """Builds runtime LLM context from session, retrieval, and optional search."""
@@ -32,12 +36,14 @@ class ContextAssemblyService:
         source_context_service: SourceContextServiceLike,
         rag_config_service: RagConfigServiceLike,
         rag_context_builder: Callable[..., Awaitable[tuple[str | None, list[SourcePayload]]]],
+        context_deadline_seconds: float = DEFAULT_CONTEXT_DEADLINE_SECONDS,
     ):
         self.storage = storage
         self.memory_service = memory_service
         self.source_context_service = source_context_service
         self.rag_config_service = rag_config_service
         self.rag_context_builder = rag_context_builder
+        self.context_deadline_seconds = max(0.0, float(context_deadline_seconds))
 
     async def prepare_context(
         self,
@@ -49,74 +55,20 @@ class ContextAssemblyService:
         context_capabilities: list[str] | None = None,
         context_capability_args: dict[str, dict[str, Any]] | None = None,
     ) -> ContextPayload:
-        """Prepare context payload consumed by orchestrators."""
-        tool_registry = get_tool_registry()
-        session = await self.storage.get_session(
-            session_id,
-            context_type=context_type,
-            project_id=project_id,
+        """Prepare context payload consumed by orchestrators.
+
+        Context capabilities start right away, memory and RAG as soon as the
+        session and assistant are known; all of them run concurrently. Sources
+        still running at the request deadline are dropped, so assembly takes as
+        long as the slowest source, bounded by ``context_deadline_seconds``
+        (``0`` waits for every source).
+        """
+        started = time.perf_counter()
+        deadline = (
+            started + self.context_deadline_seconds if self.context_deadline_seconds > 0 else None
         )
-        messages = session["state"]["messages"]
-        assistant_id = session.get("assistant_id")
-        model_id = session.get("model_id")
-
-        base_system_prompt = None
-        max_rounds = None
-        assistant_params: dict[str, Any] = {}
-        assistant_obj: AssistantLike | None = None
-        memory_context: str | None = None
-        webpage_context: str | None = None
-        search_context: str | None = None
-        capability_contexts: dict[str, str] = {}
-        rag_context: str | None = None
-        structured_source_context: str | None = None
-
-        if assistant_id:
-            from src.infrastructure.config.assistant_config_service import AssistantConfigService
-
-            assistant_service = AssistantConfigService()
-            try:
-                assistant = await assistant_service.require_enabled_assistant(assistant_id)
-                assistant_obj = assistant
-                base_system_prompt = assistant.system_prompt
-                max_rounds = assistant.max_rounds
-                assistant_params = self._assistant_params_from_assistant(assistant)
-            except ValueError:
-                raise
-            except Exception as e:
-                logger.warning("Failed to load assistant config: %s, using defaults", e)
-
-        param_overrides = session.get("param_overrides", {})
-        if param_overrides:
-            if "model_id" in param_overrides:
-                model_id = param_overrides["model_id"]
-            if "max_rounds" in param_overrides:
-                max_rounds = param_overrides["max_rounds"]
-            for key in [
-                "temperature",
-                "max_tokens",
-                "top_p",
-                "top_k",
-                "frequency_penalty",
-                "presence_penalty",
-            ]:
-                if key in param_overrides:
-                    assistant_params[key] = param_overrides[key]
-
-        assistant_memory_enabled = bool(getattr(assistant_obj, "memory_enabled", True))
-        resolved_model_id = str(model_id or "")
-
-        memory_sources: list[SourcePayload] = []
-        try:
-            include_assistant_memory = bool(assistant_id and assistant_memory_enabled)
-            memory_context, memory_sources = self.memory_service.build_memory_context(
-                query=raw_user_message,
-                assistant_id=assistant_id if include_assistant_memory else None,
-                include_global=True,
-                include_assistant=include_assistant_memory,
-            )
-        except Exception as e:
-            logger.warning("Memory retrieval failed: %s", e)
+        timings: dict[str, Any] = {}
+        tool_registry = get_tool_registry()
 
         normalized_capabilities = self._normalize_context_capabilities(context_capabilities)
         normalized_capability_args = self._normalize_context_capability_args(
@@ -128,48 +80,158 @@ class ContextAssemblyService:
                 "context_capability_args contains ids that are not requested: "
                 + ", ".join(unknown_args)
             )
-
-        capability_sources: list[SourcePayload] = []
         for capability_id in normalized_capabilities:
             if not tool_registry.has_chat_capability(capability_id):
                 raise ValueError(f"Unknown or unavailable context capability: {capability_id}")
-            handler = tool_registry.get_context_capability_handler(capability_id)
-            if handler is None:
+            if tool_registry.get_context_capability_handler(capability_id) is None:
                 raise ValueError(f"Context capability is not executable: {capability_id}")
-            try:
-                payload = await tool_registry.execute_context_capability_async(
-                    capability_id,
-                    raw_user_message=raw_user_message,
-                    args=normalized_capability_args.get(capability_id) or {},
+
+        source_tasks: dict[str, asyncio.Task[Any]] = {}
+        try:
+            for capability_id in normalized_capabilities:
+                source_tasks[f"capability:{capability_id}"] = asyncio.create_task(
+                    self._timed(
+                        timings,
+                        f"capability:{capability_id}",
+                        self._run_context_capability(
+                            tool_registry,
+                            capability_id,
+                            raw_user_message=raw_user_message,
+                            args=normalized_capability_args.get(capability_id) or {},
+                            context_type=context_type,
+                            project_id=project_id,
+                            session_id=session_id,
+                        ),
+                    )
+                )
+
+            session = await self._timed(
+                timings,
+                "session",
+                self.storage.get_session(
+                    session_id,
                     context_type=context_type,
                     project_id=project_id,
-                    session_id=session_id,
+                ),
+            )
+            messages = session["state"]["messages"]
+            assistant_id = session.get("assistant_id")
+            model_id = session.get("model_id")
+
+            base_system_prompt = None
+            max_rounds = None
+            assistant_params: dict[str, Any] = {}
+            assistant_obj: AssistantLike | None = None
+
+            if assistant_id:
+                from src.infrastructure.config.assistant_config_service import (
+                    AssistantConfigService,
+                )
+
+                assistant_service = AssistantConfigService()
+                try:
+                    assistant = await self._timed(
+                        timings,
+                        "assistant",
+                        assistant_service.require_enabled_assistant(assistant_id),
+                    )
+                    assistant_obj = assistant
+                    base_system_prompt = assistant.system_prompt
+                    max_rounds = assistant.max_rounds
+                    assistant_params = self._assistant_params_from_assistant(assistant)
+                except ValueError:
+                    raise
+                except Exception as e:
+                    logger.warning("Failed to load assistant config: %s, using defaults", e)
+
+            param_overrides = session.get("param_overrides", {})
+            if param_overrides:
+                if "model_id" in param_overrides:
+                    model_id = param_overrides["model_id"]
+                if "max_rounds" in param_overrides:
+                    max_rounds = param_overrides["max_rounds"]
+                for key in [
+                    "temperature",
+                    "max_tokens",
+                    "top_p",
+                    "top_k",
+                    "frequency_penalty",
+                    "presence_penalty",
+                ]:
+                    if key in param_overrides:
+                        assistant_params[key] = param_overrides[key]
+
+            assistant_memory_enabled = bool(getattr(assistant_obj, "memory_enabled", True))
+            resolved_model_id = str(model_id or "")
+
+            include_assistant_memory = bool(assistant_id and assistant_memory_enabled)
+            source_tasks["memory"] = asyncio.create_task(
+                self._timed(
+                    timings,
+                    "memory",
+                    self._build_memory_context(
+                        query=raw_user_message,
+                        assistant_id=assistant_id if include_assistant_memory else None,
+                        include_global=True,
+                        include_assistant=include_assistant_memory,
+                    ),
+                )
+            )
+            source_tasks["rag"] = asyncio.create_task(
+                self._timed(
+                    timings,
+                    "rag",
+                    self.rag_context_builder(
+                        raw_user_message=raw_user_message,
+                        assistant_id=assistant_id,
+                        assistant_obj=assistant_obj,
+                        runtime_model_id=resolved_model_id,
+                        context_type=context_type,
+                        project_id=project_id,
+                    ),
                 )
-                context_text = payload.get("context")
-                context_key = str(payload.get("context_key") or capability_id).strip()
-                if isinstance(context_text, str) and context_text.strip():
-                    capability_contexts[context_key] = context_text.strip()
-                raw_sources = payload.get("sources")
-                if isinstance(raw_sources, list):
-                    for item in raw_sources:
-                        if isinstance(item, dict):
-                            capability_sources.append(item)
-            except ValueError:
-                raise
-            except Exception as e:
-                logger.warning("Context capability failed (%s): %s", capability_id, e)
+            )
+
+            timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            _, pending = await asyncio.wait(source_tasks.values(), timeout=timeout)
+            timed_out = [name for name, task in source_tasks.items() if task in pending]
+            if timed_out:
+                logger.warning(
+                    "Context sources missed the %.1fs deadline and were skipped: %s",
+                    self.context_deadline_seconds,
+                    ", ".join(timed_out),
+                )
+        finally:
+            pending_tasks = [task for task in source_tasks.values() if not task.done()]
+            for task in pending_tasks:
+                task.cancel()
+            if pending_tasks:
+                await asyncio.gather(*pending_tasks, return_exceptions=True)
+
+        def _source_result(name: str, default: Any) -> Any:
+            task = source_tasks[name]
+            return default if name in timed_out else task.result()
+
+        capability_contexts: dict[str, str] = {}
+        capability_sources: list[SourcePayload] = []
+        for capability_id in normalized_capabilities:
+            payload = _source_result(f"capability:{capability_id}", None)
+            if payload is None:
+                continue
+            context_text = payload.get("context")
+            context_key = str(payload.get("context_key") or capability_id).strip()
+            if isinstance(context_text, str) and context_text.strip():
+                capability_contexts[context_key] = context_text.strip()
+            raw_sources = payload.get("sources")
+            if isinstance(raw_sources, list):
+                for item in raw_sources:
+                    if isinstance(item, dict):
+                        capability_sources.append(item)
 
         webpage_context = capability_contexts.get("webpage_context")
         search_context = capability_contexts.get("search_context")
-
-        rag_context, rag_sources = await self.rag_context_builder(
-            raw_user_message=raw_user_message,
-            assistant_id=assistant_id,
-            assistant_obj=assistant_obj,
-            runtime_model_id=resolved_model_id,
-            context_type=context_type,
-            project_id=project_id,
-        )
+        memory_context, memory_sources = _source_result("memory", (None, []))
+        rag_context, rag_sources = _source_result("rag", (None, []))
 
         all_sources = merge_source_groups(
             memory_sources,
@@ -189,6 +251,10 @@ class ContextAssemblyService:
             structured_source_context,
         )
 
+        timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+        timings["timed_out"] = timed_out
+        logger.info("[CONTEXT] assembled in %.1f ms: %s", timings["total"], timings)
+
         return ContextPayload(
             messages=messages,
             system_prompt=system_prompt,
@@ -206,8 +272,38 @@ class ContextAssemblyService:
             capability_contexts=capability_contexts,
             rag_context=rag_context,
             structured_source_context=structured_source_context,
+            context_timings=timings,
         )
 
+    @staticmethod
+    async def _timed(timings: dict[str, Any], stage: str, awaitable: Awaitable[Any]) -> Any:
+        """Await ``awaitable`` and record its duration in milliseconds under ``stage``."""
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            timings[stage] = round((time.perf_counter() - started) * 1000, 1)
+
+    async def _build_memory_context(self, **kwargs: Any) -> tuple[str | None, list[SourcePayload]]:
+        # Memory search embeds the query and reads Chroma synchronously.
+        try:
+            return await asyncio.to_thread(self.memory_service.build_memory_context, **kwargs)
+        except Exception as e:
+            logger.warning("Memory retrieval failed: %s", e)
+            return None, []
+
+    @staticmethod
+    async def _run_context_capability(
+        tool_registry: ToolRegistry, capability_id: str, **kwargs: Any
+    ) -> dict[str, Any] | None:
+        try:
+            return await tool_registry.execute_context_capability_async(capability_id, **kwargs)
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.warning("Context capability failed (%s): %s", capability_id, e)
+            return None
+
     @staticmethod
     def _assistant_params_from_assistant(assistant: AssistantLike) -> dict[str, Any]:
         return {
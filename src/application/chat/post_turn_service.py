@@ -151,10 +151,12 @@ class PostTurnService:
             if not enabled or count <= 0:
                 return None
 
+            max_rounds = int(getattr(config, "max_context_rounds", 0) or 0)
             updated_session = await self.storage.get_session(
                 session_id,
                 context_type=context_type,
                 project_id=project_id,
+                last_n_messages=max_rounds * 2 or None,
             )
             messages_for_followup: list[MessagePayload] = updated_session["state"]["messages"]
             questions = await followup_service.generate_followups_async(messages_for_followup)
@@ -6,6 +6,7 @@ import logging
 from typing import Any
 
 from src.application.chat.service_contracts import AssistantLike
+from src.application.chat.turn_retrieval_cache import TurnRetrievalCache
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +23,13 @@ class RagContextBuilderService:
         runtime_model_id: str | None = None,
         context_type: str = "chat",
         project_id: str | None = None,
+        retrieval_cache: TurnRetrievalCache | None = None,
     ) -> tuple[str | None, list[dict[str, Any]]]:
+        """Retrieve RAG context for the effective KBs of one assistant turn.
+
+        With ``retrieval_cache``, turns of the same group run that resolve the
+        same KB set and retrieval config reuse one retrieval.
+        """
         rag_sources: list[dict[str, Any]] = []
 
         try:
@@ -51,18 +58,40 @@ class RagContextBuilderService:
             from src.infrastructure.retrieval.rag_service import RagService
 
             rag_service = RagService()
-            rag_results, rag_diagnostics = await rag_service.retrieve_with_diagnostics(
+            if retrieval_cache is None:
+                return await self._retrieve(rag_service, raw_user_message, kb_ids, runtime_model_id)
+
+            cache_key = (
+                "rag",
                 raw_user_message,
-                kb_ids,
-                runtime_model_id=runtime_model_id,
+                tuple(sorted(set(kb_ids))),
+                rag_service.retrieval_config_key(runtime_model_id),
             )
-            rag_sources.append(rag_service.build_rag_diagnostics_source(rag_diagnostics))
-            if not rag_results:
-                return None, rag_sources
-
-            rag_context = rag_service.build_rag_context(raw_user_message, rag_results)
-            rag_sources.extend([result.to_dict() for result in rag_results])
-            return rag_context, rag_sources
+            rag_context, cached_sources = await retrieval_cache.get_or_await(
+                cache_key,
+                lambda: self._retrieve(rag_service, raw_user_message, kb_ids, runtime_model_id),
+            )
+            return rag_context, [dict(source) for source in cached_sources]
         except Exception as exc:
             logger.warning("RAG retrieval failed: %s", exc)
             return None, rag_sources
+
+    @staticmethod
+    async def _retrieve(
+        rag_service: Any,
+        raw_user_message: str,
+        kb_ids: list[str],
+        runtime_model_id: str | None,
+    ) -> tuple[str | None, list[dict[str, Any]]]:
+        rag_results, rag_diagnostics = await rag_service.retrieve_with_diagnostics(
+            raw_user_message,
+            kb_ids,
+            runtime_model_id=runtime_model_id,
+        )
+        rag_sources = [rag_service.build_rag_diagnostics_source(rag_diagnostics)]
+        if not rag_results:
+            return None, rag_sources
+
+        rag_context = rag_service.build_rag_context(raw_user_message, rag_results)
+        rag_sources.extend([result.to_dict() for result in rag_results])
+        return rag_context, rag_sources
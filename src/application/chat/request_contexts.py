@@ -6,6 +6,7 @@ from dataclasses import dataclass, field, replace
 from typing import TYPE_CHECKING, Any, cast
 
 from .service_contracts import AssistantLike, SourcePayload
+from .turn_retrieval_cache import TurnRetrievalCache
 
 if TYPE_CHECKING:
     from .chat_runtime.base import (
@@ -150,6 +151,9 @@ class CommitteeExecutionContext:
     search_sources: list[SourcePayload]
     group_mode: str = "committee"
     trace_id: str | None = None
+    retrieval_cache: TurnRetrievalCache = field(
+        default_factory=TurnRetrievalCache, compare=False, repr=False
+    )
 
     @classmethod
     def from_orchestration_request(
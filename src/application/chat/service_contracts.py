@@ -237,3 +237,4 @@ class ContextPayload:
     capability_contexts: dict[str, str] | None = None
     rag_context: str | None = None
     structured_source_context: str | None = None
+    context_timings: dict[str, Any] | None = None
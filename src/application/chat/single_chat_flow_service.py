@@ -176,6 +176,7 @@ class SingleChatRuntime:
     active_file_path: str | None = None
     active_file_hash: str | None = None
     compression_event: StreamEvent | None = None
+    context_timings: dict[str, Any] | None = None
 
 
 @dataclass
@@ -222,6 +223,7 @@ class SingleChatPreparedContext:
     max_rounds: int | None
     assistant_memory_enabled: bool
     compression_event: StreamEvent | None
+    context_timings: dict[str, Any] | None = None
 
 
 class SingleChatFlowService:
@@ -328,6 +330,7 @@ class SingleChatFlowService:
             "reasoning_effort": request.stream.reasoning_effort,
             "system_prompt": prepared_context.system_prompt,
             "context_segments": prepared_context.context_segments,
+            "context_timings": prepared_context.context_timings,
             "assistant_params": prepared_context.assistant_params,
             "context_capabilities": list(request.context_capabilities.context_capabilities or []),
             "context_capability_args": dict(
@@ -427,6 +430,8 @@ class SingleChatFlowService:
                 if event_type == "tool_diagnostics":
                     outcome.tool_diagnostics = dict(event)
                     continue
+                if event_type == "context_info" and runtime.context_timings:
+                    event = {**event, "context_timings": runtime.context_timings}
                 yield event
         except asyncio.CancelledError:
             print("[WARN] Stream generation cancelled, saving partial content...")
@@ -497,6 +502,7 @@ class SingleChatFlowService:
             active_file_path=(request.editor.active_file_path or "").strip() or None,
             active_file_hash=(request.editor.active_file_hash or "").strip() or None,
             compression_event=prepared_context.compression_event,
+            context_timings=prepared_context.context_timings,
         )
 
     async def _prepare_single_chat_input(
@@ -624,6 +630,7 @@ class SingleChatFlowService:
             max_rounds=ctx.max_rounds,
             assistant_memory_enabled=ctx.assistant_memory_enabled,
             compression_event=compression_event,
+            context_timings=ctx.context_timings,
         )
 
     def _normalize_context_payload(
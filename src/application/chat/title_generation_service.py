@@ -27,7 +27,9 @@ logger = logging.getLogger(__name__)
 
 
 class ConversationTitleStorageLike(Protocol):
-    async def get_session(self, session_id: str) -> dict[str, Any] | None: ...
+    async def get_session(
+        self, session_id: str, *, last_n_messages: int | None = None
+    ) -> dict[str, Any] | None: ...
 
     async def update_session_metadata(
         self,
@@ -176,8 +178,11 @@ class TitleGenerationService:
         try:
             logger.info(f"[TitleGen] Starting title generation for session {session_id}")
 
-            # Load session and messages
-            session = await self.storage.get_session(session_id)
+            # Load only the recent conversation rounds
+            max_messages = self.config.max_context_rounds * 2  # user + assistant
+            session = await self.storage.get_session(
+                session_id, last_n_messages=max_messages or None
+            )
             if not session:
                 logger.error(f"[TitleGen] Session {session_id} not found")
                 return None
@@ -187,8 +192,6 @@ class TitleGenerationService:
                 logger.error(f"[TitleGen] No messages in session {session_id}")
                 return None
 
-            # Extract recent conversation rounds
-            max_messages = self.config.max_context_rounds * 2  # user + assistant
             recent_messages = messages[-max_messages:]
 
             # Build conversation text
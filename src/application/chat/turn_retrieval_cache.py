@@ -0,0 +1,70 @@
+"""Turn-scoped retrieval cache shared by the participants of one group run."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class TurnRetrievalCache:
+    """Memoizes retrieval results for one group/committee user turn.
+
+    Every participant of a group turn answers the same user message, so global
+    memory lookups and RAG retrieval over the same KB set and retrieval config
+    give the same result. Keys are built by the callers from exactly those
+    inputs; concurrent lookups of a missing key share one in-flight
+    computation, and failures are not cached.
+    """
+
+    def __init__(self) -> None:
+        self._values: dict[Hashable, Any] = {}
+        self._inflight: dict[Hashable, asyncio.Future[Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, computing it synchronously once."""
+        if key in self._values:
+            self.hits += 1
+            return self._values[key]
+        self.misses += 1
+        value = compute()
+        self._values[key] = value
+        return value
+
+    async def get_or_await(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for ``key``, awaiting ``compute`` at most once at a time."""
+        while key not in self._values:
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            await asyncio.wait({pending})
+            if not pending.cancelled() and pending.exception() is not None:
+                raise pending.exception()  # type: ignore[misc]
+        if key in self._values:
+            self.hits += 1
+            return self._values[key]
+
+        self.misses += 1
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            # Waiters wake up and compute the value themselves.
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # Retrieved, so an unobserved failure is not logged.
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        self._values[key] = value
+        future.set_result(value)
+        return value
+
+    def stats(self) -> dict[str, int]:
+        """Cached entries plus hit/miss counters."""
+        return {"entries": len(self._values), "hits": self.hits, "misses": self.misses}
@@ -2,9 +2,10 @@
 
 from .async_run_provider import get_async_run_service, get_async_run_store
 from .async_run_service import AsyncRunService
+from .flow_delta_coalescer import FlowDeltaCoalescer, coalesce_text_deltas
 from .flow_event_emitter import FlowEventEmitter
 from .flow_event_mapper import FlowEventMapper, StreamChunk
-from .flow_events import FlowEvent, FlowEventStage, new_flow_event, now_ms
+from .flow_events import FlowEvent, FlowEventStage, new_flow_event, new_flow_event_dict, now_ms
 from .flow_stream_runtime import (
     FlowReplayCursorGoneError,
     FlowStreamContextMismatchError,
@@ -18,6 +19,7 @@ from .workflow_flow_event_mapper import map_workflow_event_to_flow_payload
 
 __all__ = [
     "AsyncRunService",
+    "FlowDeltaCoalescer",
     "FlowEvent",
     "FlowEventEmitter",
     "FlowEventMapper",
@@ -29,10 +31,12 @@ __all__ = [
     "FlowStreamRuntime",
     "FlowStreamState",
     "StreamChunk",
+    "coalesce_text_deltas",
     "get_async_run_service",
     "get_async_run_store",
     "get_flow_stream_runtime",
     "map_workflow_event_to_flow_payload",
     "new_flow_event",
+    "new_flow_event_dict",
     "now_ms",
 ]
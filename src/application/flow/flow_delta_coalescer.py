@@ -0,0 +1,203 @@
+"""Merge consecutive text chunks of a stream before they become flow events."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Hashable, Mapping
+
+from .flow_event_mapper import StreamChunk
+
+DEFAULT_COALESCE_MAX_CHARS = 256
+# Chunks the reader may get ahead of the consumer before it stops pulling the source.
+_MAX_READ_AHEAD_CHUNKS = 256
+
+# Raw chunk type -> fields the mapper keeps besides the text, which must match to merge.
+_DELTA_IDENTITY_FIELDS: dict[str | None, tuple[str, ...]] = {
+    None: (),
+    "assistant_chunk": ("assistant_id", "assistant_turn_id"),
+    "model_chunk": ("model_id",),
+}
+
+
+def _delta_key(chunk: StreamChunk) -> Hashable | None:
+    """Return the merge key of a text chunk, or None for any other stream event."""
+    if isinstance(chunk, str):
+        return ("text",)
+    if not isinstance(chunk, Mapping) or "chunk" not in chunk:
+        return None
+    if chunk.get("done") is True or "error" in chunk:
+        return None
+    chunk_type = chunk.get("type")
+    if chunk_type is not None and not isinstance(chunk_type, str):
+        return None
+    fields = _DELTA_IDENTITY_FIELDS.get(chunk_type)
+    if fields is None:
+        return None
+    try:
+        return (chunk_type, *(chunk.get(field) for field in fields))
+    except TypeError:
+        return None
+
+
+async def _cancel_paused_source(source: AsyncIterable[StreamChunk]) -> None:
+    """Raise ``CancelledError`` in a generator paused at ``yield``, then close it.
+
+    The generator sees the same cancellation it would have seen had it been
+    producing its next chunk, so its cancellation handlers still run.
+    """
+    athrow = getattr(source, "athrow", None)
+    if athrow is None:
+        return
+    try:
+        await athrow(asyncio.CancelledError())
+    except (asyncio.CancelledError, Exception):
+        return
+    # The generator swallowed the cancellation and yielded again.
+    await source.aclose()  # type: ignore[attr-defined]
+
+
+def _chunk_text(chunk: StreamChunk) -> str:
+    if isinstance(chunk, str):
+        return chunk
+    return str(chunk.get("chunk") or "")
+
+
+class FlowDeltaCoalescer:
+    """Merge consecutive text chunks within a time and size window.
+
+    Chunks of the same kind (plain text, one assistant's ``assistant_chunk``, one
+    model's ``model_chunk``) are joined until ``max_delay_ms`` passed since the
+    first buffered chunk or ``max_chars`` characters are buffered. Any other
+    event flushes the buffer first, so ordering and the concatenated text are
+    unchanged; only the number of ``text_delta`` events drops. Coalescing runs
+    before the mapper assigns sequence numbers, so replayed streams hold
+    exactly the events live subscribers received.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_delay_ms: float,
+        max_chars: int = DEFAULT_COALESCE_MAX_CHARS,
+    ) -> None:
+        self.max_delay_seconds = max(0.0, float(max_delay_ms)) / 1000.0
+        self.max_chars = max(1, int(max_chars))
+        self.chunks_in = 0
+        self.chunks_out = 0
+        self._key: Hashable | None = None
+        self._first: StreamChunk | None = None
+        self._parts: list[str] = []
+        self._chars = 0
+
+    async def coalesce(self, source: AsyncIterable[StreamChunk]) -> AsyncIterator[StreamChunk]:
+        """Yield ``source`` chunks with consecutive text chunks merged."""
+        loop = asyncio.get_running_loop()
+        # One reader task drains the source into a deque, so a burst of chunks is
+        # merged in one pass and the window timer is armed once per wakeup rather
+        # than once per chunk. The reader pauses once it is _MAX_READ_AHEAD_CHUNKS
+        # ahead, so a slow client also slows down the source.
+        received: deque[StreamChunk | None] = deque()  # None marks the end
+        wakeup = asyncio.Event()
+        space = asyncio.Event()
+        failure: list[Exception] = []
+
+        async def read() -> None:
+            try:
+                async for item in source:
+                    received.append(item)
+                    wakeup.set()
+                    if len(received) >= _MAX_READ_AHEAD_CHUNKS:
+                        space.clear()
+                        try:
+                            await space.wait()
+                        except asyncio.CancelledError:
+                            await _cancel_paused_source(source)
+                            raise
+            except Exception as e:
+                failure.append(e)
+            finally:
+                received.append(None)
+                wakeup.set()
+
+        reader = asyncio.ensure_future(read())
+        deadline = 0.0
+        try:
+            while True:
+                wakeup.clear()
+                while received:
+                    chunk = received.popleft()
+                    space.set()
+                    if chunk is None:
+                        # Text read before a source failure is still delivered first.
+                        if self._first is not None:
+                            yield self._flush()
+                        if failure:
+                            raise failure[0]
+                        return
+                    self.chunks_in += 1
+                    key = _delta_key(chunk)
+                    if key is None:
+                        if self._first is not None:
+                            yield self._flush()
+                        self.chunks_out += 1
+                        yield chunk
+                        continue
+                    if self._first is not None and key != self._key:
+                        yield self._flush()
+                    if self._first is None:
+                        self._key = key
+                        self._first = chunk
+                        deadline = loop.time() + self.max_delay_seconds
+                    self._parts.append(_chunk_text(chunk))
+                    self._chars += len(self._parts[-1])
+                    if self._chars >= self.max_chars or loop.time() >= deadline:
+                        yield self._flush()
+
+                if self._first is None:
+                    await wakeup.wait()
+                    continue
+                timeout = deadline - loop.time()
+                if timeout > 0:
+                    try:
+                        await asyncio.wait_for(wakeup.wait(), timeout)
+                        continue
+                    except asyncio.TimeoutError:
+                        pass
+                yield self._flush()
+        finally:
+            if not reader.done():
+                reader.cancel()
+            # Wait for the source's own cancellation handling (e.g. saving a partial
+            # reply) instead of leaving it to a detached task.
+            await asyncio.gather(reader, return_exceptions=True)
+
+    def _flush(self) -> StreamChunk:
+        first = self._first
+        text = "".join(self._parts)
+        self._key = None
+        self._first = None
+        self._parts = []
+        self._chars = 0
+        self.chunks_out += 1
+        if isinstance(first, str):
+            return text
+        merged = dict(first or {})
+        merged["chunk"] = text
+        return merged
+
+    def stats(self) -> dict[str, int]:
+        """Chunks read from the source and chunks yielded after merging."""
+        return {"chunks_in": self.chunks_in, "chunks_out": self.chunks_out}
+
+
+def coalesce_text_deltas(
+    source: AsyncIterable[StreamChunk],
+    *,
+    max_delay_ms: float,
+    max_chars: int = DEFAULT_COALESCE_MAX_CHARS,
+) -> AsyncIterable[StreamChunk]:
+    """Wrap ``source`` in a coalescer; ``max_delay_ms <= 0`` returns it unchanged."""
+    if max_delay_ms <= 0:
+        return source
+    return FlowDeltaCoalescer(max_delay_ms=max_delay_ms, max_chars=max_chars).coalesce(source)
@@ -32,7 +32,7 @@ from .flow_event_types import (
     USAGE_REPORTED,
     USER_MESSAGE_IDENTIFIED,
 )
-from .flow_events import FlowEventStage, new_flow_event
+from .flow_events import FlowEventStage, new_flow_event, new_flow_event_dict
 
 StreamChunk = str | Mapping[str, Any]
 
@@ -79,6 +79,17 @@ class FlowEventMapper:
         payload: dict[str, Any],
         turn_id: str | None = None,
     ) -> dict[str, Any]:
+        if event_type == TEXT_DELTA:
+            # Per-token path: the mapper builds these itself, so skip model validation.
+            return new_flow_event_dict(
+                seq=self._next_seq(),
+                stream_id=self.stream_id,
+                conversation_id=self.conversation_id,
+                turn_id=turn_id or self.default_turn_id,
+                event_type=event_type,
+                stage=stage,
+                payload=payload,
+            )
         event = new_flow_event(
             seq=self._next_seq(),
             stream_id=self.stream_id,
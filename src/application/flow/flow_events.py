@@ -65,3 +65,35 @@ def new_flow_event(
         stage=stage,
         payload=payload or {},
     )
+
+
+def new_flow_event_dict(
+    *,
+    seq: int,
+    stream_id: str,
+    event_type: str,
+    stage: FlowEventStage,
+    payload: dict[str, Any],
+    conversation_id: str | None = None,
+    turn_id: str | None = None,
+) -> dict[str, Any]:
+    """Build a flow event dict without model validation, for per-token events.
+
+    The result equals ``new_flow_event(...).model_dump(exclude_none=True)``;
+    callers are responsible for passing values the schema would accept.
+    """
+
+    event: dict[str, Any] = {
+        "event_id": str(uuid.uuid4()),
+        "seq": seq,
+        "ts": now_ms(),
+        "stream_id": stream_id,
+    }
+    if conversation_id is not None:
+        event["conversation_id"] = conversation_id
+    if turn_id is not None:
+        event["turn_id"] = turn_id
+    event["event_type"] = event_type
+    event["stage"] = stage
+    event["payload"] = payload
+    return event
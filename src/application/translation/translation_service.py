@@ -10,6 +10,7 @@ from src.infrastructure.config.translation_config_service import TranslationConf
 from src.infrastructure.llm.language_detection_service import LanguageDetectionService
 from src.infrastructure.llm.local_llama_cpp_service import LocalLlamaCppService
 from src.llm_runtime.think_tag_filter import ThinkTagStreamFilter
+from src.providers.client_cache import create_llm_cached
 from src.providers.types import CallMode
 
 logger = logging.getLogger(__name__)
@@ -209,7 +210,9 @@ class TranslationService:
             return
 
         # Create LLM instance
-        llm = adapter.create_llm(
+        llm = create_llm_cached(
+            adapter,
+            provider_id=provider_config.id,
             model=model_config.id,
             base_url=provider_config.base_url,
             api_key=api_key,
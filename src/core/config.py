@@ -50,6 +50,21 @@ class Settings(BaseSettings):
     conversations_dir: Path = Field(default_factory=conversations_dir)
     attachments_dir: Path = Field(default_factory=attachments_dir)
     max_file_size_mb: int = 10
+    # Knowledge base documents processed concurrently by the ingestion queue
+    kb_ingestion_workers: int = 2
+    # Documents allowed to wait in the ingestion queue before uploads are rejected
+    kb_ingestion_max_pending: int = 10000
+    # Processes extracting and chunking PDF/DOCX/HTML and large files (0 uses a thread)
+    kb_extraction_processes: int = 2
+    # Seconds a chat turn waits for memory, RAG and context capabilities before
+    # answering without the ones still running (0 waits for all of them)
+    context_deadline_seconds: float = 20.0
+    # Memory cap for the in-process parsed-session cache (0 disables it)
+    session_cache_max_mb: int = 64
+    # Entry cap for the process-wide query-embedding cache (0 disables it)
+    query_embedding_cache_size: int = 4096
+    # Load the configured embedding model in the background at startup
+    embedding_warmup_on_startup: bool = True
 
     # Project Configuration
     projects_config_path: Path = Field(
@@ -90,6 +105,9 @@ class Settings(BaseSettings):
     flow_stream_ttl_seconds: int = 900
     flow_stream_max_events: int = 5000
     flow_stream_max_active: int = 200
+    # Merge consecutive text chunks into one text_delta per window (0 disables).
+    flow_delta_coalesce_ms: float = 0.0
+    flow_delta_coalesce_max_chars: int = 256
 
     # Project chat pending patch confirmation window
     project_chat_pending_patch_ttl_seconds: int = 3600
@@ -43,6 +43,12 @@ class KnowledgeBaseDocument(BaseModel):
         default="pending", description="Processing status: pending, processing, ready, error"
     )
     chunk_count: int = Field(default=0, description="Number of chunks created")
+    embedded_chunk_count: int = Field(
+        default=0, description="Chunks sent to the embedding backend in the last processing run"
+    )
+    reused_chunk_count: int = Field(
+        default=0, description="Chunks whose stored embeddings were reused in the last run"
+    )
     error_message: str | None = Field(
         default=None, description="Error message if processing failed"
     )
@@ -98,3 +104,5 @@ class KnowledgeBaseChunk(BaseModel):
     filename: str | None = Field(default=None, description="Source filename")
     chunk_index: int = Field(default=0, description="Chunk index within the document")
     content: str = Field(..., description="Chunk text content")
+    page_start: int | None = Field(default=None, description="First source page (1-based)")
+    page_end: int | None = Field(default=None, description="Last source page (1-based)")
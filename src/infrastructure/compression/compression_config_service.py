@@ -15,6 +15,7 @@ from src.core.paths import (
     config_local_dir,
     ensure_local_file,
 )
+from src.infrastructure.config.config_snapshot_registry import config_snapshots
 from src.infrastructure.config.yaml_config_utils import (
     load_layered_yaml_section,
     save_yaml_section_updates,
@@ -122,7 +123,10 @@ class CompressionConfigService:
         else:
             self.config_path = Path(config_path)
         self._ensure_config_exists()
-        self.config = self._load_config()
+        self.config = config_snapshots.load(
+            (self.config_path, self.defaults_path), self._load_config
+        )
+        config_snapshots.subscribe((self.config_path, self.defaults_path), self)
 
     def _ensure_config_exists(self) -> None:
         """Create default config file if it doesn't exist"""
@@ -229,7 +233,9 @@ class CompressionConfigService:
 
     def reload_config(self):
         """Reload configuration from file"""
-        self.config = self._load_config()
+        self.config = config_snapshots.load(
+            (self.config_path, self.defaults_path), self._load_config
+        )
 
     def save_config(self, updates: dict):
         """Save updated configuration to file"""
@@ -239,7 +245,9 @@ class CompressionConfigService:
                 section_name="compression",
                 updates=updates,
             )
-            self.reload_config()
+            self.config = config_snapshots.refresh(
+                (self.config_path, self.defaults_path), self._load_config
+            )
             logger.info("Compression config updated successfully")
         except Exception as e:
             logger.error(f"Failed to save compression config: {e}")
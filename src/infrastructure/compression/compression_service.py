@@ -12,6 +12,7 @@ from src.infrastructure.llm.language_detection_service import LanguageDetectionS
 from src.infrastructure.llm.local_llama_cpp_service import LocalLlamaCppService
 from src.llm_runtime import filter_messages_by_context_boundary
 from src.llm_runtime.think_tag_filter import strip_think_blocks
+from src.providers.client_cache import create_llm_cached
 from src.providers.types import CallMode
 
 logger = logging.getLogger(__name__)
@@ -1093,7 +1094,9 @@ class CompressionService:
         try:
 
             def llm_factory(*, max_tokens: int):
-                return adapter.create_llm(
+                return create_llm_cached(
+                    adapter,
+                    provider_id=provider_config.id,
                     model=model_config.id,
                     base_url=provider_config.base_url,
                     api_key=api_key,
@@ -1297,7 +1300,9 @@ class CompressionService:
         try:
 
             def llm_factory(*, max_tokens: int):
-                return adapter.create_llm(
+                return create_llm_cached(
+                    adapter,
+                    provider_id=provider_config.id,
                     model=model_config.id,
                     base_url=provider_config.base_url,
                     api_key=api_key,
@@ -4,6 +4,7 @@ Assistant configuration management service
 Handles loading, saving, and managing AI assistant configurations
 """
 
+import asyncio
 from pathlib import Path
 
 import aiofiles
@@ -18,6 +19,7 @@ from src.core.paths import (
 )
 from src.domain.models.assistant_config import Assistant, AssistantsConfig
 
+from .config_snapshot_registry import config_snapshots
 from .model_config_service import ModelConfigService
 
 
@@ -47,6 +49,9 @@ class AssistantConfigService:
 
     def _ensure_config_exists(self):
         """Ensure configuration file exists, create default if not"""
+        if self.config_path.exists():
+            return
+
         if self.defaults_path is not None:
             default_config = self._get_default_config()
             initial_text = yaml.safe_dump(default_config, allow_unicode=True, sort_keys=False)
@@ -57,10 +62,9 @@ class AssistantConfigService:
             )
             return
 
-        if not self.config_path.exists():
-            default_config = self._get_default_config()
-            with open(self.config_path, "w", encoding="utf-8") as f:
-                yaml.safe_dump(default_config, f, allow_unicode=True, sort_keys=False)
+        default_config = self._get_default_config()
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            yaml.safe_dump(default_config, f, allow_unicode=True, sort_keys=False)
 
     def _get_default_config(self) -> dict:
         """Get default configuration"""
@@ -72,6 +76,11 @@ class AssistantConfigService:
 
     async def load_config(self) -> AssistantsConfig:
         """Load configuration file"""
+        return await asyncio.to_thread(
+            config_snapshots.load, (self.config_path, self.defaults_path), self._read_config
+        )
+
+    def _read_config(self) -> AssistantsConfig:
         config_path = (
             resolve_layered_read_path(
                 local_path=self.config_path,
@@ -81,10 +90,9 @@ class AssistantConfigService:
             else self.config_path
         )
 
-        async with aiofiles.open(config_path, encoding="utf-8") as f:
-            content = await f.read()
-            data = yaml.safe_load(content)
-            return AssistantsConfig(**data)
+        with open(config_path, encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+        return AssistantsConfig(**data)
 
     async def save_config(self, config: AssistantsConfig):
         """
@@ -103,6 +111,9 @@ class AssistantConfigService:
 
         # Atomic replace
         temp_path.replace(self.config_path)
+        await asyncio.to_thread(
+            config_snapshots.refresh, (self.config_path, self.defaults_path), self._read_config
+        )
 
     # ==================== Assistant Management ====================
 
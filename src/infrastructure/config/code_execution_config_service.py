@@ -9,6 +9,7 @@ from pathlib import Path
 import yaml
 
 from src.core.paths import config_defaults_dir, config_local_dir, ensure_local_file
+from src.infrastructure.config.config_snapshot_registry import config_snapshots
 from src.infrastructure.config.yaml_config_utils import (
     load_layered_yaml_section,
     save_yaml_section_updates,
@@ -59,7 +60,10 @@ class CodeExecutionConfigService:
         else:
             self.config_path = Path(config_path)
         self._ensure_config_exists()
-        self.config = self._load_config()
+        self.config = config_snapshots.load(
+            (self.config_path, self.defaults_path), self._load_config
+        )
+        config_snapshots.subscribe((self.config_path, self.defaults_path), self)
 
     def _ensure_config_exists(self) -> None:
         ensure_local_file(
@@ -114,4 +118,6 @@ class CodeExecutionConfigService:
             section_name="code_execution",
             updates=updates,
         )
-        self.config = self._load_config()
+        self.config = config_snapshots.refresh(
+            (self.config_path, self.defaults_path), self._load_config
+        )
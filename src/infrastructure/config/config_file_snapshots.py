@@ -0,0 +1,158 @@
+"""
+Process-wide snapshots of parsed config files, validated by file signature.
+
+:class:`FileSnapshotCache` keeps one compiled value per set of config files:
+
+- the value is rebuilt when the ``(mtime_ns, size)`` signature of any of the
+  files changes, so edits made outside the app are picked up
+- signatures are re-checked at most every ``revalidate_seconds``; between
+  checks a lookup does no filesystem I/O
+- writers call :meth:`FileSnapshotCache.invalidate`, so their changes are
+  visible to the next lookup without waiting for the re-check
+
+Cached values are shared by every caller and must be treated as read-only.
+
+Every rebuild is recorded in :data:`config_parse_meter`.
+:mod:`.config_snapshot_registry` builds its change notification for config
+services on top of a :class:`FileSnapshotCache`.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_REVALIDATE_SECONDS = 1.0
+
+FileSignature = tuple[tuple[int, int] | None, ...]
+
+
+def file_signature(paths: Sequence[Path]) -> FileSignature:
+    """``(mtime_ns, size)`` of each path, ``None`` for missing files."""
+    signature: list[tuple[int, int] | None] = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            signature.append(None)
+            continue
+        signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+class ParseMeter:
+    """Counts config file parses, in total and over a sliding window."""
+
+    def __init__(self, window_seconds: float = 60.0):
+        self.window_seconds = float(window_seconds)
+        self._recent: deque[float] = deque()
+        self._totals: dict[str, int] = {}
+        self._lock = Lock()
+
+    def _prune(self, now: float) -> None:
+        while self._recent and now - self._recent[0] > self.window_seconds:
+            self._recent.popleft()
+
+    def record(self, name: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._recent.append(now)
+            self._prune(now)
+            self._totals[name] = self._totals.get(name, 0) + 1
+
+    def stats(self) -> dict[str, Any]:
+        """Parses in the last window plus totals per config name."""
+        with self._lock:
+            self._prune(time.monotonic())
+            return {
+                "window_seconds": self.window_seconds,
+                "recent": len(self._recent),
+                "total": sum(self._totals.values()),
+                "by_name": dict(sorted(self._totals.items())),
+            }
+
+
+config_parse_meter = ParseMeter()
+
+
+@dataclass
+class _Entry(Generic[T]):
+    value: T
+    signature: FileSignature
+    checked_at: float
+
+
+class FileSnapshotCache(Generic[T]):
+    """Values built from config files, rebuilt only when the files change."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        revalidate_seconds: float = DEFAULT_REVALIDATE_SECONDS,
+        meter: ParseMeter = config_parse_meter,
+    ):
+        self.name = name
+        self.revalidate_seconds = max(0.0, float(revalidate_seconds))
+        self._meter = meter
+        self._entries: dict[tuple[str, ...], _Entry[T]] = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.builds = 0
+
+    @staticmethod
+    def _key(paths: Sequence[Path]) -> tuple[str, ...]:
+        return tuple(str(path) for path in paths)
+
+    def get(self, paths: Sequence[Path], build: Callable[[], T], *, label: str | None = None) -> T:
+        """Return the value for ``paths``, calling ``build`` if the files changed.
+
+        Rebuilds are metered under ``label``, defaulting to the cache name.
+        """
+        key = self._key(paths)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry.checked_at < self.revalidate_seconds:
+                self.hits += 1
+                return entry.value
+
+        # Taken before building, so a write racing with the build triggers a rebuild.
+        signature = file_signature(paths)
+        if entry is not None and entry.signature == signature:
+            with self._lock:
+                entry.checked_at = now
+                self.hits += 1
+            return entry.value
+
+        value = build()
+        self._meter.record(label or self.name)
+        with self._lock:
+            self._entries[key] = _Entry(value=value, signature=signature, checked_at=now)
+            self.builds += 1
+        return value
+
+    def invalidate(self, paths: Sequence[Path] | None = None) -> None:
+        """Drop the value for ``paths``, or every value when ``paths`` is None."""
+        with self._lock:
+            if paths is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(self._key(paths), None)
+
+    def stats(self) -> dict[str, Any]:
+        """Entry count plus hit and rebuild counters."""
+        with self._lock:
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "builds": self.builds,
+            }
@@ -0,0 +1,162 @@
+"""
+Process-wide registry of parsed config files with change notification.
+
+Config services (RAG, memory, compression, TTS, ...) are constructed inside
+request paths, and each used to parse its YAML in ``__init__``. They now load
+through :data:`config_snapshots`:
+
+- parsed values live in a :class:`~.config_file_snapshots.FileSnapshotCache`,
+  so they follow its rules: files are re-checked by ``(mtime_ns, size)`` at
+  most every ``revalidate_seconds`` and writers invalidate explicitly
+- every caller gets its own deep copy, so services may keep mutating their
+  ``config`` attribute without affecting other instances
+- services :meth:`~ConfigSnapshotRegistry.subscribe`; after a service writes its
+  file and calls :meth:`~ConfigSnapshotRegistry.refresh`, or when a lookup
+  rebuilds the value after an edit made outside the app, every live subscriber
+  gets the new value
+- parses are recorded in :data:`config_parse_meter` for ``/api/debug``
+"""
+
+from __future__ import annotations
+
+import logging
+import weakref
+from collections.abc import Callable, Sequence
+from copy import deepcopy
+from pathlib import Path
+from threading import Lock
+from typing import Any, TypeVar, cast
+
+from .config_file_snapshots import (
+    DEFAULT_REVALIDATE_SECONDS,
+    FileSnapshotCache,
+    ParseMeter,
+    config_parse_meter,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ConfigFiles = Path | Sequence[Path | None]
+
+
+class ConfigSnapshotRegistry:
+    """Parsed config values shared by every service instance reading the same files."""
+
+    def __init__(
+        self,
+        meter: ParseMeter = config_parse_meter,
+        *,
+        revalidate_seconds: float = DEFAULT_REVALIDATE_SECONDS,
+    ):
+        self._cache: FileSnapshotCache[Any] = FileSnapshotCache(
+            "config_services", revalidate_seconds=revalidate_seconds, meter=meter
+        )
+        # Last value handed to the subscribers of each file set.
+        self._published: dict[tuple[str, ...], Any] = {}
+        self._subscribers: dict[tuple[str, ...], list[tuple[weakref.ref, str]]] = {}
+        self._lock = Lock()
+
+    @property
+    def revalidate_seconds(self) -> float:
+        return self._cache.revalidate_seconds
+
+    @revalidate_seconds.setter
+    def revalidate_seconds(self, value: float) -> None:
+        self._cache.revalidate_seconds = max(0.0, float(value))
+
+    @staticmethod
+    def _paths(files: ConfigFiles) -> list[Path]:
+        if isinstance(files, Path):
+            return [files]
+        return [Path(path) for path in files if path is not None]
+
+    @staticmethod
+    def _key(paths: list[Path]) -> tuple[str, ...]:
+        return tuple(str(path) for path in paths)
+
+    def load(self, files: ConfigFiles, parse: Callable[[], T]) -> T:
+        """Return a private copy of the value parsed from ``files``.
+
+        ``parse`` runs only when the cache finds the files changed; the new
+        value is then pushed to the subscribers of ``files`` as well.
+        """
+        paths = self._paths(files)
+        key = self._key(paths)
+        value = self._cache.get(paths, parse, label=_label(paths))
+        with self._lock:
+            previous = self._published.get(key)
+            self._published[key] = value
+        if previous is not None and previous is not value and _differs(previous, value):
+            self._notify(key, value)
+        return cast(T, deepcopy(value))
+
+    def refresh(self, files: ConfigFiles, parse: Callable[[], T]) -> T:
+        """Re-parse ``files`` after a write and push the value to every subscriber."""
+        paths = self._paths(files)
+        key = self._key(paths)
+        self._cache.invalidate(paths)
+        value = self._cache.get(paths, parse, label=_label(paths))
+        with self._lock:
+            self._published[key] = value
+        self._notify(key, value)
+        return cast(T, deepcopy(value))
+
+    def subscribe(self, files: ConfigFiles, owner: object, attr: str = "config") -> None:
+        """Set ``owner.<attr>`` to a copy of each new value parsed from ``files``.
+
+        ``owner`` is held weakly, so short-lived services need not unsubscribe.
+        """
+        key = self._key(self._paths(files))
+        with self._lock:
+            live = [item for item in self._subscribers.get(key, []) if item[0]() is not None]
+            live.append((weakref.ref(owner), attr))
+            self._subscribers[key] = live
+
+    def _notify(self, key: tuple[str, ...], value: Any) -> None:
+        with self._lock:
+            subscribers = [item for item in self._subscribers.get(key, []) if item[0]() is not None]
+            self._subscribers[key] = subscribers
+        for ref, attr in subscribers:
+            owner = ref()
+            if owner is None:
+                continue
+            try:
+                setattr(owner, attr, deepcopy(value))
+            except Exception as e:
+                logger.warning("Failed to apply config change to %r: %s", owner, e)
+
+    def invalidate(self) -> None:
+        """Forget every parsed value (tests)."""
+        self._cache.invalidate()
+        with self._lock:
+            self._published.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Cached file sets, live subscribers and parse/hit counters."""
+        cache_stats = self._cache.stats()
+        with self._lock:
+            subscribers = sum(
+                1 for items in self._subscribers.values() for ref, _ in items if ref() is not None
+            )
+        return {
+            "entries": cache_stats["entries"],
+            "subscribers": subscribers,
+            "hits": cache_stats["hits"],
+            "parses": cache_stats["builds"],
+        }
+
+
+def _label(paths: list[Path]) -> str:
+    return paths[0].name if paths else "config"
+
+
+def _differs(old: Any, new: Any) -> bool:
+    try:
+        return bool(old != new)
+    except Exception:
+        return True
+
+
+config_snapshots = ConfigSnapshotRegistry()
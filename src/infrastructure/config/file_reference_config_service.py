@@ -12,6 +12,8 @@ from src.core.paths import (
     ensure_local_file,
 )
 
+from .config_snapshot_registry import config_snapshots
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,7 +43,8 @@ class FileReferenceConfigService:
             self.config_path = Path(config_path)
 
         self._ensure_config_exists()
-        self.config = self._load_config()
+        self.config = config_snapshots.load(self.config_path, self._load_config)
+        config_snapshots.subscribe(self.config_path, self)
 
     @staticmethod
     def _default_data() -> dict:
@@ -110,7 +113,7 @@ class FileReferenceConfigService:
             return FileReferenceConfig()
 
     def reload_config(self) -> None:
-        self.config = self._load_config()
+        self.config = config_snapshots.load(self.config_path, self._load_config)
 
     def save_config(self, updates: dict) -> None:
         self._ensure_config_exists()
@@ -129,4 +132,4 @@ class FileReferenceConfigService:
         with open(self.config_path, "w", encoding="utf-8") as f:
             yaml.safe_dump(data, f, allow_unicode=True, sort_keys=False)
 
-        self.config = self._load_config()
+        self.config = config_snapshots.refresh(self.config_path, self._load_config)
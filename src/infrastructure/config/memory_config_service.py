@@ -13,6 +13,8 @@ import yaml
 
 from src.core.paths import data_state_dir, ensure_local_file
 
+from .config_snapshot_registry import config_snapshots
+
 logger = logging.getLogger(__name__)
 
 
@@ -114,7 +116,8 @@ class MemoryConfigService:
 
         self.config_path = path
         self._ensure_config_exists()
-        self.config = self._load_config()
+        self.config = config_snapshots.load(self.config_path, self._load_config)
+        config_snapshots.subscribe(self.config_path, self)
 
     def _ensure_config_exists(self) -> None:
         if self.config_path.exists():
@@ -209,7 +212,7 @@ class MemoryConfigService:
             return MemoryConfig()
 
     def reload_config(self) -> None:
-        self.config = self._load_config()
+        self.config = config_snapshots.load(self.config_path, self._load_config)
 
     def save_config(self, updates: dict) -> None:
         try:
@@ -235,7 +238,7 @@ class MemoryConfigService:
             with open(self.config_path, "w", encoding="utf-8") as f:
                 yaml.safe_dump(data, f, allow_unicode=True, sort_keys=False)
 
-            self.reload_config()
+            self.config = config_snapshots.refresh(self.config_path, self._load_config)
             logger.info("Memory config updated successfully")
         except Exception as e:
             logger.error("Failed to save memory config: %s", e)
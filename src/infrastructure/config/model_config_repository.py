@@ -10,6 +10,8 @@ import yaml
 
 from src.core.paths import ensure_local_file
 
+from .model_config_snapshot import invalidate_model_config_snapshots
+
 if TYPE_CHECKING:
     from .model_config_service import ModelConfigService
 
@@ -36,6 +38,7 @@ class ModelConfigRepository:
         path.parent.mkdir(parents=True, exist_ok=True)
         with open(path, "w", encoding="utf-8") as f:
             yaml.safe_dump(data, f, allow_unicode=True, sort_keys=False)
+        invalidate_model_config_snapshots()
 
     def split_config_paths_exist(self) -> bool:
         return (
@@ -127,6 +130,7 @@ class ModelConfigRepository:
                 local_path=self.owner.app_defaults_path,
                 initial_text=yaml.safe_dump(app_defaults, allow_unicode=True, sort_keys=False),
             )
+            invalidate_model_config_snapshots()
             return
 
         self.write_yaml_dict(self.owner.provider_config_path, provider_defaults)
@@ -174,6 +178,7 @@ class ModelConfigRepository:
                 defaults_path=bootstrap_path,
                 initial_text=initial_text,
             )
+            invalidate_model_config_snapshots()
             return
 
         if self.is_shared_keys_path(self.owner.keys_path):
@@ -185,6 +190,7 @@ class ModelConfigRepository:
 
         with open(self.owner.keys_path, "w", encoding="utf-8") as f:
             f.write(initial_text)
+        invalidate_model_config_snapshots()
 
     async def load_keys_config(self) -> dict[str, Any]:
         if not self.owner.keys_path.exists():
@@ -202,6 +208,7 @@ class ModelConfigRepository:
             content = yaml.safe_dump(keys_data, allow_unicode=True, sort_keys=False)
             await f.write(content)
         temp_path.replace(self.owner.keys_path)
+        invalidate_model_config_snapshots()
 
     @staticmethod
     def same_path(path_a: Path, path_b: Path) -> bool:
@@ -33,6 +33,11 @@ from src.providers.model_capability_rules import infer_capability_overrides
 from src.providers.types import ProviderConfig, ProviderDefinition
 
 from .model_config_repository import ModelConfigRepository
+from .model_config_snapshot import (
+    ModelConfigSnapshot,
+    model_config_bootstrap_checks,
+    model_config_snapshots,
+)
 from .model_runtime_service import ModelRuntimeService
 
 logger = logging.getLogger(__name__)
@@ -78,9 +83,28 @@ class ModelConfigService:
         self.logger = logger
         self.repository = ModelConfigRepository(self)
         self.runtime = ModelRuntimeService(self)
+        # Services are constructed per request; bootstrap only when the files changed.
+        model_config_bootstrap_checks.get(
+            (*self._config_paths(), self.keys_path), self._bootstrap_config_files
+        )
+
+    def _bootstrap_config_files(self) -> bool:
         self._ensure_config_exists()
         self._sync_builtin_entries()
         self._ensure_keys_config_exists()
+        return True
+
+    def _config_paths(self) -> tuple[Path, Path, Path]:
+        return self.provider_config_path, self.models_catalog_path, self.app_defaults_path
+
+    def get_config_snapshot(self) -> ModelConfigSnapshot:
+        """Compiled model/provider config, re-parsed only after the files change."""
+        return model_config_snapshots.get(
+            self._config_paths(),
+            lambda: ModelConfigSnapshot.compile(
+                self._load_split_config(), self._compute_merged_capabilities
+            ),
+        )
 
     def _get_repository(self) -> ModelConfigRepository:
         repository = getattr(self, "repository", None)
@@ -527,9 +551,8 @@ class ModelConfigService:
             self._write_yaml_dict(self.app_defaults_path, app_data)
 
     async def load_config(self) -> ModelsConfig:
-        """Load config."""
-        data = self._load_split_config()
-        return ModelsConfig(**data)
+        """Load a mutable copy of the config."""
+        return self.get_config_snapshot().copy_config()
 
     async def save_config(self, config: ModelsConfig):
         """Persist aggregated model/provider/default config into split local files."""
@@ -658,19 +681,19 @@ class ModelConfigService:
     @classmethod
     def _resolve_model_and_provider_from_config(
         cls,
-        config: ModelsConfig,
+        snapshot: ModelConfigSnapshot,
         model_id: str | None = None,
     ) -> tuple[Model, Provider, str, bool]:
         requested_model_id = model_id
         using_default_model = requested_model_id is None
         if requested_model_id is None:
-            requested_model_id = cls._require_default_model_lookup_id(config)
+            requested_model_id = cls._require_default_model_lookup_id(snapshot.config)
 
-        model = cls._find_model_in_config(config, requested_model_id)
+        model = snapshot.find_model(requested_model_id)
         if not model:
             raise ValueError(f"Model with id '{requested_model_id}' not found")
 
-        provider = next((p for p in config.providers if p.id == model.provider_id), None)
+        provider = snapshot.providers_by_id.get(model.provider_id)
         if not provider:
             raise ValueError(f"Provider with id '{model.provider_id}' not found")
 
@@ -702,10 +725,9 @@ class ModelConfigService:
 
     async def require_enabled_model(self, model_id: str | None = None) -> tuple[Model, Provider]:
         """Resolve a model/provider pair and ensure both are enabled."""
-        config = await self.load_config()
         model, provider, requested_model_id, using_default_model = (
             self._resolve_model_and_provider_from_config(
-                config,
+                self.get_config_snapshot(),
                 model_id,
             )
         )
@@ -1207,13 +1229,11 @@ class ModelConfigService:
 
     def get_model_and_provider_sync(self, model_id: str | None = None) -> tuple[Model, Provider]:
         """
-        Synchronously load a model and provider pair.
+        Synchronously resolve a model and provider pair from the config snapshot.
         """
-        config = ModelsConfig(**self._load_split_config())
-
         model, provider, requested_model_id, using_default_model = (
             self._resolve_model_and_provider_from_config(
-                config,
+                self.get_config_snapshot(),
                 model_id,
             )
         )
@@ -1226,20 +1246,6 @@ class ModelConfigService:
 
         return model, provider
 
-    @staticmethod
-    def _find_model_in_config(config: ModelsConfig, model_id: str) -> Model | None:
-        if ":" in model_id:
-            provider_id, simple_model_id = model_id.split(":", 1)
-            return next(
-                (
-                    m
-                    for m in config.models
-                    if m.id == simple_model_id and m.provider_id == provider_id
-                ),
-                None,
-            )
-        return next((m for m in config.models if m.id == model_id), None)
-
     @staticmethod
     def _find_single_enabled_model_and_provider(
         config: ModelsConfig,
@@ -1270,6 +1276,16 @@ class ModelConfigService:
         Returns:
             The merged ``ModelCapabilities`` value.
         """
+        try:
+            cached = self.get_config_snapshot().capabilities_for(model, provider)
+        except Exception:
+            cached = None
+        if cached is not None:
+            return cached
+        return self._compute_merged_capabilities(model, provider)
+
+    @staticmethod
+    def _compute_merged_capabilities(model: Model, provider: Provider) -> ModelCapabilities:
         # Start with default capabilities
         base_caps = ModelCapabilities()
 
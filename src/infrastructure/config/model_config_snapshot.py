@@ -0,0 +1,97 @@
+"""Compiled, indexed view of the split model/provider configuration."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.domain.models.model_config import Model, ModelsConfig, Provider
+from src.providers import ModelCapabilities
+
+from .config_file_snapshots import FileSnapshotCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ModelConfigSnapshot:
+    """One parse of ``provider_config.yaml``, ``models_catalog.yaml`` and ``app_defaults.yaml``.
+
+    Lookups are dict accesses. Shared by every ``ModelConfigService`` using the
+    same files, so neither the snapshot nor the models in it may be mutated;
+    write paths work on :meth:`copy_config`.
+    """
+
+    config: ModelsConfig
+    providers_by_id: dict[str, Provider] = field(default_factory=dict)
+    models_by_key: dict[tuple[str, str], Model] = field(default_factory=dict)
+    models_by_id: dict[str, Model] = field(default_factory=dict)
+    capabilities: dict[tuple[str, str], ModelCapabilities] = field(default_factory=dict)
+
+    @classmethod
+    def compile(
+        cls,
+        data: dict[str, Any],
+        merge_capabilities: Callable[[Model, Provider], ModelCapabilities],
+    ) -> ModelConfigSnapshot:
+        config = ModelsConfig(**data)
+        providers_by_id: dict[str, Provider] = {}
+        for provider in config.providers:
+            providers_by_id.setdefault(provider.id, provider)
+        models_by_key: dict[tuple[str, str], Model] = {}
+        models_by_id: dict[str, Model] = {}
+        capabilities: dict[tuple[str, str], ModelCapabilities] = {}
+        for model in config.models:
+            key = (model.provider_id, model.id)
+            if key in models_by_key:
+                continue
+            models_by_key[key] = model
+            models_by_id.setdefault(model.id, model)
+            model_provider = providers_by_id.get(model.provider_id)
+            if model_provider is None:
+                continue
+            try:
+                capabilities[key] = merge_capabilities(model, model_provider)
+            except Exception as e:
+                logger.warning("Failed to merge capabilities for %s:%s: %s", *key, e)
+        return cls(
+            config=config,
+            providers_by_id=providers_by_id,
+            models_by_key=models_by_key,
+            models_by_id=models_by_id,
+            capabilities=capabilities,
+        )
+
+    def find_model(self, model_id: str) -> Model | None:
+        """Find a model by ``provider_id:model_id`` or by plain model id."""
+        if ":" in model_id:
+            provider_id, simple_model_id = model_id.split(":", 1)
+            return self.models_by_key.get((provider_id, simple_model_id))
+        return self.models_by_id.get(model_id)
+
+    def capabilities_for(self, model: Model, provider: Provider) -> ModelCapabilities | None:
+        """Pre-merged capabilities, only for the model/provider objects of this snapshot."""
+        key = (provider.id, model.id)
+        if self.models_by_key.get(key) is not model:
+            return None
+        if self.providers_by_id.get(provider.id) is not provider:
+            return None
+        return self.capabilities.get(key)
+
+    def copy_config(self) -> ModelsConfig:
+        """A private, mutable copy of the config for write paths."""
+        return self.config.model_copy(deep=True)
+
+
+model_config_snapshots: FileSnapshotCache[ModelConfigSnapshot] = FileSnapshotCache("models")
+api_key_snapshots: FileSnapshotCache[dict[str, str]] = FileSnapshotCache("model_api_keys")
+model_config_bootstrap_checks: FileSnapshotCache[bool] = FileSnapshotCache("models_bootstrap")
+
+
+def invalidate_model_config_snapshots() -> None:
+    """Forget compiled model configs and keys (a config or key file was written)."""
+    model_config_snapshots.invalidate()
+    api_key_snapshots.invalidate()
+    model_config_bootstrap_checks.invalidate()
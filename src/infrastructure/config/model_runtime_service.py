@@ -2,15 +2,19 @@
 
 from __future__ import annotations
 
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 from urllib.parse import urlparse
 
 import yaml
 
-from src.domain.models.model_config import ModelsConfig, Provider
+from src.domain.models.model_config import Provider
 from src.providers import AdapterRegistry, ApiProtocol, CallMode, ProviderType
+from src.providers.client_cache import create_llm_cached
 from src.providers.types import ProviderConfig
 
+from .model_config_snapshot import api_key_snapshots
+
 if TYPE_CHECKING:
     from .model_config_service import ModelConfigService
 
@@ -22,25 +26,31 @@ class ModelRuntimeService:
         self.owner = owner
 
     def get_api_key_sync(self, provider_id: str) -> str | None:
-        if not self.owner.keys_path.exists():
-            return None
+        keys_path = self.owner.keys_path
+        return api_key_snapshots.get((keys_path,), lambda: self._load_api_keys(keys_path)).get(
+            provider_id
+        )
+
+    @staticmethod
+    def _load_api_keys(keys_path: Path) -> dict[str, str]:
+        """Provider id -> API key from the keys file ({} when missing or invalid)."""
+        if not keys_path.exists():
+            return {}
         try:
-            with open(self.owner.keys_path, encoding="utf-8") as f:
+            with open(keys_path, encoding="utf-8") as f:
                 keys_data = yaml.safe_load(f)
         except Exception:
-            return None
+            return {}
         if not isinstance(keys_data, dict):
-            return None
+            return {}
         providers = keys_data.get("providers")
         if not isinstance(providers, dict):
-            return None
-        provider_data = providers.get(provider_id)
-        if not isinstance(provider_data, dict):
-            return None
-        api_key = provider_data.get("api_key")
-        if isinstance(api_key, str):
-            return api_key
-        return None
+            return {}
+        return {
+            str(provider_id): provider_data["api_key"]
+            for provider_id, provider_data in providers.items()
+            if isinstance(provider_data, dict) and isinstance(provider_data.get("api_key"), str)
+        }
 
     def provider_requires_api_key(self, provider: Provider | ProviderConfig) -> bool:
         provider_cfg = (
@@ -143,10 +153,9 @@ class ModelRuntimeService:
         presence_penalty: float | None = None,
         disable_thinking: bool = False,
     ) -> Any:
-        config = ModelsConfig(**self.owner._load_split_config())
         model, provider, requested_model_id, using_default_model = (
             self.owner._resolve_model_and_provider_from_config(
-                config,
+                self.owner.get_config_snapshot(),
                 model_id,
             )
         )
@@ -188,4 +197,4 @@ class ModelRuntimeService:
         if disable_thinking:
             create_kwargs["disable_thinking"] = True
 
-        return adapter.create_llm(**create_kwargs)
+        return create_llm_cached(adapter, provider_id=provider.id, **create_kwargs)
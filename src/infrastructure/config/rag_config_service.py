@@ -12,6 +12,8 @@ import yaml
 
 from src.core.paths import data_state_dir, ensure_local_file
 
+from .config_snapshot_registry import config_snapshots
+
 logger = logging.getLogger(__name__)
 
 
@@ -84,6 +86,11 @@ class RetrievalConfig:
 class StorageConfig:
     vector_store_backend: str = "sqlite_vec"
     vector_sqlite_path: str = "data/state/rag_vec.sqlite3"
+    vector_index: str = "exact"
+    vector_ivf_nprobe: int = 16
+    vector_ivf_min_rows: int = 50000
+    vector_quantization: str = "none"
+    vector_rescore_multiplier: int = 4
     persist_directory: str = "data/chromadb"
     bm25_sqlite_path: str = "data/state/rag_bm25.sqlite3"
 
@@ -107,7 +114,8 @@ class RagConfigService:
 
         self.config_path: Path = resolved_config_path
         self._ensure_config_exists()
-        self.config = self._load_config()
+        self.config = config_snapshots.load(self.config_path, self._load_config)
+        config_snapshots.subscribe(self.config_path, self)
 
     def _ensure_config_exists(self) -> None:
         """Create default config file if it doesn't exist"""
@@ -175,6 +183,11 @@ class RagConfigService:
                 "storage": {
                     "vector_store_backend": "sqlite_vec",
                     "vector_sqlite_path": "data/state/rag_vec.sqlite3",
+                    "vector_index": "exact",
+                    "vector_ivf_nprobe": 16,
+                    "vector_ivf_min_rows": 50000,
+                    "vector_quantization": "none",
+                    "vector_rescore_multiplier": 4,
                     "persist_directory": "data/chromadb",
                     "bm25_sqlite_path": "data/state/rag_bm25.sqlite3",
                 },
@@ -309,6 +322,11 @@ class RagConfigService:
                     vector_sqlite_path=storage_data.get(
                         "vector_sqlite_path", "data/state/rag_vec.sqlite3"
                     ),
+                    vector_index=storage_data.get("vector_index", "exact"),
+                    vector_ivf_nprobe=storage_data.get("vector_ivf_nprobe", 16),
+                    vector_ivf_min_rows=storage_data.get("vector_ivf_min_rows", 50000),
+                    vector_quantization=storage_data.get("vector_quantization", "none"),
+                    vector_rescore_multiplier=storage_data.get("vector_rescore_multiplier", 4),
                     persist_directory=storage_data.get("persist_directory", "data/chromadb"),
                     bm25_sqlite_path=storage_data.get(
                         "bm25_sqlite_path", "data/state/rag_bm25.sqlite3"
@@ -321,7 +339,7 @@ class RagConfigService:
 
     def reload_config(self):
         """Reload configuration from file"""
-        self.config = self._load_config()
+        self.config = config_snapshots.load(self.config_path, self._load_config)
 
     def save_config(self, updates: dict):
         """Save updated configuration to file"""
@@ -344,7 +362,7 @@ class RagConfigService:
             with open(self.config_path, "w", encoding="utf-8") as f:
                 yaml.dump(data, f, allow_unicode=True, default_flow_style=False)
 
-            self.reload_config()
+            self.config = config_snapshots.refresh(self.config_path, self._load_config)
             logger.info("RAG config updated successfully")
         except Exception as e:
             logger.error(f"Failed to save RAG config: {e}")
@@ -408,6 +426,11 @@ class RagConfigService:
             "rerank_weight": self.config.retrieval.rerank_weight,
             "vector_store_backend": self.config.storage.vector_store_backend,
             "vector_sqlite_path": self.config.storage.vector_sqlite_path,
+            "vector_index": self.config.storage.vector_index,
+            "vector_ivf_nprobe": self.config.storage.vector_ivf_nprobe,
+            "vector_ivf_min_rows": self.config.storage.vector_ivf_min_rows,
+            "vector_quantization": self.config.storage.vector_quantization,
+            "vector_rescore_multiplier": self.config.storage.vector_rescore_multiplier,
             "persist_directory": self.config.storage.persist_directory,
             "bm25_sqlite_path": self.config.storage.bm25_sqlite_path,
         }
@@ -486,6 +509,11 @@ class RagConfigService:
             "rerank_weight": ("retrieval", "rerank_weight"),
             "vector_store_backend": ("storage", "vector_store_backend"),
             "vector_sqlite_path": ("storage", "vector_sqlite_path"),
+            "vector_index": ("storage", "vector_index"),
+            "vector_ivf_nprobe": ("storage", "vector_ivf_nprobe"),
+            "vector_ivf_min_rows": ("storage", "vector_ivf_min_rows"),
+            "vector_quantization": ("storage", "vector_quantization"),
+            "vector_rescore_multiplier": ("storage", "vector_rescore_multiplier"),
             "persist_directory": ("storage", "persist_directory"),
             "bm25_sqlite_path": ("storage", "bm25_sqlite_path"),
         }
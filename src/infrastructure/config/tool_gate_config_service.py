@@ -10,6 +10,7 @@ from typing import Any
 import yaml
 
 from src.core.paths import config_defaults_dir, config_local_dir, ensure_local_file
+from src.infrastructure.config.config_snapshot_registry import config_snapshots
 from src.infrastructure.config.yaml_config_utils import (
     load_layered_yaml_section,
     save_yaml_section_updates,
@@ -118,7 +119,10 @@ class ToolGateConfigService:
         else:
             self.config_path = Path(config_path)
         self._ensure_config_exists()
-        self.config = self._load_config()
+        self.config = config_snapshots.load(
+            (self.config_path, self.defaults_path), self._load_config
+        )
+        config_snapshots.subscribe((self.config_path, self.defaults_path), self)
 
     def _ensure_config_exists(self) -> None:
         ensure_local_file(
@@ -142,7 +146,9 @@ class ToolGateConfigService:
         )
 
     def reload_config(self) -> None:
-        self.config = self._load_config()
+        self.config = config_snapshots.load(
+            (self.config_path, self.defaults_path), self._load_config
+        )
 
     def save_config(self, updates: dict[str, object]) -> None:
         save_yaml_section_updates(
@@ -150,4 +156,6 @@ class ToolGateConfigService:
             section_name="tool_gate",
             updates=updates,
         )
-        self.config = self._load_config()
+        self.config = config_snapshots.refresh(
+            (self.config_path, self.defaults_path), self._load_config
+        )
@@ -12,6 +12,7 @@ from typing import Any
 import yaml
 
 from src.core.paths import config_local_dir, ensure_local_file
+from src.infrastructure.config.config_snapshot_registry import config_snapshots
 from src.infrastructure.config.yaml_config_utils import (
     load_layered_yaml_section,
     save_yaml_section_updates,
@@ -63,7 +64,8 @@ class ToolPluginSettingsService:
         else:
             self.config_path = Path(config_path)
         self._ensure_config_exists()
-        self.config = self._load_config()
+        self.config = config_snapshots.load(self.config_path, self._load_config)
+        config_snapshots.subscribe(self.config_path, self)
 
     def _ensure_config_exists(self) -> None:
         ensure_local_file(
@@ -90,7 +92,7 @@ class ToolPluginSettingsService:
         )
 
     def reload_config(self) -> None:
-        self.config = self._load_config()
+        self.config = config_snapshots.load(self.config_path, self._load_config)
 
     def get_plugin_settings(self, plugin_id: str) -> dict[str, Any]:
         return deepcopy(self.config.plugins.get(plugin_id, {}))
@@ -113,7 +115,7 @@ class ToolPluginSettingsService:
             section_name="tool_plugin_settings",
             updates={"plugins": wrapped_plugins},
         )
-        self.config = self._load_config()
+        self.config = config_snapshots.refresh(self.config_path, self._load_config)
 
     @staticmethod
     def resolve_plugin_file_path(plugin_dir: Path, relative_path: str) -> Path:
@@ -16,6 +16,7 @@ from src.core.paths import (
     ensure_local_file,
 )
 
+from .config_snapshot_registry import config_snapshots
 from .yaml_config_utils import (
     load_layered_yaml_section,
     save_yaml_section_updates,
@@ -60,7 +61,10 @@ class TranslationConfigService:
         else:
             self.config_path = Path(config_path)
         self._ensure_config_exists()
-        self.config = self._load_config()
+        self.config = config_snapshots.load(
+            (self.config_path, self.defaults_path), self._load_config
+        )
+        config_snapshots.subscribe((self.config_path, self.defaults_path), self)
 
     def _ensure_config_exists(self) -> None:
         """Create default config file if it doesn't exist"""
@@ -122,7 +126,9 @@ class TranslationConfigService:
 
     def reload_config(self):
         """Reload configuration from file"""
-        self.config = self._load_config()
+        self.config = config_snapshots.load(
+            (self.config_path, self.defaults_path), self._load_config
+        )
 
     def save_config(self, updates: dict):
         """Save updated configuration to file"""
@@ -132,7 +138,9 @@ class TranslationConfigService:
                 section_name="translation",
                 updates=updates,
             )
-            self.reload_config()
+            self.config = config_snapshots.refresh(
+                (self.config_path, self.defaults_path), self._load_config
+            )
             logger.info("Translation config updated successfully")
         except Exception as e:
             logger.error(f"Failed to save translation config: {e}")
@@ -16,6 +16,8 @@ from src.core.paths import (
     ensure_local_file,
 )
 
+from .config_snapshot_registry import config_snapshots
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,7 +45,8 @@ class TTSConfigService:
         else:
             self.config_path = Path(config_path)
         self._ensure_config_exists()
-        self.config = self._load_config()
+        self.config = config_snapshots.load(self.config_path, self._load_config)
+        config_snapshots.subscribe(self.config_path, self)
 
     def _ensure_config_exists(self) -> None:
         """Create default config file if it doesn't exist"""
@@ -94,7 +97,7 @@ class TTSConfigService:
 
     def reload_config(self):
         """Reload configuration from file"""
-        self.config = self._load_config()
+        self.config = config_snapshots.load(self.config_path, self._load_config)
 
     def save_config(self, updates: dict):
         """Save updated configuration to file"""
@@ -112,7 +115,7 @@ class TTSConfigService:
             with open(self.config_path, "w", encoding="utf-8") as f:
                 yaml.dump(data, f, allow_unicode=True, default_flow_style=False)
 
-            self.reload_config()
+            self.config = config_snapshots.refresh(self.config_path, self._load_config)
             logger.info("TTS config updated successfully")
         except Exception as e:
             logger.error(f"Failed to save TTS config: {e}")
@@ -2,20 +2,147 @@
 Document Processing Service
 
 Pipeline: Upload -> Extract Text -> Chunk -> Embed -> Store in vector backend
+
+The stages overlap across documents processed concurrently by the ingestion
+queue: extraction and chunking run in a process pool, embedding requests are
+packed across documents by ``EmbeddingBatcher``, and storage writes run in
+worker threads.
+
+Large documents are streamed instead: extraction yields page (PDF, DOCX page
+breaks) or file text segments, the chunker consumes them incrementally, and
+windows of chunks are embedded and written while later pages are still being
+extracted. Chunks carry the pages they were taken from.
 """
 
 import asyncio
+import hashlib
 import importlib
 import logging
-import random
+import multiprocessing
+import os
+import sys
 import uuid
+from collections.abc import AsyncGenerator, Generator, Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import aclosing
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from threading import Lock
+from typing import Any, NamedTuple
 
 from src.core.paths import resolve_user_data_path
+from src.infrastructure.knowledge.embedding_batcher import (
+    EmbeddingBatcher,
+    get_embedding_batcher,
+    is_rate_limit_error,
+)
 
 logger = logging.getLogger(__name__)
 
+# Plain-text files below this size are cheaper to chunk in a thread than to
+# ship to a worker process.
+_INLINE_EXTRACTION_MAX_BYTES = 256 * 1024
+_INLINE_FILE_TYPES = (".txt", ".md")
+# Files from this size on are streamed in windows instead of chunked up front.
+_STREAMING_MIN_BYTES = 4 * 1024 * 1024
+_STREAM_WINDOW_CHUNKS = 256
+_DOCX_RENDERED_PAGE_BREAK = ".//w:lastRenderedPageBreak"
+
+_extraction_pool: ProcessPoolExecutor | None = None
+_extraction_pool_lock = Lock()
+
+
+class TextSegment(NamedTuple):
+    """Extracted text of one page, or of the whole file when it has no pages."""
+
+    text: str
+    page: int | None = None
+
+
+class DocumentChunk(NamedTuple):
+    """Chunk text with the (1-based) pages it was taken from."""
+
+    text: str
+    page_start: int | None = None
+    page_end: int | None = None
+
+
+ChunkSource = Sequence[str | DocumentChunk] | AsyncGenerator[list[DocumentChunk], None]
+
+
+def iter_document_chunks(
+    file_path: str, file_type: str, chunk_size: int, chunk_overlap: int
+) -> Generator[DocumentChunk, None, None]:
+    """Stream the chunks of one document, raising if it yields no text."""
+    service = DocumentProcessingService.__new__(DocumentProcessingService)
+    has_text = False
+
+    def segments() -> Iterator[TextSegment]:
+        nonlocal has_text
+        for segment in service._iter_text_segments(file_path, file_type):
+            if segment.text.strip():
+                has_text = True
+                yield segment
+
+    produced = 0
+    for chunk in service._iter_chunks(segments(), file_type, chunk_size, chunk_overlap):
+        produced += 1
+        yield chunk
+    if not has_text:
+        raise ValueError("No text content extracted from document")
+    if not produced:
+        raise ValueError("No chunks created from document text")
+
+
+def extract_document_chunks(
+    file_path: str, file_type: str, chunk_size: int, chunk_overlap: int
+) -> list[DocumentChunk]:
+    """Extract and chunk one document; picklable entry point for the process pool."""
+    return list(iter_document_chunks(file_path, file_type, chunk_size, chunk_overlap))
+
+
+async def _iter_chunk_windows(
+    chunks: ChunkSource,
+) -> AsyncGenerator[list[DocumentChunk], None]:
+    """Normalize a chunk list (one window) or a window stream."""
+    if isinstance(chunks, AsyncGenerator):
+        async with aclosing(chunks) as windows:
+            async for window in windows:
+                yield window
+        return
+    window = [DocumentChunk(chunk) if isinstance(chunk, str) else chunk for chunk in chunks]
+    if window:
+        yield window
+
+
+def _get_extraction_pool() -> ProcessPoolExecutor | None:
+    """Shared extraction process pool, or None when ``kb_extraction_processes`` is 0."""
+    global _extraction_pool
+    from src.core.config import settings
+
+    processes = int(settings.kb_extraction_processes or 0)
+    # Frozen executables cannot re-launch themselves as spawn workers.
+    if processes <= 0 or getattr(sys, "frozen", False):
+        return None
+    with _extraction_pool_lock:
+        if _extraction_pool is None:
+            # spawn: the API process runs threads, which fork does not copy safely.
+            _extraction_pool = ProcessPoolExecutor(
+                max_workers=min(processes, os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _extraction_pool
+
+
+def shutdown_extraction_pool() -> None:
+    """Stop the extraction worker processes (application shutdown)."""
+    global _extraction_pool
+    with _extraction_pool_lock:
+        pool, _extraction_pool = _extraction_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
 
 class DocumentProcessingService:
     """Service for processing documents into vector embeddings"""
@@ -30,10 +157,73 @@ class DocumentProcessingService:
         from src.infrastructure.retrieval.embedding_service import EmbeddingService
 
         self.rag_config_service = RagConfigService()
-        self.embedding_service = EmbeddingService()
+        self.embedding_service = EmbeddingService(rag_config_service=self.rag_config_service)
         self.bm25_service = Bm25Service()
         self._sqlite_vec_service = None
 
+    def _get_embedding_batcher(self, embedding_fn) -> EmbeddingBatcher:
+        embedding_config = self.rag_config_service.config.embedding
+        return get_embedding_batcher(
+            embedding_fn,
+            batch_size=max(1, int(getattr(embedding_config, "batch_size", 64) or 64)),
+            max_retries=int(getattr(embedding_config, "batch_max_retries", 3) or 0),
+            base_delay=float(getattr(embedding_config, "batch_delay_seconds", 0.5) or 0.0),
+        )
+
+    async def _extract_chunks(
+        self, file_path: str, file_type: str, chunk_size: int, chunk_overlap: int
+    ) -> ChunkSource:
+        """Chunk a document off the event loop.
+
+        Mid-sized PDF/DOCX/HTML files are chunked whole in the process pool.
+        Everything else is streamed from a thread in windows of chunks, so
+        large files never hold their full text, chunk list or vectors at once.
+        """
+        args = (file_path, file_type, chunk_size, chunk_overlap)
+        pool = _get_extraction_pool()
+        file_size = Path(file_path).stat().st_size
+        inline = (
+            file_type.lower() in _INLINE_FILE_TYPES and file_size <= _INLINE_EXTRACTION_MAX_BYTES
+        )
+        if pool is not None and not inline and file_size < _STREAMING_MIN_BYTES:
+            try:
+                return await asyncio.get_running_loop().run_in_executor(
+                    pool, extract_document_chunks, *args
+                )
+            except BrokenProcessPool:
+                logger.warning("Extraction process pool broke; restarting it")
+                shutdown_extraction_pool()
+        return self._stream_chunks(*args)
+
+    async def _stream_chunks(
+        self,
+        file_path: str,
+        file_type: str,
+        chunk_size: int,
+        chunk_overlap: int,
+        window_size: int = _STREAM_WINDOW_CHUNKS,
+    ) -> AsyncGenerator[list[DocumentChunk], None]:
+        """Yield windows of chunks, extracting the next window in a thread."""
+        iterator = iter_document_chunks(file_path, file_type, chunk_size, chunk_overlap)
+        next_window: asyncio.Future[list[DocumentChunk]] | None = None
+        try:
+            while True:
+                next_window = asyncio.ensure_future(
+                    asyncio.to_thread(lambda: list(islice(iterator, window_size)))
+                )
+                # Shielded: a cancel must not abandon the thread inside the generator.
+                window = await asyncio.shield(next_window)
+                if not window:
+                    return
+                yield window
+        finally:
+            if next_window is not None and not next_window.done():
+                # The generator cannot be closed until the thread's step returns.
+                await asyncio.wait({next_window})
+                if not next_window.cancelled():
+                    next_window.exception()
+            await asyncio.to_thread(iterator.close)
+
     def _get_sqlite_vec_service(self):
         from src.infrastructure.retrieval.sqlite_vec_service import SqliteVecService
 
@@ -93,24 +283,14 @@ class DocumentProcessingService:
                 else self.rag_config_service.config.chunking.chunk_overlap
             )
 
-            # Step 1: Extract text
-            logger.info(f"Extracting text from {filename} ({file_type})")
-            text = self._extract_text(file_path, file_type)
-            if not text or not text.strip():
-                raise ValueError("No text content extracted from document")
-            logger.info(f"Extracted {len(text)} characters from {filename}")
-
-            # Step 2: Chunk text (semantic-first)
+            # Steps 1-2: Extract text and chunk it (semantic-first)
             logger.info(
-                f"Chunking text with size={effective_chunk_size}, overlap={effective_chunk_overlap}"
+                f"Extracting and chunking {filename} ({file_type}) with "
+                f"size={effective_chunk_size}, overlap={effective_chunk_overlap}"
             )
-            chunks = self._chunk_text(
-                text, file_type, effective_chunk_size, effective_chunk_overlap
+            chunks = await self._extract_chunks(
+                file_path, file_type, effective_chunk_size, effective_chunk_overlap
             )
-            logger.info(f"Created {len(chunks)} chunks from {filename}")
-
-            if not chunks:
-                raise ValueError("No chunks created from document text")
 
             # Step 3: Get embedding function
             override_model = kb.embedding_model if kb and kb.embedding_model else None
@@ -122,18 +302,19 @@ class DocumentProcessingService:
                 or "chroma"
             ).lower()
             if vector_backend == "sqlite_vec":
-                logger.info(f"Storing {len(chunks)} chunks in SQLite vector store for kb_{kb_id}")
-                await self._store_in_sqlite_vec(
+                logger.info(f"Storing chunks of {filename} in SQLite vector store for kb_{kb_id}")
+                embedding_stats = await self._store_in_sqlite_vec(
                     kb_id=kb_id,
                     doc_id=doc_id,
                     filename=filename,
                     file_type=file_type,
                     chunks=chunks,
                     embedding_fn=embedding_fn,
+                    embedding_model_key=self.embedding_service.embedding_model_key(override_model),
                 )
             else:
-                logger.info(f"Storing {len(chunks)} chunks in ChromaDB collection kb_{kb_id}")
-                await self._store_in_chromadb(
+                logger.info(f"Storing chunks of {filename} in ChromaDB collection kb_{kb_id}")
+                embedding_stats = await self._store_in_chromadb(
                     kb_id=kb_id,
                     doc_id=doc_id,
                     filename=filename,
@@ -145,12 +326,19 @@ class DocumentProcessingService:
             # Step 5: Update document status to ready
             if track_status:
                 await kb_service.update_document_status(
-                    kb_id, doc_id, "ready", chunk_count=len(chunks)
+                    kb_id,
+                    doc_id,
+                    "ready",
+                    chunk_count=embedding_stats["chunks"],
+                    embedded_chunk_count=embedding_stats["embedded"],
+                    reused_chunk_count=embedding_stats["reused"],
                 )
             logger.info(
-                f"Document {doc_id} ({filename}) processed successfully: {len(chunks)} chunks"
+                f"Document {doc_id} ({filename}) processed successfully: "
+                f"{embedding_stats['chunks']} chunks "
+                f"({embedding_stats['embedded']} embedded, {embedding_stats['reused']} reused)"
             )
-            return len(chunks)
+            return embedding_stats["chunks"]
 
         except Exception as e:
             logger.error(f"Document processing failed for {doc_id} ({filename}): {e}")
@@ -165,16 +353,22 @@ class DocumentProcessingService:
 
     def _extract_text(self, file_path: str, file_type: str) -> str:
         """Extract text content from a file based on its type"""
+        return "\n\n".join(
+            segment.text for segment in self._iter_text_segments(file_path, file_type)
+        )
+
+    def _iter_text_segments(self, file_path: str, file_type: str) -> Iterator[TextSegment]:
+        """Yield a file's text page by page where the format has pages."""
         file_type = file_type.lower()
 
         if file_type in (".txt", ".md"):
-            return self._extract_text_plain(file_path)
+            yield TextSegment(self._extract_text_plain(file_path))
         elif file_type == ".pdf":
-            return self._extract_text_pdf(file_path)
+            yield from self._iter_pdf_pages(file_path)
         elif file_type == ".docx":
-            return self._extract_text_docx(file_path)
+            yield from self._iter_docx_pages(file_path)
         elif file_type in (".html", ".htm"):
-            return self._extract_text_html(file_path)
+            yield TextSegment(self._extract_text_html(file_path))
         else:
             raise ValueError(f"Unsupported file type: {file_type}")
 
@@ -191,23 +385,28 @@ class DocumentProcessingService:
         with open(file_path, "rb") as f:
             return f.read().decode("utf-8", errors="replace")
 
-    def _extract_text_pdf(self, file_path: str) -> str:
-        """Extract text from PDF files."""
+    def _iter_pdf_pages(self, file_path: str) -> Iterator[TextSegment]:
+        """Yield non-empty PDF pages one at a time."""
         # PyMuPDF handles many CJK PDFs better than pypdf when ToUnicode maps are missing.
+        next_page = 0
         try:
             fitz_module = importlib.import_module("fitz")
-            doc = fitz_module.open(file_path)
-            text_parts = []
-            for page in doc:
-                page_text = page.get_text("text")
-                if page_text and page_text.strip():
-                    text_parts.append(page_text)
-            if text_parts:
-                return "\n\n".join(text_parts)
+            yielded = False
+            with fitz_module.open(file_path) as doc:
+                for index, page in enumerate(doc):
+                    page_text = page.get_text("text")
+                    next_page = index + 1
+                    if page_text and page_text.strip():
+                        yielded = True
+                        yield TextSegment(page_text, index + 1)
+            if yielded:
+                return
             logger.warning("PyMuPDF extracted empty text from PDF: %s", file_path)
+            next_page = 0
         except ModuleNotFoundError:
             logger.debug("PyMuPDF not installed, falling back to pypdf for: %s", file_path)
         except Exception as e:
+            # Pages already yielded are kept; pypdf continues after them.
             logger.warning(
                 "PyMuPDF extraction failed for %s: %s, falling back to pypdf", file_path, e
             )
@@ -215,23 +414,31 @@ class DocumentProcessingService:
         from pypdf import PdfReader
 
         reader = PdfReader(file_path)
-        text_parts = []
-        for page in reader.pages:
-            page_text = page.extract_text()
+        for index in range(next_page, len(reader.pages)):
+            page_text = reader.pages[index].extract_text()
             if page_text and page_text.strip():
-                text_parts.append(page_text)
-        return "\n\n".join(text_parts)
+                yield TextSegment(page_text, index + 1)
 
-    def _extract_text_docx(self, file_path: str) -> str:
-        """Extract text from DOCX files"""
+    def _iter_docx_pages(self, file_path: str) -> Iterator[TextSegment]:
+        """Yield DOCX paragraphs grouped by the page breaks Word last rendered."""
         from docx import Document
 
         doc = Document(file_path)
-        text_parts = []
+        # Files never laid out by Word carry no rendered breaks, so no page numbers.
+        page: int | None = 1 if doc.element.body.xpath(_DOCX_RENDERED_PAGE_BREAK) else None
+        text_parts: list[str] = []
         for paragraph in doc.paragraphs:
+            if page is not None:
+                breaks = len(paragraph._p.xpath(_DOCX_RENDERED_PAGE_BREAK))
+                if breaks:
+                    if text_parts:
+                        yield TextSegment("\n\n".join(text_parts), page)
+                        text_parts = []
+                    page += breaks
             if paragraph.text.strip():
                 text_parts.append(paragraph.text)
-        return "\n\n".join(text_parts)
+        if text_parts:
+            yield TextSegment("\n\n".join(text_parts), page)
 
     def _extract_text_html(self, file_path: str) -> str:
         """Extract text from HTML files using trafilatura"""
@@ -249,14 +456,20 @@ class DocumentProcessingService:
         # Fallback: read as plain text
         return self._extract_text_plain(file_path)
 
-    def _chunk_text(
-        self, text: str, file_type: str, chunk_size: int, chunk_overlap: int
-    ) -> list[str]:
-        """Split text into semantic chunks first, then merge into size-limited chunks."""
-        units = self._semantic_units(text, file_type, chunk_size, chunk_overlap)
-        if not units:
-            return self._fallback_recursive_chunks(text, chunk_size, chunk_overlap)
-        return self._merge_units(units, chunk_size, chunk_overlap)
+    def _iter_chunks(
+        self,
+        segments: Iterable[TextSegment],
+        file_type: str,
+        chunk_size: int,
+        chunk_overlap: int,
+    ) -> Iterator[DocumentChunk]:
+        """Chunk a stream of text segments, keeping the pages of each chunk."""
+        units = (
+            (unit, segment.page)
+            for segment in segments
+            for unit in self._semantic_units(segment.text, file_type, chunk_size, chunk_overlap)
+        )
+        yield from self._merge_units(units, chunk_size, chunk_overlap)
 
     def _semantic_units(
         self, text: str, file_type: str, chunk_size: int, chunk_overlap: int
@@ -301,36 +514,43 @@ class DocumentProcessingService:
         paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
         return paragraphs
 
-    def _merge_units(self, units: list[str], chunk_size: int, chunk_overlap: int) -> list[str]:
-        """Merge semantic units into size-limited chunks with overlap."""
-        chunks: list[str] = []
-        current_units: list[str] = []
+    def _merge_units(
+        self,
+        units: Iterable[tuple[str, int | None]],
+        chunk_size: int,
+        chunk_overlap: int,
+    ) -> Iterator[DocumentChunk]:
+        """Merge (unit, page) pairs into size-limited chunks with overlap."""
+        current_units: list[tuple[str, int | None]] = []
         current_len = 0
 
-        def flush_current() -> None:
+        def flush_current() -> DocumentChunk | None:
             nonlocal current_units, current_len
             if not current_units:
-                return
-            chunk = "\n\n".join(current_units).strip()
-            if chunk:
-                chunks.append(chunk)
+                return None
+            text = "\n\n".join(unit for unit, _ in current_units).strip()
+            pages = [page for _, page in current_units if page is not None]
+            chunk = DocumentChunk(text, min(pages), max(pages)) if pages else DocumentChunk(text)
             if chunk_overlap <= 0:
                 current_units = []
                 current_len = 0
-                return
-            # Build overlap by keeping trailing units up to overlap size
-            overlap_units: list[str] = []
-            overlap_len = 0
-            for unit in reversed(current_units):
-                overlap_len += len(unit)
-                overlap_units.append(unit)
-                if overlap_len >= chunk_overlap:
-                    break
-            overlap_units.reverse()
-            current_units = overlap_units
-            current_len = sum(len(u) for u in current_units) + max(0, len(current_units) - 1) * 2
+            else:
+                # Build overlap by keeping trailing units up to overlap size
+                overlap_units: list[tuple[str, int | None]] = []
+                overlap_len = 0
+                for item in reversed(current_units):
+                    overlap_len += len(item[0])
+                    overlap_units.append(item)
+                    if overlap_len >= chunk_overlap:
+                        break
+                overlap_units.reverse()
+                current_units = overlap_units
+                current_len = (
+                    sum(len(unit) for unit, _ in current_units) + max(0, len(current_units) - 1) * 2
+                )
+            return chunk if text else None
 
-        for unit in units:
+        for unit, page in units:
             unit = unit.strip()
             if not unit:
                 continue
@@ -338,14 +558,17 @@ class DocumentProcessingService:
             # +2 for "\n\n" separator
             projected = current_len + unit_len + (2 if current_units else 0)
             if current_units and projected > chunk_size:
-                flush_current()
+                chunk = flush_current()
+                if chunk is not None:
+                    yield chunk
                 # Recompute projected after flush
                 projected = current_len + unit_len + (2 if current_units else 0)
-            current_units.append(unit)
+            current_units.append((unit, page))
             current_len = projected
 
-        flush_current()
-        return [c for c in chunks if c]
+        chunk = flush_current()
+        if chunk is not None:
+            yield chunk
 
     def _fallback_recursive_chunks(
         self, text: str, chunk_size: int, chunk_overlap: int
@@ -361,18 +584,30 @@ class DocumentProcessingService:
         )
         return splitter.split_text(text)
 
+    @staticmethod
+    def _page_metadata(chunk: DocumentChunk) -> dict[str, int]:
+        if chunk.page_start is None:
+            return {}
+        return {"page_start": chunk.page_start, "page_end": chunk.page_end or chunk.page_start}
+
     async def _store_in_chromadb(
         self,
         kb_id: str,
         doc_id: str,
         filename: str,
         file_type: str,
-        chunks: list[str],
+        chunks: ChunkSource,
         embedding_fn,
-    ):
-        """Store document chunks in ChromaDB"""
+    ) -> dict[str, int]:
+        """Store document chunks in ChromaDB.
+
+        Returns:
+            ``{"chunks": ..., "embedded": ..., "reused": ...}``; Chroma embeds
+            every chunk itself, so nothing is reused.
+        """
         from chromadb.errors import InvalidArgumentError
-        from langchain_chroma import Chroma
+
+        from src.infrastructure.retrieval.chroma_registry import get_chroma_registry
 
         persist_dir = Path(self.rag_config_service.config.storage.persist_directory)
         if not persist_dir.is_absolute():
@@ -382,129 +617,124 @@ class DocumentProcessingService:
         collection_name = f"kb_{kb_id}"
 
         # Create or get the vector store
-        vectorstore = Chroma(
-            collection_name=collection_name,
-            embedding_function=embedding_fn,
-            persist_directory=str(persist_dir),
-            collection_metadata={"hnsw:space": "cosine"},
+        vectorstore = get_chroma_registry().get_vectorstore(
+            persist_dir, collection_name, embedding_fn
         )
 
+        batcher = self._get_embedding_batcher(embedding_fn)
+        # add_texts embeds inside Chroma, so only the shared pacing applies here.
+        pacer = batcher.pacer
+        batch_size = batcher.batch_size
+        max_retries = batcher.max_retries
+
         # Write a new document generation first, then clean stale generations.
         # This keeps old chunks serving if re-indexing fails midway.
         ingest_id = uuid.uuid4().hex[:8]
-        ids = [f"{doc_id}_{ingest_id}_chunk_{i}" for i in range(len(chunks))]
-        metadatas = [
-            {
-                "kb_id": kb_id,
-                "doc_id": doc_id,
-                "filename": filename,
-                "file_type": file_type,
-                "chunk_index": i,
-                "ingest_id": ingest_id,
-            }
-            for i in range(len(chunks))
-        ]
-
-        batch_size = max(
-            1, int(getattr(self.rag_config_service.config.embedding, "batch_size", 64) or 64)
-        )
-        batch_delay = max(
-            0.0,
-            float(
-                getattr(self.rag_config_service.config.embedding, "batch_delay_seconds", 0.5) or 0.0
-            ),
-        )
-        max_retries = int(
-            getattr(self.rag_config_service.config.embedding, "batch_max_retries", 3) or 0
-        )
-        max_delay = 60.0
-
-        total = len(chunks)
-        added_ids: list[str] = []
-        for start in range(0, total, batch_size):
-            end = min(start + batch_size, total)
-            batch_texts = chunks[start:end]
-            batch_ids = ids[start:end]
-            batch_metas = metadatas[start:end]
-
-            attempt = 0
-            retry_delay = batch_delay or 0.5
-            while True:
-                try:
-                    vectorstore.add_texts(
-                        texts=batch_texts,
-                        ids=batch_ids,
-                        metadatas=batch_metas,
-                    )
-                    added_ids.extend(batch_ids)
-                    logger.info(
-                        f"Stored chunks {start + 1}-{end} of {total} in '{collection_name}'"
-                    )
-                    break
-                except InvalidArgumentError as e:
-                    if added_ids:
-                        try:
-                            vectorstore._collection.delete(ids=added_ids)
-                        except Exception:
-                            pass
-                    raise e
-                except Exception as e:
-                    message = str(e).lower()
-                    is_rate_limit = "rate limit" in message or "429" in message
-                    attempt += 1
-                    enforce_retries = max_retries > 0 and not is_rate_limit
-                    if enforce_retries and attempt > max_retries:
-                        if added_ids:
-                            try:
-                                vectorstore._collection.delete(ids=added_ids)
-                            except Exception:
-                                pass
-                        raise e
-
-                    if is_rate_limit:
-                        retry_delay = max(retry_delay, 5.0)
-                    wait_seconds = min(max_delay, max(retry_delay, batch_delay, 0.5))
-                    wait_seconds *= random.uniform(0.8, 1.2)
-                    max_label = "inf" if is_rate_limit or max_retries <= 0 else str(max_retries)
-                    logger.warning(
-                        f"Embedding batch {start + 1}-{end} failed "
-                        f"(attempt {attempt}/{max_label}). Retrying in {wait_seconds:.2f}s: {e}"
-                    )
-                    await asyncio.sleep(wait_seconds)
-                    retry_delay = min(max_delay, max(retry_delay * 2, batch_delay, 0.5))
-
-            if batch_delay > 0 and end < total:
-                await asyncio.sleep(batch_delay)
-
-        bm25_chunks = [
-            {
-                "chunk_id": ids[index],
-                "chunk_index": metadatas[index]["chunk_index"],
-                "content": chunks[index],
-            }
-            for index in range(total)
-        ]
+        stored = 0
         try:
-            self.bm25_service.upsert_document_chunks(
-                kb_id=kb_id,
-                doc_id=doc_id,
-                filename=filename,
-                chunks=bm25_chunks,
-            )
+            async for window in _iter_chunk_windows(chunks):
+                offset = stored
+                window_ids = [
+                    f"{doc_id}_{ingest_id}_chunk_{offset + i}" for i in range(len(window))
+                ]
+                metadatas = [
+                    {
+                        "kb_id": kb_id,
+                        "doc_id": doc_id,
+                        "filename": filename,
+                        "file_type": file_type,
+                        "chunk_index": offset + i,
+                        "ingest_id": ingest_id,
+                        **self._page_metadata(chunk),
+                    }
+                    for i, chunk in enumerate(window)
+                ]
+
+                for start in range(0, len(window), batch_size):
+                    end = min(start + batch_size, len(window))
+                    batch_texts = [chunk.text for chunk in window[start:end]]
+                    batch_ids = window_ids[start:end]
+                    batch_metas = metadatas[start:end]
+
+                    attempt = 0
+                    while True:
+                        await pacer.wait()
+                        try:
+                            await asyncio.to_thread(
+                                vectorstore.add_texts,
+                                texts=batch_texts,
+                                ids=batch_ids,
+                                metadatas=batch_metas,
+                            )
+                            pacer.on_success()
+                            logger.info(
+                                f"Stored chunks {offset + start + 1}-{offset + end} "
+                                f"in '{collection_name}'"
+                            )
+                            break
+                        except InvalidArgumentError:
+                            raise
+                        except Exception as e:
+                            is_rate_limit = is_rate_limit_error(e)
+                            attempt += 1
+                            enforce_retries = max_retries > 0 and not is_rate_limit
+                            if enforce_retries and attempt > max_retries:
+                                raise e
+
+                            wait_seconds = pacer.on_error(e)
+                            max_label = (
+                                "inf" if is_rate_limit or max_retries <= 0 else str(max_retries)
+                            )
+                            logger.warning(
+                                f"Embedding batch {offset + start + 1}-{offset + end} failed "
+                                f"(attempt {attempt}/{max_label}). "
+                                f"Retrying in ~{wait_seconds:.2f}s: {e}"
+                            )
+
+                await asyncio.to_thread(
+                    self.bm25_service.append_document_chunks,
+                    kb_id=kb_id,
+                    doc_id=doc_id,
+                    filename=filename,
+                    ingest_id=ingest_id,
+                    chunks=[
+                        {"chunk_id": chunk_id, "chunk_index": offset + i, "content": chunk.text}
+                        for i, (chunk_id, chunk) in enumerate(zip(window_ids, window, strict=True))
+                    ],
+                )
+                stored += len(window)
         except Exception:
-            if added_ids:
-                try:
-                    vectorstore._collection.delete(ids=added_ids)
-                except Exception:
-                    pass
+            try:
+                vectorstore._collection.delete(
+                    where={"$and": [{"doc_id": doc_id}, {"ingest_id": ingest_id}]}
+                )
+                await asyncio.to_thread(
+                    self.bm25_service.delete_document_generation,
+                    kb_id=kb_id,
+                    doc_id=doc_id,
+                    ingest_id=ingest_id,
+                )
+            except Exception:
+                pass
             raise
 
         # Keep only the newest generation for this document.
         try:
-            existing = vectorstore._collection.get(where={"doc_id": doc_id}, include=[])
-            existing_ids = existing.get("ids", []) or []
-            current_ids = set(ids)
-            stale_ids = [chunk_id for chunk_id in existing_ids if chunk_id not in current_ids]
+            await asyncio.to_thread(
+                self.bm25_service.delete_stale_document_chunks,
+                kb_id=kb_id,
+                doc_id=doc_id,
+                keep_ingest_id=ingest_id,
+            )
+            # Chunks written before generations were tracked have no ingest_id.
+            existing = vectorstore._collection.get(where={"doc_id": doc_id}, include=["metadatas"])
+            stale_ids = [
+                chunk_id
+                for chunk_id, metadata in zip(
+                    existing.get("ids", []) or [], existing.get("metadatas", []) or [], strict=False
+                )
+                if (metadata or {}).get("ingest_id") != ingest_id
+            ]
             if stale_ids:
                 vectorstore._collection.delete(ids=stale_ids)
                 logger.info(
@@ -512,6 +742,7 @@ class DocumentProcessingService:
                 )
         except Exception as e:
             logger.warning(f"Failed to cleanup stale chunks for doc {doc_id}: {e}")
+        return {"chunks": stored, "embedded": stored, "reused": 0}
 
     async def _store_in_sqlite_vec(
         self,
@@ -519,116 +750,153 @@ class DocumentProcessingService:
         doc_id: str,
         filename: str,
         file_type: str,
-        chunks: list[str],
+        chunks: ChunkSource,
         embedding_fn,
-    ):
-        """Store document chunks in SQLite vector store."""
+        embedding_model_key: str | None = None,
+    ) -> dict[str, int]:
+        """Store document chunks in SQLite vector store.
+
+        Chunks are embedded and written one window at a time. With
+        ``embedding_model_key``, vectors of chunks whose text is already in
+        the content-addressed embedding store are reused and only new texts are
+        sent to the embedding backend.
+
+        Returns:
+            ``{"chunks": ..., "embedded": ..., "reused": ...}``: stored chunks,
+            texts sent to the embedding backend, and chunks served from stored
+            or in-window duplicates.
+        """
         if not hasattr(embedding_fn, "embed_documents"):
             raise ValueError(
                 "Embedding function does not support embed_documents() for sqlite_vec backend"
             )
 
         sqlite_vec_service = self._get_sqlite_vec_service()
+        batcher = self._get_embedding_batcher(embedding_fn)
+        batch_size = batcher.batch_size
         ingest_id = uuid.uuid4().hex[:8]
-        ids = [f"{doc_id}_{ingest_id}_chunk_{i}" for i in range(len(chunks))]
+        stored = 0
+        had_existing_chunks = False
+        embedded_total = 0
 
-        batch_size = max(
-            1, int(getattr(self.rag_config_service.config.embedding, "batch_size", 64) or 64)
-        )
-        batch_delay = max(
-            0.0,
-            float(
-                getattr(self.rag_config_service.config.embedding, "batch_delay_seconds", 0.5) or 0.0
-            ),
-        )
-        max_retries = int(
-            getattr(self.rag_config_service.config.embedding, "batch_max_retries", 3) or 0
-        )
-        max_delay = 60.0
-
-        total = len(chunks)
-        chunk_rows: list[dict] = []
-        for start in range(0, total, batch_size):
-            end = min(start + batch_size, total)
-            batch_texts = chunks[start:end]
-            batch_ids = ids[start:end]
-
-            attempt = 0
-            retry_delay = batch_delay or 0.5
-            while True:
-                try:
-                    batch_vectors = embedding_fn.embed_documents(batch_texts)
-                    if len(batch_vectors) != len(batch_texts):
-                        raise ValueError(
-                            f"Embedding result count mismatch: expected {len(batch_texts)}, got {len(batch_vectors)}"
+        try:
+            with batcher.track_document() as token:
+                async for window in _iter_chunk_windows(chunks):
+                    offset = stored
+                    texts = [chunk.text for chunk in window]
+                    content_hashes = [
+                        hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts
+                    ]
+                    vectors_by_hash: dict[str, list[float]] = {}
+                    if embedding_model_key:
+                        vectors_by_hash = await asyncio.to_thread(
+                            sqlite_vec_service.get_stored_embeddings,
+                            model_key=embedding_model_key,
+                            content_hashes=content_hashes,
                         )
-                    for offset, vector in enumerate(batch_vectors):
-                        chunk_rows.append(
-                            {
-                                "chunk_id": batch_ids[offset],
-                                "chunk_index": start + offset,
-                                "content": batch_texts[offset],
-                                "embedding": vector,
-                            }
+                    # Identical chunks within the window are embedded once.
+                    text_by_hash = dict(zip(content_hashes, texts, strict=True))
+                    pending_hashes = [
+                        content_hash
+                        for content_hash in text_by_hash
+                        if content_hash not in vectors_by_hash
+                    ]
+                    pending_texts = [text_by_hash[content_hash] for content_hash in pending_hashes]
+                    pending_total = len(pending_texts)
+                    reused_count = len(window) - pending_total
+                    if reused_count:
+                        logger.info(
+                            f"Reusing stored embeddings for {reused_count} of {len(window)} "
+                            f"chunks of doc {doc_id} in kb_{kb_id}"
                         )
-                    logger.info(f"Embedded chunks {start + 1}-{end} of {total} for kb_{kb_id}")
-                    break
-                except Exception as e:
-                    message = str(e).lower()
-                    is_rate_limit = "rate limit" in message or "429" in message
-                    attempt += 1
-                    enforce_retries = max_retries > 0 and not is_rate_limit
-                    if enforce_retries and attempt > max_retries:
-                        raise e
-
-                    if is_rate_limit:
-                        retry_delay = max(retry_delay, 5.0)
-                    wait_seconds = min(max_delay, max(retry_delay, batch_delay, 0.5))
-                    wait_seconds *= random.uniform(0.8, 1.2)
-                    max_label = "inf" if is_rate_limit or max_retries <= 0 else str(max_retries)
-                    logger.warning(
-                        f"Embedding batch {start + 1}-{end} failed "
-                        f"(attempt {attempt}/{max_label}). Retrying in {wait_seconds:.2f}s: {e}"
-                    )
-                    await asyncio.sleep(wait_seconds)
-                    retry_delay = min(max_delay, max(retry_delay * 2, batch_delay, 0.5))
-
-            if batch_delay > 0 and end < total:
-                await asyncio.sleep(batch_delay)
-
-        had_existing_chunks = sqlite_vec_service.upsert_chunks(
-            kb_id=kb_id,
-            doc_id=doc_id,
-            filename=filename,
-            file_type=file_type,
-            ingest_id=ingest_id,
-            chunk_rows=chunk_rows,
-        )
 
-        bm25_chunks = [
-            {
-                "chunk_id": ids[index],
-                "chunk_index": index,
-                "content": chunks[index],
-            }
-            for index in range(total)
-        ]
-        try:
-            self.bm25_service.upsert_document_chunks(
+                    # Slices of one batch: a document's last partial slice shares a
+                    # request with other documents, and each slice is stored before
+                    # the next so a failed run resumes from the embedding store.
+                    for start in range(0, pending_total, batch_size):
+                        end = min(start + batch_size, pending_total)
+                        batch_hashes = pending_hashes[start:end]
+                        batch_vectors = await batcher.embed(pending_texts[start:end], token)
+                        batch_by_hash = dict(zip(batch_hashes, batch_vectors, strict=True))
+                        vectors_by_hash.update(batch_by_hash)
+                        if embedding_model_key:
+                            await asyncio.to_thread(
+                                sqlite_vec_service.store_embeddings,
+                                model_key=embedding_model_key,
+                                vectors=batch_by_hash,
+                            )
+                        logger.info(
+                            f"Embedded chunks {start + 1}-{end} of {pending_total} for kb_{kb_id}"
+                        )
+                    embedded_total += pending_total
+
+                    window_ids = [
+                        f"{doc_id}_{ingest_id}_chunk_{offset + i}" for i in range(len(window))
+                    ]
+                    chunk_rows = [
+                        {
+                            "chunk_id": window_ids[i],
+                            "chunk_index": offset + i,
+                            "content": chunk.text,
+                            "embedding": vectors_by_hash[content_hashes[i]],
+                            **self._page_metadata(chunk),
+                        }
+                        for i, chunk in enumerate(window)
+                    ]
+                    had_existing = await asyncio.to_thread(
+                        sqlite_vec_service.upsert_chunks,
+                        kb_id=kb_id,
+                        doc_id=doc_id,
+                        filename=filename,
+                        file_type=file_type,
+                        ingest_id=ingest_id,
+                        chunk_rows=chunk_rows,
+                    )
+                    # Later windows see the earlier ones; only the first tells.
+                    had_existing_chunks = had_existing_chunks or (offset == 0 and had_existing)
+                    await asyncio.to_thread(
+                        self.bm25_service.append_document_chunks,
+                        kb_id=kb_id,
+                        doc_id=doc_id,
+                        filename=filename,
+                        ingest_id=ingest_id,
+                        chunks=[
+                            {"chunk_id": chunk_id, "chunk_index": offset + i, "content": text}
+                            for i, (chunk_id, text) in enumerate(
+                                zip(window_ids, texts, strict=True)
+                            )
+                        ],
+                    )
+                    stored += len(window)
+        except Exception:
+            await asyncio.to_thread(
+                sqlite_vec_service.delete_document_generation,
                 kb_id=kb_id,
                 doc_id=doc_id,
-                filename=filename,
-                chunks=bm25_chunks,
+                ingest_id=ingest_id,
+            )
+            await asyncio.to_thread(
+                self.bm25_service.delete_document_generation,
+                kb_id=kb_id,
+                doc_id=doc_id,
+                ingest_id=ingest_id,
             )
-        except Exception:
-            sqlite_vec_service.delete_chunks_by_ids(kb_id=kb_id, chunk_ids=ids)
             raise
 
         if had_existing_chunks:
-            deleted = sqlite_vec_service.delete_stale_document_chunks(
+            deleted = await asyncio.to_thread(
+                sqlite_vec_service.delete_stale_document_chunks,
                 kb_id=kb_id,
                 doc_id=doc_id,
-                keep_chunk_ids=ids,
+                keep_ingest_id=ingest_id,
             )
             if deleted:
                 logger.info(f"Removed {deleted} stale SQLite chunks for doc {doc_id} in kb_{kb_id}")
+        await asyncio.to_thread(
+            self.bm25_service.delete_stale_document_chunks,
+            kb_id=kb_id,
+            doc_id=doc_id,
+            keep_ingest_id=ingest_id,
+        )
+        total = stored
+        return {"chunks": total, "embedded": embedded_total, "reused": total - embedded_total}
@@ -0,0 +1,306 @@
+"""
+Cross-document embedding batches with adaptive pacing.
+
+Documents processed by the ingestion queue used to embed their chunks one
+batch at a time, with a fixed ``batch_delay_seconds`` sleep between batches,
+so a KB of many small files sent many small requests and slept after each.
+
+:class:`EmbeddingBatcher` is shared by every document using the same
+embedding instance (instances are cached per model in ``embedding_service``):
+
+- texts submitted by concurrently processed documents are packed into
+  batches of ``batch_size``; a partial batch waits at most ``linger_seconds``
+  and only while another tracked document is still preparing its next slice
+- each batch runs in a worker thread so extraction and storage of other
+  documents keep going on the event loop
+- :class:`AdaptivePacer` replaces the fixed sleep: no delay while the backend
+  accepts requests, exponential backoff (honouring ``Retry-After`` hints) on
+  rate limits and errors, and a decay back to zero on success
+- a batch that still fails after its retries is split by document and each
+  part is retried alone, so one document's bad input (e.g. a chunk over the
+  model's input limit) does not fail the other documents sharing the batch
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import re
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LINGER_SECONDS = 0.05
+_MAX_DELAY_SECONDS = 60.0
+_RATE_LIMIT_MIN_DELAY_SECONDS = 5.0
+_RETRY_AFTER_PATTERN = re.compile(r"retry[- _]after\D{0,5}(\d+(?:\.\d+)?)", re.IGNORECASE)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    message = str(error).lower()
+    return "rate limit" in message or "429" in message
+
+
+def _retry_after_seconds(error: BaseException) -> float | None:
+    match = _RETRY_AFTER_PATTERN.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+class AdaptivePacer:
+    """Delay between embedding requests that follows backend pressure."""
+
+    def __init__(self, base_delay: float = 0.5, max_delay: float = _MAX_DELAY_SECONDS):
+        self.base_delay = max(0.05, float(base_delay or 0.0))
+        self.max_delay = max(self.base_delay, float(max_delay))
+        self.delay = 0.0
+
+    async def wait(self) -> None:
+        if self.delay > 0:
+            await asyncio.sleep(self.delay * random.uniform(0.8, 1.2))
+
+    def on_success(self) -> None:
+        self.delay = self.delay / 2 if self.delay >= 0.05 else 0.0
+
+    def on_error(self, error: BaseException) -> float:
+        """Back off after a failed request; returns the new delay."""
+        step = self.base_delay
+        if is_rate_limit_error(error):
+            step = max(step, _RATE_LIMIT_MIN_DELAY_SECONDS)
+        retry_after = _retry_after_seconds(error) or 0.0
+        self.delay = min(self.max_delay, max(self.delay * 2, step, retry_after))
+        return self.delay
+
+
+@dataclass
+class _PendingText:
+    text: str
+    future: asyncio.Future
+    token: object | None
+
+
+@dataclass
+class _BatcherStats:
+    batches: int = 0
+    texts: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    failed_batches: int = 0
+    embed_seconds: float = 0.0
+    documents_per_batch: list[int] = field(default_factory=list)
+
+
+class EmbeddingBatcher:
+    """Packs ``embed_documents`` calls of concurrent documents into full batches."""
+
+    def __init__(
+        self,
+        embedding_fn: Any,
+        *,
+        batch_size: int = 64,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        linger_seconds: float = DEFAULT_LINGER_SECONDS,
+    ):
+        self.embedding_fn = embedding_fn
+        self.batch_size = max(1, int(batch_size))
+        self.max_retries = int(max_retries or 0)
+        self.linger_seconds = max(0.0, float(linger_seconds))
+        self.pacer = AdaptivePacer(base_delay)
+        self._pending: deque[_PendingText] = deque()
+        self._active_tokens: set[object] = set()
+        self._flusher: asyncio.Task | None = None
+        self._changed: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stats = _BatcherStats()
+
+    def configure(self, *, batch_size: int, max_retries: int, base_delay: float) -> None:
+        """Apply the current RAG embedding settings."""
+        self.batch_size = max(1, int(batch_size))
+        self.max_retries = int(max_retries or 0)
+        self.pacer.base_delay = max(0.05, float(base_delay or 0.0))
+
+    def _bind_loop(self) -> asyncio.Event:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._changed is None:
+            # Futures of a previous event loop can never be resolved; drop them.
+            self._loop = loop
+            self._changed = asyncio.Event()
+            self._pending.clear()
+            self._active_tokens.clear()
+            self._flusher = None
+        return self._changed
+
+    @contextmanager
+    def track_document(self) -> Iterator[object]:
+        """Mark a document as embedding, so partial batches briefly wait for it."""
+        changed = self._bind_loop()
+        token = object()
+        self._active_tokens.add(token)
+        try:
+            yield token
+        finally:
+            self._active_tokens.discard(token)
+            changed.set()
+
+    async def embed(self, texts: list[str], token: object | None = None) -> list[list[float]]:
+        """Embed ``texts``, sharing requests with other documents."""
+        if not texts:
+            return []
+        changed = self._bind_loop()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self._pending.append(_PendingText(text=text, future=future, token=token))
+            futures.append(future)
+        changed.set()
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop(), name="embedding-batcher")
+        return list(await asyncio.gather(*futures))
+
+    def _documents_waiting(self) -> int:
+        return len({item.token for item in self._pending if item.token is not None})
+
+    async def _linger(self) -> None:
+        changed = self._changed
+        assert changed is not None
+        deadline = time.monotonic() + self.linger_seconds
+        while len(self._pending) < self.batch_size and self._documents_waiting() < len(
+            self._active_tokens
+        ):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            changed.clear()
+            try:
+                await asyncio.wait_for(changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return
+
+    async def _flush_loop(self) -> None:
+        while self._pending:
+            await self._linger()
+            batch = [
+                self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))
+            ]
+            batch = [item for item in batch if not item.future.done()]
+            if batch:
+                await self._run_batch(batch)
+
+    async def _run_batch(self, batch: list[_PendingText]) -> None:
+        texts = [item.text for item in batch]
+        attempt = 0
+        while True:
+            await self.pacer.wait()
+            started = time.perf_counter()
+            try:
+                vectors = await asyncio.to_thread(self.embedding_fn.embed_documents, texts)
+                if len(vectors) != len(texts):
+                    raise ValueError(
+                        f"Embedding result count mismatch: expected {len(texts)}, got {len(vectors)}"
+                    )
+            except Exception as e:
+                rate_limited = is_rate_limit_error(e)
+                attempt += 1
+                self._stats.retries += 1
+                self._stats.rate_limited += int(rate_limited)
+                enforce_retries = self.max_retries > 0 and not rate_limited
+                if enforce_retries and attempt > self.max_retries:
+                    groups = self._split_by_document(batch)
+                    if len(groups) > 1:
+                        logger.warning(
+                            f"Embedding batch of {len(texts)} failed after {attempt} attempts; "
+                            f"retrying its {len(groups)} documents separately: {e}"
+                        )
+                        for group in groups:
+                            await self._run_batch(group)
+                        return
+                    self._stats.failed_batches += 1
+                    for item in batch:
+                        if not item.future.done():
+                            item.future.set_exception(e)
+                    return
+                delay = self.pacer.on_error(e)
+                max_label = "inf" if rate_limited or self.max_retries <= 0 else self.max_retries
+                logger.warning(
+                    f"Embedding batch of {len(texts)} failed (attempt {attempt}/{max_label}). "
+                    f"Retrying in ~{delay:.2f}s: {e}"
+                )
+                continue
+
+            self.pacer.on_success()
+            stats = self._stats
+            stats.batches += 1
+            stats.texts += len(texts)
+            stats.embed_seconds += time.perf_counter() - started
+            stats.documents_per_batch.append(len({id(item.token) for item in batch}))
+            del stats.documents_per_batch[:-100]
+            for item, vector in zip(batch, vectors, strict=True):
+                if not item.future.done():
+                    item.future.set_result([float(value) for value in vector])
+            return
+
+    @staticmethod
+    def _split_by_document(batch: list[_PendingText]) -> list[list[_PendingText]]:
+        """Group pending texts by document token, keeping submission order."""
+        groups: dict[int, list[_PendingText]] = {}
+        for item in batch:
+            groups.setdefault(id(item.token), []).append(item)
+        return list(groups.values())
+
+    def stats(self) -> dict[str, Any]:
+        """Batch sizes, retries and current pacing delay."""
+        stats = self._stats
+        recent = stats.documents_per_batch
+        return {
+            "batch_size": self.batch_size,
+            "batches": stats.batches,
+            "texts": stats.texts,
+            "avg_batch_size": round(stats.texts / stats.batches, 2) if stats.batches else 0.0,
+            "avg_documents_per_batch": round(sum(recent) / len(recent), 2) if recent else 0.0,
+            "retries": stats.retries,
+            "rate_limited": stats.rate_limited,
+            "failed_batches": stats.failed_batches,
+            "embed_seconds": round(stats.embed_seconds, 3),
+            "pacing_delay_seconds": round(self.pacer.delay, 3),
+        }
+
+
+_batchers: dict[int, tuple[Any, EmbeddingBatcher]] = {}
+_batchers_lock = Lock()
+
+
+def get_embedding_batcher(
+    embedding_fn: Any, *, batch_size: int, max_retries: int, base_delay: float
+) -> EmbeddingBatcher:
+    """Return the batcher shared by all documents using ``embedding_fn``."""
+    key = id(embedding_fn)
+    with _batchers_lock:
+        entry = _batchers.get(key)
+        if entry is None or entry[0] is not embedding_fn:
+            # Entries keep the embedding instance alive so its id() stays unique.
+            entry = (embedding_fn, EmbeddingBatcher(embedding_fn))
+            _batchers[key] = entry
+    batcher = entry[1]
+    batcher.configure(batch_size=batch_size, max_retries=max_retries, base_delay=base_delay)
+    return batcher
+
+
+def embedding_batcher_stats() -> list[dict[str, Any]]:
+    """Stats of every batcher created in this process."""
+    with _batchers_lock:
+        batchers = [entry[1] for entry in _batchers.values()]
+    return [batcher.stats() for batcher in batchers]
+
+
+def clear_embedding_batchers() -> None:
+    """Forget all batchers (embedding instances were invalidated, tests)."""
+    with _batchers_lock:
+        _batchers.clear()
@@ -0,0 +1,330 @@
+"""
+Bounded ingestion queue for knowledge base documents.
+
+Uploads and reprocess requests enqueue a job instead of starting their own
+pipeline, and a fixed number of workers drain the queue:
+
+- at most ``workers`` documents are processed at once, so bulk uploads do
+  not fight over the embedding rate limit and the SQLite write lock
+- KBs are served round-robin, so one large import does not starve others
+- within a KB, smaller files go first
+- at most ``max_pending`` jobs wait; :meth:`IngestionQueue.enqueue` raises
+  :class:`IngestionQueueFullError` beyond that. Callers that persist a
+  document before enqueueing it hold a slot with :meth:`IngestionQueue.reserve`
+  first, so a full queue is reported before anything is stored
+
+Document status is the durable record: queued documents stay ``pending`` (or
+``processing``) in the document store until a worker finishes them, and
+:meth:`IngestionQueue.resume_unfinished` re-enqueues them after a restart.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INGESTION_WORKERS = 2
+DEFAULT_INGESTION_MAX_PENDING = 10000
+_THROUGHPUT_WINDOW_SECONDS = 300.0
+UNFINISHED_DOCUMENT_STATUSES = ("pending", "processing")
+
+
+class IngestionQueueFullError(RuntimeError):
+    """Raised when the queue already holds ``max_pending`` jobs."""
+
+
+@dataclass(order=True)
+class IngestionJob:
+    """One document waiting to be processed; ordered small files first."""
+
+    file_size: int
+    seq: int = field(default=0, compare=True)
+    kb_id: str = field(default="", compare=False)
+    doc_id: str = field(default="", compare=False)
+    filename: str = field(default="", compare=False)
+    file_type: str = field(default="", compare=False)
+    storage_path: str = field(default="", compare=False)
+    enqueued_at: float = field(default_factory=time.monotonic, compare=False)
+
+
+ProcessFn = Callable[[IngestionJob], Awaitable[Any]]
+
+
+async def process_document_job(job: IngestionJob) -> Any:
+    """Default job handler: run the document pipeline and record failures."""
+    from src.infrastructure.knowledge.knowledge_base_service import KnowledgeBaseService
+
+    try:
+        from src.infrastructure.knowledge.document_processing_service import (
+            DocumentProcessingService,
+        )
+
+        processor = DocumentProcessingService()
+        return await processor.process_document(
+            job.kb_id, job.doc_id, job.filename, job.file_type, job.storage_path
+        )
+    except Exception as e:
+        logger.error(f"Background document processing failed for {job.doc_id}: {e}")
+        try:
+            service = KnowledgeBaseService()
+            await service.update_document_status(
+                job.kb_id, job.doc_id, "error", error_message=str(e)
+            )
+        except Exception as e2:
+            logger.error(f"Failed to update document status to error: {e2}")
+        raise
+
+
+class IngestionQueue:
+    """Per-KB fair, size-prioritized job queue drained by a fixed worker pool."""
+
+    def __init__(
+        self,
+        process_fn: ProcessFn = process_document_job,
+        *,
+        workers: int = DEFAULT_INGESTION_WORKERS,
+        max_pending: int = DEFAULT_INGESTION_MAX_PENDING,
+    ):
+        self.process_fn = process_fn
+        self.workers = max(1, int(workers))
+        self.max_pending = max(1, int(max_pending))
+        self._heaps: dict[str, list[IngestionJob]] = {}
+        self._kb_order: deque[str] = deque()
+        self._queued_keys: set[tuple[str, str]] = set()
+        # Slots held by callers that are still preparing their job.
+        self._reserved = 0
+        self._running: dict[tuple[str, str], IngestionJob] = {}
+        self._seq = itertools.count()
+        self._condition: asyncio.Condition | None = None
+        self._worker_tasks: list[asyncio.Task] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._completions: deque[float] = deque()
+        self.completed = 0
+        self.failed = 0
+        self.total_seconds = 0.0
+
+    @property
+    def depth(self) -> int:
+        return len(self._queued_keys)
+
+    def is_full(self) -> bool:
+        return self.depth + self._reserved >= self.max_pending
+
+    def _full_error(self) -> IngestionQueueFullError:
+        return IngestionQueueFullError(
+            f"Ingestion queue is full ({self.max_pending} documents pending)"
+        )
+
+    @contextmanager
+    def reserve(self) -> Iterator[None]:
+        """Hold one pending slot while the caller stores the document to enqueue.
+
+        Raises :class:`IngestionQueueFullError` up front when no slot is free.
+        ``enqueue(..., reserved=True)`` inside the block uses the held slot.
+        """
+        if self.is_full():
+            raise self._full_error()
+        self._reserved += 1
+        try:
+            yield
+        finally:
+            self._reserved -= 1
+
+    def _ensure_started(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._condition is None:
+            # First use, or the previous event loop is gone (tests, restarts).
+            self._loop = loop
+            self._condition = asyncio.Condition()
+            self._worker_tasks = []
+        self._worker_tasks = [task for task in self._worker_tasks if not task.done()]
+        while len(self._worker_tasks) < self.workers:
+            index = len(self._worker_tasks)
+            self._worker_tasks.append(
+                asyncio.create_task(self._worker(), name=f"kb-ingestion-{index}")
+            )
+        return self._condition
+
+    async def enqueue(
+        self,
+        *,
+        kb_id: str,
+        doc_id: str,
+        filename: str,
+        file_type: str,
+        storage_path: str,
+        file_size: int = 0,
+        reserved: bool = False,
+    ) -> bool:
+        """Queue a document; returns False if it is already waiting.
+
+        Pass ``reserved=True`` from inside :meth:`reserve` so the caller's own
+        held slot does not count against it.
+        """
+        condition = self._ensure_started()
+        async with condition:
+            key = (kb_id, doc_id)
+            if key in self._queued_keys:
+                return False
+            if self.depth + self._reserved - int(reserved) >= self.max_pending:
+                raise self._full_error()
+            job = IngestionJob(
+                file_size=max(0, int(file_size or 0)),
+                seq=next(self._seq),
+                kb_id=kb_id,
+                doc_id=doc_id,
+                filename=filename,
+                file_type=file_type,
+                storage_path=str(storage_path),
+            )
+            heap = self._heaps.get(kb_id)
+            if heap is None:
+                heap = self._heaps[kb_id] = []
+                self._kb_order.append(kb_id)
+            heapq.heappush(heap, job)
+            self._queued_keys.add(key)
+            condition.notify()
+            return True
+
+    def _pop_next_locked(self) -> IngestionJob | None:
+        while self._kb_order:
+            kb_id = self._kb_order.popleft()
+            heap = self._heaps.get(kb_id)
+            if not heap:
+                self._heaps.pop(kb_id, None)
+                continue
+            job = heapq.heappop(heap)
+            if heap:
+                self._kb_order.append(kb_id)
+            else:
+                del self._heaps[kb_id]
+            return job
+        return None
+
+    async def _worker(self) -> None:
+        condition = self._condition
+        assert condition is not None
+        while True:
+            async with condition:
+                job = self._pop_next_locked()
+                while job is None:
+                    await condition.wait()
+                    job = self._pop_next_locked()
+                key = (job.kb_id, job.doc_id)
+                self._queued_keys.discard(key)
+                self._running[key] = job
+
+            started = time.monotonic()
+            ok = True
+            try:
+                await self.process_fn(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                ok = False
+                task = asyncio.current_task()
+                if task is not None and task.cancelling():
+                    # The job turned stop()'s cancellation into an ordinary error.
+                    raise asyncio.CancelledError from None
+            finally:
+                finished = time.monotonic()
+                async with condition:
+                    self._running.pop(key, None)
+                    self.total_seconds += finished - started
+                    if ok:
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+                    self._completions.append(finished)
+                    condition.notify_all()
+
+    async def join(self) -> None:
+        """Wait until no job is queued or running."""
+        condition = self._ensure_started()
+        async with condition:
+            while self._queued_keys or self._running:
+                await condition.wait()
+
+    async def stop(self) -> None:
+        """Cancel the workers; queued documents stay ``pending`` for the next start."""
+        tasks, self._worker_tasks = self._worker_tasks, []
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def resume_unfinished(self, kb_service: Any) -> int:
+        """Re-enqueue documents left ``pending``/``processing`` by a previous run."""
+        resumed = 0
+        for kb in await kb_service.get_knowledge_bases():
+            for doc in await kb_service.get_documents(kb.id):
+                if doc.status not in UNFINISHED_DOCUMENT_STATUSES:
+                    continue
+                storage_path = kb_service.find_document_file(kb.id, doc.id)
+                if storage_path is None:
+                    await kb_service.update_document_status(
+                        kb.id, doc.id, "error", error_message="Document file not found on disk"
+                    )
+                    continue
+                try:
+                    queued = await self.enqueue(
+                        kb_id=kb.id,
+                        doc_id=doc.id,
+                        filename=doc.filename,
+                        file_type=doc.file_type,
+                        storage_path=str(storage_path),
+                        file_size=doc.file_size,
+                    )
+                except IngestionQueueFullError:
+                    logger.warning("Ingestion queue full; remaining documents resume later")
+                    return resumed
+                resumed += int(queued)
+        return resumed
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth per KB, running jobs and recent throughput."""
+        now = time.monotonic()
+        while self._completions and now - self._completions[0] > _THROUGHPUT_WINDOW_SECONDS:
+            self._completions.popleft()
+        finished = self.completed + self.failed
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.depth,
+            "pending_by_kb": {kb_id: len(heap) for kb_id, heap in self._heaps.items() if heap},
+            "running": len(self._running),
+            "running_docs": [
+                {"kb_id": job.kb_id, "doc_id": job.doc_id, "filename": job.filename}
+                for job in self._running.values()
+            ],
+            "completed": self.completed,
+            "failed": self.failed,
+            "docs_per_minute": round(len(self._completions) * 60.0 / _THROUGHPUT_WINDOW_SECONDS, 2),
+            "avg_job_seconds": round(self.total_seconds / finished, 3) if finished else 0.0,
+        }
+
+
+_ingestion_queue: IngestionQueue | None = None
+
+
+def get_ingestion_queue() -> IngestionQueue:
+    """Return the process-wide ingestion queue used by the API."""
+    global _ingestion_queue
+    if _ingestion_queue is None:
+        from src.core.config import settings
+
+        _ingestion_queue = IngestionQueue(
+            workers=settings.kb_ingestion_workers,
+            max_pending=settings.kb_ingestion_max_pending,
+        )
+    return _ingestion_queue
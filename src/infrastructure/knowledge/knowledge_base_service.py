@@ -402,10 +402,12 @@ class KnowledgeBaseService:
                 if not persist_dir.is_absolute():
                     persist_dir = resolve_user_data_path(persist_dir)
 
-                import chromadb
+                from src.infrastructure.retrieval.chroma_registry import get_chroma_registry
 
-                client = chromadb.PersistentClient(path=str(persist_dir))
+                registry = get_chroma_registry()
+                client = registry.get_client(persist_dir)
                 collection_name = f"kb_{kb_id}"
+                registry.evict_collection(persist_dir, collection_name)
                 try:
                     client.delete_collection(collection_name)
                     logger.info(f"Deleted ChromaDB collection: {collection_name}")
@@ -500,6 +502,8 @@ class KnowledgeBaseService:
         status: str,
         chunk_count: int = 0,
         error_message: str | None = None,
+        embedded_chunk_count: int = 0,
+        reused_chunk_count: int = 0,
     ):
         """Update document processing status"""
         async with self._mutation_lock:
@@ -516,6 +520,8 @@ class KnowledgeBaseService:
                 doc_dict["status"] = status
                 doc_dict["chunk_count"] = chunk_count
                 doc_dict["error_message"] = error_message
+                doc_dict["embedded_chunk_count"] = embedded_chunk_count
+                doc_dict["reused_chunk_count"] = reused_chunk_count
                 updated = KnowledgeBaseDocument(**doc_dict)
                 docs_map[cache_key] = updated
                 await self._append_doc_events(
@@ -612,9 +618,9 @@ class KnowledgeBaseService:
                 if not persist_dir.is_absolute():
                     persist_dir = resolve_user_data_path(persist_dir)
 
-                import chromadb
+                from src.infrastructure.retrieval.chroma_registry import get_chroma_registry
 
-                client = chromadb.PersistentClient(path=str(persist_dir))
+                client = get_chroma_registry().get_client(persist_dir)
                 collection_name = f"kb_{kb_id}"
                 try:
                     collection = client.get_collection(collection_name)
@@ -638,3 +644,11 @@ class KnowledgeBaseService:
         doc_dir = self.storage_dir / kb_id / "documents"
         doc_dir.mkdir(parents=True, exist_ok=True)
         return doc_dir / f"{doc_id}_{filename}"
+
+    def find_document_file(self, kb_id: str, doc_id: str) -> Path | None:
+        """Locate the stored file of a document, if it still exists."""
+        doc_dir = self.storage_dir / kb_id / "documents"
+        for file_path in doc_dir.glob(f"{doc_id}_*"):
+            if file_path.exists():
+                return file_path
+        return None
@@ -10,7 +10,7 @@ import logging
 import re
 import uuid
 from collections.abc import Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, cast
@@ -22,6 +22,8 @@ from src.infrastructure.retrieval.embedding_service import EmbeddingService
 
 logger = logging.getLogger(__name__)
 
+_MAX_INSTRUCTION_ITEMS = 15
+
 
 @dataclass
 class MemoryResult:
@@ -40,6 +42,14 @@ class MemoryResult:
         return data
 
 
+@dataclass
+class MemoryContextItems:
+    """Memories selected for one prompt, before rendering."""
+
+    instructions: list[MemoryResult] = field(default_factory=list)
+    facts: list[dict[str, Any]] = field(default_factory=list)
+
+
 class MemoryService:
     """Service for long-term memory operations."""
 
@@ -54,7 +64,9 @@ class MemoryService:
     ):
         self.memory_config_service = memory_config_service or MemoryConfigService()
         self.rag_config_service = rag_config_service or RagConfigService()
-        self.embedding_service = embedding_service or EmbeddingService()
+        self.embedding_service = embedding_service or EmbeddingService(
+            rag_config_service=self.rag_config_service
+        )
 
     def _now_iso(self) -> str:
         return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
@@ -140,18 +152,13 @@ class MemoryService:
         return persist_dir
 
     def _get_vectorstore(self):
-        from langchain_chroma import Chroma
+        from src.infrastructure.retrieval.chroma_registry import get_chroma_registry
 
         cfg = self.memory_config_service.config
         persist_dir = self._resolve_persist_dir()
         embedding_fn = cast(Any, self.embedding_service.get_embedding_function())
 
-        return Chroma(
-            collection_name=cfg.collection_name,
-            embedding_function=embedding_fn,
-            persist_directory=str(persist_dir),
-            collection_metadata={"hnsw:space": "cosine"},
-        )
+        return get_chroma_registry().get_vectorstore(persist_dir, cfg.collection_name, embedding_fn)
 
     @staticmethod
     def _build_where(filters: Sequence[dict[str, Any]]) -> dict[str, Any] | None:
@@ -514,6 +521,8 @@ class MemoryService:
         score_threshold: float,
         layer: str | None = None,
     ) -> list[MemoryResult]:
+        from src.infrastructure.retrieval.chroma_registry import search_by_vector_with_relevance
+
         filters: list[dict[str, Any]] = [
             {"profile_id": profile_id},
             {"scope": scope},
@@ -526,10 +535,10 @@ class MemoryService:
 
         where = self._build_where(filters)
         vectorstore = self._get_vectorstore()
-        docs_and_scores = vectorstore.similarity_search_with_relevance_scores(
-            query,
-            k=max(1, top_k),
-            filter=where,
+        # Global and assistant scopes search the same text; the shared cache embeds it once.
+        query_embedding = self.embedding_service.embed_queries([query])[0]
+        docs_and_scores = search_by_vector_with_relevance(
+            vectorstore, query_embedding, k=max(1, top_k), filter=where
         )
 
         results: list[MemoryResult] = []
@@ -699,7 +708,7 @@ class MemoryService:
         assistant_id: str | None,
         include_global: bool = True,
         include_assistant: bool = True,
-        max_items: int = 15,
+        max_items: int = _MAX_INSTRUCTION_ITEMS,
     ) -> list[MemoryResult]:
         """Load ALL active instruction-layer memories (no vector search)."""
         cfg = self.memory_config_service.config
@@ -741,7 +750,7 @@ class MemoryService:
 
         return all_results[:max_items]
 
-    def build_memory_context(
+    def collect_memory_items(
         self,
         *,
         query: str,
@@ -749,17 +758,16 @@ class MemoryService:
         profile_id: str | None = None,
         include_global: bool = True,
         include_assistant: bool = True,
-    ) -> tuple[str, list[dict[str, Any]]]:
+    ) -> MemoryContextItems:
+        """Select the instruction and fact memories injected for ``query``."""
         cfg = self.memory_config_service.config
         if not cfg.enabled:
-            return "", []
+            return MemoryContextItems()
 
         resolved_profile = self._resolve_profile_id(profile_id)
         enabled_layers = {
             str(layer).strip().lower() for layer in (cfg.enabled_layers or []) if str(layer).strip()
         }
-        lines: list[str] = []
-        sources: list[dict[str, Any]] = []
 
         # Phase 1: instruction layer - load ALL active items (always apply)
         instructions: list[MemoryResult] = []
@@ -770,9 +778,91 @@ class MemoryService:
                 include_global=include_global,
                 include_assistant=include_assistant,
             )
-        if instructions:
+
+        # Phase 2: fact layer - vector similarity search (inject when relevant)
+        fact_results: list[dict[str, Any]] = []
+        if not enabled_layers or "fact" in enabled_layers:
+            fact_results = self.search_memories_for_scopes(
+                query=query,
+                assistant_id=assistant_id,
+                profile_id=profile_id,
+                include_global=include_global,
+                include_assistant=include_assistant,
+                layer="fact",
+                limit=cfg.retrieval.max_injected_items,
+            )
+        return MemoryContextItems(instructions=instructions, facts=fact_results)
+
+    def _merge_memory_items(
+        self, shared: MemoryContextItems, own: MemoryContextItems
+    ) -> MemoryContextItems:
+        """Layer assistant memories over shared global ones, as one combined search would."""
+        cfg = self.memory_config_service.config
+        dedup: dict[str, dict[str, Any]] = {}
+        for item in [*shared.facts, *own.facts]:
+            key = item.get("id") or item.get("hash")
+            if not key:
+                continue
+            old = dedup.get(key)
+            if old is None or self._safe_float(item.get("score"), 0.0) > self._safe_float(
+                old.get("score"), 0.0
+            ):
+                dedup[key] = item
+        facts = sorted(
+            dedup.values(), key=lambda x: self._safe_float(x.get("score"), 0.0), reverse=True
+        )
+        return MemoryContextItems(
+            instructions=[*shared.instructions, *own.instructions][:_MAX_INSTRUCTION_ITEMS],
+            facts=facts[: max(1, cfg.retrieval.max_injected_items)],
+        )
+
+    def build_memory_context(
+        self,
+        *,
+        query: str,
+        assistant_id: str | None,
+        profile_id: str | None = None,
+        include_global: bool = True,
+        include_assistant: bool = True,
+        shared_items: MemoryContextItems | None = None,
+    ) -> tuple[str, list[dict[str, Any]]]:
+        """Render the memory prompt block and its sources.
+
+        ``shared_items`` are global-scope items already collected for the same
+        query (e.g. once per group turn); only the assistant scope is searched
+        then.
+        """
+        cfg = self.memory_config_service.config
+        if not cfg.enabled:
+            return "", []
+
+        if shared_items is None:
+            items = self.collect_memory_items(
+                query=query,
+                assistant_id=assistant_id,
+                profile_id=profile_id,
+                include_global=include_global,
+                include_assistant=include_assistant,
+            )
+        else:
+            own = MemoryContextItems()
+            if include_assistant:
+                own = self.collect_memory_items(
+                    query=query,
+                    assistant_id=assistant_id,
+                    profile_id=profile_id,
+                    include_global=False,
+                    include_assistant=True,
+                )
+            items = self._merge_memory_items(
+                shared_items if include_global else MemoryContextItems(), own
+            )
+
+        lines: list[str] = []
+        sources: list[dict[str, Any]] = []
+        if items.instructions:
             lines.append("## User instructions (always apply):")
-            for item in instructions:
+            for item in items.instructions:
                 content = self._clean_text(item.content)
                 if len(content) > cfg.retrieval.max_item_length:
                     content = f"{content[: cfg.retrieval.max_item_length]}..."
@@ -788,23 +878,11 @@ class MemoryService:
                     }
                 )
 
-        # Phase 2: fact layer - vector similarity search (inject when relevant)
-        fact_results: list[dict[str, Any]] = []
-        if not enabled_layers or "fact" in enabled_layers:
-            fact_results = self.search_memories_for_scopes(
-                query=query,
-                assistant_id=assistant_id,
-                profile_id=profile_id,
-                include_global=include_global,
-                include_assistant=include_assistant,
-                layer="fact",
-                limit=cfg.retrieval.max_injected_items,
-            )
-        if fact_results:
+        if items.facts:
             if lines:
                 lines.append("")
             lines.append("## User context (relevant background):")
-            for idx, fact_item in enumerate(fact_results, start=1):
+            for idx, fact_item in enumerate(items.facts, start=1):
                 content = self._clean_text(str(fact_item.get("content", "")))
                 if len(content) > cfg.retrieval.max_item_length:
                     content = f"{content[: cfg.retrieval.max_item_length]}..."
@@ -2,22 +2,33 @@
 BM25 Service
 
 Maintains a lightweight SQLite FTS5 index for lexical retrieval.
+
+Each knowledge base has its own external-content FTS5 table over
+``rag_bm25_chunks`` (keyed by the chunk row ``id``), so a query only scores
+matches in the KB it targets and BM25 statistics are per KB.
 """
 
 from __future__ import annotations
 
+import hashlib
 import importlib
 import logging
 import re
 import sqlite3
+import time
+from contextlib import AbstractContextManager
 from pathlib import Path
 from threading import Lock
 from typing import Any
 
 from src.core.paths import resolve_user_data_path
 
+from .sqlite_connection_pool import PooledConnection, get_sqlite_pool
+
 logger = logging.getLogger(__name__)
 
+_CHUNK_ID_BATCH = 500
+
 
 class Bm25Service:
     """Service for chunk-level BM25 indexing and retrieval."""
@@ -42,40 +53,218 @@ class Bm25Service:
 
         self.db_path = db_path_obj
         self._lock = Lock()
-        self._ensure_schema()
+        self._pool = get_sqlite_pool(self.db_path)
+        if not self._pool.has_schema("bm25") and self._ensure_schema():
+            self._pool.mark_schema("bm25")
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def _connect(self) -> AbstractContextManager[PooledConnection]:
+        """Check out a pooled connection (commits on success)."""
+        return self._pool.connection()
 
-    def _ensure_schema(self) -> None:
+    @staticmethod
+    def _chunk_columns(conn: sqlite3.Connection) -> set[str]:
+        return {
+            str(row["name"])
+            for row in conn.execute("PRAGMA table_info(rag_bm25_chunks)").fetchall()
+        }
+
+    def _ensure_schema(self) -> bool:
+        """Create missing tables and indexes; cheap and idempotent.
+
+        Returns False while the chunks still use the legacy shared FTS index;
+        ``migrate_shared_fts_index`` converts it.
+        """
         with self._connect() as conn:
+            existing_cols = self._chunk_columns(conn)
+            if existing_cols and "id" not in existing_cols:
+                logger.warning(
+                    "rag_bm25_chunks in %s uses the legacy shared FTS index; "
+                    "it is converted by the startup migration",
+                    self.db_path,
+                )
+                return False
+            if existing_cols and "ingest_id" not in existing_cols:
+                # Rows written before stay in the '' generation.
+                conn.execute(
+                    "ALTER TABLE rag_bm25_chunks ADD COLUMN ingest_id TEXT NOT NULL DEFAULT ''"
+                )
+                conn.commit()
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS rag_bm25_chunks (
-                    chunk_id TEXT PRIMARY KEY,
+                    id INTEGER PRIMARY KEY,
+                    chunk_id TEXT NOT NULL UNIQUE,
                     kb_id TEXT NOT NULL,
                     doc_id TEXT NOT NULL,
                     filename TEXT NOT NULL,
                     chunk_index INTEGER NOT NULL,
                     content TEXT NOT NULL,
                     tokenized TEXT NOT NULL,
+                    ingest_id TEXT NOT NULL DEFAULT '',
                     updated_at TEXT DEFAULT CURRENT_TIMESTAMP
                 )
                 """
             )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_rag_bm25_kb_doc "
+                "ON rag_bm25_chunks (kb_id, doc_id, chunk_index)"
+            )
             conn.execute(
                 """
-                CREATE VIRTUAL TABLE IF NOT EXISTS rag_bm25_fts
-                USING fts5(
-                    chunk_id,
-                    tokenized,
-                    tokenize='unicode61'
+                CREATE TABLE IF NOT EXISTS rag_bm25_kb_fts (
+                    kb_id TEXT PRIMARY KEY,
+                    table_name TEXT NOT NULL UNIQUE
                 )
                 """
             )
             conn.commit()
+        return True
+
+    def migrate_shared_fts_index(self) -> int:
+        """Move a single shared ``rag_bm25_fts`` index to per-KB FTS tables.
+
+        Chunk rows are copied into a table with a stable integer ``id`` (the
+        FTS rowid), then one FTS table per KB is filled from it, in a single
+        transaction. Called once at startup, before the backend serves
+        requests.
+
+        Returns:
+            Number of per-KB FTS tables built (0 when nothing was legacy).
+        """
+        with self._lock, self._connect() as conn:
+            existing_cols = self._chunk_columns(conn)
+            if not existing_cols or "id" in existing_cols:
+                return 0
+            kb_count = self._migrate_shared_fts_index(conn)
+        if self._ensure_schema():
+            self._pool.mark_schema("bm25")
+        return kb_count
+
+    def _migrate_shared_fts_index(self, conn: sqlite3.Connection) -> int:
+        started = time.perf_counter()
+        conn.execute("BEGIN")
+        try:
+            conn.execute("DROP TABLE IF EXISTS rag_bm25_chunks_migrating")
+            conn.execute(
+                """
+                CREATE TABLE rag_bm25_chunks_migrating (
+                    id INTEGER PRIMARY KEY,
+                    chunk_id TEXT NOT NULL UNIQUE,
+                    kb_id TEXT NOT NULL,
+                    doc_id TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    chunk_index INTEGER NOT NULL,
+                    content TEXT NOT NULL,
+                    tokenized TEXT NOT NULL,
+                    ingest_id TEXT NOT NULL DEFAULT '',
+                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+            conn.execute(
+                """
+                INSERT INTO rag_bm25_chunks_migrating (
+                    chunk_id, kb_id, doc_id, filename, chunk_index, content, tokenized, updated_at
+                )
+                SELECT chunk_id, kb_id, doc_id, filename, chunk_index, content, tokenized, updated_at
+                FROM rag_bm25_chunks
+                ORDER BY kb_id, doc_id, chunk_index
+                """
+            )
+            conn.execute("DROP TABLE rag_bm25_chunks")
+            conn.execute("DROP TABLE IF EXISTS rag_bm25_fts")
+            conn.execute("ALTER TABLE rag_bm25_chunks_migrating RENAME TO rag_bm25_chunks")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS rag_bm25_kb_fts (
+                    kb_id TEXT PRIMARY KEY,
+                    table_name TEXT NOT NULL UNIQUE
+                )
+                """
+            )
+            kb_ids = [
+                str(row["kb_id"])
+                for row in conn.execute("SELECT DISTINCT kb_id FROM rag_bm25_chunks").fetchall()
+            ]
+            for kb_id in kb_ids:
+                table = self._ensure_kb_table(conn, kb_id)
+                conn.execute(
+                    f"""
+                    INSERT INTO {table} (rowid, tokenized)
+                    SELECT id, tokenized FROM rag_bm25_chunks WHERE kb_id = ?
+                    """,
+                    (kb_id,),
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        logger.info(
+            "Split BM25 index into %s per-KB FTS tables in %.2fs",
+            len(kb_ids),
+            time.perf_counter() - started,
+        )
+        return len(kb_ids)
+
+    @staticmethod
+    def _kb_table_name(kb_id: str) -> str:
+        digest = hashlib.sha1(kb_id.encode("utf-8")).hexdigest()[:16]
+        return f"rag_bm25_fts_{digest}"
+
+    @staticmethod
+    def _kb_table(conn: sqlite3.Connection, kb_id: str) -> str | None:
+        row = conn.execute(
+            "SELECT table_name FROM rag_bm25_kb_fts WHERE kb_id = ?", (kb_id,)
+        ).fetchone()
+        return str(row["table_name"]) if row else None
+
+    def _ensure_kb_table(self, conn: sqlite3.Connection, kb_id: str) -> str:
+        """Return the KB's FTS table, creating and registering it if needed."""
+        table = self._kb_table(conn, kb_id)
+        if table is not None:
+            return table
+        table = self._kb_table_name(kb_id)
+        conn.execute(
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {table}
+            USING fts5(
+                tokenized,
+                content='rag_bm25_chunks',
+                content_rowid='id',
+                tokenize='unicode61'
+            )
+            """
+        )
+        conn.execute(
+            "INSERT INTO rag_bm25_kb_fts (kb_id, table_name) VALUES (?, ?)", (kb_id, table)
+        )
+        return table
+
+    def _delete_fts_entries(self, conn: sqlite3.Connection, rows: list[sqlite3.Row]) -> None:
+        """Remove chunk rows from their KB's FTS index (before the rows are deleted).
+
+        External-content FTS tables need the indexed text to delete an entry,
+        so this must run while the chunk rows still hold it.
+        """
+        by_kb: dict[str, list[tuple[int, str]]] = {}
+        for row in rows:
+            by_kb.setdefault(str(row["kb_id"]), []).append((int(row["id"]), str(row["tokenized"])))
+        for kb_id, entries in by_kb.items():
+            table = self._kb_table(conn, kb_id)
+            if table is None:
+                continue
+            conn.executemany(
+                f"INSERT INTO {table} ({table}, rowid, tokenized) VALUES ('delete', ?, ?)",
+                entries,
+            )
+
+    def _delete_chunk_rows(self, conn: sqlite3.Connection, rows: list[sqlite3.Row]) -> None:
+        if not rows:
+            return
+        self._delete_fts_entries(conn, rows)
+        conn.executemany(
+            "DELETE FROM rag_bm25_chunks WHERE id = ?", [(int(row["id"]),) for row in rows]
+        )
 
     @staticmethod
     def _fallback_tokenize(text: str) -> list[str]:
@@ -189,15 +378,7 @@ class Bm25Service:
             cursor = conn.cursor()
             cursor.execute("BEGIN")
             try:
-                existing_rows = cursor.execute(
-                    "SELECT chunk_id FROM rag_bm25_chunks WHERE kb_id = ? AND doc_id = ?",
-                    (kb_id, doc_id),
-                ).fetchall()
-                existing_ids = [str(item["chunk_id"]) for item in existing_rows]
-
-                current_ids: list[str] = []
                 chunk_rows: list[tuple[object, ...]] = []
-                fts_rows: list[tuple[str, str]] = []
                 for row in chunks:
                     chunk_id = str(row.get("chunk_id") or "")
                     if not chunk_id:
@@ -205,103 +386,181 @@ class Bm25Service:
                     chunk_index = int(row.get("chunk_index", 0) or 0)
                     content = str(row.get("content") or "")
                     tokenized = self._to_tokenized_text(content)
-                    current_ids.append(chunk_id)
                     chunk_rows.append(
                         (chunk_id, kb_id, doc_id, filename, chunk_index, content, tokenized)
                     )
-                    fts_rows.append((chunk_id, tokenized))
 
-                if not current_ids:
+                # Previous generation of this document, plus any rows elsewhere
+                # that reuse one of the incoming chunk ids.
+                existing_rows = cursor.execute(
+                    """
+                    SELECT id, kb_id, tokenized FROM rag_bm25_chunks
+                    WHERE kb_id = ? AND doc_id = ?
+                    """,
+                    (kb_id, doc_id),
+                ).fetchall()
+                seen_ids = {int(row["id"]) for row in existing_rows}
+                chunk_ids = [str(row[0]) for row in chunk_rows]
+                for start in range(0, len(chunk_ids), _CHUNK_ID_BATCH):
+                    batch = chunk_ids[start : start + _CHUNK_ID_BATCH]
+                    placeholders = ",".join("?" for _ in batch)
+                    for row in cursor.execute(
+                        f"""
+                        SELECT id, kb_id, tokenized FROM rag_bm25_chunks
+                        WHERE chunk_id IN ({placeholders})
+                        """,
+                        batch,
+                    ).fetchall():
+                        if int(row["id"]) not in seen_ids:
+                            seen_ids.add(int(row["id"]))
+                            existing_rows.append(row)
+                self._delete_chunk_rows(conn, existing_rows)
+
+                if chunk_rows:
+                    cursor.executemany(
+                        """
+                        INSERT OR REPLACE INTO rag_bm25_chunks (
+                            chunk_id, kb_id, doc_id, filename, chunk_index, content, tokenized,
+                            updated_at
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                        """,
+                        chunk_rows,
+                    )
+                    table = self._ensure_kb_table(conn, kb_id)
                     cursor.execute(
-                        "DELETE FROM rag_bm25_chunks WHERE kb_id = ? AND doc_id = ?",
+                        f"""
+                        INSERT INTO {table} (rowid, tokenized)
+                        SELECT id, tokenized FROM rag_bm25_chunks
+                        WHERE kb_id = ? AND doc_id = ?
+                        """,
                         (kb_id, doc_id),
                     )
-                    if existing_ids:
-                        placeholders = ",".join("?" for _ in existing_ids)
-                        cursor.execute(
-                            f"DELETE FROM rag_bm25_fts WHERE chunk_id IN ({placeholders})",
-                            existing_ids,
-                        )
-                    conn.commit()
-                    return
 
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def append_document_chunks(
+        self,
+        *,
+        kb_id: str,
+        doc_id: str,
+        filename: str,
+        ingest_id: str,
+        chunks: list[dict[str, Any]],
+    ) -> None:
+        """Add one window of a document generation that is written window by window.
+
+        Earlier generations stay searchable until
+        :meth:`delete_stale_document_chunks` drops them after the last window.
+        """
+        chunk_rows = [
+            (
+                str(row["chunk_id"]),
+                kb_id,
+                doc_id,
+                filename,
+                int(row.get("chunk_index", 0) or 0),
+                str(row.get("content") or ""),
+                self._to_tokenized_text(str(row.get("content") or "")),
+                ingest_id,
+            )
+            for row in chunks
+            if row.get("chunk_id")
+        ]
+        if not chunk_rows:
+            return
+
+        with self._lock, self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN")
+            try:
+                chunk_ids = [row[0] for row in chunk_rows]
+                table = self._ensure_kb_table(conn, kb_id)
+                for start in range(0, len(chunk_ids), _CHUNK_ID_BATCH):
+                    batch = chunk_ids[start : start + _CHUNK_ID_BATCH]
+                    placeholders = ",".join("?" for _ in batch)
+                    # A retried window replaces the rows it already wrote.
+                    self._delete_chunk_rows(
+                        conn,
+                        cursor.execute(
+                            f"""
+                            SELECT id, kb_id, tokenized FROM rag_bm25_chunks
+                            WHERE chunk_id IN ({placeholders})
+                            """,
+                            batch,
+                        ).fetchall(),
+                    )
                 cursor.executemany(
                     """
-                    INSERT OR REPLACE INTO rag_bm25_chunks (
-                        chunk_id, kb_id, doc_id, filename, chunk_index, content, tokenized, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    INSERT INTO rag_bm25_chunks (
+                        chunk_id, kb_id, doc_id, filename, chunk_index, content, tokenized,
+                        ingest_id, updated_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
                     """,
                     chunk_rows,
                 )
-
-                # Fast path: common import flow is append-only new docs.
-                if not existing_ids:
-                    cursor.executemany(
-                        "INSERT INTO rag_bm25_fts (chunk_id, tokenized) VALUES (?, ?)",
-                        fts_rows,
-                    )
-                    conn.commit()
-                    return
-
-                current_id_set = set(current_ids)
-                stale_ids = [
-                    chunk_id for chunk_id in existing_ids if chunk_id not in current_id_set
-                ]
-                if stale_ids:
-                    placeholders = ",".join("?" for _ in stale_ids)
+                for start in range(0, len(chunk_ids), _CHUNK_ID_BATCH):
+                    batch = chunk_ids[start : start + _CHUNK_ID_BATCH]
+                    placeholders = ",".join("?" for _ in batch)
                     cursor.execute(
-                        f"DELETE FROM rag_bm25_chunks WHERE chunk_id IN ({placeholders})",
-                        stale_ids,
+                        f"""
+                        INSERT INTO {table} (rowid, tokenized)
+                        SELECT id, tokenized FROM rag_bm25_chunks
+                        WHERE chunk_id IN ({placeholders})
+                        """,
+                        batch,
                     )
-
-                # Refresh FTS rows for this document generation.
-                placeholders = ",".join("?" for _ in existing_ids)
-                cursor.execute(
-                    f"DELETE FROM rag_bm25_fts WHERE chunk_id IN ({placeholders})",
-                    existing_ids,
-                )
-                cursor.executemany(
-                    "INSERT INTO rag_bm25_fts (chunk_id, tokenized) VALUES (?, ?)",
-                    fts_rows,
-                )
-
                 conn.commit()
             except Exception:
                 conn.rollback()
                 raise
 
+    def delete_document_generation(self, *, kb_id: str, doc_id: str, ingest_id: str) -> None:
+        """Drop the rows one (failed) ingestion run wrote for a document."""
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT id, kb_id, tokenized FROM rag_bm25_chunks
+                WHERE kb_id = ? AND doc_id = ? AND ingest_id = ?
+                """,
+                (kb_id, doc_id, ingest_id),
+            ).fetchall()
+            self._delete_chunk_rows(conn, rows)
+            conn.commit()
+
+    def delete_stale_document_chunks(self, *, kb_id: str, doc_id: str, keep_ingest_id: str) -> int:
+        """Drop a document's rows except those of the current generation."""
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT id, kb_id, tokenized FROM rag_bm25_chunks
+                WHERE kb_id = ? AND doc_id = ? AND ingest_id != ?
+                """,
+                (kb_id, doc_id, keep_ingest_id),
+            ).fetchall()
+            self._delete_chunk_rows(conn, rows)
+            conn.commit()
+        return len(rows)
+
     def delete_document_chunks(self, *, kb_id: str, doc_id: str) -> None:
         with self._lock, self._connect() as conn:
-            cursor = conn.cursor()
-            rows = cursor.execute(
-                "SELECT chunk_id FROM rag_bm25_chunks WHERE kb_id = ? AND doc_id = ?",
+            rows = conn.execute(
+                "SELECT id, kb_id, tokenized FROM rag_bm25_chunks WHERE kb_id = ? AND doc_id = ?",
                 (kb_id, doc_id),
             ).fetchall()
-            chunk_ids = [str(item["chunk_id"]) for item in rows]
-            cursor.execute(
-                "DELETE FROM rag_bm25_chunks WHERE kb_id = ? AND doc_id = ?", (kb_id, doc_id)
-            )
-            if chunk_ids:
-                placeholders = ",".join("?" for _ in chunk_ids)
-                cursor.execute(
-                    f"DELETE FROM rag_bm25_fts WHERE chunk_id IN ({placeholders})", chunk_ids
-                )
+            self._delete_chunk_rows(conn, rows)
             conn.commit()
 
     def delete_kb_chunks(self, *, kb_id: str) -> None:
         with self._lock, self._connect() as conn:
-            cursor = conn.cursor()
-            rows = cursor.execute(
-                "SELECT chunk_id FROM rag_bm25_chunks WHERE kb_id = ?",
-                (kb_id,),
-            ).fetchall()
-            chunk_ids = [str(item["chunk_id"]) for item in rows]
-            cursor.execute("DELETE FROM rag_bm25_chunks WHERE kb_id = ?", (kb_id,))
-            if chunk_ids:
-                placeholders = ",".join("?" for _ in chunk_ids)
-                cursor.execute(
-                    f"DELETE FROM rag_bm25_fts WHERE chunk_id IN ({placeholders})", chunk_ids
-                )
+            conn.execute("BEGIN")
+            table = self._kb_table(conn, kb_id)
+            if table is not None:
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+                conn.execute("DELETE FROM rag_bm25_kb_fts WHERE kb_id = ?", (kb_id,))
+            conn.execute("DELETE FROM rag_bm25_chunks WHERE kb_id = ?", (kb_id,))
             conn.commit()
 
     def search(
@@ -333,8 +592,11 @@ class Bm25Service:
             fetch_k = min(max(safe_top_k * 8, 80), 1000)
 
         with self._connect() as conn:
+            table = self._kb_table(conn, kb_id)
+            if table is None:
+                return []
             rows = conn.execute(
-                """
+                f"""
                 SELECT
                     c.chunk_id,
                     c.kb_id,
@@ -343,14 +605,14 @@ class Bm25Service:
                     c.chunk_index,
                     c.content,
                     c.tokenized,
-                    bm25(rag_bm25_fts) AS bm25_score
-                FROM rag_bm25_fts
-                JOIN rag_bm25_chunks c ON c.chunk_id = rag_bm25_fts.chunk_id
-                WHERE rag_bm25_fts.tokenized MATCH ? AND c.kb_id = ?
+                    bm25({table}) AS bm25_score
+                FROM {table}
+                JOIN rag_bm25_chunks c ON c.id = {table}.rowid
+                WHERE {table}.tokenized MATCH ?
                 ORDER BY bm25_score ASC
                 LIMIT ?
                 """,
-                (match_expr, kb_id, fetch_k),
+                (match_expr, fetch_k),
             ).fetchall()
 
         if not rows:
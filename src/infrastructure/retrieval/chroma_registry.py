@@ -0,0 +1,190 @@
+"""
+Process-wide registry of Chroma clients and collection handles.
+
+Building a ``langchain_chroma.Chroma`` per search, upsert or delete starts a
+``PersistentClient`` and re-resolves the collection every time. Instead:
+
+- one ``PersistentClient`` is kept per resolved ``persist_directory``
+- one ``Chroma`` handle is kept per ``(persist_directory, collection,
+  embedding instance)``, in a bounded LRU. Embedding instances are cached by
+  model and config fingerprint in ``embedding_service``, so the instance
+  identity stands in for the embedding fingerprint
+- handles of a dropped collection are evicted, all handles are dropped when
+  the embedding instances are invalidated (so replaced models are released),
+  and everything is released by :func:`close_chroma_clients` on shutdown
+
+Every collection uses the cosine space, so the registry also owns the
+distance-to-relevance mapping used by precomputed-vector searches.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+from collections.abc import Sequence
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_COLLECTION_HANDLES = 64
+_COLLECTION_METADATA = {"hnsw:space": "cosine"}
+
+
+def cosine_relevance_score(distance: float) -> float:
+    """Map a cosine distance to the relevance score reported by text-query search."""
+    return 1.0 - distance
+
+
+def search_by_vector_with_relevance(
+    vectorstore: Any,
+    embedding: Sequence[float],
+    *,
+    k: int,
+    filter: dict[str, Any] | None = None,
+) -> list[tuple[Any, float]]:
+    """Search a registry handle by vector and return ``(document, relevance)`` pairs.
+
+    ``similarity_search_by_vector_with_relevance_scores`` reports raw
+    distances; they are normalized the same way as
+    ``similarity_search_with_relevance_scores`` so thresholds stay comparable.
+    """
+    kwargs: dict[str, Any] = {"k": k}
+    if filter is not None:
+        kwargs["filter"] = filter
+    return [
+        (doc, cosine_relevance_score(distance))
+        for doc, distance in vectorstore.similarity_search_by_vector_with_relevance_scores(
+            list(embedding), **kwargs
+        )
+    ]
+
+
+class ChromaRegistry:
+    """Thread-safe cache of Chroma clients and collection handles."""
+
+    def __init__(self, max_handles: int = DEFAULT_MAX_COLLECTION_HANDLES):
+        self.max_handles = max(1, int(max_handles))
+        self._clients: dict[str, Any] = {}
+        # Values keep the embedding instance alive so its id() stays unique.
+        self._handles: OrderedDict[tuple[str, str, int], tuple[Any, Any]] = OrderedDict()
+        self._lock = Lock()
+        self.clients_created = 0
+        self.handles_created = 0
+        self.hits = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _path_key(persist_dir: Path | str) -> str:
+        return str(Path(persist_dir).resolve())
+
+    def get_client(self, persist_dir: Path | str) -> Any:
+        """Return the shared ``PersistentClient`` for a persist directory."""
+        key = self._path_key(persist_dir)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                import chromadb
+
+                client = chromadb.PersistentClient(path=key)
+                self._clients[key] = client
+                self.clients_created += 1
+            return client
+
+    def get_vectorstore(
+        self, persist_dir: Path | str, collection_name: str, embedding_fn: Any
+    ) -> Any:
+        """Return a cached ``Chroma`` handle, creating the collection if missing."""
+        key = (self._path_key(persist_dir), collection_name, id(embedding_fn))
+        with self._lock:
+            entry = self._handles.get(key)
+            if entry is not None and entry[0] is embedding_fn:
+                self._handles.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        client = self.get_client(persist_dir)
+        from langchain_chroma import Chroma
+
+        with self._lock:
+            entry = self._handles.get(key)
+            if entry is not None and entry[0] is embedding_fn:
+                self.hits += 1
+                return entry[1]
+            vectorstore = Chroma(
+                client=client,
+                collection_name=collection_name,
+                embedding_function=embedding_fn,
+                collection_metadata=dict(_COLLECTION_METADATA),
+                relevance_score_fn=cosine_relevance_score,
+            )
+            self._handles[key] = (embedding_fn, vectorstore)
+            self.handles_created += 1
+            while len(self._handles) > self.max_handles:
+                self._handles.popitem(last=False)
+                self.evictions += 1
+            return vectorstore
+
+    def evict_collection(self, persist_dir: Path | str, collection_name: str) -> None:
+        """Forget handles of a collection that was deleted or recreated."""
+        path_key = self._path_key(persist_dir)
+        with self._lock:
+            stale = [
+                key for key in self._handles if key[0] == path_key and key[1] == collection_name
+            ]
+            for key in stale:
+                del self._handles[key]
+
+    def evict_handles(self) -> None:
+        """Forget every collection handle, keeping the clients open.
+
+        Called when embedding instances are invalidated so stale handles do
+        not keep replaced embedding models alive.
+        """
+        with self._lock:
+            self._handles.clear()
+
+    def close(self) -> None:
+        """Drop all handles and stop the cached clients."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._handles.clear()
+        for client in clients:
+            try:
+                close = getattr(client, "close", None)
+                if callable(close):
+                    close()
+                else:
+                    # Older chromadb releases only expose the system stop hook.
+                    system = getattr(client, "_system", None)
+                    if system is not None:
+                        system.stop()
+            except Exception as e:
+                logger.warning("Failed to close Chroma client: %s", e)
+
+    def stats(self) -> dict[str, int]:
+        """Return client/handle counts and handle reuse counters."""
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "handles": len(self._handles),
+                "clients_created": self.clients_created,
+                "handles_created": self.handles_created,
+                "hits": self.hits,
+                "evictions": self.evictions,
+            }
+
+
+_chroma_registry = ChromaRegistry()
+
+
+def get_chroma_registry() -> ChromaRegistry:
+    """Return the process-wide Chroma registry."""
+    return _chroma_registry
+
+
+def close_chroma_clients() -> None:
+    """Release all cached Chroma clients (application shutdown, tests)."""
+    _chroma_registry.close()
@@ -3,11 +3,19 @@ Embedding Service
 
 Provides abstraction over API-based and local embedding models.
 Uses LangChain Embeddings interface.
+
+Embedding instances are cached process-wide, keyed by the model identity and
+a fingerprint of the embedding config, so local models are loaded from disk
+once and API embeddings share one pooled HTTP client.
 """
 
+import hashlib
 import importlib
+import json
 import logging
 import math
+import time
+from collections.abc import Callable, Sequence
 from pathlib import Path
 from threading import Lock
 from typing import Any
@@ -18,6 +26,9 @@ from src.core.paths import repo_root
 from src.infrastructure.config.model_config_service import ModelConfigService
 from src.infrastructure.config.rag_config_service import RagConfigService
 
+from .chroma_registry import get_chroma_registry
+from .query_embedding_cache import get_query_embedding_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -161,23 +172,179 @@ class LlamaCppEmbeddings:
         return self._embed_single(text or "")
 
 
+class EmbeddingInstanceCache:
+    """Process-wide cache of constructed embedding instances."""
+
+    def __init__(self):
+        self._instances: dict[tuple[str, str], Any] = {}
+        self._lock = Lock()
+        # Serializes construction so concurrent cold requests load a model once.
+        self._build_lock = Lock()
+        self.hits = 0
+        self.created = 0
+        self.invalidations = 0
+        self.load_seconds = 0.0
+        self.last_load_ms = 0.0
+
+    def get_or_create(self, key: tuple[str, str], factory: Callable[[], Any]) -> Any:
+        with self._lock:
+            instance = self._instances.get(key)
+            if instance is not None:
+                self.hits += 1
+                return instance
+        with self._build_lock:
+            with self._lock:
+                instance = self._instances.get(key)
+                if instance is not None:
+                    self.hits += 1
+                    return instance
+            started = time.perf_counter()
+            instance = factory()
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._instances[key] = instance
+                self.created += 1
+                self.load_seconds += elapsed
+                self.last_load_ms = elapsed * 1000
+            logger.info("Embedding model %s ready in %.1f ms", key[0], elapsed * 1000)
+            return instance
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._instances.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return instance counts and cumulative model construction time."""
+        with self._lock:
+            return {
+                "instances": len(self._instances),
+                "hits": self.hits,
+                "created": self.created,
+                "invalidations": self.invalidations,
+                "load_ms": round(self.load_seconds * 1000, 2),
+                "last_load_ms": round(self.last_load_ms, 2),
+            }
+
+
+_embedding_instance_cache = EmbeddingInstanceCache()
+_http_clients: tuple[Any, Any] | None = None
+_http_clients_lock = Lock()
+
+
+def get_embedding_instance_cache() -> EmbeddingInstanceCache:
+    """Return the process-wide embedding instance cache."""
+    return _embedding_instance_cache
+
+
+def invalidate_embedding_instances() -> None:
+    """Drop cached embedding instances, query vectors and the Chroma handles bound to them."""
+    from src.infrastructure.knowledge.embedding_batcher import clear_embedding_batchers
+
+    _embedding_instance_cache.invalidate()
+    get_query_embedding_cache().clear()
+    clear_embedding_batchers()
+    get_chroma_registry().evict_handles()
+
+
+def _shared_http_clients() -> tuple[Any, Any]:
+    """Sync/async HTTP clients shared by every API embedding instance."""
+    global _http_clients
+    with _http_clients_lock:
+        if _http_clients is None:
+            import httpx
+
+            limits = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+            _http_clients = (httpx.Client(limits=limits), httpx.AsyncClient(limits=limits))
+        return _http_clients
+
+
+async def close_embedding_http_clients() -> None:
+    """Close the shared HTTP clients (application shutdown)."""
+    global _http_clients
+    with _http_clients_lock:
+        clients, _http_clients = _http_clients, None
+    if clients is not None:
+        clients[0].close()
+        await clients[1].aclose()
+
+
 class EmbeddingService:
     """Service for creating embedding functions based on RAG config"""
 
-    def __init__(self):
-        self.rag_config_service = RagConfigService()
-        self.model_config_service = ModelConfigService()
+    def __init__(
+        self,
+        rag_config_service: RagConfigService | None = None,
+        model_config_service: ModelConfigService | None = None,
+    ):
+        self.rag_config_service = rag_config_service or RagConfigService()
+        self._model_config_service = model_config_service
+
+    @property
+    def model_config_service(self) -> ModelConfigService:
+        # Only API embeddings without a dedicated base URL need provider config.
+        if self._model_config_service is None:
+            self._model_config_service = ModelConfigService()
+        return self._model_config_service
+
+    def _config_fingerprint(self, override_model: str | None = None) -> str:
+        config = self.rag_config_service.config.embedding
+        api_key = str(config.api_key or "")
+        payload: dict[str, Any] = {
+            "provider": config.provider,
+            "model": override_model or "",
+            "batch_size": config.batch_size,
+            "local_device": config.local_device,
+            "gguf": [
+                config.local_gguf_n_ctx,
+                config.local_gguf_n_threads,
+                config.local_gguf_n_gpu_layers,
+            ],
+        }
+        if config.provider == "api" and not config.api_base_url:
+            # Credentials fall back to the LLM provider, which is edited elsewhere.
+            model_id = override_model or config.api_model
+            provider_id = model_id.split(":", 1)[0] if ":" in model_id else "deepseek"
+            if not api_key:
+                api_key = self.model_config_service.get_api_key_sync(provider_id) or ""
+            payload["provider_base_url"] = self._get_provider_base_url_sync(provider_id) or ""
+        payload["api_key"] = hashlib.sha1(api_key.encode("utf-8")).hexdigest()
+        return hashlib.sha1(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
 
     def get_embedding_function(self, override_model: str | None = None):
         """
         Get the appropriate embedding function based on config.
 
+        Instances are cached per model and config fingerprint; see
+        :func:`invalidate_embedding_instances`.
+
         Args:
             override_model: Optional model override (plain model name or provider:model format)
 
         Returns:
             LangChain Embeddings instance
         """
+        key = (
+            self.embedding_model_key(override_model),
+            self._config_fingerprint(override_model),
+        )
+        return _embedding_instance_cache.get_or_create(
+            key, lambda: self._create_embedding_function(override_model)
+        )
+
+    def warm_up(self) -> float:
+        """Construct (and for local models, load) the configured embedding model.
+
+        Returns the elapsed seconds. API embeddings are only constructed, so no
+        request is sent to the provider.
+        """
+        started = time.perf_counter()
+        embedding_fn = self.get_embedding_function()
+        if self.rag_config_service.config.embedding.provider in {"local", "local_gguf"}:
+            embedding_fn.embed_query("warm up")
+        return time.perf_counter() - started
+
+    def _create_embedding_function(self, override_model: str | None = None):
         config = self.rag_config_service.config.embedding
 
         if config.provider == "local":
@@ -196,15 +363,45 @@ class EmbeddingService:
                 model, config.api_base_url, config.api_key, config.batch_size
             )
 
+    def embedding_model_key(self, override_model: str | None = None) -> str:
+        """Identity of the model ``get_embedding_function`` would return (cache key)."""
+        config = self.rag_config_service.config.embedding
+        if config.provider == "local":
+            return f"local:{config.local_model}"
+        if config.provider == "local_gguf":
+            return (
+                f"local_gguf:{config.local_gguf_model_path}:normalize={config.local_gguf_normalize}"
+            )
+        model = override_model or config.api_model
+        return f"api:{config.api_base_url}:{model}"
+
+    def embed_queries(
+        self, texts: Sequence[str], override_model: str | None = None
+    ) -> list[list[float]]:
+        """Embed query texts through the shared query-embedding cache."""
+        return get_query_embedding_cache().embed(
+            self.embedding_model_key(override_model),
+            texts,
+            lambda: self.get_embedding_function(override_model),
+        )
+
+    async def aembed_queries(
+        self, texts: Sequence[str], override_model: str | None = None
+    ) -> list[list[float]]:
+        """Async :meth:`embed_queries`; uncached texts are embedded off the event loop."""
+        return await get_query_embedding_cache().aembed(
+            self.embedding_model_key(override_model),
+            texts,
+            lambda: self.get_embedding_function(override_model),
+        )
+
     def _get_provider_base_url_sync(self, provider_id: str) -> str | None:
-        """Read provider base_url from the aggregated split model/provider config."""
+        """Read provider base_url from the compiled model/provider config snapshot."""
         try:
-            data = self.model_config_service._load_split_config()
-            for provider in data.get("providers", []):
-                if provider.get("id") == provider_id:
-                    base_url = provider.get("base_url")
-                    if isinstance(base_url, str):
-                        return base_url
+            snapshot = self.model_config_service.get_config_snapshot()
+            provider = snapshot.providers_by_id.get(provider_id)
+            if provider is not None and isinstance(provider.base_url, str):
+                return provider.base_url
         except Exception as e:
             logger.warning(f"Failed to read provider base_url for {provider_id}: {e}")
         return None
@@ -243,6 +440,9 @@ class EmbeddingService:
             }
             if batch_size is not None:
                 direct_kwargs["chunk_size"] = int(batch_size)
+            direct_kwargs["http_client"], direct_kwargs["http_async_client"] = (
+                _shared_http_clients()
+            )
             return OpenAIEmbeddings(**direct_kwargs)
 
         # Fall back: resolve from LLM provider config using provider:model format
@@ -280,6 +480,9 @@ class EmbeddingService:
 
         if batch_size is not None:
             resolved_kwargs["chunk_size"] = int(batch_size)
+        resolved_kwargs["http_client"], resolved_kwargs["http_async_client"] = (
+            _shared_http_clients()
+        )
         return OpenAIEmbeddings(**resolved_kwargs)
 
     def _get_local_embeddings(self, model_name: str, device: str = "cpu"):
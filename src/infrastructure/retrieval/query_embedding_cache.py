@@ -0,0 +1,148 @@
+"""
+Process-wide LRU cache of query embeddings.
+
+The same user message is embedded by RAG retrieval (once per KB and query
+variant), by memory search (global and assistant scopes) and again by the
+RAG tools within a turn. Vectors are cached by ``(model_key, normalized
+text)`` so each distinct text is embedded once per model until evicted.
+
+Misses are embedded together in one ``embed_documents`` call. The embedding
+backends created by ``EmbeddingService`` embed queries and documents the
+same way, so the batched vectors match ``embed_query``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from threading import Lock
+from typing import Any
+
+DEFAULT_QUERY_EMBEDDING_CACHE_SIZE = 4096
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query_text(text: str) -> str:
+    """Collapse whitespace; case is kept because embeddings are case-sensitive."""
+    return _WHITESPACE_RE.sub(" ", str(text or "")).strip()
+
+
+class QueryEmbeddingCache:
+    """Entry-capped LRU of ``(model_key, text) -> vector``."""
+
+    def __init__(self, max_entries: int = DEFAULT_QUERY_EMBEDDING_CACHE_SIZE):
+        self.max_entries = max(0, int(max_entries))
+        # float32 arrays keep a 1536-dim vector at ~6 KB instead of ~48 KB.
+        self._entries: OrderedDict[tuple[str, str], array] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.batches = 0
+
+    def _lookup(self, model_key: str, texts: Sequence[str]) -> dict[str, list[float]]:
+        found: dict[str, list[float]] = {}
+        with self._lock:
+            for text in texts:
+                entry = self._entries.get((model_key, text))
+                if entry is None:
+                    continue
+                self._entries.move_to_end((model_key, text))
+                found[text] = entry.tolist()
+        return found
+
+    def _store(self, model_key: str, vectors: dict[str, list[float]]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            for text, vector in vectors.items():
+                self._entries[(model_key, text)] = array("f", vector)
+                self._entries.move_to_end((model_key, text))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def embed(
+        self, model_key: str, texts: Sequence[str], load_embedding_fn: Callable[[], Any]
+    ) -> list[list[float]]:
+        """Return one vector per text, embedding all uncached texts in one batch.
+
+        ``load_embedding_fn`` is only called on a miss, so fully cached lookups
+        never construct (or load) the embedding model.
+        """
+        normalized = [normalize_query_text(text) for text in texts]
+        distinct = list(dict.fromkeys(normalized))
+        found = self._lookup(model_key, distinct)
+        missing = [text for text in distinct if text not in found]
+        with self._lock:
+            # Repeats of a text within one call are served by its single embedding.
+            self.misses += len(missing)
+            self.hits += len(normalized) - len(missing)
+
+        if missing:
+            embedding_fn = load_embedding_fn()
+            if hasattr(embedding_fn, "embed_documents"):
+                raw_vectors = embedding_fn.embed_documents(missing)
+            else:
+                raw_vectors = [embedding_fn.embed_query(text) for text in missing]
+            if len(raw_vectors) != len(missing):
+                raise ValueError(
+                    f"Embedding count mismatch: expected {len(missing)}, got {len(raw_vectors)}"
+                )
+            computed = {
+                text: [float(value) for value in vector]
+                for text, vector in zip(missing, raw_vectors, strict=True)
+            }
+            with self._lock:
+                self.batches += 1
+            self._store(model_key, computed)
+            found.update(computed)
+
+        return [found[text] for text in normalized]
+
+    async def aembed(
+        self, model_key: str, texts: Sequence[str], load_embedding_fn: Callable[[], Any]
+    ) -> list[list[float]]:
+        """Like :meth:`embed`, but misses are embedded in a worker thread."""
+        distinct = list(dict.fromkeys(normalize_query_text(text) for text in texts))
+        if len(self._lookup(model_key, distinct)) == len(distinct):
+            # Fully cached: no embedding call, so stay on the event loop.
+            return self.embed(model_key, texts, load_embedding_fn)
+        return await asyncio.to_thread(self.embed, model_key, texts, load_embedding_fn)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and the current entry count."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "batches": self.batches,
+            }
+
+
+_shared_query_embedding_cache: QueryEmbeddingCache | None = None
+_shared_query_embedding_cache_lock = Lock()
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """Return the process-wide query-embedding cache."""
+    global _shared_query_embedding_cache
+    with _shared_query_embedding_cache_lock:
+        if _shared_query_embedding_cache is None:
+            from src.core.config import settings
+
+            _shared_query_embedding_cache = QueryEmbeddingCache(
+                max_entries=settings.query_embedding_cache_size
+            )
+        return _shared_query_embedding_cache
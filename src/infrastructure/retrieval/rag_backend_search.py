@@ -51,6 +51,7 @@ class RagBackendSearch:
             top_k=top_k,
             score_threshold=score_threshold,
             override_model=override_model,
+            query_embedding=query_embedding,
         )
 
     def search_collection_chroma(
@@ -60,8 +61,12 @@ class RagBackendSearch:
         top_k: int,
         score_threshold: float,
         override_model: str | None = None,
+        query_embedding: Sequence[float] | None = None,
     ) -> list[Any]:
-        from langchain_chroma import Chroma
+        from src.infrastructure.retrieval.chroma_registry import (
+            get_chroma_registry,
+            search_by_vector_with_relevance,
+        )
 
         persist_dir = Path(self.owner.rag_config_service.config.storage.persist_directory)
         if not persist_dir.is_absolute():
@@ -73,11 +78,8 @@ class RagBackendSearch:
         )
 
         try:
-            vectorstore = Chroma(
-                collection_name=collection_name,
-                embedding_function=embedding_fn,
-                persist_directory=str(persist_dir),
-                collection_metadata={"hnsw:space": "cosine"},
+            vectorstore = get_chroma_registry().get_vectorstore(
+                persist_dir, collection_name, embedding_fn
             )
             try:
                 collection_count = vectorstore._collection.count()
@@ -95,8 +97,12 @@ class RagBackendSearch:
                     str(persist_dir),
                     override_model,
                 )
-            results_with_scores = vectorstore.similarity_search_with_relevance_scores(
-                query, k=top_k
+            if query_embedding is None:
+                query_embedding = self.owner.embedding_service.embed_queries(
+                    [query], override_model
+                )[0]
+            results_with_scores = search_by_vector_with_relevance(
+                vectorstore, query_embedding, k=top_k
             )
         except Exception as e:
             logger.warning("ChromaDB search failed for collection %s: %s", collection_name, e)
@@ -144,16 +150,12 @@ class RagBackendSearch:
 
         try:
             if query_embedding is None:
-                embedding_fn = self.owner.embedding_service.get_embedding_function(override_model)
-                if not hasattr(embedding_fn, "embed_query"):
-                    logger.warning(
-                        "sqlite_vec search failed for kb=%s: embedding function lacks embed_query()",
-                        kb_id,
-                    )
-                    return []
-                query_embedding = embedding_fn.embed_query(query)
+                query_embedding = self.owner.embedding_service.embed_queries(
+                    [query], override_model
+                )[0]
             if query_embedding is None:
                 return []
+            storage_config = self.owner.rag_config_service.config.storage
             sqlite_vec = SqliteVecService()
             rows = cast(
                 list[dict[str, Any]],
@@ -161,6 +163,9 @@ class RagBackendSearch:
                     kb_id=kb_id,
                     query_embedding=query_embedding,
                     top_k=top_k,
+                    vector_index=getattr(storage_config, "vector_index", None),
+                    nprobe=getattr(storage_config, "vector_ivf_nprobe", None),
+                    quantization=getattr(storage_config, "vector_quantization", None),
                 ),
             )
         except Exception as e:
@@ -6,9 +6,11 @@ result merging, and context formatting.
 """
 
 import asyncio
+import json
 import logging
+import time
 from collections.abc import Sequence
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from typing import Any, cast
 
 from .rag_backend_search import RagBackendSearch
@@ -78,7 +80,9 @@ class RagService:
         )
 
         self.rag_config_service = rag_config_service or RagConfigService()
-        self.embedding_service = embedding_service or EmbeddingService()
+        self.embedding_service = embedding_service or EmbeddingService(
+            rag_config_service=self.rag_config_service
+        )
         self.rerank_service = rerank_service or RerankService()
         self.bm25_service = bm25_service or Bm25Service()
         self.query_transform_service = query_transform_service or QueryTransformService()
@@ -402,6 +406,7 @@ class RagService:
         bm25_recall_k: int,
         bm25_min_term_coverage: float,
         effective_threshold: float,
+        embedding_timings: dict[str, float] | None = None,
     ) -> tuple[list[RagResult], list[RagResult], int]:
         from src.infrastructure.knowledge.knowledge_base_service import KnowledgeBaseService
 
@@ -435,7 +440,7 @@ class RagService:
             enabled_kbs=enabled_kbs,
             retrieval_queries=retrieval_queries,
             retrieval_mode=retrieval_mode,
-            vector_backend=vector_backend,
+            timings=embedding_timings,
         )
         kb_retrieval_tasks = [
             self._retrieve_single_kb(
@@ -472,16 +477,24 @@ class RagService:
         enabled_kbs: list[tuple[str, Any]],
         retrieval_queries: list[str],
         retrieval_mode: str,
-        vector_backend: str,
+        timings: dict[str, float] | None = None,
     ) -> dict[tuple[str, str], Sequence[float]]:
+        """Embed every retrieval query once per distinct KB embedding model.
+
+        Vectors come from the process-wide query-embedding cache; uncached
+        queries of a model are embedded in one batch off the event loop.
+        ``timings`` receives the embedding wall time and the part of it spent
+        constructing/loading embedding models (non-zero on a cold start).
+        """
+        from src.infrastructure.retrieval.embedding_service import get_embedding_instance_cache
+
         query_embedding_cache: dict[tuple[str, str], Sequence[float]] = {}
-        if not (
-            enabled_kbs
-            and retrieval_mode in {"vector", "hybrid"}
-            and vector_backend == "sqlite_vec"
-        ):
+        if not (enabled_kbs and retrieval_queries and retrieval_mode in {"vector", "hybrid"}):
             return query_embedding_cache
 
+        instance_stats = get_embedding_instance_cache().stats()
+        started = time.perf_counter()
+
         model_cache_targets: dict[str, str | None] = {}
         for _, kb in enabled_kbs:
             override_model = getattr(kb, "embedding_model", None)
@@ -489,26 +502,25 @@ class RagService:
             if cache_key not in model_cache_targets:
                 model_cache_targets[cache_key] = override_model
 
-        for retrieval_query in retrieval_queries:
-            for cache_key, override_model in model_cache_targets.items():
-                try:
-                    embedding_fn = self.embedding_service.get_embedding_function(override_model)
-                    if not hasattr(embedding_fn, "embed_query"):
-                        logger.warning(
-                            "sqlite_vec cache skipped for model=%s: embed_query() unavailable",
-                            override_model or "default",
-                        )
-                        continue
-                    query_embedding_cache[(retrieval_query, cache_key)] = embedding_fn.embed_query(
-                        retrieval_query
-                    )
-                except Exception as e:
-                    logger.warning(
-                        "sqlite_vec cache embed failed for model=%s query='%s': %s",
-                        override_model or "default",
-                        retrieval_query,
-                        e,
-                    )
+        for cache_key, override_model in model_cache_targets.items():
+            try:
+                vectors = await self.embedding_service.aembed_queries(
+                    retrieval_queries, override_model
+                )
+            except Exception as e:
+                logger.warning(
+                    "Query embedding failed for model=%s: %s", override_model or "default", e
+                )
+                continue
+            for retrieval_query, vector in zip(retrieval_queries, vectors, strict=True):
+                query_embedding_cache[(retrieval_query, cache_key)] = vector
+
+        if timings is not None:
+            loaded_stats = get_embedding_instance_cache().stats()
+            timings["query_embedding_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            timings["embedding_model_load_ms"] = round(
+                max(0.0, loaded_stats["load_ms"] - instance_stats["load_ms"]), 2
+            )
         return query_embedding_cache
 
     async def _retrieve_single_kb(
@@ -586,13 +598,12 @@ class RagService:
                 "score_threshold": effective_threshold,
                 "override_model": kb.embedding_model,
             }
-            if vector_backend == "sqlite_vec":
-                cache_key = (
-                    str(kb.embedding_model).strip() if kb.embedding_model else ""
-                ) or "__default__"
-                cached_embedding = query_embedding_cache.get((retrieval_query, cache_key))
-                if cached_embedding is not None:
-                    vector_kwargs["query_embedding"] = cached_embedding
+            cache_key = (
+                str(kb.embedding_model).strip() if kb.embedding_model else ""
+            ) or "__default__"
+            cached_embedding = query_embedding_cache.get((retrieval_query, cache_key))
+            if cached_embedding is not None:
+                vector_kwargs["query_embedding"] = cached_embedding
             channel_jobs.append(
                 ("vector", asyncio.to_thread(self._search_collection, **vector_kwargs))
             )
@@ -1134,6 +1145,10 @@ class RagService:
             "rerank_applied": rerank_applied,
             "rerank_weight": rerank_weight,
             "rerank_model": rerank_model,
+            "query_embedding_ms": float(diagnostics.get("query_embedding_ms", 0.0) or 0.0),
+            "embedding_model_load_ms": float(
+                diagnostics.get("embedding_model_load_ms", 0.0) or 0.0
+            ),
             "tool_search_count": int(diagnostics.get("tool_search_count", 0) or 0),
             "tool_search_unique_count": int(diagnostics.get("tool_search_unique_count", 0) or 0),
             "tool_search_duplicate_count": int(
@@ -1198,6 +1213,27 @@ class RagService:
         )
         return ranked, True
 
+    def retrieval_config_key(self, runtime_model_id: str | None = None) -> tuple[str, str]:
+        """
+        Fingerprint of the settings that shape retrieval besides query and KBs.
+
+        The runtime model only counts when query rewriting or planning resolves
+        its model as ``auto`` from it.
+        """
+        config = self.rag_config_service.config
+        retrieval = config.retrieval
+        auto_model_stages = (
+            ("query_transform_enabled", "query_transform_model_id"),
+            ("retrieval_query_planner_enabled", "retrieval_query_planner_model_id"),
+        )
+        uses_runtime_model = any(
+            bool(getattr(retrieval, enabled_attr, False))
+            and str(getattr(retrieval, model_attr, "auto") or "auto").strip().lower() == "auto"
+            for enabled_attr, model_attr in auto_model_stages
+        )
+        fingerprint = json.dumps(asdict(config), sort_keys=True, default=str)
+        return fingerprint, str(runtime_model_id or "") if uses_runtime_model else ""
+
     async def retrieve(
         self,
         query: str,
@@ -1515,6 +1551,7 @@ class RagService:
             config.storage.persist_directory,
         )
 
+        embedding_timings: dict[str, float] = {}
         vector_results, bm25_results, searched_kb_count = await self._retrieve_enabled_kbs(
             kb_ids=kb_ids,
             retrieval_queries=retrieval_queries,
@@ -1524,6 +1561,7 @@ class RagService:
             bm25_recall_k=bm25_recall_k,
             bm25_min_term_coverage=bm25_min_term_coverage,
             effective_threshold=float(effective_threshold),
+            embedding_timings=embedding_timings,
         )
 
         vector_results.sort(key=lambda r: r.score, reverse=True)
@@ -1629,6 +1667,7 @@ class RagService:
             rerank_model=rerank_model,
             rerank_weight=rerank_weight,
         )
+        diagnostics.update(embedding_timings)
 
         final_results = reordered_results
         final_diagnostics = diagnostics
@@ -1682,13 +1721,16 @@ class RagService:
             if query_embedding is not None:
                 sqlite_kwargs["query_embedding"] = query_embedding
             return self._search_collection_sqlite_vec(**sqlite_kwargs)
-        return self._search_collection_chroma(
-            kb_id=kb_id,
-            query=query,
-            top_k=top_k,
-            score_threshold=score_threshold,
-            override_model=override_model,
-        )
+        chroma_kwargs: dict[str, Any] = {
+            "kb_id": kb_id,
+            "query": query,
+            "top_k": top_k,
+            "score_threshold": score_threshold,
+            "override_model": override_model,
+        }
+        if query_embedding is not None:
+            chroma_kwargs["query_embedding"] = query_embedding
+        return self._search_collection_chroma(**chroma_kwargs)
 
     def _search_collection_chroma(
         self,
@@ -1697,6 +1739,7 @@ class RagService:
         top_k: int,
         score_threshold: float,
         override_model: str | None = None,
+        query_embedding: Sequence[float] | None = None,
     ) -> list[RagResult]:
         return cast(
             list[RagResult],
@@ -1706,6 +1749,7 @@ class RagService:
                 top_k,
                 score_threshold,
                 override_model=override_model,
+                query_embedding=query_embedding,
             ),
         )
 
@@ -0,0 +1,208 @@
+"""
+Pooled SQLite connections for the retrieval stores.
+
+Retrieval services are created per request and used from worker threads, so
+opening a fresh connection per call repeats the file open, pragma setup and
+(for sqlite_vec) the extension load on every query. Connections are instead
+kept in one process-wide pool per database file:
+
+- WAL journal, ``synchronous=NORMAL`` and larger page cache / mmap pragmas are
+  applied once when a connection is opened
+- each checked-out connection is used by one thread at a time; idle
+  connections are reused (keeping their prepared-statement cache warm)
+- at most ``max_idle`` connections stay open, extra ones are closed on release
+- callers can record one-time per-connection setup (e.g. a loaded extension)
+  in ``PooledConnection.setup_state``
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_MAX_IDLE = 8
+DEFAULT_CACHE_SIZE_KIB = 16 * 1024
+DEFAULT_MMAP_SIZE_BYTES = 256 * 1024 * 1024
+_STATEMENT_CACHE_SIZE = 256
+_BUSY_TIMEOUT_SECONDS = 30
+
+
+class PooledConnection(sqlite3.Connection):
+    """SQLite connection that remembers per-connection setup done by callers."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.setup_state: dict[str, bool] = {}
+        self.pool_generation = 0
+
+
+class SqliteConnectionPool:
+    """Bounded pool of reusable connections to one SQLite database file."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        *,
+        max_idle: int = DEFAULT_POOL_MAX_IDLE,
+        cache_size_kib: int = DEFAULT_CACHE_SIZE_KIB,
+        mmap_size_bytes: int = DEFAULT_MMAP_SIZE_BYTES,
+    ):
+        self.db_path = Path(db_path)
+        self.max_idle = max(0, int(max_idle))
+        self.cache_size_kib = max(0, int(cache_size_kib))
+        self.mmap_size_bytes = max(0, int(mmap_size_bytes))
+        # Schemas created by owners (by name); cleared when the pool is closed.
+        self.ready_schemas: set[str] = set()
+        self._idle: list[PooledConnection] = []
+        self._lock = Lock()
+        self._in_use = 0
+        self._generation = 0
+        self.opened = 0
+        self.reused = 0
+        self.closed = 0
+        self.peak_in_use = 0
+
+    def _open(self) -> PooledConnection:
+        conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=_BUSY_TIMEOUT_SECONDS,
+            check_same_thread=False,
+            factory=PooledConnection,
+            cached_statements=_STATEMENT_CACHE_SIZE,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.pool_generation = self._generation
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA cache_size=-{self.cache_size_kib}")
+            conn.execute(f"PRAGMA mmap_size={self.mmap_size_bytes}")
+            conn.execute("PRAGMA temp_store=MEMORY")
+        except sqlite3.Error as exc:
+            # Pragmas are tuning only; e.g. WAL is unavailable on some network drives.
+            logger.warning("SQLite pragma setup failed for %s: %s", self.db_path, exc)
+        return conn
+
+    def _check_file(self) -> None:
+        if not self.db_path.exists():
+            # The file was deleted under us; stale connections would keep
+            # writing to the unlinked file.
+            self.close()
+
+    def has_schema(self, name: str) -> bool:
+        """Whether an owner already created schema ``name`` in this database."""
+        self._check_file()
+        with self._lock:
+            return name in self.ready_schemas
+
+    def mark_schema(self, name: str) -> None:
+        with self._lock:
+            self.ready_schemas.add(name)
+
+    def _acquire(self) -> PooledConnection:
+        self._check_file()
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+            self._in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self._in_use)
+            if conn is not None:
+                self.reused += 1
+                return conn
+            self.opened += 1
+        try:
+            return self._open()
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+            raise
+
+    def _release(self, conn: PooledConnection, *, reusable: bool) -> None:
+        with self._lock:
+            self._in_use -= 1
+            current = conn.pool_generation == self._generation
+            if reusable and current and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+            self.closed += 1
+        conn.close()
+
+    @contextmanager
+    def connection(self) -> Iterator[PooledConnection]:
+        """Check out a connection; commit on success, roll back on error."""
+        conn = self._acquire()
+        reusable = True
+        try:
+            yield conn
+            if conn.in_transaction:
+                conn.commit()
+        except BaseException:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                reusable = False
+            raise
+        finally:
+            if conn.in_transaction:
+                reusable = False
+            self._release(conn, reusable=reusable)
+
+    def close(self) -> None:
+        """Close idle connections; checked-out ones close when released."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self.closed += len(idle)
+            self._generation += 1
+            self.ready_schemas.clear()
+        for conn in idle:
+            conn.close()
+
+    def stats(self) -> dict[str, int]:
+        """Connection churn counters: opened vs. reused checkouts."""
+        with self._lock:
+            return {
+                "opened": self.opened,
+                "reused": self.reused,
+                "closed": self.closed,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "peak_in_use": self.peak_in_use,
+                "max_idle": self.max_idle,
+            }
+
+
+_pools: dict[str, SqliteConnectionPool] = {}
+_pools_lock = Lock()
+
+
+def get_sqlite_pool(db_path: Path) -> SqliteConnectionPool:
+    """Return the process-wide pool for a database file."""
+    key = str(Path(db_path).resolve())
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = SqliteConnectionPool(Path(key))
+            _pools[key] = pool
+        return pool
+
+
+def sqlite_pool_stats() -> dict[str, dict[str, int]]:
+    """Churn counters for every pool, keyed by database path."""
+    with _pools_lock:
+        pools = list(_pools.items())
+    return {key: pool.stats() for key, pool in pools}
+
+
+def close_sqlite_pools() -> None:
+    """Close all pooled connections (application shutdown, tests)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
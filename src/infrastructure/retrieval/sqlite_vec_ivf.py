@@ -0,0 +1,88 @@
+"""
+IVF (inverted file) helpers for approximate search in the sqlite_vec backend.
+
+Vectors of a KB are clustered with spherical k-means; each chunk row stores the
+id of its nearest centroid (``ivf_list``). A query is compared with the
+centroids first and only rows in the ``nprobe`` closest lists are scored.
+Raising ``nprobe`` trades latency for recall; probing every list is exact.
+
+All functions take the NumPy module as an argument so callers can keep NumPy
+an optional import.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+# Training samples drawn per list, capped overall to keep training bounded.
+IVF_SAMPLES_PER_LIST = 64
+IVF_MAX_TRAIN_SAMPLES = 65536
+IVF_TRAIN_ITERATIONS = 10
+# Retrain once a KB has grown this many times past its last training size.
+IVF_RETRAIN_GROWTH = 4.0
+_ASSIGN_BATCH_ROWS = 8192
+
+
+def choose_nlist(row_count: int) -> int:
+    """Number of lists for a KB size (about sqrt(N))."""
+    return max(1, int(round(math.sqrt(max(1, row_count)))))
+
+
+def normalize_rows(np: Any, matrix: Any) -> Any:
+    """L2-normalize rows in place; all-zero rows stay zero."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def train_centroids(
+    np: Any,
+    vectors: Any,
+    nlist: int,
+    *,
+    iterations: int = IVF_TRAIN_ITERATIONS,
+    seed: int = 0,
+) -> Any:
+    """Spherical k-means over normalized ``vectors``; returns normalized centroids."""
+    rows = int(vectors.shape[0])
+    nlist = max(1, min(int(nlist), rows))
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(rows, size=nlist, replace=False)].copy()
+
+    for _ in range(max(1, int(iterations))):
+        assignments = assign_lists(np, centroids, vectors)
+        counts = np.bincount(assignments, minlength=nlist)
+        sums = np.zeros_like(centroids)
+        filled = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[filled]
+        ordered = vectors[np.argsort(assignments, kind="stable")]
+        sums[filled] = np.add.reduceat(ordered, starts, axis=0)
+        empty = np.flatnonzero(counts == 0)
+        if empty.size:
+            # Re-seed empty lists with random points so every list stays usable.
+            sums[empty] = vectors[rng.choice(rows, size=empty.size, replace=False)]
+        centroids = normalize_rows(np, sums.astype(np.float32))
+    return centroids
+
+
+def assign_lists(np: Any, centroids: Any, vectors: Any) -> Any:
+    """Return the nearest centroid id (int32) for each row of ``vectors``."""
+    if vectors.shape[0] == 0:
+        return np.zeros(0, dtype=np.int32)
+    parts = []
+    for start in range(0, int(vectors.shape[0]), _ASSIGN_BATCH_ROWS):
+        block = vectors[start : start + _ASSIGN_BATCH_ROWS]
+        parts.append(np.argmax(block @ centroids.T, axis=1).astype(np.int32))
+    return np.concatenate(parts)
+
+
+def probe_lists(np: Any, centroids: Any, query: Any, nprobe: int) -> list[int]:
+    """Ids of the ``nprobe`` lists whose centroids are closest to ``query``."""
+    scores = centroids @ query
+    count = max(1, min(int(nprobe), int(scores.shape[0])))
+    if count >= scores.shape[0]:
+        picked = np.arange(scores.shape[0])
+    else:
+        picked = np.argpartition(-scores, count - 1)[:count]
+    return [int(item) for item in picked]
@@ -0,0 +1,89 @@
+"""
+Quantized embedding codes for first-pass search in the sqlite_vec backend.
+
+Every chunk keeps its float32 vector for exact scoring plus two compact codes:
+
+- ``int8``: the L2-normalized vector scaled by 127 (1 byte per dimension)
+- ``binary``: one sign bit per dimension, packed 8 per byte
+
+A quantized search ranks rows by code similarity, keeps ``top_k * multiplier``
+candidates and rescores only those with the float32 vectors.
+
+Pure-Python encoders are used on the write path; the batch helpers take the
+NumPy module as an argument so callers can keep NumPy an optional import.
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+from collections.abc import Sequence
+from typing import Any
+
+QUANTIZATION_MODES = ("none", "int8", "binary")
+DEFAULT_RESCORE_MULTIPLIER = 4
+_INT8_SCALE = 127.0
+_SCORE_BATCH_ROWS = 65536
+
+
+def normalize_quantization(value: str | None) -> str:
+    mode = str(value or "none").strip().lower()
+    return mode if mode in QUANTIZATION_MODES else "none"
+
+
+def binary_code_size(dim: int) -> int:
+    return (max(0, int(dim)) + 7) // 8
+
+
+def encode_int8(vector: Sequence[float]) -> bytes:
+    """Scalar-quantize a vector after L2 normalization."""
+    if not vector:
+        return b""
+    norm = math.sqrt(sum(float(item) * float(item) for item in vector))
+    scale = _INT8_SCALE / norm if norm > 0 else 0.0
+    codes = [max(-127, min(127, int(round(float(item) * scale)))) for item in vector]
+    return struct.pack(f"<{len(codes)}b", *codes)
+
+
+def encode_binary(vector: Sequence[float]) -> bytes:
+    """Pack sign bits (1 for positive values), most significant bit first."""
+    if not vector:
+        return b""
+    packed = bytearray(binary_code_size(len(vector)))
+    for index, value in enumerate(vector):
+        if float(value) > 0:
+            packed[index >> 3] |= 0x80 >> (index & 7)
+    return bytes(packed)
+
+
+def encode_int8_rows(np: Any, matrix: Any) -> Any:
+    """Batch version of :func:`encode_int8` for a float32 matrix."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    scaled = np.divide(matrix * _INT8_SCALE, norms, out=np.zeros_like(matrix), where=norms > 0)
+    return np.clip(np.rint(scaled), -127, 127).astype(np.int8)
+
+
+def encode_binary_rows(np: Any, matrix: Any) -> Any:
+    """Batch version of :func:`encode_binary` for a float32 matrix."""
+    return np.packbits(matrix > 0, axis=1)
+
+
+def score_int8(np: Any, codes: Any, query: Any) -> Any:
+    """Approximate cosine scores of int8 codes against a normalized float32 query."""
+    scores = np.empty(int(codes.shape[0]), dtype=np.float32)
+    for start in range(0, int(codes.shape[0]), _SCORE_BATCH_ROWS):
+        block = codes[start : start + _SCORE_BATCH_ROWS].astype(np.float32)
+        scores[start : start + len(block)] = block @ query
+    return scores / _INT8_SCALE
+
+
+def score_binary(np: Any, codes: Any, query_code: Any) -> Any:
+    """Negated Hamming distances, so larger is closer like the other scores."""
+    popcount = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+    popcount = popcount.astype(np.int32)
+    scores = np.empty(int(codes.shape[0]), dtype=np.float32)
+    for start in range(0, int(codes.shape[0]), _SCORE_BATCH_ROWS):
+        block = codes[start : start + _SCORE_BATCH_ROWS]
+        distances = popcount[np.bitwise_xor(block, query_code)].sum(axis=1)
+        scores[start : start + len(block)] = -distances.astype(np.float32)
+    return scores
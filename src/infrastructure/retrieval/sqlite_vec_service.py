@@ -2,7 +2,17 @@
 SQLite vector store service for RAG chunks.
 
 This backend stores chunk metadata/content and embedding vectors in SQLite,
-and uses sqlite-vec acceleration when available.
+and uses sqlite-vec acceleration when available. Without the extension, a KB's
+embeddings are scored with NumPy against a cached float32 matrix.
+
+With ``vector_index: ivf`` large KBs get an IVF index (see ``sqlite_vec_ivf``)
+stored in the same database, and searches only score the probed lists. With
+``vector_quantization`` set, a first pass ranks compact int8/binary codes and
+only the best candidates are rescored with float32 vectors.
+
+Chunk embeddings are also kept in a content-addressed store keyed by
+``(embedding model, sha256(chunk text))``, so reprocessing a document only
+embeds chunks whose text changed.
 """
 
 from __future__ import annotations
@@ -13,25 +23,235 @@ import logging
 import math
 import sqlite3
 import struct
-from collections.abc import Sequence
+import time
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
 from threading import Lock
 from typing import Any
 
 from src.core.paths import resolve_user_data_path
 
+from .sqlite_connection_pool import PooledConnection, get_sqlite_pool
+from .sqlite_vec_ivf import (
+    IVF_MAX_TRAIN_SAMPLES,
+    IVF_RETRAIN_GROWTH,
+    IVF_SAMPLES_PER_LIST,
+    assign_lists,
+    choose_nlist,
+    normalize_rows,
+    probe_lists,
+    train_centroids,
+)
+from .sqlite_vec_quantization import (
+    DEFAULT_RESCORE_MULTIPLIER,
+    binary_code_size,
+    encode_binary,
+    encode_int8,
+    normalize_quantization,
+    score_binary,
+    score_int8,
+)
+
 logger = logging.getLogger(__name__)
 
+# Upper bound for cached fallback matrices across all KBs (float32 bytes).
+_MATRIX_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+VECTOR_INDEX_MODES = ("exact", "ivf")
+DEFAULT_IVF_MIN_ROWS = 50000
+DEFAULT_IVF_NPROBE = 16
+_IVF_UPDATE_BATCH_ROWS = 8192
+# Stays below SQLITE_MAX_VARIABLE_NUMBER on old SQLite builds.
+_ROWID_QUERY_BATCH = 500
+_MIGRATION_BATCH_ROWS = 2000
+# Least recently used vectors beyond this are pruned from the embedding store.
+DEFAULT_EMBEDDING_STORE_MAX_ENTRIES = 200000
+
+# Small fixed-size columns come first and content last, so first-pass scans
+# over codes do not have to walk the overflow pages of large rows.
+_CHUNKS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS {table} (
+    chunk_id TEXT PRIMARY KEY,
+    kb_id TEXT NOT NULL,
+    doc_id TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    file_type TEXT NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    embedding_dim INTEGER NOT NULL,
+    ivf_list INTEGER,
+    ingest_id TEXT DEFAULT '',
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    embedding_bit BLOB NOT NULL,
+    embedding_int8 BLOB NOT NULL,
+    embedding_blob BLOB NOT NULL,
+    content TEXT NOT NULL,
+    page_start INTEGER,
+    page_end INTEGER
+)
+"""
+
+_CHUNK_INSERT_COLUMNS = (
+    "chunk_id, kb_id, doc_id, filename, file_type, chunk_index, embedding_dim, ingest_id, "
+    "embedding_bit, embedding_int8, embedding_blob, content, page_start, page_end, ivf_list"
+)
+_CHUNK_INSERT_PLACEHOLDERS = ", ".join("?" for _ in _CHUNK_INSERT_COLUMNS.split(","))
+
+
+def optional_int(value: object) -> int | None:
+    """Coerce stored page metadata to ``int``; anything else becomes ``None``."""
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return None
+    try:
+        return int(value)
+    except (OverflowError, ValueError):
+        return None
+
+
+def _load_numpy() -> Any | None:
+    try:
+        return importlib.import_module("numpy")
+    except ImportError:
+        return None
+
+
+@dataclass
+class _KbMatrix:
+    """Embeddings of one KB for a single dimension and representation.
+
+    ``matrix`` holds L2-normalized float32 rows, or int8 / packed-bit codes for
+    quantized search. Rows are ordered by IVF list (``-1`` for unassigned rows) so a probe only
+    slices the matching ranges.
+    """
+
+    signature: tuple[int, int, int]
+    chunk_ids: list[str]
+    matrix: Any
+    lists: Any
+
+    def probe_rows(self, np: Any, list_ids: Sequence[int]) -> Any:
+        """Row indices of the given lists plus all unassigned rows."""
+        ranges = [(0, int(np.searchsorted(self.lists, 0, side="left")))]
+        for list_id in sorted(set(list_ids)):
+            start = int(np.searchsorted(self.lists, list_id, side="left"))
+            end = int(np.searchsorted(self.lists, list_id, side="right"))
+            ranges.append((start, end))
+        return np.concatenate([np.arange(start, end) for start, end in ranges])
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.matrix.nbytes)
+
+
+class _KbMatrixCache:
+    """Process-wide LRU of fallback matrices keyed by (db_path, kb_id, dim, kind).
+
+    Service instances are created per call site, so the cache lives at module
+    level to be shared and invalidated consistently across them.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, str, int, str], _KbMatrix] = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+
+    def get(
+        self, key: tuple[str, str, int, str], signature: tuple[int, int, int]
+    ) -> _KbMatrix | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.signature != signature:
+                self._pop_locked(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: tuple[str, str, int, str], entry: _KbMatrix) -> None:
+        with self._lock:
+            self._pop_locked(key)
+            if entry.nbytes > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self._bytes += entry.nbytes
+            while self._bytes > self.max_bytes and self._entries:
+                self._pop_locked(next(iter(self._entries)))
+
+    def invalidate(self, db_path: str, kb_id: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == db_path and key[1] == kb_id]:
+                self._pop_locked(key)
+
+    def _pop_locked(self, key: tuple[str, str, int, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.nbytes
+
+
+_kb_matrix_cache = _KbMatrixCache(_MATRIX_CACHE_MAX_BYTES)
+
+
+class _IvfCentroidCache:
+    """Process-wide centroid matrices keyed by (db_path, kb_id, dim), checked by version."""
+
+    def __init__(self) -> None:
+        self._entries: dict[tuple[str, str, int], tuple[int, Any]] = {}
+        self._lock = Lock()
+
+    def get(self, key: tuple[str, str, int], version: int) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            return entry[1]
+
+    def put(self, key: tuple[str, str, int], version: int, centroids: Any) -> None:
+        with self._lock:
+            self._entries[key] = (version, centroids)
+
+    def invalidate(self, db_path: str, kb_id: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == db_path and key[1] == kb_id]:
+                self._entries.pop(key, None)
+
+
+_ivf_centroid_cache = _IvfCentroidCache()
+
 
 class SqliteVecService:
     """Service for chunk-level vector storage and retrieval in SQLite."""
 
-    def __init__(self, db_path: str | None = None):
+    def __init__(
+        self,
+        db_path: str | None = None,
+        *,
+        vector_index: str | None = None,
+        ivf_min_rows: int | None = None,
+        ivf_nprobe: int | None = None,
+        quantization: str | None = None,
+        rescore_multiplier: int | None = None,
+    ):
         if db_path is None:
             from src.infrastructure.config.rag_config_service import RagConfigService
 
             cfg = RagConfigService().config.storage
             db_path = str(getattr(cfg, "vector_sqlite_path", "data/state/rag_vec.sqlite3"))
+            if vector_index is None:
+                vector_index = str(getattr(cfg, "vector_index", "exact"))
+            if ivf_min_rows is None:
+                ivf_min_rows = int(getattr(cfg, "vector_ivf_min_rows", DEFAULT_IVF_MIN_ROWS))
+            if ivf_nprobe is None:
+                ivf_nprobe = int(getattr(cfg, "vector_ivf_nprobe", DEFAULT_IVF_NPROBE))
+            if quantization is None:
+                quantization = str(getattr(cfg, "vector_quantization", "none"))
+            if rescore_multiplier is None:
+                rescore_multiplier = int(
+                    getattr(cfg, "vector_rescore_multiplier", DEFAULT_RESCORE_MULTIPLIER)
+                )
 
         db_path_obj = Path(db_path)
         if not db_path_obj.is_absolute():
@@ -39,16 +259,29 @@ class SqliteVecService:
         db_path_obj.parent.mkdir(parents=True, exist_ok=True)
 
         self.db_path = db_path_obj
+        self.vector_index = self._normalize_index_mode(vector_index)
+        self.ivf_min_rows = max(1, int(ivf_min_rows or DEFAULT_IVF_MIN_ROWS))
+        self.ivf_nprobe = max(1, int(ivf_nprobe or DEFAULT_IVF_NPROBE))
+        self.quantization = normalize_quantization(quantization)
+        self.rescore_multiplier = max(1, int(rescore_multiplier or DEFAULT_RESCORE_MULTIPLIER))
         self._lock = Lock()
         self._sqlite_vec_available = True
-        self._ensure_schema()
+        self._pool = get_sqlite_pool(self.db_path)
+        if not self._pool.has_schema("sqlite_vec") and self._ensure_schema():
+            self._pool.mark_schema("sqlite_vec")
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        if self._sqlite_vec_available:
-            self._try_load_sqlite_vec(conn)
-        return conn
+    @contextmanager
+    def _connect(self) -> Iterator[PooledConnection]:
+        """Check out a pooled connection, loading sqlite-vec once per connection."""
+        with self._pool.connection() as conn:
+            if self._sqlite_vec_available:
+                loaded = conn.setup_state.get("sqlite_vec")
+                if loaded is None:
+                    self._try_load_sqlite_vec(conn)
+                    conn.setup_state["sqlite_vec"] = self._sqlite_vec_available
+                elif not loaded:
+                    self._sqlite_vec_available = False
+            yield conn
 
     def _try_load_sqlite_vec(self, conn: sqlite3.Connection) -> None:
         """Best-effort sqlite-vec extension load for SQL-side distance search."""
@@ -67,42 +300,234 @@ class SqliteVecService:
             except Exception:
                 pass
 
-    def _ensure_schema(self) -> None:
+    @staticmethod
+    def _chunk_columns(conn: sqlite3.Connection) -> set[str]:
+        return {
+            str(row["name"]) for row in conn.execute("PRAGMA table_info(rag_vec_chunks)").fetchall()
+        }
+
+    def _ensure_schema(self) -> bool:
+        """Create missing tables and indexes; cheap and idempotent.
+
+        Returns False while the chunks table still has the legacy
+        ``embedding_json`` layout; ``migrate_legacy_storage`` converts it.
+        """
         with self._connect() as conn:
+            existing_cols = self._chunk_columns(conn)
+            if "embedding_json" in existing_cols:
+                logger.warning(
+                    "rag_vec_chunks in %s uses the legacy JSON layout; "
+                    "it is converted by the startup migration",
+                    self.db_path,
+                )
+                return False
+            if existing_cols and "page_start" not in existing_cols:
+                # Page provenance columns; rows written before stay NULL.
+                conn.execute("ALTER TABLE rag_vec_chunks ADD COLUMN page_start INTEGER")
+                conn.execute("ALTER TABLE rag_vec_chunks ADD COLUMN page_end INTEGER")
+                conn.commit()
+            conn.execute(_CHUNKS_TABLE_SQL.format(table="rag_vec_chunks"))
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_rag_vec_kb ON rag_vec_chunks (kb_id)")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_rag_vec_kb_doc ON rag_vec_chunks (kb_id, doc_id)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_rag_vec_kb_dim ON rag_vec_chunks (kb_id, embedding_dim)"
+            )
             conn.execute(
                 """
-                CREATE TABLE IF NOT EXISTS rag_vec_chunks (
-                    chunk_id TEXT PRIMARY KEY,
+                CREATE INDEX IF NOT EXISTS idx_rag_vec_kb_dim_list
+                ON rag_vec_chunks (kb_id, embedding_dim, ivf_list)
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS rag_vec_ivf_meta (
                     kb_id TEXT NOT NULL,
-                    doc_id TEXT NOT NULL,
-                    filename TEXT NOT NULL,
-                    file_type TEXT NOT NULL,
-                    chunk_index INTEGER NOT NULL,
-                    content TEXT NOT NULL,
-                    embedding_json TEXT NOT NULL,
-                    embedding_blob BLOB,
-                    embedding_dim INTEGER,
-                    ingest_id TEXT DEFAULT '',
-                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+                    embedding_dim INTEGER NOT NULL,
+                    nlist INTEGER NOT NULL,
+                    trained_rows INTEGER NOT NULL,
+                    version INTEGER NOT NULL,
+                    trained_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (kb_id, embedding_dim)
                 )
                 """
             )
-            existing_cols = {
-                str(row["name"])
-                for row in conn.execute("PRAGMA table_info(rag_vec_chunks)").fetchall()
-            }
-            if "embedding_blob" not in existing_cols:
-                conn.execute("ALTER TABLE rag_vec_chunks ADD COLUMN embedding_blob BLOB")
-            if "embedding_dim" not in existing_cols:
-                conn.execute("ALTER TABLE rag_vec_chunks ADD COLUMN embedding_dim INTEGER")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_rag_vec_kb ON rag_vec_chunks (kb_id)")
             conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_rag_vec_kb_doc ON rag_vec_chunks (kb_id, doc_id)"
+                """
+                CREATE TABLE IF NOT EXISTS rag_vec_ivf_centroids (
+                    kb_id TEXT NOT NULL,
+                    embedding_dim INTEGER NOT NULL,
+                    list_id INTEGER NOT NULL,
+                    centroid BLOB NOT NULL,
+                    PRIMARY KEY (kb_id, embedding_dim, list_id)
+                )
+                """
             )
             conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_rag_vec_kb_dim ON rag_vec_chunks (kb_id, embedding_dim)"
+                """
+                CREATE TABLE IF NOT EXISTS rag_vec_embedding_store (
+                    model_key TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    embedding_blob BLOB NOT NULL,
+                    last_used_at REAL NOT NULL,
+                    PRIMARY KEY (model_key, content_hash)
+                ) WITHOUT ROWID
+                """
+            )
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_rag_vec_embedding_store_used
+                ON rag_vec_embedding_store (last_used_at)
+                """
             )
             conn.commit()
+        return True
+
+    def migrate_legacy_storage(self) -> int:
+        """Rewrite a chunks table that still stores ``embedding_json``.
+
+        Vectors are taken from the float32 blob (or parsed from JSON for rows
+        that predate it), quantized codes are added, and the redundant JSON
+        column is dropped. Rows are copied in batches that commit on their
+        own, so the write lock is released between batches and an
+        interrupted migration resumes where it stopped. Called once at
+        startup, before the backend serves requests.
+
+        Returns:
+            Number of rows copied by this call (0 when nothing was legacy).
+        """
+        with self._connect() as conn:
+            if "embedding_json" not in self._chunk_columns(conn):
+                return 0
+
+        started = time.perf_counter()
+        copied = 0
+        with self._connect() as conn:
+            last_rowid = self._migration_resume_rowid(conn)
+            while True:
+                rows = conn.execute(
+                    """
+                    SELECT rowid AS source_rowid, * FROM rag_vec_chunks
+                    WHERE rowid > ? ORDER BY rowid ASC LIMIT ?
+                    """,
+                    (last_rowid, _MIGRATION_BATCH_ROWS),
+                ).fetchall()
+                if not rows:
+                    break
+                conn.executemany(
+                    f"""
+                    INSERT OR REPLACE INTO rag_vec_chunks_migrating (
+                        {_CHUNK_INSERT_COLUMNS}, updated_at
+                    ) VALUES ({_CHUNK_INSERT_PLACEHOLDERS}, ?)
+                    """,
+                    [self._migrated_chunk_row(row) for row in rows],
+                )
+                copied += len(rows)
+                last_rowid = int(rows[-1]["source_rowid"])
+                conn.execute("UPDATE rag_vec_migration_progress SET last_rowid = ?", (last_rowid,))
+                conn.commit()
+
+            conn.execute("BEGIN")
+            conn.execute("DROP TABLE rag_vec_chunks")
+            conn.execute("ALTER TABLE rag_vec_chunks_migrating RENAME TO rag_vec_chunks")
+            conn.execute("DROP TABLE rag_vec_migration_progress")
+            conn.commit()
+
+        if self._ensure_schema():
+            self._pool.mark_schema("sqlite_vec")
+        logger.info(
+            "Migrated %s rag_vec_chunks rows to quantized storage in %.2fs "
+            "(run VACUUM to return freed pages to the OS)",
+            copied,
+            time.perf_counter() - started,
+        )
+        return copied
+
+    @staticmethod
+    def _migration_resume_rowid(conn: sqlite3.Connection) -> int:
+        """Prepare the migration tables and return the last legacy rowid already copied."""
+        progress_exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rag_vec_migration_progress'"
+        ).fetchone()
+        if progress_exists:
+            row = conn.execute("SELECT last_rowid FROM rag_vec_migration_progress").fetchone()
+            if row is not None:
+                return int(row["last_rowid"])
+        conn.execute("DROP TABLE IF EXISTS rag_vec_chunks_migrating")
+        conn.execute(_CHUNKS_TABLE_SQL.format(table="rag_vec_chunks_migrating"))
+        conn.execute("DROP TABLE IF EXISTS rag_vec_migration_progress")
+        conn.execute("CREATE TABLE rag_vec_migration_progress (last_rowid INTEGER NOT NULL)")
+        conn.execute("INSERT INTO rag_vec_migration_progress (last_rowid) VALUES (0)")
+        conn.commit()
+        return 0
+
+    def _migrated_chunk_row(self, row: sqlite3.Row) -> tuple[object, ...]:
+        keys = set(row.keys())
+        vector: list[float] = []
+        blob = row["embedding_blob"] if "embedding_blob" in keys else None
+        if isinstance(blob, (bytes, bytearray)):
+            vector = self._unpack_vector_float32(bytes(blob))
+        if not vector:
+            try:
+                vector = self._normalize_vector(json.loads(row["embedding_json"] or "[]"))
+            except Exception:
+                vector = []
+        return (
+            *self._chunk_row_values(
+                chunk_id=str(row["chunk_id"]),
+                kb_id=str(row["kb_id"]),
+                doc_id=str(row["doc_id"]),
+                filename=str(row["filename"]),
+                file_type=str(row["file_type"]),
+                chunk_index=int(row["chunk_index"] or 0),
+                ingest_id=str(row["ingest_id"] or ""),
+                content=str(row["content"] or ""),
+                embedding=vector,
+                page_start=row["page_start"] if "page_start" in keys else None,
+                page_end=row["page_end"] if "page_end" in keys else None,
+            ),
+            row["ivf_list"] if "ivf_list" in keys else None,
+            row["updated_at"],
+        )
+
+    def _chunk_row_values(
+        self,
+        *,
+        chunk_id: str,
+        kb_id: str,
+        doc_id: str,
+        filename: str,
+        file_type: str,
+        chunk_index: int,
+        ingest_id: str,
+        content: str,
+        embedding: list[float],
+        page_start: int | None = None,
+        page_end: int | None = None,
+    ) -> list[object]:
+        """Column values in ``_CHUNK_INSERT_COLUMNS`` order, without ``ivf_list``."""
+        return [
+            chunk_id,
+            kb_id,
+            doc_id,
+            filename,
+            file_type,
+            chunk_index,
+            len(embedding),
+            ingest_id,
+            encode_binary(embedding),
+            encode_int8(embedding),
+            self._pack_vector_float32(embedding),
+            content,
+            page_start,
+            page_end,
+        ]
+
+    @staticmethod
+    def _normalize_index_mode(value: str | None) -> str:
+        mode = str(value or "exact").strip().lower()
+        return mode if mode in VECTOR_INDEX_MODES else "exact"
 
     @staticmethod
     def _normalize_vector(vector: Sequence[float]) -> list[float]:
@@ -157,7 +582,8 @@ class SqliteVecService:
         if not chunk_rows:
             return False
 
-        prepared_rows: list[tuple[object, ...]] = []
+        prepared_rows: list[list[object]] = []
+        embeddings: list[list[float]] = []
         for row in chunk_rows:
             chunk_id = str(row.get("chunk_id") or "")
             if not chunk_id:
@@ -170,24 +596,21 @@ class SqliteVecService:
             ):
                 raw_embedding = []
             embedding = self._normalize_vector(raw_embedding)
-            embedding_json = json.dumps(embedding, separators=(",", ":"))
-            embedding_blob = self._pack_vector_float32(embedding)
-            embedding_dim = len(embedding)
-            prepared_rows.append(
-                (
-                    chunk_id,
-                    kb_id,
-                    doc_id,
-                    filename,
-                    file_type,
-                    chunk_index,
-                    content,
-                    embedding_json,
-                    embedding_blob,
-                    embedding_dim,
-                    ingest_id,
-                )
+            values = self._chunk_row_values(
+                chunk_id=chunk_id,
+                kb_id=kb_id,
+                doc_id=doc_id,
+                filename=filename,
+                file_type=file_type,
+                chunk_index=chunk_index,
+                ingest_id=ingest_id,
+                content=content,
+                embedding=embedding,
+                page_start=optional_int(row.get("page_start")),
+                page_end=optional_int(row.get("page_end")),
             )
+            prepared_rows.append([*values, None])
+            embeddings.append(embedding)
         if not prepared_rows:
             return False
 
@@ -202,60 +625,139 @@ class SqliteVecService:
                     ).fetchone()
                     is not None
                 )
+                self._assign_ivf_lists(
+                    conn, kb_id=kb_id, prepared_rows=prepared_rows, embeddings=embeddings
+                )
                 cursor.executemany(
-                    """
+                    f"""
                     INSERT OR REPLACE INTO rag_vec_chunks (
-                        chunk_id, kb_id, doc_id, filename, file_type, chunk_index,
-                        content, embedding_json, embedding_blob, embedding_dim, ingest_id, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                        {_CHUNK_INSERT_COLUMNS}, updated_at
+                    ) VALUES ({_CHUNK_INSERT_PLACEHOLDERS}, CURRENT_TIMESTAMP)
                     """,
                     prepared_rows,
                 )
                 conn.commit()
-                return had_existing
             except Exception:
                 conn.rollback()
                 raise
+        self._invalidate_kb_matrix(kb_id)
 
-    def delete_chunks_by_ids(self, *, kb_id: str, chunk_ids: list[str]) -> None:
-        if not chunk_ids:
+        if self.vector_index == "ivf":
+            self._maybe_build_ivf_index(
+                kb_id=kb_id, dims={len(embedding) for embedding in embeddings if embedding}
+            )
+        return had_existing
+
+    def get_stored_embeddings(
+        self, *, model_key: str, content_hashes: Sequence[str]
+    ) -> dict[str, list[float]]:
+        """Return stored vectors by content hash and mark them as recently used."""
+        hashes = list(dict.fromkeys(str(item) for item in content_hashes if item))
+        found: dict[str, list[float]] = {}
+        if not hashes:
+            return found
+        with self._lock, self._connect() as conn:
+            for start in range(0, len(hashes), _ROWID_QUERY_BATCH):
+                batch = hashes[start : start + _ROWID_QUERY_BATCH]
+                placeholders = ",".join("?" for _ in batch)
+                rows = conn.execute(
+                    f"""
+                    SELECT content_hash, embedding_blob FROM rag_vec_embedding_store
+                    WHERE model_key = ? AND content_hash IN ({placeholders})
+                    """,
+                    [model_key, *batch],
+                ).fetchall()
+                for row in rows:
+                    vector = self._unpack_vector_float32(row["embedding_blob"])
+                    if vector:
+                        found[str(row["content_hash"])] = vector
+            if found:
+                now = time.time()
+                conn.executemany(
+                    """
+                    UPDATE rag_vec_embedding_store SET last_used_at = ?
+                    WHERE model_key = ? AND content_hash = ?
+                    """,
+                    [(now, model_key, content_hash) for content_hash in found],
+                )
+                conn.commit()
+        return found
+
+    def store_embeddings(
+        self,
+        *,
+        model_key: str,
+        vectors: dict[str, Sequence[float]],
+        max_entries: int = DEFAULT_EMBEDDING_STORE_MAX_ENTRIES,
+    ) -> None:
+        """Save vectors by content hash, pruning the least recently used overflow."""
+        rows = [
+            (model_key, content_hash, self._pack_vector_float32(vector), time.time())
+            for content_hash, vector in vectors.items()
+            if content_hash and vector
+        ]
+        if not rows:
             return
         with self._lock, self._connect() as conn:
-            placeholders = ",".join("?" for _ in chunk_ids)
-            conn.execute(
-                f"DELETE FROM rag_vec_chunks WHERE kb_id = ? AND chunk_id IN ({placeholders})",
-                [kb_id, *chunk_ids],
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO rag_vec_embedding_store (
+                    model_key, content_hash, embedding_blob, last_used_at
+                ) VALUES (?, ?, ?, ?)
+                """,
+                rows,
+            )
+            overflow = (
+                int(conn.execute("SELECT COUNT(*) FROM rag_vec_embedding_store").fetchone()[0])
+                - max_entries
+            )
+            if overflow > 0:
+                conn.execute(
+                    """
+                    DELETE FROM rag_vec_embedding_store
+                    WHERE (model_key, content_hash) IN (
+                        SELECT model_key, content_hash FROM rag_vec_embedding_store
+                        ORDER BY last_used_at ASC LIMIT ?
+                    )
+                    """,
+                    (overflow,),
+                )
+            conn.commit()
+
+    def delete_document_generation(self, *, kb_id: str, doc_id: str, ingest_id: str) -> int:
+        """Delete the chunks one (failed) ingestion run wrote for a document."""
+        with self._lock, self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "DELETE FROM rag_vec_chunks WHERE kb_id = ? AND doc_id = ? AND ingest_id = ?",
+                (kb_id, doc_id, ingest_id),
             )
+            deleted = int(cursor.rowcount or 0)
             conn.commit()
+        self._invalidate_kb_matrix(kb_id)
+        return deleted
 
     def delete_stale_document_chunks(
         self,
         *,
         kb_id: str,
         doc_id: str,
-        keep_chunk_ids: list[str],
+        keep_ingest_id: str,
     ) -> int:
-        """Delete chunks in one document except current generation ids."""
+        """Delete chunks in one document except those of the current generation."""
         with self._lock, self._connect() as conn:
             cursor = conn.cursor()
-            if keep_chunk_ids:
-                placeholders = ",".join("?" for _ in keep_chunk_ids)
-                params = [kb_id, doc_id, *keep_chunk_ids]
-                cursor.execute(
-                    f"""
-                    DELETE FROM rag_vec_chunks
-                    WHERE kb_id = ? AND doc_id = ? AND chunk_id NOT IN ({placeholders})
-                    """,
-                    params,
-                )
-            else:
-                cursor.execute(
-                    "DELETE FROM rag_vec_chunks WHERE kb_id = ? AND doc_id = ?",
-                    (kb_id, doc_id),
-                )
+            cursor.execute(
+                """
+                DELETE FROM rag_vec_chunks
+                WHERE kb_id = ? AND doc_id = ? AND ingest_id IS NOT ?
+                """,
+                (kb_id, doc_id, keep_ingest_id),
+            )
             deleted = int(cursor.rowcount or 0)
             conn.commit()
-            return deleted
+        self._invalidate_kb_matrix(kb_id)
+        return deleted
 
     def delete_document_chunks(self, *, kb_id: str, doc_id: str) -> int:
         with self._lock, self._connect() as conn:
@@ -266,15 +768,19 @@ class SqliteVecService:
             )
             deleted = int(cursor.rowcount or 0)
             conn.commit()
-            return deleted
+        self._invalidate_kb_matrix(kb_id)
+        return deleted
 
     def delete_kb_chunks(self, *, kb_id: str) -> int:
         with self._lock, self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM rag_vec_chunks WHERE kb_id = ?", (kb_id,))
             deleted = int(cursor.rowcount or 0)
+            cursor.execute("DELETE FROM rag_vec_ivf_centroids WHERE kb_id = ?", (kb_id,))
+            cursor.execute("DELETE FROM rag_vec_ivf_meta WHERE kb_id = ?", (kb_id,))
             conn.commit()
-            return deleted
+        self._invalidate_kb_matrix(kb_id)
+        return deleted
 
     def list_chunks(
         self,
@@ -288,7 +794,8 @@ class SqliteVecService:
             if doc_id:
                 rows = conn.execute(
                     """
-                    SELECT chunk_id, kb_id, doc_id, filename, chunk_index, content
+                    SELECT chunk_id, kb_id, doc_id, filename, chunk_index, content,
+                           page_start, page_end
                     FROM rag_vec_chunks
                     WHERE kb_id = ? AND doc_id = ?
                     ORDER BY doc_id ASC, chunk_index ASC, chunk_id ASC
@@ -299,7 +806,8 @@ class SqliteVecService:
             else:
                 rows = conn.execute(
                     """
-                    SELECT chunk_id, kb_id, doc_id, filename, chunk_index, content
+                    SELECT chunk_id, kb_id, doc_id, filename, chunk_index, content,
+                           page_start, page_end
                     FROM rag_vec_chunks
                     WHERE kb_id = ?
                     ORDER BY doc_id ASC, chunk_index ASC, chunk_id ASC
@@ -318,6 +826,8 @@ class SqliteVecService:
                     "filename": str(row["filename"]),
                     "chunk_index": int(row["chunk_index"]),
                     "content": str(row["content"] or ""),
+                    "page_start": row["page_start"],
+                    "page_end": row["page_end"],
                 }
             )
         return items
@@ -362,51 +872,40 @@ class SqliteVecService:
             )
         return items
 
-    def _hydrate_missing_embedding_blobs(self, *, kb_id: str, max_rows: int = 2048) -> int:
-        """
-        Backfill binary float32 blobs for legacy rows that only have embedding_json.
-
-        This keeps existing databases compatible while enabling faster SQL-side scoring.
-        """
-        safe_limit = max(1, int(max_rows))
-        with self._lock, self._connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT chunk_id, embedding_json
+    def storage_stats(self, *, kb_ids: Sequence[str] | None = None) -> dict[str, Any]:
+        """Row count and bytes per stored representation, for benchmark reports."""
+        where = ""
+        params: list[str] = []
+        if kb_ids:
+            params = [str(kb_id) for kb_id in kb_ids]
+            where = f"WHERE kb_id IN ({','.join('?' for _ in params)})"
+        with self._connect() as conn:
+            row = conn.execute(
+                f"""
+                SELECT
+                    COUNT(*) AS row_count,
+                    COALESCE(SUM(length(embedding_blob)), 0) AS float32_bytes,
+                    COALESCE(SUM(length(embedding_int8)), 0) AS int8_bytes,
+                    COALESCE(SUM(length(embedding_bit)), 0) AS binary_bytes,
+                    COALESCE(SUM(length(CAST(content AS BLOB))), 0) AS content_bytes
                 FROM rag_vec_chunks
-                WHERE kb_id = ? AND (embedding_blob IS NULL OR embedding_dim IS NULL)
-                LIMIT ?
-                """,
-                (kb_id, safe_limit),
-            ).fetchall()
-            if not rows:
-                return 0
-
-            updates: list[tuple[bytes, int, str]] = []
-            for row in rows:
-                try:
-                    vector = self._normalize_vector(json.loads(row["embedding_json"] or "[]"))
-                except Exception:
-                    continue
-                if not vector:
-                    continue
-                updates.append(
-                    (self._pack_vector_float32(vector), len(vector), str(row["chunk_id"]))
-                )
-
-            if not updates:
-                return 0
-
-            conn.executemany(
-                """
-                UPDATE rag_vec_chunks
-                SET embedding_blob = ?, embedding_dim = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE chunk_id = ?
+                {where}
                 """,
-                updates,
-            )
-            conn.commit()
-            return len(updates)
+                params,
+            ).fetchone()
+        return {
+            "db_path": str(self.db_path),
+            "db_file_bytes": self.db_path.stat().st_size if self.db_path.exists() else 0,
+            "kb_ids": list(params),
+            "rows": int(row["row_count"]),
+            "float32_bytes": int(row["float32_bytes"]),
+            "int8_bytes": int(row["int8_bytes"]),
+            "binary_bytes": int(row["binary_bytes"]),
+            "content_bytes": int(row["content_bytes"]),
+            "vector_index": self.vector_index,
+            "quantization": self.quantization,
+            "rescore_multiplier": self.rescore_multiplier,
+        }
 
     def _search_with_sqlite_vec(
         self,
@@ -414,6 +913,8 @@ class SqliteVecService:
         kb_id: str,
         query_vector: Sequence[float],
         top_k: int,
+        ivf_lists: Sequence[int] | None = None,
+        quantization: str = "none",
     ) -> list[dict[str, Any]]:
         if not self._sqlite_vec_available:
             return []
@@ -423,25 +924,73 @@ class SqliteVecService:
             return []
         query_blob = self._pack_vector_float32(query_vector)
 
-        with self._connect() as conn:
-            try:
-                rows = conn.execute(
-                    """
-                    SELECT
-                        chunk_id,
-                        kb_id,
-                        doc_id,
-                        filename,
-                        chunk_index,
-                        content,
-                        (1.0 - vec_distance_cosine(embedding_blob, ?)) AS score
+        list_clause = ""
+        list_params: list[int] = []
+        if ivf_lists is not None:
+            list_params = sorted({int(item) for item in ivf_lists})
+            placeholders = ",".join("?" for _ in list_params)
+            list_clause = f"AND (ivf_list IN ({placeholders}) OR ivf_list IS NULL)"
+
+        if quantization == "none":
+            sql = f"""
+                SELECT
+                    chunk_id,
+                    kb_id,
+                    doc_id,
+                    filename,
+                    chunk_index,
+                    content,
+                    (1.0 - vec_distance_cosine(embedding_blob, ?)) AS score
+                FROM rag_vec_chunks
+                WHERE kb_id = ? AND embedding_dim = ?
+                {list_clause}
+                ORDER BY score DESC
+                LIMIT ?
+            """
+            params: list[object] = [query_blob, kb_id, query_dim, *list_params, top_k]
+        else:
+            if quantization == "int8":
+                distance = "vec_distance_cosine(vec_int8(embedding_int8), vec_int8(?))"
+                query_code = encode_int8(query_vector)
+            else:
+                distance = "vec_distance_hamming(vec_bit(embedding_bit), vec_bit(?))"
+                query_code = encode_binary(query_vector)
+            # First pass over the codes, then exact float32 rescoring of the candidates.
+            sql = f"""
+                WITH candidates AS (
+                    SELECT rowid AS candidate_rowid
                     FROM rag_vec_chunks
-                    WHERE kb_id = ? AND embedding_dim = ? AND embedding_blob IS NOT NULL
-                    ORDER BY score DESC
+                    WHERE kb_id = ? AND embedding_dim = ?
+                    {list_clause}
+                    ORDER BY {distance} ASC
                     LIMIT ?
-                    """,
-                    (query_blob, kb_id, query_dim, top_k),
-                ).fetchall()
+                )
+                SELECT
+                    chunk_id,
+                    kb_id,
+                    doc_id,
+                    filename,
+                    chunk_index,
+                    content,
+                    (1.0 - vec_distance_cosine(embedding_blob, ?)) AS score
+                FROM candidates
+                JOIN rag_vec_chunks ON rag_vec_chunks.rowid = candidates.candidate_rowid
+                ORDER BY score DESC
+                LIMIT ?
+            """
+            params = [
+                kb_id,
+                query_dim,
+                *list_params,
+                query_code,
+                top_k * self.rescore_multiplier,
+                query_blob,
+                top_k,
+            ]
+
+        with self._connect() as conn:
+            try:
+                rows = conn.execute(sql, params).fetchall()
             except sqlite3.OperationalError:
                 self._sqlite_vec_available = False
                 return []
@@ -467,24 +1016,53 @@ class SqliteVecService:
         kb_id: str,
         query_embedding: Sequence[float],
         top_k: int,
+        vector_index: str | None = None,
+        nprobe: int | None = None,
+        quantization: str | None = None,
     ) -> list[dict[str, Any]]:
+        """Return the ``top_k`` most similar chunks.
+
+        ``vector_index`` overrides the configured mode: ``exact`` scans every row,
+        ``ivf`` only scores the ``nprobe`` closest lists when the KB has an index.
+        ``quantization`` (``none``/``int8``/``binary``) overrides the first-pass
+        representation; returned scores are always exact float32 cosine.
+        """
         query_vector = self._normalize_vector(query_embedding)
         if not query_vector:
             return []
         safe_top_k = max(1, int(top_k))
         query_dim = len(query_vector)
+        quantization_mode = normalize_quantization(quantization or self.quantization)
 
-        # Backfill legacy rows once so older DBs can use the optimized path.
-        self._hydrate_missing_embedding_blobs(kb_id=kb_id)
+        ivf_lists: list[int] | None = None
+        mode = self._normalize_index_mode(vector_index or self.vector_index)
+        if mode == "ivf":
+            ivf_lists = self._probe_ivf_lists(
+                kb_id=kb_id,
+                query_vector=query_vector,
+                nprobe=max(1, int(nprobe or self.ivf_nprobe)),
+            )
 
         optimized = self._search_with_sqlite_vec(
             kb_id=kb_id,
             query_vector=query_vector,
             top_k=safe_top_k,
+            ivf_lists=ivf_lists,
+            quantization=quantization_mode,
         )
         if optimized:
             return optimized
 
+        vectorized = self._search_with_numpy(
+            kb_id=kb_id,
+            query_vector=query_vector,
+            top_k=safe_top_k,
+            ivf_lists=ivf_lists,
+            quantization=quantization_mode,
+        )
+        if vectorized is not None:
+            return vectorized
+
         with self._connect() as conn:
             rows = conn.execute(
                 """
@@ -495,35 +1073,30 @@ class SqliteVecService:
                     filename,
                     chunk_index,
                     content,
-                    embedding_json,
-                    embedding_blob,
-                    embedding_dim
+                    embedding_blob
                 FROM rag_vec_chunks
-                WHERE kb_id = ? AND (embedding_dim = ? OR embedding_dim IS NULL)
+                WHERE kb_id = ? AND embedding_dim = ?
                 """,
                 (kb_id, query_dim),
             ).fetchall()
 
-        if not rows:
-            return []
+        ranked = self._score_rows(rows, query_vector)
+        ranked.sort(key=lambda item: float(item.get("score", 0.0) or 0.0), reverse=True)
+        return ranked[:safe_top_k]
 
+    def _score_rows(
+        self, rows: Sequence[sqlite3.Row], query_vector: Sequence[float]
+    ) -> list[dict[str, Any]]:
+        """Score rows one by one in Python against their float32 blobs."""
+        query_dim = len(query_vector)
         ranked: list[dict[str, Any]] = []
         for row in rows:
-            candidate_vector: list[float] = []
             blob = row["embedding_blob"]
-            dim = row["embedding_dim"]
-            if blob and isinstance(blob, (bytes, bytearray)):
-                expected_dim = int(dim) if dim is not None else query_dim
-                candidate_vector = self._unpack_vector_float32(
-                    bytes(blob), expected_dim=expected_dim
-                )
+            if not isinstance(blob, (bytes, bytearray)):
+                continue
+            candidate_vector = self._unpack_vector_float32(bytes(blob), expected_dim=query_dim)
             if not candidate_vector:
-                try:
-                    candidate_vector = self._normalize_vector(
-                        json.loads(row["embedding_json"] or "[]")
-                    )
-                except Exception:
-                    continue
+                continue
             score = self._cosine_similarity(query_vector, candidate_vector)
             ranked.append(
                 {
@@ -536,6 +1109,447 @@ class SqliteVecService:
                     "score": float(score),
                 }
             )
+        return ranked
 
-        ranked.sort(key=lambda item: float(item.get("score", 0.0) or 0.0), reverse=True)
-        return ranked[:safe_top_k]
+    def _invalidate_kb_matrix(self, kb_id: str) -> None:
+        _kb_matrix_cache.invalidate(str(self.db_path), kb_id)
+        _ivf_centroid_cache.invalidate(str(self.db_path), kb_id)
+
+    @staticmethod
+    def _ivf_version(conn: sqlite3.Connection, *, kb_id: str, dim: int) -> int:
+        row = conn.execute(
+            "SELECT version FROM rag_vec_ivf_meta WHERE kb_id = ? AND embedding_dim = ?",
+            (kb_id, dim),
+        ).fetchone()
+        return int(row["version"]) if row is not None else 0
+
+    def _load_ivf_centroids(
+        self, conn: sqlite3.Connection, np: Any, *, kb_id: str, dim: int
+    ) -> Any | None:
+        """Return the KB's centroid matrix for ``dim``, or ``None`` without an index."""
+        version = self._ivf_version(conn, kb_id=kb_id, dim=dim)
+        if version <= 0:
+            return None
+        key = (str(self.db_path), kb_id, dim)
+        centroids = _ivf_centroid_cache.get(key, version)
+        if centroids is not None:
+            return centroids
+
+        blobs = [
+            bytes(row["centroid"])
+            for row in conn.execute(
+                """
+                SELECT centroid FROM rag_vec_ivf_centroids
+                WHERE kb_id = ? AND embedding_dim = ?
+                ORDER BY list_id ASC
+                """,
+                (kb_id, dim),
+            )
+        ]
+        if not blobs or any(len(blob) != dim * 4 for blob in blobs):
+            return None
+        centroids = np.frombuffer(b"".join(blobs), dtype="<f4").reshape(len(blobs), dim)
+        centroids = centroids.astype(np.float32)
+        _ivf_centroid_cache.put(key, version, centroids)
+        return centroids
+
+    def _probe_ivf_lists(
+        self, *, kb_id: str, query_vector: Sequence[float], nprobe: int
+    ) -> list[int] | None:
+        """Lists to scan for a query; ``None`` means exact search (no index or NumPy)."""
+        np = _load_numpy()
+        if np is None:
+            return None
+        with self._connect() as conn:
+            centroids = self._load_ivf_centroids(conn, np, kb_id=kb_id, dim=len(query_vector))
+        if centroids is None or nprobe >= len(centroids):
+            return None
+        query = normalize_rows(np, np.asarray([query_vector], dtype=np.float32))[0]
+        return probe_lists(np, centroids, query, nprobe)
+
+    def _assign_ivf_lists(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        kb_id: str,
+        prepared_rows: list[list[object]],
+        embeddings: list[list[float]],
+    ) -> None:
+        """Fill the trailing ``ivf_list`` value of new rows from the KB's centroids."""
+        np = _load_numpy()
+        if np is None:
+            return
+        positions_by_dim: dict[int, list[int]] = {}
+        for position, embedding in enumerate(embeddings):
+            if embedding:
+                positions_by_dim.setdefault(len(embedding), []).append(position)
+
+        for dim, positions in positions_by_dim.items():
+            centroids = self._load_ivf_centroids(conn, np, kb_id=kb_id, dim=dim)
+            if centroids is None:
+                continue
+            vectors = np.asarray([embeddings[position] for position in positions], np.float32)
+            assigned = assign_lists(np, centroids, normalize_rows(np, vectors))
+            for position, list_id in zip(positions, assigned.tolist(), strict=True):
+                prepared_rows[position][-1] = int(list_id)
+
+    def _maybe_build_ivf_index(self, *, kb_id: str, dims: set[int]) -> None:
+        """Train a KB's index once it is large enough, and retrain after heavy growth."""
+        pending: list[int] = []
+        with self._connect() as conn:
+            for dim in sorted(dims):
+                row_count = int(
+                    conn.execute(
+                        "SELECT COUNT(*) FROM rag_vec_chunks WHERE kb_id = ? AND embedding_dim = ?",
+                        (kb_id, dim),
+                    ).fetchone()[0]
+                )
+                meta = conn.execute(
+                    """
+                    SELECT trained_rows FROM rag_vec_ivf_meta
+                    WHERE kb_id = ? AND embedding_dim = ?
+                    """,
+                    (kb_id, dim),
+                ).fetchone()
+                if meta is None:
+                    if row_count >= self.ivf_min_rows:
+                        pending.append(dim)
+                elif row_count >= int(meta["trained_rows"]) * IVF_RETRAIN_GROWTH:
+                    pending.append(dim)
+        for dim in pending:
+            self.build_ivf_index(kb_id=kb_id, dim=dim)
+
+    def build_ivf_index(self, *, kb_id: str, dim: int | None = None) -> int:
+        """(Re)train the IVF index of a KB and assign every row to a list.
+
+        Args:
+            kb_id: Knowledge base id
+            dim: Embedding dimension to index; defaults to the KB's most common one
+
+        Returns:
+            Number of lists, or 0 when nothing was indexed.
+        """
+        np = _load_numpy()
+        if np is None:
+            logger.warning("NumPy is not installed; skipping IVF index build for %s", kb_id)
+            return 0
+
+        started = time.perf_counter()
+        with self._lock, self._connect() as conn:
+            if dim is None:
+                row = conn.execute(
+                    """
+                    SELECT embedding_dim, COUNT(*) AS row_count
+                    FROM rag_vec_chunks
+                    WHERE kb_id = ? AND embedding_dim > 0
+                    GROUP BY embedding_dim
+                    ORDER BY row_count DESC
+                    LIMIT 1
+                    """,
+                    (kb_id,),
+                ).fetchone()
+                if row is None:
+                    return 0
+                dim = int(row["embedding_dim"])
+
+            rowids = np.asarray(
+                [
+                    int(row[0])
+                    for row in conn.execute(
+                        """
+                        SELECT rowid FROM rag_vec_chunks
+                        WHERE kb_id = ? AND embedding_dim = ?
+                        ORDER BY rowid ASC
+                        """,
+                        (kb_id, dim),
+                    )
+                ],
+                dtype=np.int64,
+            )
+            if rowids.size == 0:
+                return 0
+
+            nlist = choose_nlist(int(rowids.size))
+            sample_size = min(int(rowids.size), IVF_MAX_TRAIN_SAMPLES, nlist * IVF_SAMPLES_PER_LIST)
+            rng = np.random.default_rng(0)
+            sample_ids = np.sort(rng.choice(rowids, size=sample_size, replace=False))
+            samples = [
+                vector
+                for _rowid, vector in self._read_vectors_by_rowid(conn, sample_ids.tolist(), dim)
+                if vector is not None
+            ]
+            if not samples:
+                return 0
+            centroids = train_centroids(
+                np,
+                normalize_rows(np, np.frombuffer(b"".join(samples), "<f4").reshape(-1, dim).copy()),
+                nlist,
+            )
+
+            cursor = conn.cursor()
+            cursor.execute("BEGIN")
+            try:
+                for start in range(0, int(rowids.size), _IVF_UPDATE_BATCH_ROWS):
+                    batch = rowids[start : start + _IVF_UPDATE_BATCH_ROWS].tolist()
+                    fetched = self._read_vectors_by_rowid(conn, batch, dim)
+                    valid = [(rowid, vector) for rowid, vector in fetched if vector is not None]
+                    updates: list[tuple[int | None, int]] = [
+                        (None, rowid) for rowid, vector in fetched if vector is None
+                    ]
+                    if valid:
+                        vectors = np.frombuffer(
+                            b"".join(vector for _rowid, vector in valid), "<f4"
+                        ).reshape(-1, dim)
+                        assigned = assign_lists(np, centroids, normalize_rows(np, vectors.copy()))
+                        updates.extend(
+                            (int(list_id), rowid)
+                            for (rowid, _vector), list_id in zip(
+                                valid, assigned.tolist(), strict=True
+                            )
+                        )
+                    cursor.executemany(
+                        "UPDATE rag_vec_chunks SET ivf_list = ? WHERE rowid = ?", updates
+                    )
+
+                cursor.execute(
+                    "DELETE FROM rag_vec_ivf_centroids WHERE kb_id = ? AND embedding_dim = ?",
+                    (kb_id, dim),
+                )
+                cursor.executemany(
+                    """
+                    INSERT INTO rag_vec_ivf_centroids (kb_id, embedding_dim, list_id, centroid)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    [
+                        (kb_id, dim, list_id, centroids[list_id].astype("<f4").tobytes())
+                        for list_id in range(len(centroids))
+                    ],
+                )
+                # Versions are timestamps so caches in other processes never match a
+                # rebuilt index by accident.
+                cursor.execute(
+                    """
+                    INSERT OR REPLACE INTO rag_vec_ivf_meta (
+                        kb_id, embedding_dim, nlist, trained_rows, version, trained_at
+                    ) VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    """,
+                    (kb_id, dim, len(centroids), int(rowids.size), time.time_ns()),
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        self._invalidate_kb_matrix(kb_id)
+        logger.info(
+            "Built IVF index for kb=%s dim=%s: %s lists over %s rows in %.2fs",
+            kb_id,
+            dim,
+            len(centroids),
+            int(rowids.size),
+            time.perf_counter() - started,
+        )
+        return len(centroids)
+
+    @staticmethod
+    def _read_vectors_by_rowid(
+        conn: sqlite3.Connection, rowids: Sequence[int], dim: int
+    ) -> list[tuple[int, bytes | None]]:
+        """Fetch raw float32 blobs by rowid; ``None`` marks unusable blobs."""
+        found: list[tuple[int, bytes | None]] = []
+        for start in range(0, len(rowids), _ROWID_QUERY_BATCH):
+            batch = list(rowids[start : start + _ROWID_QUERY_BATCH])
+            placeholders = ",".join("?" for _ in batch)
+            for row in conn.execute(
+                f"SELECT rowid, embedding_blob FROM rag_vec_chunks WHERE rowid IN ({placeholders})",
+                batch,
+            ):
+                blob = row[1]
+                usable = isinstance(blob, (bytes, bytearray)) and len(blob) == dim * 4
+                found.append((int(row[0]), bytes(blob) if usable else None))
+        return found
+
+    def _load_kb_matrix(
+        self, conn: sqlite3.Connection, np: Any, *, kb_id: str, dim: int, kind: str = "none"
+    ) -> _KbMatrix | None:
+        """Return the cached matrix for a KB, rebuilding it if rows changed.
+
+        ``kind`` selects the representation: ``none`` (normalized float32),
+        ``int8`` or ``binary`` codes.
+        """
+        # Row count plus max rowid changes on every insert/replace/delete, including
+        # writes from other processes that never hit the in-process invalidation.
+        # An IVF rebuild only rewrites ``ivf_list``, so its version is part of the key.
+        signature_row = conn.execute(
+            """
+            SELECT COUNT(*) AS row_count, COALESCE(MAX(rowid), 0) AS max_rowid
+            FROM rag_vec_chunks
+            WHERE kb_id = ? AND embedding_dim = ?
+            """,
+            (kb_id, dim),
+        ).fetchone()
+        signature = (
+            int(signature_row["row_count"]),
+            int(signature_row["max_rowid"]),
+            self._ivf_version(conn, kb_id=kb_id, dim=dim),
+        )
+        if signature[0] <= 0:
+            return None
+
+        key = (str(self.db_path), kb_id, dim, kind)
+        cached = _kb_matrix_cache.get(key, signature)
+        if cached is not None:
+            return cached
+
+        column, dtype, expected_size = {
+            "none": ("embedding_blob", "<f4", dim * 4),
+            "int8": ("embedding_int8", "i1", dim),
+            "binary": ("embedding_bit", "u1", binary_code_size(dim)),
+        }[kind]
+        chunk_ids: list[str] = []
+        blobs: list[bytes] = []
+        list_ids: list[int] = []
+        for row in conn.execute(
+            f"""
+            SELECT chunk_id, {column} AS code, ivf_list
+            FROM rag_vec_chunks
+            WHERE kb_id = ? AND embedding_dim = ?
+            """,
+            (kb_id, dim),
+        ):
+            blob = row["code"]
+            if isinstance(blob, (bytes, bytearray)) and len(blob) == expected_size:
+                chunk_ids.append(str(row["chunk_id"]))
+                blobs.append(bytes(blob))
+                list_id = row["ivf_list"]
+                list_ids.append(-1 if list_id is None else int(list_id))
+        if not chunk_ids:
+            return None
+
+        lists = np.asarray(list_ids, dtype=np.int32)
+        order = np.argsort(lists, kind="stable")
+        matrix = np.frombuffer(b"".join(blobs), dtype=dtype).reshape(len(chunk_ids), -1)
+        matrix = matrix[order]
+        if kind == "none":
+            matrix = normalize_rows(np, matrix.astype(np.float32))
+
+        entry = _KbMatrix(
+            signature=signature,
+            chunk_ids=[chunk_ids[index] for index in order],
+            matrix=matrix,
+            lists=lists[order],
+        )
+        _kb_matrix_cache.put(key, entry)
+        return entry
+
+    def _search_with_numpy(
+        self,
+        *,
+        kb_id: str,
+        query_vector: Sequence[float],
+        top_k: int,
+        ivf_lists: Sequence[int] | None = None,
+        quantization: str = "none",
+    ) -> list[dict[str, Any]] | None:
+        """Vectorized cosine search; ``None`` when NumPy is unavailable.
+
+        With ``ivf_lists`` only rows of those lists (and unassigned rows) are scored.
+        With quantization the codes pick ``top_k * rescore_multiplier`` candidates
+        that are rescored against their float32 blobs.
+        """
+        np = _load_numpy()
+        if np is None:
+            return None
+
+        query_dim = len(query_vector)
+        query = normalize_rows(np, np.asarray([query_vector], dtype=np.float32))[0]
+        limit = top_k if quantization == "none" else top_k * self.rescore_multiplier
+
+        with self._connect() as conn:
+            kb_matrix = self._load_kb_matrix(
+                conn, np, kb_id=kb_id, dim=query_dim, kind=quantization
+            )
+            candidates: list[tuple[float, str]] = []
+            if kb_matrix is not None:
+                if ivf_lists is None:
+                    rows = np.arange(len(kb_matrix.chunk_ids))
+                    codes = kb_matrix.matrix
+                else:
+                    rows = kb_matrix.probe_rows(np, ivf_lists)
+                    codes = kb_matrix.matrix[rows]
+                if quantization == "int8":
+                    scores = score_int8(np, codes, query)
+                elif quantization == "binary":
+                    query_code = np.frombuffer(encode_binary(query_vector), dtype=np.uint8)
+                    scores = score_binary(np, codes, query_code)
+                else:
+                    scores = codes @ query
+                if limit < len(scores):
+                    picked = np.argpartition(-scores, limit - 1)[:limit]
+                else:
+                    picked = np.arange(len(scores))
+                picked = picked[np.argsort(-scores[picked], kind="stable")]
+                candidates = [
+                    (float(scores[index]), kb_matrix.chunk_ids[int(rows[index])])
+                    for index in picked
+                ]
+
+            chunk_rows: dict[str, sqlite3.Row] = {}
+            chunk_ids = [chunk_id for _score, chunk_id in candidates]
+            if chunk_ids:
+                blob_column = ", embedding_blob" if quantization != "none" else ""
+                placeholders = ",".join("?" for _ in chunk_ids)
+                # ``+kb_id`` keeps the planner on the primary key instead of the KB index.
+                for row in conn.execute(
+                    f"""
+                    SELECT chunk_id, kb_id, doc_id, filename, chunk_index, content{blob_column}
+                    FROM rag_vec_chunks
+                    WHERE +kb_id = ? AND chunk_id IN ({placeholders})
+                    """,
+                    [kb_id, *chunk_ids],
+                ):
+                    chunk_rows[str(row["chunk_id"])] = row
+
+        if quantization != "none":
+            candidates = self._rescore_candidates(np, candidates, chunk_rows, query)
+
+        ranked: list[dict[str, Any]] = []
+        for score, chunk_id in candidates:
+            row = chunk_rows.get(chunk_id)
+            if row is None:
+                continue
+            ranked.append(
+                {
+                    "chunk_id": chunk_id,
+                    "kb_id": str(row["kb_id"]),
+                    "doc_id": str(row["doc_id"]),
+                    "filename": str(row["filename"]),
+                    "chunk_index": int(row["chunk_index"]),
+                    "content": str(row["content"] or ""),
+                    "score": score,
+                }
+            )
+        return ranked[:top_k]
+
+    @staticmethod
+    def _rescore_candidates(
+        np: Any,
+        candidates: list[tuple[float, str]],
+        chunk_rows: dict[str, sqlite3.Row],
+        query: Any,
+    ) -> list[tuple[float, str]]:
+        """Replace first-pass scores with exact cosine scores from float32 blobs."""
+        expected_size = int(query.shape[0]) * 4
+        chunk_ids: list[str] = []
+        blobs: list[bytes] = []
+        for _score, chunk_id in candidates:
+            row = chunk_rows.get(chunk_id)
+            blob = row["embedding_blob"] if row is not None else None
+            if isinstance(blob, (bytes, bytearray)) and len(blob) == expected_size:
+                chunk_ids.append(chunk_id)
+                blobs.append(bytes(blob))
+        if not chunk_ids:
+            return []
+        vectors = np.frombuffer(b"".join(blobs), dtype="<f4").reshape(len(chunk_ids), -1)
+        scores = normalize_rows(np, vectors.astype(np.float32)) @ query
+        order = np.argsort(-scores, kind="stable")
+        return [(float(scores[index]), chunk_ids[index]) for index in order]
@@ -3,18 +3,25 @@
 from .async_run_store_service import AsyncRunStoreService
 from .comparison_storage import ComparisonStorage
 from .conversation_storage import ConversationStorage, create_storage_with_project_resolver
-from .conversation_storage_paths import StoragePathResolver, build_project_root_resolver
+from .conversation_storage_paths import (
+    SessionPathIndex,
+    StoragePathResolver,
+    build_project_root_resolver,
+)
 from .conversation_target_resolver import ConversationSessionTargetResolver, ResolvedSessionTarget
 from .migration_service import migrate_project_conversations
+from .session_cache import ParsedSessionCache
 
 __all__ = [
     "AsyncRunStoreService",
     "ComparisonStorage",
     "ConversationStorage",
     "create_storage_with_project_resolver",
+    "SessionPathIndex",
     "StoragePathResolver",
     "build_project_root_resolver",
     "ConversationSessionTargetResolver",
     "ResolvedSessionTarget",
     "migrate_project_conversations",
+    "ParsedSessionCache",
 ]
@@ -0,0 +1,109 @@
+"""Markdown body format helpers for conversation files."""
+
+from __future__ import annotations
+
+import json
+import re
+import uuid
+from typing import Any
+
+_HEADER_ROLES = {
+    "User": "user",
+    "Assistant": "assistant",
+    "Separator": "separator",
+    "Summary": "summary",
+}
+
+# Header lines start a new message: "## User (2026-01-01 00:00:00)". The leading
+# newline (instead of ``^`` with MULTILINE) keeps a literal prefix so the regex
+# engine can skip ahead quickly on large bodies.
+_HEADER_PREFIX_RE = re.compile(r"\n## (User|Assistant|Separator|Summary) \(")
+_HEADER_TIMESTAMP_RE = re.compile(r"\((\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\)")
+
+# All per-message metadata lives in single-line HTML comments.
+_COMMENT_RE = re.compile(
+    r"<!-- (usage|cost|attachment|message_id|assistant_id|sources|compression_meta): (.+) -->"
+)
+_COMMENT_PREFIX = "<!-- "
+_QUOTED_KEYS = frozenset({"message_id", "assistant_id"})
+
+
+def _apply_comment(message: dict[str, Any], key: str, raw_value: str) -> bool:
+    """Store one metadata comment on ``message``; return False if it is plain content."""
+    if key in _QUOTED_KEYS:
+        # IDs are written quoted; an unquoted value was never metadata.
+        if len(raw_value) < 3 or raw_value[0] != '"' or raw_value[-1] != '"':
+            return False
+        message[key] = raw_value[1:-1]
+        return True
+
+    try:
+        value = json.loads(raw_value)
+    except json.JSONDecodeError:
+        return True
+
+    if key == "attachment":
+        attachments = message.get("attachments")
+        if not isinstance(attachments, list):
+            attachments = []
+            message["attachments"] = attachments
+        attachments.append(value)
+    else:
+        message[key] = value
+    return True
+
+
+def _parse_block(lines: list[str], role: str, created_at: str | None) -> dict[str, Any]:
+    message: dict[str, Any] = {"role": role, "content": "", "created_at": created_at}
+    buffer: list[str] = []
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith(_COMMENT_PREFIX):
+            comment_match = _COMMENT_RE.fullmatch(stripped)
+            if comment_match and _apply_comment(
+                message, comment_match.group(1), comment_match.group(2)
+            ):
+                continue
+        # Skip empty lines at the start of the message content.
+        if buffer or stripped:
+            buffer.append(line)
+    message["content"] = "\n".join(buffer).strip()
+    return message
+
+
+def parse_messages(content: str, session_id: str, last_n: int | None = None) -> list[dict]:
+    """Parse messages from markdown content.
+
+    Args:
+        content: Markdown body content (without frontmatter)
+        session_id: Session ID for generating fallback message IDs
+        last_n: When set, only the last ``last_n`` messages are parsed. Fallback
+            message IDs stay identical to those of a full parse.
+
+    Returns:
+        List of message dicts:
+        [{"role": "user/assistant", "content": "...", "message_id": "...", "attachments": [...], "usage": {...}, "cost": {...}}, ...]
+    """
+    text = "\n" + content
+    headers = list(_HEADER_PREFIX_RE.finditer(text))
+    first_index = 0
+    if last_n is not None:
+        first_index = max(len(headers) - max(last_n, 0), 0)
+
+    messages: list[dict[str, Any]] = []
+    for index in range(first_index, len(headers)):
+        header = headers[index]
+        end = headers[index + 1].start() if index + 1 < len(headers) else len(text)
+        lines = text[header.start() + 1 : end].split("\n")
+        ts_match = _HEADER_TIMESTAMP_RE.search(lines[0])
+        message = _parse_block(
+            lines[1:],
+            _HEADER_ROLES[header.group(1)],
+            ts_match.group(1) if ts_match else None,
+        )
+        # Generate fallback UUID if message_id not found.
+        if "message_id" not in message:
+            message["message_id"] = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{session_id}:{index}"))
+        messages.append(message)
+
+    return messages
@@ -2,8 +2,6 @@
 
 import asyncio
 import json
-import os
-import re
 import shutil
 import uuid
 from collections.abc import Callable
@@ -11,14 +9,28 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-import aiofiles
 import frontmatter
 
 from src.domain.models.group_participant import parse_group_participant
 from src.providers.types import CostInfo, TokenUsage
 
+from .conversation_markdown import parse_messages
+from .conversation_storage_meta import (
+    OVERLAY_KEYS,
+    append_body,
+    discard_overlay,
+    load_counters,
+    meta_sidecar_path,
+    read_post,
+    save_overlay,
+    write_post,
+)
 from .conversation_storage_paths import StoragePathResolver, build_project_root_resolver
 from .conversation_target_resolver import ConversationSessionTargetResolver
+from .session_cache import ParsedSessionCache, current_signature, get_session_cache
+from .session_catalog import SessionCatalog, get_session_catalog
+
+SESSION_CATALOG_FILENAME = ".session_catalog.sqlite3"
 
 
 class ConversationStorage:
@@ -35,6 +47,8 @@ class ConversationStorage:
         project_root_resolver: Callable[[str], str | None] | None = None,
         assistant_service: Any = None,
         model_service: Any = None,
+        session_catalog: SessionCatalog | None = None,
+        session_cache: ParsedSessionCache | None = None,
     ):
         """Initialize storage with conversations directory.
 
@@ -45,6 +59,10 @@ class ConversationStorage:
                 When set, project conversations are stored under
                 {root_path}/.lex_mint/conversations/ instead of
                 conversations/projects/{project_id}/.
+            session_catalog: Optional summary catalog used by list_sessions.
+                Defaults to a shared SQLite catalog inside conversations_dir.
+            session_cache: Optional parsed-session cache. Defaults to the
+                process-wide cache sized by ``settings.session_cache_max_mb``.
         """
         self.conversations_dir = Path(conversations_dir)
         self.conversations_dir.mkdir(exist_ok=True)
@@ -54,9 +72,58 @@ class ConversationStorage:
             assistant_service=assistant_service,
             model_service=model_service,
         )
+        self._catalog = session_catalog or get_session_catalog(
+            self.conversations_dir / SESSION_CATALOG_FILENAME
+        )
+        self._session_cache = session_cache or get_session_cache()
         # Per-file locks to prevent concurrent read-modify-write corruption
         self._file_locks: dict[str, asyncio.Lock] = {}
 
+    async def _write_session(
+        self, filepath: Path, post: frontmatter.Post, *, reindex_messages: bool = False
+    ) -> None:
+        cache_current = self._session_cache.is_current(filepath)
+        await write_post(filepath, post)
+        messages = None
+        if reindex_messages:
+            session_id = self._as_str(post.metadata.get("session_id"), filepath.stem)
+            messages = self._parse_messages(post.content, session_id)
+            self._session_cache.put(filepath, dict(post.metadata or {}), messages)
+        elif cache_current:
+            # Metadata-only rewrite: the cached message list is still valid.
+            self._session_cache.update_metadata(filepath, dict(post.metadata or {}))
+        await asyncio.to_thread(self._catalog.upsert_post, filepath, post, messages=messages)
+
+    async def _load_parsed_session(
+        self, filepath: Path, session_id: str, last_n: int | None = None
+    ) -> tuple[dict[str, Any], list[dict]]:
+        """Return ``(metadata, messages)``, served from the session cache when current."""
+        cached = self._session_cache.get(filepath)
+        if cached is not None:
+            cached_metadata, cached_messages = cached
+            if last_n is not None:
+                cached_messages = cached_messages[-last_n:] if last_n > 0 else []
+            return cached_metadata, cached_messages
+
+        signature = current_signature(filepath)
+        post = await read_post(filepath)
+        if await self._migrate_legacy_session_metadata(post):
+            await self._write_session(filepath, post)
+            signature = None
+        metadata: dict[str, Any] = dict(post.metadata or {})
+        if last_n is not None:
+            return metadata, self._parse_messages(post.content, session_id, last_n=last_n)
+
+        messages = self._parse_messages(post.content, session_id)
+        self._session_cache.put(filepath, metadata, messages, signature=signature)
+        return metadata, messages
+
+    def _get_file_lock(self, filepath: Path) -> asyncio.Lock:
+        file_key = str(filepath)
+        if file_key not in self._file_locks:
+            self._file_locks[file_key] = asyncio.Lock()
+        return self._file_locks[file_key]
+
     @staticmethod
     def _as_optional_str(value: Any) -> str | None:
         if isinstance(value, str):
@@ -200,13 +267,17 @@ class ConversationStorage:
 
         post.metadata = metadata
 
-        async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-            await f.write(frontmatter.dumps(post))
+        await self._write_session(filepath, post)
+        self._path_resolver.session_index.record(filepath, session_id)
 
         return session_id
 
     async def get_session(
-        self, session_id: str, context_type: str = "chat", project_id: str | None = None
+        self,
+        session_id: str,
+        context_type: str = "chat",
+        project_id: str | None = None,
+        last_n_messages: int | None = None,
     ) -> dict:
         """Load a conversation session.
 
@@ -214,6 +285,8 @@ class ConversationStorage:
             session_id: Session UUID to load
             context_type: Context type ("chat" or "project")
             project_id: Project ID (required when context_type="project")
+            last_n_messages: Only parse the most recent N messages; for callers
+                that need recent history only. ``None`` loads all messages.
 
         Returns:
             Dictionary with session metadata and state:
@@ -237,18 +310,9 @@ class ConversationStorage:
         if not filepath:
             raise FileNotFoundError(f"Session {session_id} not found")
 
-        async with aiofiles.open(filepath, encoding="utf-8") as f:
-            content = await f.read()
-
-        post = frontmatter.loads(content)
-        metadata_migrated = await self._migrate_legacy_session_metadata(post)
-        if metadata_migrated:
-            async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-                await f.write(frontmatter.dumps(post))
-        metadata: dict[str, Any] = dict(post.metadata or {})
-
-        # Parse messages from markdown content
-        messages = self._parse_messages(post.content, session_id)
+        metadata, messages = await self._load_parsed_session(
+            filepath, session_id, last_n=last_n_messages
+        )
 
         # Resolve assistant/model target from explicit canonical metadata only.
         assistant_id = self._as_optional_str(metadata.get("assistant_id"))
@@ -276,9 +340,9 @@ class ConversationStorage:
                     )
                 metadata["target_type"] = "model"
                 metadata.pop("assistant_id", None)
-                post.metadata = metadata
-                async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-                    await f.write(frontmatter.dumps(post))
+                post = await read_post(filepath)
+                post.metadata = dict(metadata)
+                await self._write_session(filepath, post)
                 target_type = "model"
                 assistant_id = None
             else:
@@ -368,13 +432,6 @@ class ConversationStorage:
         # Generate message ID
         message_id = str(uuid.uuid4())
 
-        # Read existing content
-        async with aiofiles.open(filepath, encoding="utf-8") as f:
-            file_content = await f.read()
-
-        post = frontmatter.loads(file_content)
-        metadata: dict[str, Any] = dict(post.metadata or {})
-
         # Append new message
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         if role == "user":
@@ -409,8 +466,61 @@ class ConversationStorage:
         if role == "assistant" and sources:
             new_message += f"<!-- sources: {json.dumps(sources, ensure_ascii=False)} -->\n"
 
-        post.content += new_message
+        async with self._get_file_lock(filepath):
+            # Counters live in the sidecar overlay so the body is only appended to.
+            cached = self._session_cache.get_metadata(filepath)
+            if cached is not None:
+                previous_signature, cached_metadata = cached
+                metadata = {
+                    key: cached_metadata[key] for key in OVERLAY_KEYS if key in cached_metadata
+                }
+            else:
+                previous_signature = None
+                metadata = await load_counters(filepath)
+            self._apply_append_counters(metadata, role, content, usage, cost)
+            await append_body(filepath, new_message)
+            await save_overlay(filepath, metadata)
+            self._update_cache_after_append(
+                filepath, session_id, previous_signature, metadata, new_message
+            )
+            await asyncio.to_thread(
+                self._catalog.record_append,
+                filepath,
+                role,
+                self._as_optional_str(metadata.get("title")),
+                message_id=message_id,
+                content=content,
+            )
+
+        return message_id
 
+    def _update_cache_after_append(
+        self,
+        filepath: Path,
+        session_id: str,
+        previous_signature: tuple[int, int, int] | None,
+        metadata_updates: dict[str, Any],
+        appended_text: str,
+    ) -> None:
+        """Extend a cached session in place with the just-appended message."""
+        if previous_signature is None:
+            return
+        appended = self._parse_messages(appended_text, session_id)
+        # Content that itself contains message headers would shift fallback IDs.
+        if len(appended) != 1:
+            self._session_cache.discard(filepath)
+            return
+        self._session_cache.apply_append(filepath, previous_signature, metadata_updates, appended)
+
+    def _apply_append_counters(
+        self,
+        metadata: dict[str, Any],
+        role: str,
+        content: str,
+        usage: TokenUsage | None,
+        cost: CostInfo | None,
+    ) -> None:
+        """Update step/usage/cost totals and the auto title for one appended message."""
         # Update current_step for assistant messages
         if role == "assistant":
             metadata["current_step"] = self._as_int(metadata.get("current_step"), 0) + 1
@@ -449,14 +559,6 @@ class ConversationStorage:
             clean_title = content.strip().replace("\n", " ")[:30]
             metadata["title"] = clean_title + ("..." if len(content) > 30 else "")
 
-        post.metadata = metadata
-
-        # Write back to file
-        async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-            await f.write(frontmatter.dumps(post))
-
-        return message_id
-
     async def append_separator(
         self, session_id: str, context_type: str = "chat", project_id: str | None = None
     ) -> str:
@@ -515,11 +617,6 @@ class ConversationStorage:
 
         message_id = str(uuid.uuid4())
 
-        async with aiofiles.open(filepath, encoding="utf-8") as f:
-            file_content = await f.read()
-
-        post = frontmatter.loads(file_content)
-
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         new_message = f"\n## Summary ({timestamp})\n{content}\n"
         new_message += f'\n<!-- message_id: "{message_id}" -->\n'
@@ -528,24 +625,45 @@ class ConversationStorage:
             merged_meta.update(compression_meta)
         new_message += f"<!-- compression_meta: {json.dumps(merged_meta)} -->\n"
 
-        post.content += new_message
-
-        async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-            await f.write(frontmatter.dumps(post))
+        async with self._get_file_lock(filepath):
+            cached = self._session_cache.get_metadata(filepath)
+            await append_body(filepath, new_message)
+            self._update_cache_after_append(
+                filepath, session_id, cached[0] if cached else None, {}, new_message
+            )
+            await asyncio.to_thread(
+                self._catalog.record_append,
+                filepath,
+                "summary",
+                None,
+                message_id=message_id,
+                content=content,
+            )
 
         return message_id
 
     async def list_sessions(
-        self, context_type: str = "chat", project_id: str | None = None
+        self,
+        context_type: str = "chat",
+        project_id: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        sort_by: str = "updated_at",
     ) -> list[dict]:
         """List all conversation sessions in a specific context.
 
+        Summaries come from the session catalog; only files whose stat
+        signature changed since they were last cataloged are parsed.
+
         Args:
             context_type: Context type ("chat" or "project")
             project_id: Project ID (required when context_type="project")
+            limit: Optional page size (None returns every session)
+            offset: Number of sessions to skip for pagination
+            sort_by: "updated_at" (default) or "created_at", newest first
 
         Returns:
-            List of session summaries sorted by creation time (newest first):
+            List of session summaries sorted newest first:
             [
                 {
                     "session_id": str,
@@ -557,7 +675,7 @@ class ConversationStorage:
             ]
 
         Raises:
-            ValueError: If context parameters are invalid
+            ValueError: If context parameters or sort_by are invalid
         """
         # Get context-specific directory
         conversation_dir = self._get_conversation_dir(context_type, project_id)
@@ -566,143 +684,64 @@ class ConversationStorage:
         if not conversation_dir.exists():
             return []
 
-        sessions = []
-        for filepath in conversation_dir.glob("*.md"):
-            try:
-                async with aiofiles.open(filepath, encoding="utf-8") as f:
-                    content = await f.read()
-
-                post = frontmatter.loads(content)
-
-                # Skip temporary sessions
-                if post.metadata.get("temporary", False):
-                    continue
-
-                # Count messages
-                message_count = post.content.count("## User") + post.content.count("## Assistant")
-
-                # Get file modification time as updated_at
-                mtime = os.path.getmtime(filepath)
-                updated_at = datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")
+        return await asyncio.to_thread(
+            self._catalog.list_sessions,
+            conversation_dir,
+            limit=limit,
+            offset=offset,
+            sort_by=sort_by,
+        )
 
-                session_entry = {
-                    "session_id": post.metadata["session_id"],
-                    "title": post.metadata.get("title", "New Chat"),
-                    "created_at": post.metadata["created_at"],
-                    "updated_at": updated_at,
-                    "message_count": message_count,
-                    "folder_id": post.metadata.get("folder_id"),  # Chat folder ID (optional)
-                }
+    async def sync_session_catalog(
+        self, context_type: str = "chat", project_id: str | None = None
+    ) -> int:
+        """Reconcile the session catalog with the files on disk.
 
-                group_assistants = post.metadata.get("group_assistants")
-                if group_assistants:
-                    session_entry["group_assistants"] = group_assistants
-                    session_entry["group_mode"] = post.metadata.get("group_mode", "round_robin")
-                    if "group_settings" in post.metadata:
-                        session_entry["group_settings"] = post.metadata.get("group_settings")
-
-                sessions.append(session_entry)
-            except Exception as e:
-                # Skip corrupted files
-                print(f"Warning: Skipping corrupted file {filepath}: {e}")
-                continue
+        Called at backend startup; unchanged files are skipped by stat signature.
 
-        # Sort by updated_at descending (most recently modified first)
-        sessions.sort(key=lambda s: s["updated_at"], reverse=True)
-        return sessions
+        Returns:
+            Number of session files (re)parsed
+        """
+        conversation_dir = self._get_conversation_dir(context_type, project_id)
+        if not conversation_dir.exists():
+            return 0
+        return await asyncio.to_thread(self._catalog.reconcile, conversation_dir, force=True)
 
     async def search_sessions(
-        self, query: str, context_type: str = "chat", project_id: str | None = None, limit: int = 20
+        self,
+        query: str,
+        context_type: str = "chat",
+        project_id: str | None = None,
+        limit: int = 20,
+        offset: int = 0,
     ) -> list[dict]:
         """Search sessions by title and message content.
 
+        Uses the catalog's full-text index, ranked by BM25. Every query token
+        must appear in the same title or message.
+
         Args:
-            query: Search query string (case-insensitive substring match)
+            query: Search query string
             context_type: Context type ("chat" or "project")
             project_id: Project ID (required when context_type="project")
             limit: Maximum number of results to return
+            offset: Number of ranked results to skip for pagination
 
         Returns:
-            List of matching session summaries with match info
+            List of matching session summaries with match info:
+            match_type ("title"/"content"), match_context excerpt, score,
+            message_id of the best hit, and per-message ``hits``
         """
         if not query or not query.strip():
             return []
 
-        query_lower = query.lower().strip()
-
         conversation_dir = self._get_conversation_dir(context_type, project_id)
         if not conversation_dir.exists():
             return []
 
-        results: list[dict[str, Any]] = []
-        for filepath in sorted(conversation_dir.glob("*.md"), reverse=True):
-            if len(results) >= limit:
-                break
-            try:
-                async with aiofiles.open(filepath, encoding="utf-8") as f:
-                    content = await f.read()
-
-                post = frontmatter.loads(content)
-                metadata = self._as_dict(post.metadata)
-
-                # Skip temporary sessions
-                if bool(metadata.get("temporary", False)):
-                    continue
-
-                title = self._as_str(metadata.get("title"))
-                session_id = self._as_str(metadata.get("session_id"))
-                created_at = self._as_str(metadata.get("created_at"))
-                body = post.content
-
-                message_count = body.count("## User") + body.count("## Assistant")
-
-                # Get file modification time as updated_at
-                mtime = os.path.getmtime(filepath)
-                updated_at = datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")
-
-                # Check title match
-                if query_lower in title.lower():
-                    results.append(
-                        {
-                            "session_id": session_id,
-                            "title": title,
-                            "created_at": created_at,
-                            "updated_at": updated_at,
-                            "message_count": message_count,
-                            "match_type": "title",
-                            "match_context": title,
-                        }
-                    )
-                    continue
-
-                # Check body content match
-                body_lower = body.lower()
-                idx = body_lower.find(query_lower)
-                if idx != -1:
-                    # Extract snippet around match (~80 chars)
-                    start = max(0, idx - 30)
-                    end = min(len(body), idx + len(query) + 50)
-                    snippet = body[start:end].replace("\n", " ").strip()
-                    if start > 0:
-                        snippet = "..." + snippet
-                    if end < len(body):
-                        snippet = snippet + "..."
-
-                    results.append(
-                        {
-                            "session_id": session_id,
-                            "title": title,
-                            "created_at": created_at,
-                            "updated_at": updated_at,
-                            "message_count": message_count,
-                            "match_type": "content",
-                            "match_context": snippet,
-                        }
-                    )
-            except Exception:
-                continue
-
-        return results
+        return await asyncio.to_thread(
+            self._catalog.search, conversation_dir, query.strip(), limit=limit, offset=offset
+        )
 
     async def truncate_messages_after(
         self,
@@ -729,10 +768,7 @@ class ConversationStorage:
             raise FileNotFoundError(f"Session {session_id} not found")
 
         # Read and parse existing file
-        async with aiofiles.open(filepath, encoding="utf-8") as f:
-            file_content = await f.read()
-
-        post = frontmatter.loads(file_content)
+        post = await read_post(filepath)
         messages = self._parse_messages(post.content, session_id)
 
         # Truncate messages list
@@ -781,8 +817,7 @@ class ConversationStorage:
         post.metadata["current_step"] = assistant_count
 
         # Write back to file
-        async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-            await f.write(frontmatter.dumps(post))
+        await self._write_session(filepath, post, reindex_messages=True)
 
     async def delete_message(
         self,
@@ -809,10 +844,7 @@ class ConversationStorage:
             raise FileNotFoundError(f"Session {session_id} not found")
 
         # Read and parse existing file
-        async with aiofiles.open(filepath, encoding="utf-8") as f:
-            file_content = await f.read()
-
-        post = frontmatter.loads(file_content)
+        post = await read_post(filepath)
         messages = self._parse_messages(post.content, session_id)
 
         # Validate index
@@ -866,8 +898,7 @@ class ConversationStorage:
             post.metadata["title"] = "New Chat"
 
         # Write back to file
-        async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-            await f.write(frontmatter.dumps(post))
+        await self._write_session(filepath, post, reindex_messages=True)
 
     async def delete_message_by_id(
         self,
@@ -893,10 +924,7 @@ class ConversationStorage:
             raise FileNotFoundError(f"Session {session_id} not found")
 
         # Read and parse existing file
-        async with aiofiles.open(filepath, encoding="utf-8") as f:
-            file_content = await f.read()
-
-        post = frontmatter.loads(file_content)
+        post = await read_post(filepath)
         messages = self._parse_messages(post.content, session_id)
 
         # Find the message with the given ID
@@ -937,10 +965,7 @@ class ConversationStorage:
         if not filepath:
             raise FileNotFoundError(f"Session {session_id} not found")
 
-        async with aiofiles.open(filepath, encoding="utf-8") as f:
-            file_content = await f.read()
-
-        post = frontmatter.loads(file_content)
+        post = await read_post(filepath)
         messages = self._parse_messages(post.content, session_id)
 
         # Find the message with the given ID
@@ -989,8 +1014,7 @@ class ConversationStorage:
 
         post.content = new_md_content
 
-        async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-            await f.write(frontmatter.dumps(post))
+        await self._write_session(filepath, post, reindex_messages=True)
 
     async def clear_all_messages(
         self, session_id: str, context_type: str = "chat", project_id: str | None = None
@@ -1011,10 +1035,7 @@ class ConversationStorage:
             raise FileNotFoundError(f"Session {session_id} not found")
 
         # Read and parse existing file
-        async with aiofiles.open(filepath, encoding="utf-8") as f:
-            file_content = await f.read()
-
-        post = frontmatter.loads(file_content)
+        post = await read_post(filepath)
 
         # Clear all content
         post.content = ""
@@ -1037,8 +1058,7 @@ class ConversationStorage:
         }
 
         # Write back to file
-        async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-            await f.write(frontmatter.dumps(post))
+        await self._write_session(filepath, post, reindex_messages=True)
 
     async def set_messages(
         self,
@@ -1064,10 +1084,7 @@ class ConversationStorage:
             raise FileNotFoundError(f"Session {session_id} not found")
 
         # Read existing content
-        async with aiofiles.open(filepath, encoding="utf-8") as f:
-            file_content = await f.read()
-
-        post = frontmatter.loads(file_content)
+        post = await read_post(filepath)
 
         # Rebuild markdown content from messages
         new_content = ""
@@ -1109,8 +1126,7 @@ class ConversationStorage:
             post.metadata["title"] = "New Chat"
 
         # Write back to file
-        async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-            await f.write(frontmatter.dumps(post))
+        await self._write_session(filepath, post, reindex_messages=True)
 
     async def update_session_metadata(
         self,
@@ -1136,24 +1152,16 @@ class ConversationStorage:
             raise FileNotFoundError(f"Session {session_id} not found")
 
         # Use per-file lock to prevent concurrent read-modify-write corruption
-        file_key = str(filepath)
-        if file_key not in self._file_locks:
-            self._file_locks[file_key] = asyncio.Lock()
-
-        async with self._file_locks[file_key]:
+        async with self._get_file_lock(filepath):
             # Read and parse existing file
-            async with aiofiles.open(filepath, encoding="utf-8") as f:
-                file_content = await f.read()
-
-            post = frontmatter.loads(file_content)
+            post = await read_post(filepath)
 
             # Update metadata fields
             for key, value in metadata_updates.items():
                 post.metadata[key] = value
 
             # Write back to file
-            async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-                await f.write(frontmatter.dumps(post))
+            await self._write_session(filepath, post)
 
     async def delete_session(
         self, session_id: str, context_type: str = "chat", project_id: str | None = None
@@ -1174,11 +1182,15 @@ class ConversationStorage:
             raise FileNotFoundError(f"Session {session_id} not found")
 
         filepath.unlink()
+        self._path_resolver.session_index.forget(filepath)
+        await asyncio.to_thread(self._catalog.remove, filepath)
+        self._session_cache.discard(filepath)
 
         # Also delete sidecar .compare.json if it exists
         compare_path = filepath.with_suffix(".compare.json")
         if compare_path.exists():
             compare_path.unlink()
+        discard_overlay(filepath)
 
     async def move_session(
         self,
@@ -1233,6 +1245,14 @@ class ConversationStorage:
         shutil.move(str(source_path), str(target_path))
         if source_compare_path.exists():
             shutil.move(str(source_compare_path), str(target_compare_path))
+        source_meta_path = meta_sidecar_path(source_path)
+        if source_meta_path.exists():
+            shutil.move(str(source_meta_path), str(meta_sidecar_path(target_path)))
+        self._path_resolver.session_index.forget(source_path)
+        self._path_resolver.session_index.record(target_path, session_id)
+        await asyncio.to_thread(self._catalog.remove, source_path)
+        self._session_cache.discard(source_path)
+        await asyncio.to_thread(self._catalog.refresh_file, target_path)
 
         # Move lock reference to new path if present
         old_key = str(source_path)
@@ -1276,10 +1296,7 @@ class ConversationStorage:
         target_dir = self._get_conversation_dir(target_context_type, target_project_id)
         target_dir.mkdir(parents=True, exist_ok=True)
 
-        async with aiofiles.open(source_path, encoding="utf-8") as f:
-            file_content = await f.read()
-
-        post = frontmatter.loads(file_content)
+        post = await read_post(source_path)
         new_session_id = str(uuid.uuid4())
         post.metadata["session_id"] = new_session_id
         post.metadata["created_at"] = datetime.now().isoformat()
@@ -1293,8 +1310,8 @@ class ConversationStorage:
         filename = f"{timestamp}_{new_session_id[:8]}.md"
         target_path = target_dir / filename
 
-        async with aiofiles.open(target_path, "w", encoding="utf-8") as f:
-            await f.write(frontmatter.dumps(post))
+        await self._write_session(target_path, post, reindex_messages=True)
+        self._path_resolver.session_index.record(target_path, new_session_id)
 
         source_compare_path = source_path.with_suffix(".compare.json")
         if source_compare_path.exists():
@@ -1319,47 +1336,102 @@ class ConversationStorage:
 
                     if post.metadata.get("temporary", False):
                         filepath.unlink()
+                        self._path_resolver.session_index.forget(filepath)
+                        self._catalog.remove(filepath)
+                        self._session_cache.discard(filepath)
                         compare_path = filepath.with_suffix(".compare.json")
                         if compare_path.exists():
                             compare_path.unlink()
+                        discard_overlay(filepath)
                         cleaned += 1
                 except Exception:
                     continue
 
         # Scan project directories via project root resolver
-        if self._project_root_resolver:
-            try:
-                import yaml
-
-                from src.core.config import settings
-
-                config_path = settings.projects_config_path
-                if config_path.exists():
-                    with open(config_path, encoding="utf-8") as f:
-                        data = yaml.safe_load(f)
-                    if data:
-                        for proj in data.get("projects", []):
-                            root_path = proj.get("root_path")
-                            if root_path:
-                                proj_conv_dir = Path(root_path) / ".lex_mint" / "conversations"
-                                if proj_conv_dir.exists():
-                                    for filepath in proj_conv_dir.glob("*.md"):
-                                        try:
-                                            with open(filepath, encoding="utf-8") as f:
-                                                post = frontmatter.load(f)
-                                            if post.metadata.get("temporary", False):
-                                                filepath.unlink()
-                                                compare_path = filepath.with_suffix(".compare.json")
-                                                if compare_path.exists():
-                                                    compare_path.unlink()
-                                                cleaned += 1
-                                        except Exception:
-                                            continue
-            except Exception:
-                pass
+        for proj_conv_dir in self._project_conversation_dirs():
+            for filepath in proj_conv_dir.glob("*.md"):
+                try:
+                    with open(filepath, encoding="utf-8") as f:
+                        post = frontmatter.load(f)
+                    if post.metadata.get("temporary", False):
+                        filepath.unlink()
+                        self._path_resolver.session_index.forget(filepath)
+                        self._catalog.remove(filepath)
+                        self._session_cache.discard(filepath)
+                        compare_path = filepath.with_suffix(".compare.json")
+                        if compare_path.exists():
+                            compare_path.unlink()
+                        discard_overlay(filepath)
+                        cleaned += 1
+                except Exception:
+                    continue
 
         return cleaned
 
+    async def compact_session(
+        self, session_id: str, context_type: str = "chat", project_id: str | None = None
+    ) -> bool:
+        """Fold a session's append-path sidecar counters back into its frontmatter.
+
+        Args:
+            session_id: Session UUID
+            context_type: Context type ("chat" or "project")
+            project_id: Project ID (required when context_type="project")
+
+        Returns:
+            True if a sidecar was compacted, False if there was nothing to do
+
+        Raises:
+            FileNotFoundError: If session doesn't exist
+        """
+        filepath = await self._find_session_file(session_id, context_type, project_id)
+        if not filepath:
+            raise FileNotFoundError(f"Session {session_id} not found")
+        return await self._compact_file(filepath)
+
+    async def compact_sessions(
+        self, context_type: str | None = None, project_id: str | None = None
+    ) -> int:
+        """Compact every pending sidecar in one or all context directories.
+
+        Called at backend startup so long-lived sessions converge back to
+        self-contained markdown files.
+
+        Args:
+            context_type: Context type to compact; ``None`` compacts the chat
+                directory and every known project conversation directory
+            project_id: Project ID (required when context_type="project")
+
+        Returns:
+            Number of sessions compacted
+        """
+        if context_type is None:
+            conversation_dirs = [self.conversations_dir / "chat"]
+            conversation_dirs.extend(self._project_conversation_dirs())
+        else:
+            conversation_dirs = [self._get_conversation_dir(context_type, project_id)]
+
+        compacted = 0
+        for conversation_dir in conversation_dirs:
+            if not conversation_dir.exists():
+                continue
+            for filepath in conversation_dir.glob("*.md"):
+                try:
+                    if await self._compact_file(filepath):
+                        compacted += 1
+                except Exception as e:
+                    print(f"Warning: Failed to compact session file {filepath}: {e}")
+                    continue
+        return compacted
+
+    async def _compact_file(self, filepath: Path) -> bool:
+        if not meta_sidecar_path(filepath).exists():
+            return False
+        async with self._get_file_lock(filepath):
+            post = await read_post(filepath)
+            await self._write_session(filepath, post)
+        return True
+
     async def convert_to_permanent(
         self, session_id: str, context_type: str = "chat", project_id: str | None = None
     ):
@@ -1379,17 +1451,13 @@ class ConversationStorage:
         if not filepath:
             raise FileNotFoundError(f"Session {session_id} not found")
 
-        async with aiofiles.open(filepath, encoding="utf-8") as f:
-            file_content = await f.read()
-
-        post = frontmatter.loads(file_content)
+        post = await read_post(filepath)
 
         # Remove temporary flag
         if "temporary" in post.metadata:
             del post.metadata["temporary"]
 
-        async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-            await f.write(frontmatter.dumps(post))
+        await self._write_session(filepath, post)
 
     async def update_session_target(
         self,
@@ -1406,9 +1474,7 @@ class ConversationStorage:
         if not filepath:
             raise FileNotFoundError(f"Session {session_id} not found")
 
-        async with aiofiles.open(filepath, encoding="utf-8") as f:
-            file_content = await f.read()
-        post = frontmatter.loads(file_content)
+        post = await read_post(filepath)
 
         await self._target_resolver.apply_target_metadata(
             post,
@@ -1417,8 +1483,7 @@ class ConversationStorage:
             model_id=model_id,
         )
 
-        async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-            await f.write(frontmatter.dumps(post))
+        await self._write_session(filepath, post)
 
     async def update_session_model(
         self,
@@ -1539,6 +1604,33 @@ class ConversationStorage:
         """
         return self._path_resolver.get_conversation_dir(context_type, project_id)
 
+    def _project_conversation_dirs(self) -> list[Path]:
+        """Return the existing conversation directories of all configured projects."""
+        if not self._project_root_resolver:
+            return []
+        try:
+            import yaml
+
+            from src.core.config import settings
+
+            config_path = settings.projects_config_path
+            if not config_path.exists():
+                return []
+            with open(config_path, encoding="utf-8") as f:
+                data = yaml.safe_load(f)
+        except Exception:
+            return []
+
+        directories: list[Path] = []
+        for proj in (data or {}).get("projects", []) or []:
+            root_path = proj.get("root_path") if isinstance(proj, dict) else None
+            if not root_path:
+                continue
+            proj_conv_dir = Path(root_path) / ".lex_mint" / "conversations"
+            if proj_conv_dir.exists():
+                directories.append(proj_conv_dir)
+        return directories
+
     async def _find_session_file(
         self, session_id: str, context_type: str = "chat", project_id: str | None = None
     ) -> Path | None:
@@ -1557,118 +1649,21 @@ class ConversationStorage:
         """
         return await self._path_resolver.find_session_file(session_id, context_type, project_id)
 
-    def _parse_messages(self, content: str, session_id: str) -> list[dict]:
+    def _parse_messages(
+        self, content: str, session_id: str, last_n: int | None = None
+    ) -> list[dict]:
         """Parse messages from markdown content.
 
         Args:
             content: Markdown body content (without frontmatter)
             session_id: Session ID for generating fallback message IDs
+            last_n: Only parse the last N messages when set
 
         Returns:
             List of message dicts:
             [{"role": "user/assistant", "content": "...", "message_id": "...", "attachments": [...], "usage": {...}, "cost": {...}}, ...]
         """
-        messages: list[dict[str, Any]] = []
-        lines = content.split("\n")
-        current_message: dict[str, Any] | None = None
-
-        for line in lines:
-            # Detect message headers (## User/Assistant/Separator/Summary (timestamp))
-            if (
-                line.startswith("## User (")
-                or line.startswith("## Assistant (")
-                or line.startswith("## Separator (")
-                or line.startswith("## Summary (")
-            ):
-                # Save previous message
-                if current_message:
-                    messages.append(current_message)
-
-                # Start new message
-                if line.startswith("## User"):
-                    role = "user"
-                elif line.startswith("## Assistant"):
-                    role = "assistant"
-                elif line.startswith("## Summary"):
-                    role = "summary"
-                else:  # Separator
-                    role = "separator"
-
-                # Extract timestamp from header
-                ts_match = re.search(r"\((\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\)", line)
-                created_at = ts_match.group(1) if ts_match else None
-
-                current_message = {"role": role, "content": "", "created_at": created_at}
-            elif current_message is not None:
-                # Parse usage/cost/attachment/message_id HTML comments
-                usage_match = re.match(r"^<!-- usage: (.+) -->$", line.strip())
-                cost_match = re.match(r"^<!-- cost: (.+) -->$", line.strip())
-                attachment_match = re.match(r"^<!-- attachment: (.+) -->$", line.strip())
-                message_id_match = re.match(r'^<!-- message_id: "(.+)" -->$', line.strip())
-                assistant_id_match = re.match(r'^<!-- assistant_id: "(.+)" -->$', line.strip())
-                sources_match = re.match(r"^<!-- sources: (.+) -->$", line.strip())
-                compression_meta_match = re.match(
-                    r"^<!-- compression_meta: (.+) -->$", line.strip()
-                )
-
-                if usage_match:
-                    try:
-                        current_message["usage"] = json.loads(usage_match.group(1))
-                    except json.JSONDecodeError:
-                        pass
-                elif cost_match:
-                    try:
-                        current_message["cost"] = json.loads(cost_match.group(1))
-                    except json.JSONDecodeError:
-                        pass
-                elif attachment_match:
-                    try:
-                        if "attachments" not in current_message:
-                            current_message["attachments"] = []
-                        attachments = current_message["attachments"]
-                        if not isinstance(attachments, list):
-                            attachments = []
-                            current_message["attachments"] = attachments
-                        attachments.append(json.loads(attachment_match.group(1)))
-                    except json.JSONDecodeError:
-                        pass
-                elif message_id_match:
-                    current_message["message_id"] = message_id_match.group(1)
-                elif assistant_id_match:
-                    current_message["assistant_id"] = assistant_id_match.group(1)
-                elif sources_match:
-                    try:
-                        current_message["sources"] = json.loads(sources_match.group(1))
-                    except json.JSONDecodeError:
-                        pass
-                elif compression_meta_match:
-                    try:
-                        current_message["compression_meta"] = json.loads(
-                            compression_meta_match.group(1)
-                        )
-                    except json.JSONDecodeError:
-                        pass
-                else:
-                    # Append line to current message content
-                    # Skip empty lines at the start
-                    content_value = current_message.get("content")
-                    if not isinstance(content_value, str):
-                        content_value = ""
-                    if content_value or line.strip():
-                        current_message["content"] = content_value + line + "\n"
-
-        # Save last message
-        if current_message:
-            messages.append(current_message)
-
-        # Clean up: strip trailing whitespace and generate fallback message IDs
-        for index, msg in enumerate(messages):
-            msg["content"] = str(msg.get("content", "")).strip()
-            # Generate fallback UUID if message_id not found.
-            if "message_id" not in msg:
-                msg["message_id"] = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{session_id}:{index}"))
-
-        return messages
+        return parse_messages(content, session_id, last_n=last_n)
 
 
 def create_storage_with_project_resolver(
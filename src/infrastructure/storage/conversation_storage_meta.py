@@ -0,0 +1,155 @@
+"""Sidecar metadata overlay for append-only conversation writes.
+
+Appending a message only needs to touch a handful of frontmatter counters
+(``current_step``, ``total_usage``, ``total_cost`` and the auto-generated
+``title``). Instead of re-serializing the whole markdown file for every turn,
+those fields are kept in a small ``.meta.json`` file next to the session and
+overlaid on the frontmatter when the session is read. Any full rewrite of the
+markdown file folds the overlay back into the frontmatter (compaction).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import aiofiles
+import frontmatter
+import yaml
+
+META_SIDECAR_SUFFIX = ".meta.json"
+
+# Frontmatter keys that the append path is allowed to keep in the sidecar.
+OVERLAY_KEYS = ("title", "current_step", "total_usage", "total_cost")
+
+
+def meta_sidecar_path(md_path: Path) -> Path:
+    """Return the sidecar path for a conversation markdown file."""
+    return md_path.with_suffix(META_SIDECAR_SUFFIX)
+
+
+def stat_signature(md_path: Path) -> tuple[int, int, int]:
+    """Return ``(mtime_ns, size, sidecar mtime_ns)`` used to detect file changes."""
+    stat = md_path.stat()
+    try:
+        meta_mtime_ns = meta_sidecar_path(md_path).stat().st_mtime_ns
+    except OSError:
+        meta_mtime_ns = 0
+    return stat.st_mtime_ns, stat.st_size, meta_mtime_ns
+
+
+def read_frontmatter_header(md_path: Path) -> dict[str, Any]:
+    """Parse only the YAML frontmatter block, without reading the message body."""
+    lines: list[str] = []
+    with open(md_path, encoding="utf-8") as f:
+        first = f.readline()
+        if first.strip() != "---":
+            return {}
+        for line in f:
+            if line.rstrip() == "---":
+                break
+            lines.append(line)
+        else:
+            return {}
+    data = yaml.safe_load("".join(lines))
+    return data if isinstance(data, dict) else {}
+
+
+def _filter_overlay(data: Any) -> dict[str, Any]:
+    if not isinstance(data, dict):
+        return {}
+    return {key: data[key] for key in OVERLAY_KEYS if key in data}
+
+
+def _apply_overlay(post: frontmatter.Post, overlay: dict[str, Any]) -> frontmatter.Post:
+    if overlay:
+        metadata = dict(post.metadata or {})
+        metadata.update(overlay)
+        post.metadata = metadata
+    return post
+
+
+async def load_overlay(md_path: Path) -> dict[str, Any]:
+    """Load sidecar overlay values, or an empty dict when none exist."""
+    sidecar = meta_sidecar_path(md_path)
+    if not sidecar.exists():
+        return {}
+    try:
+        async with aiofiles.open(sidecar, encoding="utf-8") as f:
+            data = json.loads(await f.read())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return _filter_overlay(data)
+
+
+def load_overlay_sync(md_path: Path) -> dict[str, Any]:
+    """Synchronous variant of ``load_overlay`` for thread/offline callers."""
+    sidecar = meta_sidecar_path(md_path)
+    if not sidecar.exists():
+        return {}
+    try:
+        with open(sidecar, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return _filter_overlay(data)
+
+
+async def save_overlay(md_path: Path, overlay: dict[str, Any]) -> None:
+    """Atomically persist overlay values beside the markdown file."""
+    sidecar = meta_sidecar_path(md_path)
+    temp_path = sidecar.with_suffix(".json.tmp")
+    payload = {key: overlay[key] for key in OVERLAY_KEYS if key in overlay}
+    async with aiofiles.open(temp_path, "w", encoding="utf-8") as f:
+        await f.write(json.dumps(payload, ensure_ascii=False))
+    os.replace(temp_path, sidecar)
+
+
+def discard_overlay(md_path: Path) -> None:
+    """Remove the sidecar after its values were folded into the frontmatter."""
+    sidecar = meta_sidecar_path(md_path)
+    if sidecar.exists():
+        sidecar.unlink()
+
+
+async def load_counters(md_path: Path) -> dict[str, Any]:
+    """Return the current overlay-able metadata values for the append path.
+
+    Prefers the sidecar; otherwise falls back to the frontmatter header so the
+    message body never has to be read.
+    """
+    overlay = await load_overlay(md_path)
+    if overlay:
+        return overlay
+    header = await asyncio.to_thread(read_frontmatter_header, md_path)
+    return {key: header[key] for key in OVERLAY_KEYS if key in header}
+
+
+async def read_post(md_path: Path) -> frontmatter.Post:
+    """Load a conversation file with sidecar overlay values applied."""
+    async with aiofiles.open(md_path, encoding="utf-8") as f:
+        content = await f.read()
+    return _apply_overlay(frontmatter.loads(content), await load_overlay(md_path))
+
+
+def read_post_sync(md_path: Path) -> frontmatter.Post:
+    """Synchronous variant of ``read_post``."""
+    with open(md_path, encoding="utf-8") as f:
+        content = f.read()
+    return _apply_overlay(frontmatter.loads(content), load_overlay_sync(md_path))
+
+
+async def write_post(md_path: Path, post: frontmatter.Post) -> None:
+    """Rewrite a conversation file and compact any pending sidecar overlay."""
+    async with aiofiles.open(md_path, "w", encoding="utf-8") as f:
+        await f.write(frontmatter.dumps(post))
+    discard_overlay(md_path)
+
+
+async def append_body(md_path: Path, text: str) -> None:
+    """Append raw markdown to the end of the message body."""
+    async with aiofiles.open(md_path, "a", encoding="utf-8") as f:
+        await f.write(text)
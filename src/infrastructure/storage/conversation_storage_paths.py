@@ -2,10 +2,157 @@
 
 from __future__ import annotations
 
+import json
+import os
 from collections.abc import Callable
+from dataclasses import dataclass, field
 from pathlib import Path
 
-import frontmatter
+from .conversation_storage_meta import read_frontmatter_header
+
+SESSION_INDEX_FILENAME = ".session_index.json"
+_SESSION_INDEX_VERSION = 1
+
+
+@dataclass
+class _DirectoryIndex:
+    """In-memory view of one directory's persisted session index."""
+
+    files: dict[str, str | None] = field(default_factory=dict)
+    by_session: dict[str, str] = field(default_factory=dict)
+    dir_mtime_ns: int = -1
+    dirty: bool = False
+
+    def put(self, filename: str, session_id: str | None) -> None:
+        previous = self.files.get(filename)
+        if previous and self.by_session.get(previous) == filename:
+            del self.by_session[previous]
+        self.files[filename] = session_id
+        if session_id:
+            self.by_session[session_id] = filename
+        self.dirty = True
+
+    def drop(self, filename: str) -> None:
+        session_id = self.files.pop(filename, None)
+        if session_id and self.by_session.get(session_id) == filename:
+            del self.by_session[session_id]
+        self.dirty = True
+
+
+class SessionPathIndex:
+    """Persistent session_id -> filename index, one JSON file per conversation directory.
+
+    Hits are verified with a single ``exists`` check. Misses rescan the
+    directory only when its mtime moved since the last scan, and only read the
+    frontmatter header of files the index has not seen yet, so stale or
+    externally edited directories heal themselves on the next lookup.
+    """
+
+    def __init__(self) -> None:
+        self._dirs: dict[str, _DirectoryIndex] = {}
+
+    def lookup(self, directory: Path, session_id: str) -> Path | None:
+        index = self._load(directory)
+        found = self._resolve(directory, index, session_id)
+        if found is None and index.dir_mtime_ns != self._dir_mtime_ns(directory):
+            self._refresh(directory, index)
+            found = self._resolve(directory, index, session_id)
+        self._persist(directory, index)
+        return found
+
+    def record(self, path: Path, session_id: str) -> None:
+        """Register a session file created or moved by the storage layer."""
+        index = self._load(path.parent)
+        index.put(path.name, session_id)
+        self._persist(path.parent, index)
+
+    def forget(self, path: Path) -> None:
+        """Drop a session file removed or moved away by the storage layer."""
+        index = self._load(path.parent)
+        if path.name in index.files:
+            index.drop(path.name)
+            self._persist(path.parent, index)
+
+    def _resolve(self, directory: Path, index: _DirectoryIndex, session_id: str) -> Path | None:
+        filename = index.by_session.get(session_id)
+        if not filename:
+            return None
+        candidate = directory / filename
+        if candidate.exists():
+            return candidate
+        index.drop(filename)
+        return None
+
+    def _refresh(self, directory: Path, index: _DirectoryIndex) -> None:
+        present = {
+            entry.name
+            for entry in os.scandir(directory)
+            if entry.name.endswith(".md") and entry.is_file()
+        }
+        for filename in list(index.files):
+            if filename not in present:
+                index.drop(filename)
+        for filename in present - index.files.keys():
+            try:
+                session_id = read_frontmatter_header(directory / filename).get("session_id")
+            except Exception:
+                session_id = None
+            index.put(filename, session_id if isinstance(session_id, str) else None)
+        index.dir_mtime_ns = self._dir_mtime_ns(directory)
+        index.dirty = True
+
+    def _load(self, directory: Path) -> _DirectoryIndex:
+        key = str(directory)
+        index = self._dirs.get(key)
+        if index is not None:
+            return index
+
+        index = _DirectoryIndex()
+        try:
+            with open(directory / SESSION_INDEX_FILENAME, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == _SESSION_INDEX_VERSION:
+                for filename, session_id in dict(data.get("files") or {}).items():
+                    index.put(str(filename), session_id if isinstance(session_id, str) else None)
+                index.dir_mtime_ns = int(data.get("dir_mtime_ns", -1))
+        except (OSError, ValueError, TypeError, AttributeError):
+            pass
+        index.dirty = False
+        self._dirs[key] = index
+        return index
+
+    def _persist(self, directory: Path, index: _DirectoryIndex) -> None:
+        if not index.dirty:
+            return
+        # Writing the index touches the directory itself; only a scan that was
+        # current before the write stays current after it.
+        scan_was_current = index.dir_mtime_ns == self._dir_mtime_ns(directory)
+        index_path = directory / SESSION_INDEX_FILENAME
+        temp_path = index_path.with_suffix(".json.tmp")
+        payload = {
+            "version": _SESSION_INDEX_VERSION,
+            "dir_mtime_ns": index.dir_mtime_ns,
+            "files": index.files,
+        }
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(temp_path, index_path)
+        except OSError:
+            return
+        index.dirty = False
+        if scan_was_current:
+            index.dir_mtime_ns = self._dir_mtime_ns(directory)
+
+    @staticmethod
+    def _dir_mtime_ns(directory: Path) -> int:
+        try:
+            return directory.stat().st_mtime_ns
+        except OSError:
+            return -1
+
+
+_shared_session_index = SessionPathIndex()
 
 
 class StoragePathResolver:
@@ -15,9 +162,11 @@ class StoragePathResolver:
         self,
         conversations_dir: Path,
         project_root_resolver: Callable[[str], str | None] | None = None,
+        session_index: SessionPathIndex | None = None,
     ):
         self.conversations_dir = Path(conversations_dir)
         self.project_root_resolver = project_root_resolver
+        self.session_index = session_index or _shared_session_index
 
     def get_conversation_dir(
         self, context_type: str = "chat", project_id: str | None = None
@@ -53,25 +202,7 @@ class StoragePathResolver:
         if not search_dir.exists():
             return None
 
-        for filepath in search_dir.glob(f"*_{session_id[:8]}.md"):
-            try:
-                with open(filepath, encoding="utf-8") as f:
-                    post = frontmatter.load(f)
-                if post.metadata.get("session_id") == session_id:
-                    return filepath
-            except Exception:
-                continue
-
-        for filepath in search_dir.glob("*.md"):
-            try:
-                with open(filepath, encoding="utf-8") as f:
-                    post = frontmatter.load(f)
-                if post.metadata.get("session_id") == session_id:
-                    return filepath
-            except Exception:
-                continue
-
-        return None
+        return self.session_index.lookup(search_dir, session_id)
 
 
 def build_project_root_resolver(project_service: object) -> Callable[[str], str | None]:
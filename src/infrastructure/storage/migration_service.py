@@ -48,7 +48,11 @@ def _cleanup_empty_dir(path: Path) -> None:
 
 
 def _iter_project_files(project_dir: Path) -> list[Path]:
-    return list(project_dir.glob("*.md")) + list(project_dir.glob("*.compare.json"))
+    return (
+        list(project_dir.glob("*.md"))
+        + list(project_dir.glob("*.compare.json"))
+        + list(project_dir.glob("*.meta.json"))
+    )
 
 
 def _resolve_target_dir(
@@ -140,8 +144,8 @@ def migrate_project_conversations(conversations_dir: Path) -> dict[str, int]:
     """Migrate project conversations from central storage to project directories.
 
     Reads projects_config.yaml to build project_id -> root_path map, then moves
-    all .md and .compare.json files from conversations/projects/{project_id}/
-    to {root_path}/.lex_mint/conversations/.
+    all .md and sidecar (.compare.json, .meta.json) files from
+    conversations/projects/{project_id}/ to {root_path}/.lex_mint/conversations/.
 
     Args:
         conversations_dir: Base conversations directory (e.g. "conversations")
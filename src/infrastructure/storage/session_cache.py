@@ -0,0 +1,234 @@
+"""In-process LRU cache of parsed conversation sessions.
+
+A chat turn loads the session once for context assembly and then appends
+several messages to it. Re-reading and re-parsing the markdown file for each
+of those steps dominates storage time on long sessions, so parsed sessions
+(frontmatter metadata plus message list) are kept in memory.
+
+Entries are validated against the file's ``(mtime_ns, size)`` and its sidecar
+mtime on every lookup, so edits made outside the storage layer are picked up.
+Storage mutations update entries in place instead of dropping them.
+"""
+
+from __future__ import annotations
+
+import copy
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+from .conversation_storage_meta import stat_signature
+
+Signature = tuple[int, int, int]
+
+DEFAULT_SESSION_CACHE_MAX_MB = 64
+
+# Rough per-message bookkeeping overhead on top of the content length.
+_MESSAGE_OVERHEAD_BYTES = 256
+_ENTRY_OVERHEAD_BYTES = 1024
+
+
+@dataclass
+class _CachedSession:
+    signature: Signature
+    metadata: dict[str, Any]
+    messages: list[dict[str, Any]]
+    size: int
+
+
+def _estimate_size(messages: list[dict[str, Any]]) -> int:
+    return _ENTRY_OVERHEAD_BYTES + sum(
+        len(str(message.get("content", ""))) + _MESSAGE_OVERHEAD_BYTES for message in messages
+    )
+
+
+def current_signature(md_path: Path) -> Signature | None:
+    """Return the file signature, or ``None`` when the file is missing."""
+    try:
+        return stat_signature(md_path)
+    except OSError:
+        return None
+
+
+class ParsedSessionCache:
+    """Memory-capped LRU of parsed sessions keyed by markdown file path."""
+
+    def __init__(self, max_bytes: int = DEFAULT_SESSION_CACHE_MAX_MB * 1024 * 1024):
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries: OrderedDict[str, _CachedSession] = OrderedDict()
+        self._lock = Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _lookup_locked(self, key: str, signature: Signature | None) -> _CachedSession | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.signature != signature:
+            self._drop_locked(key)
+            self.invalidations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _drop_locked(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _store_locked(self, key: str, entry: _CachedSession) -> None:
+        self._drop_locked(key)
+        if entry.size > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._drop_locked(oldest)
+            self.evictions += 1
+
+    def get(self, md_path: Path) -> tuple[dict[str, Any], list[dict[str, Any]]] | None:
+        """Return copies of cached ``(metadata, messages)`` if still current."""
+        key = str(md_path)
+        signature = current_signature(md_path)
+        with self._lock:
+            entry = self._lookup_locked(key, signature)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return copy.deepcopy(entry.metadata), copy.deepcopy(entry.messages)
+
+    def get_metadata(self, md_path: Path) -> tuple[Signature, dict[str, Any]] | None:
+        """Return the validated signature and a copy of the cached metadata."""
+        key = str(md_path)
+        signature = current_signature(md_path)
+        with self._lock:
+            entry = self._lookup_locked(key, signature)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry.signature, copy.deepcopy(entry.metadata)
+
+    def is_current(self, md_path: Path) -> bool:
+        """Whether an entry exists and still matches the file on disk."""
+        key = str(md_path)
+        signature = current_signature(md_path)
+        with self._lock:
+            return self._lookup_locked(key, signature) is not None
+
+    def put(
+        self,
+        md_path: Path,
+        metadata: dict[str, Any],
+        messages: list[dict[str, Any]],
+        signature: Signature | None = None,
+    ) -> None:
+        """Cache a freshly read or written session.
+
+        Readers should pass the signature taken *before* reading the file so a
+        concurrent external write is detected on the next lookup.
+        """
+        if signature is None:
+            signature = current_signature(md_path)
+        if signature is None or self.max_bytes <= 0:
+            self.discard(md_path)
+            return
+        entry = _CachedSession(
+            signature=signature,
+            metadata=copy.deepcopy(metadata),
+            messages=copy.deepcopy(messages),
+            size=_estimate_size(messages),
+        )
+        with self._lock:
+            self._store_locked(str(md_path), entry)
+
+    def update_metadata(self, md_path: Path, metadata: dict[str, Any]) -> None:
+        """Replace the metadata of an entry after a metadata-only rewrite."""
+        key = str(md_path)
+        signature = current_signature(md_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            if signature is None:
+                self._drop_locked(key)
+                return
+            entry.signature = signature
+            entry.metadata = copy.deepcopy(metadata)
+
+    def apply_append(
+        self,
+        md_path: Path,
+        previous_signature: Signature,
+        metadata_updates: dict[str, Any],
+        messages: list[dict[str, Any]],
+    ) -> bool:
+        """Extend an entry with appended messages.
+
+        The entry is only updated when it still carries ``previous_signature``
+        (the state validated before the append); otherwise it is dropped.
+        """
+        key = str(md_path)
+        signature = current_signature(md_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            if signature is None or entry.signature != previous_signature:
+                self._drop_locked(key)
+                self.invalidations += 1
+                return False
+            self._drop_locked(key)
+            entry.signature = signature
+            entry.metadata.update(copy.deepcopy(metadata_updates))
+            entry.messages.extend(copy.deepcopy(messages))
+            entry.size += _estimate_size(messages) - _ENTRY_OVERHEAD_BYTES
+            self._store_locked(key, entry)
+            return True
+
+    def discard(self, md_path: Path) -> None:
+        """Forget a session (deleted, moved or rewritten without a parse)."""
+        with self._lock:
+            self._drop_locked(str(md_path))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and current memory usage."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+_shared_session_cache: ParsedSessionCache | None = None
+_shared_session_cache_lock = Lock()
+
+
+def get_session_cache() -> ParsedSessionCache:
+    """Return the process-wide parsed-session cache."""
+    global _shared_session_cache
+    with _shared_session_cache_lock:
+        if _shared_session_cache is None:
+            from src.core.config import settings
+
+            _shared_session_cache = ParsedSessionCache(
+                max_bytes=settings.session_cache_max_mb * 1024 * 1024
+            )
+        return _shared_session_cache
@@ -0,0 +1,579 @@
+"""SQLite catalog of conversation session summaries and message search index.
+
+The sidebar only needs a few frontmatter fields plus message counts per
+session. The catalog keeps those in one table keyed by (directory, filename)
+so ``list_sessions`` can page through sorted rows instead of parsing every
+markdown file. Titles and message bodies are also indexed in an FTS5 table
+(tokenized with the CJK-aware BM25 tokenizer) for ranked session search.
+Rows are written by ConversationStorage mutations and reconciled against
+file stat signatures for anything changed out of band.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+import frontmatter
+
+from .conversation_markdown import parse_messages
+from .conversation_storage_meta import read_post_sync, stat_signature
+
+logger = logging.getLogger(__name__)
+
+_COUNTED_HEADER_RE = re.compile(r"^## (?:User|Assistant) \(", re.MULTILINE)
+
+# Bump when the schema or indexed content changes; older catalogs are rebuilt.
+_SCHEMA_VERSION = 2
+
+_SEARCH_CONTEXT_BEFORE = 30
+_SEARCH_CONTEXT_AFTER = 50
+_SEARCH_HITS_PER_SESSION = 3
+_SEARCHABLE_ROLES = frozenset({"user", "assistant", "summary"})
+
+SORT_COLUMNS = {
+    "updated_at": "mtime_ns",
+    "created_at": "created_at",
+}
+
+
+def count_catalog_messages(body: str) -> int:
+    """Count user/assistant message headers in a markdown body."""
+    return len(_COUNTED_HEADER_RE.findall(body or ""))
+
+
+def tokenize_for_search(text: str) -> list[str]:
+    """Tokenize text with the retrieval BM25 tokenizer (jieba for CJK)."""
+    from src.infrastructure.retrieval.bm25_service import Bm25Service
+
+    return Bm25Service.tokenize_text(text)
+
+
+def build_search_match(query: str) -> str:
+    """Build an FTS5 MATCH expression requiring every query token."""
+    tokens = tokenize_for_search(query)
+    return " ".join('"' + tok.replace('"', '""') + '"' for tok in dict.fromkeys(tokens))
+
+
+def _match_context(text: str, query: str, tokens: list[str]) -> str:
+    """Return a short excerpt around the first query occurrence in ``text``."""
+    lowered = text.lower()
+    idx = lowered.find(query.lower().strip())
+    needle_len = len(query.strip())
+    if idx == -1:
+        for tok in tokens:
+            idx = lowered.find(tok)
+            if idx != -1:
+                needle_len = len(tok)
+                break
+    if idx == -1:
+        idx, needle_len = 0, 0
+    start = max(0, idx - _SEARCH_CONTEXT_BEFORE)
+    end = min(len(text), idx + needle_len + _SEARCH_CONTEXT_AFTER)
+    snippet = text[start:end].replace("\n", " ").strip()
+    if start > 0:
+        snippet = "..." + snippet
+    if end < len(text):
+        snippet = snippet + "..."
+    return snippet
+
+
+class SessionCatalog:
+    """Persist per-session summary rows for fast, paginated session listing."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        # Directory mtime observed at the last reconcile, per directory.
+        self._reconciled_dirs: dict[str, int] = {}
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS session_catalog (
+                    directory TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    session_id TEXT,
+                    title TEXT,
+                    created_at TEXT,
+                    folder_id TEXT,
+                    group_assistants TEXT,
+                    group_mode TEXT,
+                    group_settings TEXT,
+                    temporary INTEGER NOT NULL DEFAULT 0,
+                    message_count INTEGER NOT NULL DEFAULT 0,
+                    mtime_ns INTEGER NOT NULL DEFAULT 0,
+                    size INTEGER NOT NULL DEFAULT 0,
+                    meta_mtime_ns INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (directory, filename)
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_session_catalog_updated
+                ON session_catalog (directory, mtime_ns DESC)
+                """
+            )
+            # One row per indexed title/message; the FTS table shares its rowid.
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS session_messages (
+                    id INTEGER PRIMARY KEY,
+                    directory TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    message_id TEXT,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_session_messages_file
+                ON session_messages (directory, filename)
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS session_messages_fts
+                USING fts5(tokenized, tokenize='unicode61')
+                """
+            )
+            version = int(self._conn.execute("PRAGMA user_version").fetchone()[0])
+            if version < _SCHEMA_VERSION:
+                # Force a full re-catalog on the next reconcile.
+                self._conn.execute("DELETE FROM session_catalog")
+                self._conn.execute("DELETE FROM session_messages")
+                self._conn.execute("DELETE FROM session_messages_fts")
+                self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            self._conn.commit()
+
+    def upsert_post(
+        self,
+        md_path: Path,
+        post: frontmatter.Post,
+        *,
+        messages: list[dict[str, Any]] | None = None,
+    ) -> None:
+        """Record the summary of a session file the caller just wrote or parsed.
+
+        Args:
+            md_path: Session markdown path
+            post: Parsed post with overlay metadata applied
+            messages: Parsed messages to re-index for search; None keeps the
+                existing message rows (metadata-only writes)
+        """
+        try:
+            signature = stat_signature(md_path)
+        except OSError:
+            return
+        with self._lock:
+            self._upsert_locked(md_path, post, signature)
+            self._index_title_locked(md_path, str(post.metadata.get("title", "New Chat")))
+            if messages is not None:
+                self._delete_message_rows_locked(
+                    str(md_path.parent), md_path.name, roles_excluded=("title",)
+                )
+                for message in messages:
+                    if message.get("role") not in _SEARCHABLE_ROLES:
+                        continue
+                    self._insert_message_row_locked(
+                        md_path,
+                        message.get("message_id"),
+                        str(message.get("role", "")),
+                        str(message.get("content", "")),
+                    )
+            self._conn.commit()
+
+    def record_append(
+        self,
+        md_path: Path,
+        role: str,
+        title: str | None,
+        *,
+        message_id: str | None = None,
+        content: str | None = None,
+    ) -> None:
+        """Apply an append-only write without re-reading the session file."""
+        try:
+            mtime_ns, size, meta_mtime_ns = stat_signature(md_path)
+        except OSError:
+            return
+        increment = 1 if role in {"user", "assistant"} else 0
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT title FROM session_catalog WHERE directory = ? AND filename = ?",
+                (str(md_path.parent), md_path.name),
+            ).fetchone()
+            cursor = self._conn.execute(
+                """
+                UPDATE session_catalog
+                SET message_count = message_count + ?,
+                    title = COALESCE(?, title),
+                    mtime_ns = ?, size = ?, meta_mtime_ns = ?
+                WHERE directory = ? AND filename = ?
+                """,
+                (
+                    increment,
+                    title,
+                    mtime_ns,
+                    size,
+                    meta_mtime_ns,
+                    str(md_path.parent),
+                    md_path.name,
+                ),
+            )
+            if cursor.rowcount:
+                if title and previous is not None and previous["title"] != title:
+                    self._index_title_locked(md_path, title)
+                if content is not None and role in _SEARCHABLE_ROLES:
+                    self._insert_message_row_locked(md_path, message_id, role, content)
+            self._conn.commit()
+        if cursor.rowcount == 0:
+            self.refresh_file(md_path)
+
+    def refresh_file(self, md_path: Path) -> None:
+        """Re-parse one session file into the catalog and search index."""
+        try:
+            post = read_post_sync(md_path)
+            session_id = str(post.metadata.get("session_id") or md_path.stem)
+            messages = parse_messages(post.content, session_id)
+        except Exception as e:
+            logger.warning("Session catalog skipped unreadable file %s: %s", md_path, e)
+            self.remove(md_path)
+            return
+        self.upsert_post(md_path, post, messages=messages)
+
+    def remove(self, md_path: Path) -> None:
+        with self._lock:
+            self._remove_locked(str(md_path.parent), md_path.name)
+            self._conn.commit()
+
+    def reconcile(self, directory: Path, *, force: bool = False) -> int:
+        """Bring a directory's rows in line with the files on disk.
+
+        Only files whose (mtime, size, sidecar mtime) signature changed are
+        re-parsed. When the directory mtime is unchanged since the last pass,
+        the scan is skipped entirely unless ``force`` is set.
+
+        Returns:
+            Number of files (re)parsed
+        """
+        key = str(directory)
+        try:
+            dir_mtime_ns = directory.stat().st_mtime_ns
+        except OSError:
+            return 0
+        if not force and self._reconciled_dirs.get(key) == dir_mtime_ns:
+            return 0
+
+        with self._lock:
+            known = {
+                str(row["filename"]): (
+                    int(row["mtime_ns"]),
+                    int(row["size"]),
+                    int(row["meta_mtime_ns"]),
+                )
+                for row in self._conn.execute(
+                    "SELECT filename, mtime_ns, size, meta_mtime_ns FROM session_catalog "
+                    "WHERE directory = ?",
+                    (key,),
+                )
+            }
+
+        present: set[str] = set()
+        parsed = 0
+        for entry in os.scandir(directory):
+            if not entry.name.endswith(".md") or not entry.is_file():
+                continue
+            present.add(entry.name)
+            md_path = directory / entry.name
+            try:
+                signature = stat_signature(md_path)
+            except OSError:
+                continue
+            if known.get(entry.name) == signature:
+                continue
+            self.refresh_file(md_path)
+            parsed += 1
+
+        stale = [name for name in known if name not in present]
+        if stale:
+            with self._lock:
+                for name in stale:
+                    self._remove_locked(key, name)
+                self._conn.commit()
+
+        self._reconciled_dirs[key] = dir_mtime_ns
+        return parsed
+
+    def list_sessions(
+        self,
+        directory: Path,
+        *,
+        limit: int | None = None,
+        offset: int = 0,
+        sort_by: str = "updated_at",
+    ) -> list[dict[str, Any]]:
+        """Return non-temporary session summaries for a directory, newest first."""
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(
+                f"Invalid sort_by: {sort_by}. Must be one of {', '.join(SORT_COLUMNS)}"
+            )
+        self.reconcile(directory)
+
+        sql = (
+            "SELECT * FROM session_catalog "
+            "WHERE directory = ? AND temporary = 0 "
+            "AND session_id IS NOT NULL AND created_at IS NOT NULL "
+            f"ORDER BY {SORT_COLUMNS[sort_by]} DESC, filename DESC "
+            "LIMIT ? OFFSET ?"
+        )
+        safe_limit = -1 if limit is None else max(0, int(limit))
+        safe_offset = max(0, int(offset))
+        with self._lock:
+            rows = self._conn.execute(sql, (str(directory), safe_limit, safe_offset)).fetchall()
+        return [self._row_to_summary(row) for row in rows]
+
+    def search(
+        self,
+        directory: Path,
+        query: str,
+        *,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        """Rank non-temporary sessions in a directory by BM25 over titles and messages.
+
+        Every query token must appear in the same title or message. Results
+        carry up to three per-message hits (message_id/role) and a short
+        ``match_context`` excerpt from the best hit.
+        """
+        match_expr = build_search_match(query)
+        if not match_expr:
+            return []
+        self.reconcile(directory)
+
+        key = str(directory)
+        safe_limit = max(1, int(limit))
+        safe_offset = max(0, int(offset))
+        # CROSS JOIN pins the FTS match as the outer loop; otherwise the planner
+        # may drive from the directory index and re-run MATCH per message row.
+        with self._lock:
+            ranked = self._conn.execute(
+                """
+                SELECT hits.filename, MIN(hits.score) AS best_score
+                FROM (
+                    SELECT m.directory, m.filename, session_messages_fts.rank AS score
+                    FROM session_messages_fts
+                    CROSS JOIN session_messages m ON m.id = session_messages_fts.rowid
+                    WHERE session_messages_fts MATCH ? AND m.directory = ?
+                ) AS hits
+                JOIN session_catalog c
+                    ON c.directory = hits.directory AND c.filename = hits.filename
+                WHERE c.temporary = 0 AND c.session_id IS NOT NULL
+                GROUP BY hits.filename
+                ORDER BY best_score ASC, MAX(c.mtime_ns) DESC
+                LIMIT ? OFFSET ?
+                """,
+                (match_expr, key, safe_limit, safe_offset),
+            ).fetchall()
+            if not ranked:
+                return []
+            filenames = [str(row["filename"]) for row in ranked]
+            placeholders = ",".join("?" for _ in filenames)
+            hit_rows = self._conn.execute(
+                f"""
+                SELECT m.filename, m.message_id, m.role, m.content,
+                    bm25(session_messages_fts) AS score
+                FROM session_messages_fts
+                CROSS JOIN session_messages m ON m.id = session_messages_fts.rowid
+                WHERE session_messages_fts MATCH ? AND m.directory = ?
+                    AND m.filename IN ({placeholders})
+                ORDER BY score ASC
+                """,
+                (match_expr, key, *filenames),
+            ).fetchall()
+            summary_rows = self._conn.execute(
+                f"SELECT * FROM session_catalog WHERE directory = ? "
+                f"AND filename IN ({placeholders})",
+                (key, *filenames),
+            ).fetchall()
+
+        summaries = {str(row["filename"]): row for row in summary_rows}
+        hits_by_file: dict[str, list[sqlite3.Row]] = {}
+        for row in hit_rows:
+            hits_by_file.setdefault(str(row["filename"]), []).append(row)
+
+        tokens = tokenize_for_search(query)
+        results: list[dict[str, Any]] = []
+        for ranked_row in ranked:
+            filename = str(ranked_row["filename"])
+            summary = summaries.get(filename)
+            hits = hits_by_file.get(filename, [])
+            if summary is None or not hits:
+                continue
+            title_hit = next((hit for hit in hits if hit["role"] == "title"), None)
+            best_hit = title_hit or hits[0]
+            entry = {
+                key_name: value
+                for key_name, value in self._row_to_summary(summary).items()
+                if key_name in {"session_id", "title", "created_at", "updated_at", "message_count"}
+            }
+            entry["match_type"] = "title" if title_hit is not None else "content"
+            entry["match_context"] = (
+                str(summary["title"])
+                if title_hit is not None
+                else _match_context(str(best_hit["content"]), query, tokens)
+            )
+            entry["score"] = -float(ranked_row["best_score"])
+            entry["hits"] = [
+                {
+                    "message_id": hit["message_id"],
+                    "role": hit["role"],
+                    "score": -float(hit["score"]),
+                }
+                for hit in hits
+                if hit["role"] != "title"
+            ][:_SEARCH_HITS_PER_SESSION]
+            if entry["hits"]:
+                entry["message_id"] = entry["hits"][0]["message_id"]
+            results.append(entry)
+        return results
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _upsert_locked(
+        self, md_path: Path, post: frontmatter.Post, signature: tuple[int, int, int]
+    ) -> None:
+        metadata = post.metadata or {}
+        group_assistants = metadata.get("group_assistants")
+        created_at = metadata.get("created_at")
+        session_id = metadata.get("session_id")
+        folder_id = metadata.get("folder_id")
+        self._conn.execute(
+            """
+            INSERT OR REPLACE INTO session_catalog (
+                directory, filename, session_id, title, created_at, folder_id,
+                group_assistants, group_mode, group_settings, temporary,
+                message_count, mtime_ns, size, meta_mtime_ns
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                str(md_path.parent),
+                md_path.name,
+                str(session_id) if session_id else None,
+                str(metadata.get("title", "New Chat")),
+                str(created_at) if created_at is not None else None,
+                str(folder_id) if folder_id is not None else None,
+                json.dumps(group_assistants, ensure_ascii=False) if group_assistants else None,
+                str(metadata.get("group_mode", "round_robin")),
+                json.dumps(metadata.get("group_settings"), ensure_ascii=False, default=str)
+                if "group_settings" in metadata
+                else None,
+                1 if metadata.get("temporary", False) else 0,
+                count_catalog_messages(post.content),
+                *signature,
+            ),
+        )
+
+    def _index_title_locked(self, md_path: Path, title: str) -> None:
+        self._delete_message_rows_locked(str(md_path.parent), md_path.name, roles=("title",))
+        self._insert_message_row_locked(md_path, None, "title", title)
+
+    def _insert_message_row_locked(
+        self, md_path: Path, message_id: str | None, role: str, content: str
+    ) -> None:
+        tokenized = " ".join(tokenize_for_search(content))
+        if not tokenized:
+            return
+        cursor = self._conn.execute(
+            """
+            INSERT INTO session_messages (directory, filename, message_id, role, content)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (str(md_path.parent), md_path.name, message_id, role, content),
+        )
+        self._conn.execute(
+            "INSERT INTO session_messages_fts (rowid, tokenized) VALUES (?, ?)",
+            (cursor.lastrowid, tokenized),
+        )
+
+    def _delete_message_rows_locked(
+        self,
+        directory: str,
+        filename: str,
+        *,
+        roles: tuple[str, ...] | None = None,
+        roles_excluded: tuple[str, ...] | None = None,
+    ) -> None:
+        sql = "SELECT id FROM session_messages WHERE directory = ? AND filename = ?"
+        params: list[Any] = [directory, filename]
+        if roles:
+            sql += f" AND role IN ({','.join('?' for _ in roles)})"
+            params.extend(roles)
+        if roles_excluded:
+            sql += f" AND role NOT IN ({','.join('?' for _ in roles_excluded)})"
+            params.extend(roles_excluded)
+        row_ids = [(int(row["id"]),) for row in self._conn.execute(sql, params)]
+        if not row_ids:
+            return
+        self._conn.executemany("DELETE FROM session_messages_fts WHERE rowid = ?", row_ids)
+        self._conn.executemany("DELETE FROM session_messages WHERE id = ?", row_ids)
+
+    def _remove_locked(self, directory: str, filename: str) -> None:
+        self._conn.execute(
+            "DELETE FROM session_catalog WHERE directory = ? AND filename = ?",
+            (directory, filename),
+        )
+        self._delete_message_rows_locked(directory, filename)
+
+    @staticmethod
+    def _row_to_summary(row: sqlite3.Row) -> dict[str, Any]:
+        updated_at = datetime.fromtimestamp(int(row["mtime_ns"]) / 1e9).strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
+        entry: dict[str, Any] = {
+            "session_id": row["session_id"],
+            "title": row["title"],
+            "created_at": row["created_at"],
+            "updated_at": updated_at,
+            "message_count": int(row["message_count"]),
+            "folder_id": row["folder_id"],
+        }
+        if row["group_assistants"]:
+            entry["group_assistants"] = json.loads(row["group_assistants"])
+            entry["group_mode"] = row["group_mode"] or "round_robin"
+            if row["group_settings"] is not None:
+                entry["group_settings"] = json.loads(row["group_settings"])
+        return entry
+
+
+_catalogs: dict[str, SessionCatalog] = {}
+_catalogs_lock = Lock()
+
+
+def get_session_catalog(db_path: Path) -> SessionCatalog:
+    """Return the process-wide catalog instance for a database path."""
+    key = str(Path(db_path).resolve())
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            catalog = SessionCatalog(Path(key))
+            _catalogs[key] = catalog
+        return catalog
@@ -9,6 +9,7 @@ from typing import Any
 import yaml
 
 from src.core.paths import repo_root
+from src.infrastructure.config.config_snapshot_registry import config_snapshots
 from src.infrastructure.config.tool_plugin_settings_service import ToolPluginSettingsService
 
 WEB_TOOLS_PLUGIN_ID = "web_tools"
@@ -30,15 +31,18 @@ def _plugin_dir() -> Path:
     return repo_root() / "plugins" / WEB_TOOLS_PLUGIN_ID
 
 
-def load_web_tools_defaults() -> dict[str, Any]:
-    plugin_dir = _plugin_dir()
-    defaults_path = plugin_dir / _DEFAULTS_FILE
+def _read_web_tools_defaults(defaults_path: Path) -> dict[str, Any]:
     if not defaults_path.exists():
         return {}
     data = yaml.safe_load(defaults_path.read_text(encoding="utf-8")) or {}
     return data if isinstance(data, dict) else {}
 
 
+def load_web_tools_defaults() -> dict[str, Any]:
+    defaults_path = _plugin_dir() / _DEFAULTS_FILE
+    return config_snapshots.load(defaults_path, lambda: _read_web_tools_defaults(defaults_path))
+
+
 def load_effective_web_tools_settings() -> dict[str, Any]:
     service = ToolPluginSettingsService()
     defaults = load_web_tools_defaults()
@@ -25,6 +25,7 @@ from src.llm_runtime.tool_loop_runtime import (
     resolve_active_stream_llm,
     stream_tool_loop_round,
 )
+from src.providers.client_cache import create_llm_cached
 from src.providers.types import CallMode, TokenUsage
 from src.utils.llm_logger import get_llm_logger
 
@@ -123,7 +124,9 @@ def _resolve_streaming_runtime(
         decision=reasoning_decision,
     )
 
-    llm = adapter.create_llm(
+    llm = create_llm_cached(
+        adapter,
+        provider_id=provider_config.id,
         model=model_config.id,
         base_url=provider_config.base_url,
         api_key=api_key,
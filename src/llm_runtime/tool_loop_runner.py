@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
 import inspect
 import json
 import logging
 import re
+import time
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from typing import Any
@@ -14,6 +16,11 @@ from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMe
 
 logger = logging.getLogger(__name__)
 
+# Calls of the same tool running at once within one round (e.g. web_search fan-out).
+DEFAULT_MAX_CONCURRENCY_PER_TOOL = 4
+# Covers the longest single tool wait (client-side code execution, up to 120s).
+DEFAULT_TOOL_ROUND_TIMEOUT_SECONDS = 150.0
+
 
 _FINALIZE_WITHOUT_TOOLS_PROMPT = (
     "Tool-call limit reached. Provide the best possible final answer now "
@@ -61,6 +68,8 @@ class ToolLoopState:
     no_progress_rounds: int = 0
     max_tool_rounds: int = 0
     tool_finalize_reason: str = "normal_no_tools"
+    tool_call_timings: list[dict[str, Any]] = field(default_factory=list)
+    tool_round_wall_ms: list[float] = field(default_factory=list)
 
 
 class ToolLoopRunner:
@@ -507,8 +516,22 @@ class ToolLoopRunner:
             "no_progress_rounds": state.no_progress_rounds,
             "max_tool_rounds": state.max_tool_rounds or None,
             "tool_finalize_reason": state.tool_finalize_reason,
+            "tool_call_timings": list(state.tool_call_timings),
+            "tool_round_wall_ms": list(state.tool_round_wall_ms),
         }
 
+    @staticmethod
+    def record_round_timings(
+        state: ToolLoopState,
+        *,
+        call_timings: list[dict[str, Any]],
+        wall_ms: float,
+    ) -> None:
+        """Keep per-call and per-round tool latency for diagnostics."""
+        for timing in call_timings:
+            state.tool_call_timings.append({"round": state.tool_round, **timing})
+        state.tool_round_wall_ms.append(round(wall_ms, 2))
+
     @staticmethod
     def extract_tool_calls(
         merged_chunk: Any,
@@ -627,37 +650,60 @@ class ToolLoopRunner:
         round_tool_calls: list[dict[str, Any]],
         *,
         tool_executor: Callable[..., str | None | Awaitable[str | None]] | None = None,
+        max_concurrency_per_tool: int = DEFAULT_MAX_CONCURRENCY_PER_TOOL,
+        round_timeout_seconds: float | None = DEFAULT_TOOL_ROUND_TIMEOUT_SECONDS,
+        timings: list[dict[str, Any]] | None = None,
     ) -> list[dict[str, str]]:
-        """Execute tool calls with request-scoped executor fallback to registry."""
+        """Execute tool calls concurrently, with request-scoped executor fallback to registry.
+
+        Results keep the order of ``round_tool_calls``. Calls still running at
+        the round deadline are cancelled and answered with an error result, so
+        every tool call id still gets a tool message.
+        """
         from src.tools.registry import get_tool_registry
 
         registry = get_tool_registry()
-        tool_results: list[dict[str, str]] = []
+        semaphores: dict[str, asyncio.Semaphore] = {}
+        call_timings: list[dict[str, Any]] = [{} for _ in round_tool_calls]
 
-        for tc in round_tool_calls:
-            result: str | None = None
-            if tool_executor is not None:
+        async def _run(index: int, tc: dict[str, Any]) -> str:
+            semaphore = semaphores.setdefault(
+                tc["name"], asyncio.Semaphore(max(1, max_concurrency_per_tool))
+            )
+            async with semaphore:
+                started = time.perf_counter()
                 try:
-                    try:
-                        maybe_result = tool_executor(
-                            tc["name"],
-                            tc["args"],
-                            tool_call_id=(tc.get("id") or ""),
-                        )
-                    except TypeError as type_error:
-                        if "tool_call_id" not in str(type_error):
-                            raise
-                        maybe_result = tool_executor(tc["name"], tc["args"])
-                    if inspect.isawaitable(maybe_result):
-                        maybe_result = await maybe_result
-                    if maybe_result is not None:
-                        result = str(maybe_result)
-                except Exception as e:
-                    logger.warning("Request-level tool executor failed (%s): %s", tc["name"], e)
-
-            if result is None:
-                result = registry.execute_tool(tc["name"], tc["args"])
+                    return await ToolLoopRunner._execute_tool_call(
+                        tc, tool_executor=tool_executor, registry=registry
+                    )
+                finally:
+                    call_timings[index]["duration_ms"] = round(
+                        (time.perf_counter() - started) * 1000, 2
+                    )
+
+        tasks = [asyncio.create_task(_run(index, tc)) for index, tc in enumerate(round_tool_calls)]
+        try:
+            if tasks:
+                await asyncio.wait(tasks, timeout=round_timeout_seconds)
+        finally:
+            # Past the deadline, or the stream itself was cancelled.
+            pending_tasks = [task for task in tasks if not task.done()]
+            for task in pending_tasks:
+                task.cancel()
+            if pending_tasks:
+                await asyncio.gather(*pending_tasks, return_exceptions=True)
 
+        tool_results: list[dict[str, str]] = []
+        for tc, task, timing in zip(round_tool_calls, tasks, call_timings, strict=True):
+            if task.cancelled():
+                status = "timeout"
+                result = (
+                    f"Error executing {tc['name']}: "
+                    f"timed out after {round_timeout_seconds:g}s in a parallel tool round"
+                )
+            else:
+                status = "ok"
+                result = task.result()
             tool_results.append(
                 {
                     "name": tc["name"],
@@ -665,9 +711,49 @@ class ToolLoopRunner:
                     "tool_call_id": tc["id"],
                 }
             )
+            if timings is not None:
+                timings.append(
+                    {
+                        "name": tc["name"],
+                        "tool_call_id": tc["id"],
+                        "duration_ms": timing.get("duration_ms", 0.0),
+                        "status": status,
+                    }
+                )
 
         return tool_results
 
+    @staticmethod
+    async def _execute_tool_call(
+        tc: dict[str, Any],
+        *,
+        tool_executor: Callable[..., str | None | Awaitable[str | None]] | None,
+        registry: Any,
+    ) -> str:
+        result: str | None = None
+        if tool_executor is not None:
+            try:
+                try:
+                    maybe_result = tool_executor(
+                        tc["name"],
+                        tc["args"],
+                        tool_call_id=(tc.get("id") or ""),
+                    )
+                except TypeError as type_error:
+                    if "tool_call_id" not in str(type_error):
+                        raise
+                    maybe_result = tool_executor(tc["name"], tc["args"])
+                if inspect.isawaitable(maybe_result):
+                    maybe_result = await maybe_result
+                if maybe_result is not None:
+                    result = str(maybe_result)
+            except Exception as e:
+                logger.warning("Request-level tool executor failed (%s): %s", tc["name"], e)
+
+        if result is None:
+            result = await registry.execute_tool_async(tc["name"], tc["args"])
+        return result
+
     @staticmethod
     def append_round_with_tool_results(
         state: ToolLoopState,
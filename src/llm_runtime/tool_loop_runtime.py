@@ -280,9 +280,17 @@ async def execute_tool_loop_round(
     round_reasoning_details: Any,
 ) -> list[dict[str, str]]:
     """Execute tools and append the resulting messages back into loop state."""
+    call_timings: list[dict[str, Any]] = []
+    started = time.perf_counter()
     tool_results = await tool_loop_runner.execute_tool_calls(
         round_tool_calls,
         tool_executor=tool_executor,
+        timings=call_timings,
+    )
+    tool_loop_runner.record_round_timings(
+        tool_loop_state,
+        call_timings=call_timings,
+        wall_ms=(time.perf_counter() - started) * 1000,
     )
     tool_loop_runner.record_round_activity(
         tool_loop_state,
@@ -13,6 +13,7 @@ from typing import Any
 from langchain_core.messages import BaseMessage
 
 from ..base import BaseLLMAdapter
+from ..client_cache import pooled_http_client
 from ..types import LLMResponse, StreamChunk, TokenUsage
 from .utils import extract_tool_calls
 
@@ -228,13 +229,12 @@ class GeminiAdapter(BaseLLMAdapter):
         Returns:
             List of model dicts with 'id', 'name', and optional capability info
         """
-        import httpx
 
         models: list[dict[str, str]] = []
         page_token = None
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with pooled_http_client(30.0) as client:
                 while True:
                     params: dict[str, str] = {"key": api_key, "pageSize": "100"}
                     if page_token:
@@ -303,7 +303,7 @@ class GeminiAdapter(BaseLLMAdapter):
             return False, "API key is required"
 
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
+            async with pooled_http_client(15.0) as client:
                 response = await client.get(
                     f"{_GEMINI_API_BASE}/models",
                     params={"key": api_key, "pageSize": "1"},
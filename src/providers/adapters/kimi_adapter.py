@@ -12,6 +12,7 @@ from typing import Any
 from langchain_core.messages import BaseMessage
 
 from ..base import BaseLLMAdapter
+from ..client_cache import pooled_http_client
 from ..types import LLMResponse, StreamChunk, TokenUsage
 from .reasoning_openai import ChatReasoningOpenAI, inject_tool_call_reasoning_content
 from .utils import extract_tool_calls
@@ -226,7 +227,6 @@ class KimiAdapter(BaseLLMAdapter):
 
         Returns an empty list on errors (no static fallback list).
         """
-        import httpx
 
         try:
             url = base_url.rstrip("/")
@@ -236,7 +236,7 @@ class KimiAdapter(BaseLLMAdapter):
 
             headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with pooled_http_client(30.0) as client:
                 response = await client.get(models_url, headers=headers)
                 response.raise_for_status()
 
@@ -277,7 +277,7 @@ class KimiAdapter(BaseLLMAdapter):
                 url = f"{url}/v1"
             models_url = f"{url}/models"
 
-            async with httpx.AsyncClient(timeout=15.0) as client:
+            async with pooled_http_client(15.0) as client:
                 response = await client.get(
                     models_url,
                     headers={"Authorization": f"Bearer {api_key}"},
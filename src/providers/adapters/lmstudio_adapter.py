@@ -204,6 +204,7 @@ class LmStudioAdapter(BaseLLMAdapter):
     """Adapter for LM Studio's official Python SDK."""
 
     _DEFAULT_TEST_MODEL = ""
+    reuse_llm_instances = False
 
     @staticmethod
     def normalize_api_host(base_url: str) -> str:
@@ -118,6 +118,7 @@ class LocalGgufAdapter(BaseLLMAdapter):
     """Adapter for direct local GGUF chat inference."""
 
     _DEFAULT_TEST_MODEL = ""
+    reuse_llm_instances = False
 
     @staticmethod
     def _parse_tool_response_content(
@@ -12,6 +12,7 @@ from typing import Any
 from langchain_core.messages import BaseMessage
 
 from ..base import BaseLLMAdapter
+from ..client_cache import pooled_http_client
 from ..types import LLMResponse, StreamChunk, TokenUsage
 from .utils import extract_tool_calls
 
@@ -181,7 +182,7 @@ class OllamaAdapter(BaseLLMAdapter):
             url = (base_url or "http://localhost:11434").rstrip("/")
             tags_url = f"{url}/api/tags"
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with pooled_http_client(10.0) as client:
                 response = await client.get(tags_url)
                 response.raise_for_status()
 
@@ -256,7 +257,7 @@ class OllamaAdapter(BaseLLMAdapter):
         try:
             url = (base_url or "http://localhost:11434").rstrip("/")
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with pooled_http_client(10.0) as client:
                 # First check if Ollama is running
                 response = await client.get(f"{url}/api/tags")
                 response.raise_for_status()
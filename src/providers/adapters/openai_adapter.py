@@ -13,6 +13,7 @@ from langchain_openai import ChatOpenAI
 from langchain_openai.chat_models.base import BaseChatOpenAI
 
 from ..base import BaseLLMAdapter
+from ..client_cache import pooled_http_client
 from ..model_capability_rules import apply_model_capability_hints
 from ..types import CallMode, LLMResponse, StreamChunk, TokenUsage
 from .reasoning_openai import ChatReasoningOpenAI, inject_tool_call_reasoning_content
@@ -413,8 +414,6 @@ class OpenAIAdapter(BaseLLMAdapter):
         Returns:
             List of model info dicts
         """
-        import httpx
-
         try:
             provider_hint = self._infer_provider_hint_from_base_url(base_url)
             # Normalize base URL
@@ -427,7 +426,7 @@ class OpenAIAdapter(BaseLLMAdapter):
             if api_key:
                 headers["Authorization"] = f"Bearer {api_key}"
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with pooled_http_client(30.0) as client:
                 response = await client.get(
                     models_url,
                     headers=headers,
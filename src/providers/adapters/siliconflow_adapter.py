@@ -13,6 +13,7 @@ from typing import Any
 from langchain_core.messages import BaseMessage
 
 from ..base import BaseLLMAdapter
+from ..client_cache import pooled_http_client
 from ..types import LLMResponse, StreamChunk, TokenUsage
 from .reasoning_openai import ChatReasoningOpenAI
 from .utils import extract_tool_calls
@@ -175,13 +176,12 @@ class SiliconFlowAdapter(BaseLLMAdapter):
 
         Uses `type=text` query to avoid mixing image/audio/video model IDs.
         """
-        import httpx
 
         try:
             url = base_url.rstrip("/")
             models_url = f"{url}/models"
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with pooled_http_client(30.0) as client:
                 response = await client.get(
                     models_url,
                     headers={"Authorization": f"Bearer {api_key}"},
@@ -228,7 +228,7 @@ class SiliconFlowAdapter(BaseLLMAdapter):
             url = base_url.rstrip("/")
             models_url = f"{url}/models"
 
-            async with httpx.AsyncClient(timeout=15.0) as client:
+            async with pooled_http_client(15.0) as client:
                 response = await client.get(
                     models_url,
                     headers={"Authorization": f"Bearer {api_key}"},
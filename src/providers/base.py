@@ -25,6 +25,11 @@ class BaseLLMAdapter(ABC):
     # Subclasses should override for non-OpenAI providers.
     _DEFAULT_TEST_MODEL = "gpt-3.5-turbo"
 
+    # Whether instances from create_llm() may be cached and shared across
+    # requests (see client_cache). Adapters whose models hold no HTTP clients
+    # or carry per-call state should opt out.
+    reuse_llm_instances = True
+
     @abstractmethod
     def create_llm(
         self,
@@ -0,0 +1,213 @@
+"""
+Reusable LLM instances and pooled HTTP clients for provider calls.
+
+Every chat turn used to call ``adapter.create_llm(...)``, which built a new
+``ChatOpenAI`` (or provider-specific model) and its SDK client objects, and
+adapter helpers (model listing, connection tests) opened a fresh
+``httpx.AsyncClient`` per call.
+
+- :class:`LlmClientCache` keeps created LLM instances, keyed by adapter,
+  provider, base URL, API key fingerprint, call mode, model and the remaining
+  ``create_llm`` arguments. Assistants keep their sampling parameters across
+  turns, so repeated turns get the same instance; LangChain chat models hold
+  no per-request state, so one instance serves concurrent streams.
+- :func:`pooled_http_client` hands out keep-alive clients shared per event
+  loop and timeout (HTTP/2 when ``h2`` is installed), counting new versus
+  reused connections.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import importlib.util
+import logging
+import weakref
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Hashable
+from contextlib import asynccontextmanager
+from threading import Lock
+from typing import Any
+
+import httpx
+
+from .base import BaseLLMAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_LLM_INSTANCES = 64
+
+
+def api_key_fingerprint(api_key: Any) -> str:
+    """Short digest identifying an API key without keeping it in cache keys."""
+    if hasattr(api_key, "get_secret_value"):
+        api_key = api_key.get_secret_value()
+    if not api_key:
+        return ""
+    return hashlib.sha256(str(api_key).encode("utf-8")).hexdigest()[:16]
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return repr(value)
+
+
+class LlmClientCache:
+    """LRU cache of LLM instances created by provider adapters."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_LLM_INSTANCES):
+        self.max_entries = max(1, int(max_entries))
+        self._instances: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.created = 0
+        self.evictions = 0
+
+    @staticmethod
+    def build_key(
+        adapter: BaseLLMAdapter, *, provider_id: str, create_kwargs: dict[str, Any]
+    ) -> Hashable:
+        kwargs = dict(create_kwargs)
+        api_key = kwargs.pop("api_key", None)
+        return (
+            type(adapter),
+            provider_id,
+            kwargs.pop("base_url", None),
+            api_key_fingerprint(api_key),
+            _freeze(kwargs.pop("call_mode", None)),
+            kwargs.pop("model", None),
+            _freeze(kwargs),
+        )
+
+    def get_or_create(
+        self,
+        adapter: BaseLLMAdapter,
+        *,
+        provider_id: str,
+        create_kwargs: dict[str, Any],
+        create: Callable[[], Any],
+    ) -> Any:
+        key = self.build_key(adapter, provider_id=provider_id, create_kwargs=create_kwargs)
+        with self._lock:
+            llm = self._instances.get(key)
+            if llm is not None:
+                self._instances.move_to_end(key)
+                self.hits += 1
+                return llm
+
+        llm = create()
+        with self._lock:
+            # A concurrent miss may have created one first; keep a single instance.
+            llm = self._instances.setdefault(key, llm)
+            self._instances.move_to_end(key)
+            self.created += 1
+            while len(self._instances) > self.max_entries:
+                self._instances.popitem(last=False)
+                self.evictions += 1
+        return llm
+
+    def clear(self) -> None:
+        with self._lock:
+            self._instances.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Cached instances plus hit/create/eviction counters."""
+        with self._lock:
+            return {
+                "instances": len(self._instances),
+                "hits": self.hits,
+                "created": self.created,
+                "evictions": self.evictions,
+            }
+
+
+_llm_client_cache = LlmClientCache()
+
+
+def get_llm_client_cache() -> LlmClientCache:
+    """Return the process-wide LLM instance cache."""
+    return _llm_client_cache
+
+
+def create_llm_cached(adapter: Any, *, provider_id: str, **create_kwargs: Any) -> Any:
+    """``adapter.create_llm(**create_kwargs)``, reusing an instance built with the same inputs."""
+    if not isinstance(adapter, BaseLLMAdapter) or not adapter.reuse_llm_instances:
+        return adapter.create_llm(**create_kwargs)
+    return _llm_client_cache.get_or_create(
+        adapter,
+        provider_id=provider_id,
+        create_kwargs=create_kwargs,
+        create=lambda: adapter.create_llm(**create_kwargs),
+    )
+
+
+class _ConnectionStats:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.new_connections = 0
+
+    async def on_request(self, request: httpx.Request) -> None:
+        self.requests += 1
+        request.extensions.setdefault("trace", self.trace)
+
+    async def trace(self, event_name: str, info: dict[str, Any]) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.new_connections += 1
+
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+_http_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[float, httpx.AsyncClient]]
+_http_clients = weakref.WeakKeyDictionary()
+_http_clients_lock = Lock()
+_connection_stats = _ConnectionStats()
+
+
+def _create_http_client(timeout: float) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=timeout,
+        http2=_HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=8),
+        event_hooks={"request": [_connection_stats.on_request]},
+    )
+
+
+@asynccontextmanager
+async def pooled_http_client(timeout: float = 30.0) -> AsyncIterator[httpx.AsyncClient]:
+    """Yield the keep-alive client shared by provider helper calls on this loop."""
+    loop = asyncio.get_running_loop()
+    with _http_clients_lock:
+        clients = _http_clients.setdefault(loop, {})
+        client = clients.get(timeout)
+        if client is None or client.is_closed:
+            client = _create_http_client(timeout)
+            clients[timeout] = client
+    yield client
+
+
+async def close_provider_http_clients() -> None:
+    """Close the pooled helper clients of the running loop (application shutdown)."""
+    loop = asyncio.get_running_loop()
+    with _http_clients_lock:
+        clients = list(_http_clients.pop(loop, {}).values())
+    for client in clients:
+        await client.aclose()
+
+
+def provider_client_stats() -> dict[str, Any]:
+    """LLM instance reuse and helper connection reuse counters."""
+    requests = _connection_stats.requests
+    new_connections = _connection_stats.new_connections
+    return {
+        "llm_instances": _llm_client_cache.stats(),
+        "http": {
+            "http2": _HTTP2_AVAILABLE,
+            "requests": requests,
+            "new_connections": new_connections,
+            "reused_connections": max(0, requests - new_connections),
+        },
+    }
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import inspect
 import logging
 from collections.abc import Callable
@@ -261,7 +262,12 @@ class ToolRegistry:
             return None
 
         try:
-            result = handler(**(args or {}))
+            if inspect.iscoroutinefunction(handler):
+                result = await handler(**(args or {}))
+            else:
+                # Sync handlers run in a worker thread so parallel tool calls
+                # and other streams keep the event loop.
+                result = await asyncio.to_thread(handler, **(args or {}))
             if inspect.isawaitable(result):
                 result = await result
             return str(result)
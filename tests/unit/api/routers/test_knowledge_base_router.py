@@ -4,6 +4,7 @@ import asyncio
 import shutil
 import sys
 import uuid
+from contextlib import contextmanager
 from pathlib import Path
 from types import SimpleNamespace
 
@@ -14,6 +15,7 @@ from src.api.routers import knowledge_base as kb_router
 from src.api.routers.knowledge_base import _persist_upload_file
 from src.domain.models.knowledge_base import KnowledgeBase, KnowledgeBaseDocument
 from src.infrastructure.config import rag_config_service as rag_config_module
+from src.infrastructure.knowledge.ingestion_queue import IngestionQueue
 
 
 class _FakeUploadFile:
@@ -129,6 +131,10 @@ class _FakeKnowledgeBaseService:
         doc_dir.mkdir(parents=True, exist_ok=True)
         return doc_dir / f"{doc_id}_{filename}"
 
+    def find_document_file(self, kb_id: str, doc_id: str) -> Path | None:
+        doc_dir = self.storage_dir / kb_id / "documents"
+        return next(doc_dir.glob(f"{doc_id}_*"), None)
+
     async def add_document(self, doc: KnowledgeBaseDocument):
         self.added_doc = doc
 
@@ -180,14 +186,18 @@ async def test_knowledge_base_crud_and_document_routes(monkeypatch, tmp_path):
     monkeypatch.setattr(
         kb_router, "_persist_upload_file", lambda *args, **kwargs: asyncio.sleep(0, result=12)
     )
-    queued: list[object] = []
+    queued: list[dict] = []
 
-    def _capture_task(coro):
-        queued.append(coro)
-        coro.close()
-        return SimpleNamespace()
+    class _FakeQueue:
+        @contextmanager
+        def reserve(self):
+            yield
 
-    monkeypatch.setattr(kb_router.asyncio, "create_task", _capture_task)
+        async def enqueue(self, **job):
+            queued.append(job)
+            return True
+
+    monkeypatch.setattr(kb_router, "get_ingestion_queue", lambda: _FakeQueue())
 
     uploaded = await kb_router.upload_document(
         "kb1",
@@ -196,7 +206,7 @@ async def test_knowledge_base_crud_and_document_routes(monkeypatch, tmp_path):
     )
     assert uploaded.status == "pending"
     assert service.added_doc is not None
-    assert queued
+    assert queued[0]["doc_id"] == "docuuid1"
 
     deleted_doc = await kb_router.delete_document("kb1", "doc1", service=service)  # type: ignore[arg-type]
     assert "deleted successfully" in deleted_doc["message"]
@@ -206,6 +216,45 @@ async def test_knowledge_base_crud_and_document_routes(monkeypatch, tmp_path):
     reprocessed = await kb_router.reprocess_document("kb1", "doc1", service=service)  # type: ignore[arg-type]
     assert "queued for reprocessing" in reprocessed["message"]
     assert service.updated_status == ("kb1", "doc1", "pending", None)
+    assert queued[1]["doc_id"] == "doc1"
+    assert queued[1]["storage_path"] == str(doc_path)
+
+
+@pytest.mark.asyncio
+async def test_upload_rejects_full_queue_before_storing_document(monkeypatch, tmp_path):
+    service = _FakeKnowledgeBaseService(tmp_path)
+    persisted: list[Path] = []
+
+    async def _persist(file, storage_path):
+        persisted.append(storage_path)
+        return 3
+
+    async def _process(job):
+        return None
+
+    queue = IngestionQueue(_process, max_pending=1)
+    monkeypatch.setattr(kb_router, "_persist_upload_file", _persist)
+    monkeypatch.setattr(kb_router, "get_ingestion_queue", lambda: queue)
+
+    with queue.reserve():
+        with pytest.raises(HTTPException) as exc_info:
+            await kb_router.upload_document(
+                "kb1",
+                file=_FakeUploadFile("doc.md", [b"abc"]),  # type: ignore[arg-type]
+                service=service,  # type: ignore[arg-type]
+            )
+    assert exc_info.value.status_code == 429
+    assert persisted == []
+    assert service.added_doc is None
+
+    uploaded = await kb_router.upload_document(
+        "kb1",
+        file=_FakeUploadFile("doc.md", [b"abc"]),  # type: ignore[arg-type]
+        service=service,  # type: ignore[arg-type]
+    )
+    assert service.added_doc is uploaded
+    assert queue.stats()["pending"] + queue.stats()["running"] == 1
+    await queue.stop()
 
 
 @pytest.mark.asyncio
@@ -318,26 +367,3 @@ async def test_knowledge_base_router_error_mapping_and_chunk_listing(monkeypatch
     )
     chunks = await kb_router.list_chunks("kb1", doc_id="doc1", limit=200, service=service)  # type: ignore[arg-type]
     assert chunks[0].chunk_index == 2
-
-
-@pytest.mark.asyncio
-async def test_process_document_async_updates_status_on_failure(monkeypatch):
-    class _Processor:
-        async def process_document(self, *args, **kwargs):
-            raise RuntimeError("process failed")
-
-    status_updates = []
-
-    class _StatusService:
-        async def update_document_status(self, *args, **kwargs):
-            status_updates.append((args, kwargs))
-
-    monkeypatch.setitem(
-        sys.modules,
-        "src.infrastructure.knowledge.document_processing_service",
-        SimpleNamespace(DocumentProcessingService=lambda: _Processor()),
-    )
-    monkeypatch.setattr(kb_router, "KnowledgeBaseService", lambda: _StatusService(), raising=False)
-
-    await kb_router._process_document_async("kb1", "doc1", "doc.md", ".md", "/tmp/doc.md")
-    assert status_updates[0][0][:3] == ("kb1", "doc1", "error")
@@ -168,6 +168,12 @@ async def test_api_main_startup_event_initializes_runtime(tmp_path: Path, monkey
         async def cleanup_temporary_sessions(self):
             return 2
 
+        async def compact_sessions(self):
+            return 1
+
+        async def sync_session_catalog(self):
+            return 3
+
     class _RagConfig:
         def __init__(self):
             self.config = type(
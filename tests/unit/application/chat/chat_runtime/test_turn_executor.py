@@ -3,7 +3,10 @@ from dataclasses import dataclass, field
 
 import pytest
 
-from src.application.chat.chat_runtime.turn_context_builder import GroupTurnContext
+from src.application.chat.chat_runtime.turn_context_builder import (
+    GroupTurnContext,
+    GroupTurnContextBuilder,
+)
 from src.application.chat.chat_runtime.turn_executor import CommitteeTurnExecutor
 from src.application.chat.request_contexts import (
     CommitteeExecutionContext,
@@ -45,6 +48,9 @@ class _StorageStub:
 
 
 class _MemoryServiceStub:
+    def collect_memory_items(self, **_kwargs):
+        return None
+
     def build_memory_context(self, **_kwargs):
         return "memory ctx", [{"type": "memory", "title": "Memory"}]
 
@@ -157,6 +163,77 @@ async def test_group_turn_executor_merges_tool_diagnostics_into_sources(monkeypa
     assert append_kwargs["sources"] == sources_event["sources"]
 
 
+@pytest.mark.asyncio
+async def test_group_turn_context_builder_shares_retrieval_across_participants():
+    memory_calls = []
+    rag_caches = []
+
+    class _LayeredMemoryService:
+        def collect_memory_items(self, **kwargs):
+            memory_calls.append(("global", kwargs["assistant_id"]))
+            return "global items"
+
+        def build_memory_context(self, **kwargs):
+            memory_calls.append((kwargs["shared_items"], kwargs["assistant_id"]))
+            return f"memory for {kwargs['assistant_id']}", []
+
+    async def fake_build_rag_context_and_sources(**kwargs):
+        rag_caches.append(kwargs["retrieval_cache"])
+        return None, []
+
+    builder = GroupTurnContextBuilder(
+        storage=_StorageStub(),
+        memory_service=_LayeredMemoryService(),
+        build_rag_context_and_sources=fake_build_rag_context_and_sources,
+        build_group_history_hint=lambda *_args: "",
+        build_group_identity_prompt=lambda *_args: "identity",
+        build_group_instruction_prompt=lambda *_args: None,
+    )
+    assistants = {
+        assistant_id: _AssistantStub(
+            id=assistant_id,
+            name=assistant_id.upper(),
+            model_id="provider:model-a",
+            icon="",
+            system_prompt=None,
+            temperature=None,
+            max_tokens=None,
+            top_p=None,
+            top_k=None,
+            frequency_penalty=None,
+            presence_penalty=None,
+            max_rounds=None,
+        )
+        for assistant_id in ("a1", "a2")
+    }
+    execution = CommitteeExecutionContext(
+        scope=ConversationScope(session_id="s1"),
+        raw_user_message="hello",
+        group_assistants=list(assistants),
+        assistant_name_map={key: value.name for key, value in assistants.items()},
+        assistant_config_map=assistants,
+        group_settings=None,
+        reasoning_effort=None,
+        search_context=None,
+        search_sources=[],
+    )
+
+    for assistant_id, assistant in assistants.items():
+        context = await builder.build(
+            turn_context=CommitteeMemberTurnContext(
+                execution=execution, assistant_id=assistant_id, assistant_obj=assistant
+            )
+        )
+        assert context.system_prompt == f"identity\n\nmemory for {assistant_id}"
+
+    assert memory_calls == [
+        ("global", None),
+        ("global items", "a1"),
+        ("global items", "a2"),
+    ]
+    assert rag_caches == [execution.retrieval_cache, execution.retrieval_cache]
+
+
 def test_extract_bullet_items_and_keyword_sentences():
     text = """
     - First actionable point
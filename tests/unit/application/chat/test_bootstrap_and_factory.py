@@ -85,7 +85,9 @@ def test_bootstrap_helpers_and_builder(monkeypatch):
     monkeypatch.setattr(
         bootstrap,
         "settings",
-        SimpleNamespace(attachments_dir="/tmp/attachments", max_file_size_mb=8),
+        SimpleNamespace(
+            attachments_dir="/tmp/attachments", max_file_size_mb=8, context_deadline_seconds=20.0
+        ),
     )
     monkeypatch.setattr(bootstrap, "PricingService", lambda: "pricing")
     monkeypatch.setattr(bootstrap, "SearchService", lambda: "search")
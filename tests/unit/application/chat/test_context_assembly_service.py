@@ -1,5 +1,6 @@
 """Unit tests for context assembly service."""
 
+import asyncio
 from types import SimpleNamespace
 from typing import Any
 from unittest.mock import AsyncMock, patch
@@ -244,3 +245,98 @@ async def test_prepare_context_skips_web_context_when_web_tools_plugin_unavailab
             raw_user_message="hello",
             context_capabilities=["web.search_context"],
         )
+
+
+@pytest.mark.asyncio
+async def test_prepare_context_runs_sources_concurrently_and_records_timings():
+    search_started = asyncio.Event()
+
+    class _BlockingRegistry(_FakeRegistry):
+        async def execute_context_capability_async(self, capability_id: str, **kwargs):
+            search_started.set()
+            return await super().execute_context_capability_async(capability_id, **kwargs)
+
+    async def fake_rag_context_builder(**_kwargs):
+        # Only completes if the search capability runs alongside RAG.
+        await search_started.wait()
+        return "RAG", [{"type": "rag"}]
+
+    service = ContextAssemblyService(
+        storage=_FakeStorage(),
+        memory_service=_FakeMemoryService(),
+        source_context_service=_FakeSourceContextService(),
+        rag_config_service=_FakeRagConfigService(enabled=False),
+        rag_context_builder=fake_rag_context_builder,
+        context_deadline_seconds=5,
+    )
+    with patch(
+        "src.application.chat.context_assembly_service.get_tool_registry",
+        return_value=_BlockingRegistry(),
+    ):
+        ctx = await service.prepare_context(
+            session_id="s5",
+            raw_user_message="hello",
+            context_capabilities=["web.search_context"],
+        )
+
+    assert ctx.system_prompt == "MEM\n\nSEARCH\n\nRAG"
+    assert ctx.context_timings is not None
+    assert ctx.context_timings["timed_out"] == []
+    assert {"session", "memory", "rag", "capability:web.search_context", "total"} <= set(
+        ctx.context_timings
+    )
+
+
+@pytest.mark.asyncio
+async def test_prepare_context_skips_sources_missing_the_deadline():
+    rag_cancelled = asyncio.Event()
+
+    async def slow_rag_context_builder(**_kwargs):
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            rag_cancelled.set()
+            raise
+        return "RAG", [{"type": "rag"}]
+
+    service = ContextAssemblyService(
+        storage=_FakeStorage(),
+        memory_service=_FakeMemoryService(),
+        source_context_service=_FakeSourceContextService(),
+        rag_config_service=_FakeRagConfigService(enabled=False),
+        rag_context_builder=slow_rag_context_builder,
+        context_deadline_seconds=0.2,
+    )
+
+    ctx = await asyncio.wait_for(
+        service.prepare_context(session_id="s6", raw_user_message="hello"), timeout=5
+    )
+
+    assert ctx.rag_context is None
+    assert ctx.system_prompt == "MEM"
+    assert [source["type"] for source in ctx.all_sources] == ["memory"]
+    assert ctx.context_timings["timed_out"] == ["rag"]
+    assert rag_cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_prepare_context_without_deadline_waits_for_every_source():
+    async def slow_rag_context_builder(**_kwargs):
+        await asyncio.sleep(0.05)
+        return "RAG", [{"type": "rag"}]
+
+    service = ContextAssemblyService(
+        storage=_FakeStorage(),
+        memory_service=_FakeMemoryService(),
+        source_context_service=_FakeSourceContextService(),
+        rag_config_service=_FakeRagConfigService(enabled=False),
+        rag_context_builder=slow_rag_context_builder,
+        context_deadline_seconds=0,
+    )
+
+    ctx = await asyncio.wait_for(
+        service.prepare_context(session_id="s7", raw_user_message="hello"), timeout=5
+    )
+
+    assert ctx.rag_context == "RAG"
+    assert ctx.context_timings["timed_out"] == []
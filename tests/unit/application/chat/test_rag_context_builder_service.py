@@ -7,6 +7,7 @@ from types import SimpleNamespace
 import pytest
 
 from src.application.chat.rag_context_builder_service import RagContextBuilderService
+from src.application.chat.turn_retrieval_cache import TurnRetrievalCache
 from src.infrastructure.config import assistant_config_service
 from src.infrastructure.projects import project_knowledge_base_resolver
 from src.infrastructure.retrieval import rag_service as rag_service_module
@@ -119,3 +120,42 @@ async def test_rag_context_builder_handles_retrieval_errors(monkeypatch):
 
     assert context is None
     assert sources == []
+
+
+@pytest.mark.asyncio
+async def test_rag_context_builder_shares_retrieval_per_kb_set(monkeypatch):
+    kb_sets = {"a1": ["kb-2", "kb-1"], "a2": ["kb-1", "kb-2"], "a3": ["kb-3"]}
+    retrieved: list[list[str]] = []
+
+    class _Resolver:
+        async def resolve_effective_kb_ids(self, **kwargs):
+            return list(kb_sets[kwargs["assistant_id"]])
+
+    class _CountingRagService(_RagService):
+        async def retrieve_with_diagnostics(self, raw_user_message, kb_ids, runtime_model_id=None):
+            retrieved.append(list(kb_ids))
+            return [_RagResult(f"chunk:{kb_ids[0]}")], {"raw_count": 1}
+
+        def retrieval_config_key(self, runtime_model_id=None):
+            return ("config", "")
+
+    monkeypatch.setattr(
+        project_knowledge_base_resolver, "ProjectKnowledgeBaseResolver", lambda: _Resolver()
+    )
+    monkeypatch.setattr(rag_service_module, "RagService", lambda: _CountingRagService())
+
+    service = RagContextBuilderService()
+    cache = TurnRetrievalCache()
+    results = {}
+    for assistant_id in ("a1", "a2", "a3", "a1"):
+        results[assistant_id] = await service.build_context_and_sources(
+            raw_user_message="hello",
+            assistant_id=assistant_id,
+            assistant_obj=SimpleNamespace(id=assistant_id),
+            retrieval_cache=cache,
+        )
+
+    assert retrieved == [["kb-2", "kb-1"], ["kb-3"]]
+    assert results["a2"] == results["a1"] == ("context:hello:1", results["a1"][1])
+    assert results["a3"][1][1] == {"content": "chunk:kb-3"}
+    assert cache.stats() == {"entries": 2, "hits": 2, "misses": 2}
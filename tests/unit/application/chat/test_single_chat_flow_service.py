@@ -193,6 +193,7 @@ async def test_single_chat_flow_streams_events_and_finalizes(monkeypatch):
                 all_sources=[{"type": "memory"}],
                 max_rounds=None,
                 assistant_memory_enabled=True,
+                context_timings={"memory": 1.5, "total": 2.0, "timed_out": []},
             )
         ),
         build_file_context_block=lambda _refs: _return_async(""),
@@ -221,6 +222,7 @@ async def test_single_chat_flow_streams_events_and_finalizes(monkeypatch):
     assert events[0] == {"type": "user_message_id", "message_id": "user-msg-1"}
     assert events[1] == {"type": "sources", "sources": [{"type": "memory"}]}
     assert events[2]["type"] == "context_info"
+    assert events[2]["context_timings"] == {"memory": 1.5, "total": 2.0, "timed_out": []}
     assert events[3] == "hello"
     assert events[4]["type"] == "usage"
     assert events[5] == {"type": "sources", "sources": [{"type": "memory"}]}
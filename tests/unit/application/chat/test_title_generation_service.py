@@ -21,8 +21,11 @@ class _FakeStorage:
         ]
         self.updated = None
 
-    async def get_session(self, session_id: str):
-        return {"session_id": session_id, "state": {"messages": list(self.messages)}}
+    async def get_session(self, session_id: str, *, last_n_messages: int | None = None):
+        messages = list(self.messages)
+        if last_n_messages is not None:
+            messages = messages[-last_n_messages:]
+        return {"session_id": session_id, "state": {"messages": messages}}
 
     async def update_session_metadata(
         self,
@@ -0,0 +1,185 @@
+"""Unit tests for text-delta coalescing ahead of flow event mapping."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.application.flow.flow_delta_coalescer import FlowDeltaCoalescer, coalesce_text_deltas
+from src.application.flow.flow_event_mapper import FlowEventMapper
+from src.application.flow.flow_events import FlowEventStage, new_flow_event, new_flow_event_dict
+from src.application.flow.flow_stream_runtime import FlowStreamRuntime
+
+
+async def _stream(items, delay: float = 0.0):
+    for item in items:
+        if delay:
+            await asyncio.sleep(delay)
+        yield item
+
+
+async def _collect(source):
+    return [item async for item in source]
+
+
+@pytest.mark.asyncio
+async def test_coalescer_merges_runs_of_the_same_delta_kind_in_order():
+    chunks = [
+        "Hel",
+        "lo",
+        {"type": "assistant_chunk", "chunk": "a", "assistant_id": "x"},
+        {"type": "assistant_chunk", "chunk": "b", "assistant_id": "x"},
+        {"type": "assistant_chunk", "chunk": "c", "assistant_id": "y"},
+        {"type": "usage", "usage": {"total_tokens": 3}},
+        " world",
+    ]
+    coalescer = FlowDeltaCoalescer(max_delay_ms=1000, max_chars=256)
+
+    merged = await _collect(coalescer.coalesce(_stream(chunks)))
+
+    assert merged == [
+        "Hello",
+        {"type": "assistant_chunk", "chunk": "ab", "assistant_id": "x"},
+        {"type": "assistant_chunk", "chunk": "c", "assistant_id": "y"},
+        {"type": "usage", "usage": {"total_tokens": 3}},
+        " world",
+    ]
+    assert coalescer.stats() == {"chunks_in": 7, "chunks_out": 5}
+
+
+@pytest.mark.asyncio
+async def test_coalescer_flushes_on_size_and_time_windows():
+    by_size = await _collect(
+        coalesce_text_deltas(_stream(["ab", "cd", "ef"]), max_delay_ms=1000, max_chars=4)
+    )
+    assert by_size == ["abcd", "ef"]
+
+    # Chunks arriving slower than the window are delivered without waiting for the next one.
+    by_time = await _collect(
+        coalesce_text_deltas(_stream(["a", "b", "c"], delay=0.03), max_delay_ms=5)
+    )
+    assert by_time == ["a", "b", "c"]
+
+    unchanged = _stream(["a"])
+    assert coalesce_text_deltas(unchanged, max_delay_ms=0) is unchanged
+
+
+@pytest.mark.asyncio
+async def test_coalescer_delivers_buffered_text_before_source_error():
+    async def failing():
+        yield "partial"
+        raise ValueError("boom")
+
+    received = []
+    with pytest.raises(ValueError):
+        async for chunk in coalesce_text_deltas(failing(), max_delay_ms=1000):
+            received.append(chunk)
+
+    assert received == ["partial"]
+
+
+@pytest.mark.asyncio
+async def test_closing_the_coalescer_waits_for_source_cancellation_handling():
+    cleanup_done = asyncio.Event()
+
+    async def source():
+        try:
+            yield {"type": "usage", "usage": {}}
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            # Stands in for saving the partial reply when the client stops.
+            await asyncio.sleep(0.01)
+            cleanup_done.set()
+            raise
+
+    stream = coalesce_text_deltas(source(), max_delay_ms=1000)
+    assert await stream.__anext__() == {"type": "usage", "usage": {}}
+    await stream.aclose()
+
+    assert cleanup_done.is_set()
+
+
+@pytest.mark.asyncio
+async def test_reader_pauses_when_the_consumer_falls_behind():
+    produced = 0
+    cleanup_done = asyncio.Event()
+
+    async def source():
+        nonlocal produced
+        try:
+            while True:
+                produced += 1
+                yield {"type": "usage", "usage": {"n": produced}}
+        except asyncio.CancelledError:
+            await asyncio.sleep(0)
+            cleanup_done.set()
+            raise
+
+    stream = coalesce_text_deltas(source(), max_delay_ms=1000)
+    await stream.__anext__()
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert produced <= 300
+
+    await stream.aclose()
+    # A source paused by backpressure still gets its cancellation handling.
+    assert cleanup_done.is_set()
+
+
+@pytest.mark.asyncio
+async def test_coalesced_stream_replays_exactly_what_subscribers_received():
+    runtime = FlowStreamRuntime()
+    runtime.create_stream(
+        stream_id="stream-1", conversation_id="session-1", context_type="chat", project_id=None
+    )
+    mapper = FlowEventMapper(
+        stream_id="stream-1",
+        conversation_id="session-1",
+        seq_provider=lambda: runtime.next_seq("stream-1"),
+    )
+    runtime.append_payload("stream-1", mapper.make_stream_started_payload())
+    _, live = runtime.subscribe("stream-1")
+
+    tokens = [f"t{index} " for index in range(100)]
+    async for chunk in coalesce_text_deltas(_stream(tokens), max_delay_ms=1000, max_chars=64):
+        runtime.append_payload("stream-1", mapper.to_sse_payload(chunk))
+    runtime.append_payload("stream-1", mapper.to_sse_payload({"done": True}))
+
+    live_payloads = [live.get_nowait() for _ in range(live.qsize())]
+    first_event_id = runtime.get_stream("stream-1").events[0]["flow_event"]["event_id"]
+    _, _, replayed = runtime.resume_subscribe(
+        stream_id="stream-1",
+        last_event_id=first_event_id,
+        conversation_id="session-1",
+        context_type="chat",
+        project_id=None,
+    )
+
+    assert replayed == live_payloads
+    deltas = [
+        p["flow_event"] for p in live_payloads if p["flow_event"]["event_type"] == "text_delta"
+    ]
+    assert "".join(event["payload"]["text"] for event in deltas) == "".join(tokens)
+    assert len(deltas) < len(tokens)
+    seqs = [p["flow_event"]["seq"] for p in live_payloads]
+    assert seqs == list(range(2, 2 + len(live_payloads)))
+
+
+def test_light_event_constructor_matches_validated_event():
+    kwargs = {
+        "seq": 3,
+        "stream_id": "stream-1",
+        "conversation_id": "session-1",
+        "event_type": "text_delta",
+        "stage": FlowEventStage.CONTENT,
+        "payload": {"text": "hi", "assistant_id": None},
+    }
+
+    light = new_flow_event_dict(**kwargs)
+    validated = new_flow_event(**kwargs).model_dump(exclude_none=True)
+
+    for event in (light, validated):
+        event.pop("event_id")
+        event.pop("ts")
+    assert light == validated
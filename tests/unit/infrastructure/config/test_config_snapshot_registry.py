@@ -0,0 +1,85 @@
+"""Unit tests for the shared config snapshot registry."""
+
+from __future__ import annotations
+
+import gc
+import os
+import time
+
+import yaml
+
+from src.infrastructure.config.config_file_snapshots import ParseMeter
+from src.infrastructure.config.config_snapshot_registry import ConfigSnapshotRegistry
+from src.infrastructure.config.tts_config_service import TTSConfigService
+
+
+def _write_aged(path, data: dict, *, age_seconds: float = 10.0) -> None:
+    path.write_text(yaml.safe_dump(data), encoding="utf-8")
+    stamp = time.time() - age_seconds
+    os.utime(path, (stamp, stamp))
+
+
+def test_registry_parses_once_and_hands_out_private_copies(tmp_path):
+    path = tmp_path / "demo.yaml"
+    _write_aged(path, {"value": 1})
+    meter = ParseMeter()
+    registry = ConfigSnapshotRegistry(meter=meter)
+    parses: list[int] = []
+
+    def parse():
+        parses.append(1)
+        return yaml.safe_load(path.read_text(encoding="utf-8"))
+
+    first = registry.load(path, parse)
+    second = registry.load(path, parse)
+    first["value"] = 99
+
+    assert second == {"value": 1}
+    assert registry.load(path, parse) == {"value": 1}
+    assert len(parses) == 1
+    assert meter.stats()["recent"] == 1
+    assert meter.stats()["by_name"] == {"demo.yaml": 1}
+    assert registry.stats()["hits"] == 2
+
+
+class _Subscriber:
+    def __init__(self, config=None):
+        self.config = config
+
+
+def test_registry_pushes_changes_to_live_subscribers(tmp_path):
+    path = tmp_path / "demo.yaml"
+    _write_aged(path, {"value": 1})
+    registry = ConfigSnapshotRegistry(meter=ParseMeter(), revalidate_seconds=0.0)
+
+    def parse():
+        return yaml.safe_load(path.read_text(encoding="utf-8"))
+
+    subscriber = _Subscriber(registry.load(path, parse))
+    short_lived = _Subscriber()
+    registry.subscribe(path, subscriber)
+    registry.subscribe(path, short_lived)
+    del short_lived
+    gc.collect()
+
+    # An edit made outside the app is noticed by the next lookup.
+    _write_aged(path, {"value": 22}, age_seconds=5.0)
+    assert registry.load(path, parse) == {"value": 22}
+    assert subscriber.config == {"value": 22}
+
+    _write_aged(path, {"value": 333}, age_seconds=2.0)
+    registry.refresh(path, parse)
+    assert subscriber.config == {"value": 333}
+    assert registry.stats()["subscribers"] == 1
+
+
+def test_config_service_save_updates_other_instances(tmp_path):
+    config_path = tmp_path / "tts_config.yaml"
+    reader = TTSConfigService(config_path=str(config_path))
+    writer = TTSConfigService(config_path=str(config_path))
+
+    writer.save_config({"voice": "en-GB-SoniaNeural"})
+
+    assert writer.config.voice == "en-GB-SoniaNeural"
+    assert reader.config.voice == "en-GB-SoniaNeural"
+    assert reader.config is not writer.config
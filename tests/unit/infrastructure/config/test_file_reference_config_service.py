@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+from src.infrastructure.config.config_snapshot_registry import config_snapshots
 from src.infrastructure.config.file_reference_config_service import FileReferenceConfigService
 
 
-def test_file_reference_config_service_creates_loads_and_saves_config(tmp_path):
+def test_file_reference_config_service_creates_loads_and_saves_config(tmp_path, monkeypatch):
+    # The file is edited by hand below; re-check it on every lookup.
+    monkeypatch.setattr(config_snapshots, "revalidate_seconds", 0.0)
     config_path = tmp_path / "file_reference_config.yaml"
 
     service = FileReferenceConfigService(config_path=config_path)
@@ -827,6 +827,80 @@ class TestModelConfigService:
         await service.delete_api_key("deepseek")
         assert not await service.has_api_key("deepseek")
 
+    @pytest.mark.asyncio
+    async def test_model_resolution_reuses_compiled_snapshot(
+        self, temp_config_dir, sample_model_config, monkeypatch
+    ):
+        """Resolving models and keys does not re-read YAML until a file changes."""
+        from src.infrastructure.config.model_config_repository import ModelConfigRepository
+
+        config_path = temp_config_dir / "models_config.yaml"
+        keys_path = temp_config_dir / "keys_config.yaml"
+        self._write_split_config(config_path.parent, sample_model_config)
+        with open(keys_path, "w", encoding="utf-8") as f:
+            yaml.safe_dump({"providers": {"deepseek": {"api_key": "key-1"}}}, f)
+
+        loads: list[str] = []
+        original_load = ModelConfigRepository.load_yaml_dict
+
+        def counting_load(path):
+            loads.append(Path(path).name)
+            return original_load(path)
+
+        monkeypatch.setattr(ModelConfigRepository, "load_yaml_dict", staticmethod(counting_load))
+
+        first = ModelConfigService(config_path, keys_path)
+        model, provider = first.get_model_and_provider_sync("deepseek:deepseek-chat")
+        capabilities = first.get_merged_capabilities(model, provider)
+        assert first.get_api_key_sync("deepseek") == "key-1"
+        loads.clear()
+
+        # New service instances per request share the snapshot.
+        second = ModelConfigService(config_path, keys_path)
+        assert second.get_model_and_provider_sync() == (model, provider)
+        assert second.get_merged_capabilities(model, provider) is capabilities
+        assert second.get_api_key_sync("deepseek") == "key-1"
+        assert loads == []
+
+        # Writes through the service are visible immediately.
+        await second.set_api_key("deepseek", "key-2")
+        await second.set_default_model("deepseek", "deepseek-chat")
+        assert first.get_api_key_sync("deepseek") == "key-2"
+        assert first.get_model_and_provider_sync()[0] is not model
+
+    @pytest.mark.asyncio
+    async def test_model_snapshot_picks_up_external_edits(
+        self, temp_config_dir, sample_model_config, monkeypatch
+    ):
+        """Edits made outside the service are seen once the file signature is re-checked."""
+        from src.infrastructure.config.model_config_snapshot import model_config_snapshots
+
+        config_path = temp_config_dir / "models_config.yaml"
+        keys_path = temp_config_dir / "keys_config.yaml"
+        self._write_split_config(config_path.parent, sample_model_config)
+        with open(keys_path, "w", encoding="utf-8") as f:
+            yaml.safe_dump({"providers": {}}, f)
+        monkeypatch.setattr(model_config_snapshots, "revalidate_seconds", 0.0)
+
+        service = ModelConfigService(config_path, keys_path)
+        with pytest.raises(ValueError, match="not found"):
+            service.get_model_and_provider_sync("deepseek:deepseek-reasoner")
+
+        edited = dict(sample_model_config)
+        edited["models"] = [
+            *sample_model_config["models"],
+            {
+                "id": "deepseek-reasoner",
+                "name": "DeepSeek Reasoner",
+                "provider_id": "deepseek",
+                "enabled": True,
+            },
+        ]
+        self._write_split_config(config_path.parent, edited)
+
+        model, _ = service.get_model_and_provider_sync("deepseek:deepseek-reasoner")
+        assert model.name == "DeepSeek Reasoner"
+
     @pytest.mark.asyncio
     async def test_mask_api_key(self, temp_config_dir):
         """Test API key masking."""
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+from src.infrastructure.config.config_snapshot_registry import config_snapshots
 from src.infrastructure.config.tool_gate_config_service import ToolGateConfigService
 
 
-def test_tool_gate_config_service_creates_and_normalizes(tmp_path):
+def test_tool_gate_config_service_creates_and_normalizes(tmp_path, monkeypatch):
+    # The file is edited by hand below; re-check it on every lookup.
+    monkeypatch.setattr(config_snapshots, "revalidate_seconds", 0.0)
     config_path = tmp_path / "tool_gate_config.yaml"
     service = ToolGateConfigService(config_path=str(config_path))
 
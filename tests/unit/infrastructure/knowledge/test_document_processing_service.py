@@ -18,34 +18,29 @@ class _FakeCollection:
         self.docs = {}
         self.delete_calls = []
 
+    def _matching_ids(self, where):
+        clauses = where.get("$and", [where]) if where else []
+        return [
+            chunk_id
+            for chunk_id, payload in self.docs.items()
+            if all(
+                (payload.get("metadata") or {}).get(key) == value
+                for clause in clauses
+                for key, value in clause.items()
+            )
+        ]
+
     def delete(self, ids=None, where=None):
         self.delete_calls.append({"ids": ids, "where": where})
-        if ids:
-            for chunk_id in ids:
-                self.docs.pop(chunk_id, None)
-            return
-        if where and "doc_id" in where:
-            target_doc_id = where["doc_id"]
-            stale = [
-                chunk_id
-                for chunk_id, payload in self.docs.items()
-                if (payload.get("metadata") or {}).get("doc_id") == target_doc_id
-            ]
-            for chunk_id in stale:
-                self.docs.pop(chunk_id, None)
+        for chunk_id in ids or self._matching_ids(where):
+            self.docs.pop(chunk_id, None)
 
     def get(self, where=None, include=None):
-        _ = include
-        if where and "doc_id" in where:
-            target_doc_id = where["doc_id"]
-            ids = [
-                chunk_id
-                for chunk_id, payload in self.docs.items()
-                if (payload.get("metadata") or {}).get("doc_id") == target_doc_id
-            ]
-        else:
-            ids = list(self.docs.keys())
-        return {"ids": ids}
+        ids = self._matching_ids(where)
+        result = {"ids": ids}
+        if include and "metadatas" in include:
+            result["metadatas"] = [self.docs[chunk_id]["metadata"] for chunk_id in ids]
+        return result
 
 
 class _FakeChroma:
@@ -54,8 +49,15 @@ class _FakeChroma:
     fail_on_call = None
     fail_calls = set()
 
-    def __init__(self, collection_name, embedding_function, persist_directory, collection_metadata):
-        _ = embedding_function, persist_directory, collection_metadata
+    def __init__(
+        self,
+        collection_name,
+        embedding_function,
+        collection_metadata,
+        client,
+        relevance_score_fn=None,
+    ):
+        _ = embedding_function, collection_metadata, client, relevance_score_fn
         self._collection = self.collections.setdefault(collection_name, _FakeCollection())
 
     def add_texts(self, texts, ids, metadatas):
@@ -73,6 +75,10 @@ def _install_fake_vector_modules(monkeypatch):
     fake_langchain_chroma.__dict__["Chroma"] = _FakeChroma
     monkeypatch.setitem(sys.modules, "langchain_chroma", fake_langchain_chroma)
 
+    fake_chromadb = types.ModuleType("chromadb")
+    fake_chromadb.__dict__["PersistentClient"] = lambda path: SimpleNamespace(path=path)
+    monkeypatch.setitem(sys.modules, "chromadb", fake_chromadb)
+
     fake_chromadb_errors = types.ModuleType("chromadb.errors")
 
     class _InvalidArgumentError(Exception):
@@ -82,6 +88,26 @@ def _install_fake_vector_modules(monkeypatch):
     monkeypatch.setitem(sys.modules, "chromadb.errors", fake_chromadb_errors)
 
 
+class _FakeBm25Service:
+    def __init__(self, *, fail_append=False):
+        self.append_calls = []
+        self.delete_generation_calls = []
+        self.delete_stale_calls = []
+        self.fail_append = fail_append
+
+    def append_document_chunks(self, **kwargs):
+        if self.fail_append:
+            raise RuntimeError("bm25 write failed")
+        self.append_calls.append(kwargs)
+
+    def delete_document_generation(self, **kwargs):
+        self.delete_generation_calls.append(kwargs)
+
+    def delete_stale_document_chunks(self, **kwargs):
+        self.delete_stale_calls.append(kwargs)
+        return 0
+
+
 def _build_service(tmp_path: Path, *, batch_max_retries: int = 1) -> DocumentProcessingService:
     service = DocumentProcessingService.__new__(DocumentProcessingService)
     service.rag_config_service = SimpleNamespace(
@@ -95,7 +121,7 @@ def _build_service(tmp_path: Path, *, batch_max_retries: int = 1) -> DocumentPro
         )
     )
     service.embedding_service = None
-    service.bm25_service = SimpleNamespace(upsert_document_chunks=lambda **kwargs: None)
+    service.bm25_service = _FakeBm25Service()
     return service
 
 
@@ -129,7 +155,8 @@ def test_store_in_chromadb_rolls_back_partial_writes(monkeypatch):
             )
         remaining_ids = set(collection.docs.keys())
         assert remaining_ids == {"old_chunk"}
-        assert any(call["ids"] for call in collection.delete_calls)
+        assert any(call["where"] for call in collection.delete_calls)
+        assert len(service.bm25_service.delete_generation_calls) == 1
     finally:
         shutil.rmtree(tmp_path, ignore_errors=True)
 
@@ -173,6 +200,9 @@ def test_store_in_chromadb_cleans_stale_doc_generation(monkeypatch):
         assert len(doc1_ids) == 2
         assert "legacy_doc1_chunk" not in collection.docs
         assert "other_doc_chunk" in collection.docs
+        # One BM25 write per window, then stale generations are dropped.
+        assert [len(call["chunks"]) for call in service.bm25_service.append_calls] == [2]
+        assert len(service.bm25_service.delete_stale_calls) == 1
     finally:
         shutil.rmtree(tmp_path, ignore_errors=True)
 
@@ -180,7 +210,7 @@ def test_store_in_chromadb_cleans_stale_doc_generation(monkeypatch):
 class _FakeSqliteVecService:
     def __init__(self, *, had_existing=False):
         self.upsert_calls = []
-        self.delete_by_ids_calls = []
+        self.delete_generation_calls = []
         self.delete_stale_calls = []
         self.had_existing = had_existing
 
@@ -188,8 +218,8 @@ class _FakeSqliteVecService:
         self.upsert_calls.append(kwargs)
         return self.had_existing
 
-    def delete_chunks_by_ids(self, **kwargs):
-        self.delete_by_ids_calls.append(kwargs)
+    def delete_document_generation(self, **kwargs):
+        self.delete_generation_calls.append(kwargs)
 
     def delete_stale_document_chunks(self, **kwargs):
         self.delete_stale_calls.append(kwargs)
@@ -217,11 +247,7 @@ def test_store_in_sqlite_vec_rolls_back_on_bm25_failure(monkeypatch):
             lambda: fake_sqlite,
         )
 
-        def _raise_bm25(**kwargs):
-            _ = kwargs
-            raise RuntimeError("bm25 write failed")
-
-        service.bm25_service = SimpleNamespace(upsert_document_chunks=_raise_bm25)
+        service.bm25_service = _FakeBm25Service(fail_append=True)
 
         with pytest.raises(RuntimeError, match="bm25 write failed"):
             asyncio.run(
@@ -236,7 +262,8 @@ def test_store_in_sqlite_vec_rolls_back_on_bm25_failure(monkeypatch):
             )
 
         assert len(fake_sqlite.upsert_calls) == 1
-        assert len(fake_sqlite.delete_by_ids_calls) == 1
+        assert len(fake_sqlite.delete_generation_calls) == 1
+        assert len(service.bm25_service.delete_generation_calls) == 1
         assert len(fake_sqlite.delete_stale_calls) == 0
     finally:
         shutil.rmtree(tmp_path, ignore_errors=True)
@@ -253,8 +280,6 @@ def test_store_in_sqlite_vec_skips_stale_cleanup_for_new_doc(monkeypatch):
             "src.infrastructure.retrieval.sqlite_vec_service.SqliteVecService",
             lambda: fake_sqlite,
         )
-        service.bm25_service = SimpleNamespace(upsert_document_chunks=lambda **kwargs: None)
-
         asyncio.run(
             service._store_in_sqlite_vec(
                 kb_id="kb1",
@@ -283,8 +308,6 @@ def test_store_in_sqlite_vec_runs_stale_cleanup_for_existing_doc(monkeypatch):
             "src.infrastructure.retrieval.sqlite_vec_service.SqliteVecService",
             lambda: fake_sqlite,
         )
-        service.bm25_service = SimpleNamespace(upsert_document_chunks=lambda **kwargs: None)
-
         asyncio.run(
             service._store_in_sqlite_vec(
                 kb_id="kb1",
@@ -300,3 +323,189 @@ def test_store_in_sqlite_vec_runs_stale_cleanup_for_existing_doc(monkeypatch):
         assert len(fake_sqlite.delete_stale_calls) == 1
     finally:
         shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def test_store_in_sqlite_vec_reuses_embeddings_of_unchanged_chunks(monkeypatch, tmp_path):
+    from src.infrastructure.retrieval.sqlite_vec_service import SqliteVecService
+
+    service = _build_service(tmp_path, batch_max_retries=1)
+    service._sqlite_vec_service = SqliteVecService(db_path=str(tmp_path / "rag_vec.sqlite3"))
+
+    class _CountingEmbeddingFn(_FakeEmbeddingFn):
+        def __init__(self):
+            self.texts: list[str] = []
+
+        def embed_documents(self, texts):
+            self.texts.extend(texts)
+            return super().embed_documents(texts)
+
+    def store(chunks, embedding_fn):
+        return asyncio.run(
+            service._store_in_sqlite_vec(
+                kb_id="kb1",
+                doc_id="doc1",
+                filename="doc.md",
+                file_type=".md",
+                chunks=chunks,
+                embedding_fn=embedding_fn,
+                embedding_model_key="api:test-model",
+            )
+        )
+
+    first = _CountingEmbeddingFn()
+    assert store(["a", "bb", "a"], first) == {"chunks": 3, "embedded": 2, "reused": 1}
+    assert first.texts == ["a", "bb"]
+
+    second = _CountingEmbeddingFn()
+    assert store(["a", "bb", "edited"], second) == {"chunks": 3, "embedded": 1, "reused": 2}
+    assert second.texts == ["edited"]
+    chunks = service._sqlite_vec_service.list_chunks(kb_id="kb1", doc_id="doc1")
+    assert [chunk["content"] for chunk in chunks] == ["a", "bb", "edited"]
+
+
+def _chunk_windows(service, *args, window_size=None):
+    async def collect():
+        if window_size is None:
+            source = await service._extract_chunks(*args)
+        else:
+            source = service._stream_chunks(*args, window_size=window_size)
+        if isinstance(source, list):
+            return [source]
+        return [window async for window in source]
+
+    return asyncio.run(collect())
+
+
+def test_extract_chunks_streams_pdf_pages_with_provenance(monkeypatch, tmp_path):
+    import fitz
+
+    from src.core.config import settings
+
+    monkeypatch.setattr(settings, "kb_extraction_processes", 0)
+    pdf_path = tmp_path / "doc.pdf"
+    pdf = fitz.open()
+    for text in ("first page text", "", "third page text", "fourth page text"):
+        page = pdf.new_page()
+        if text:
+            page.insert_text((72, 72), text)
+    pdf.save(str(pdf_path))
+    pdf.close()
+    service = _build_service(tmp_path)
+
+    windows = _chunk_windows(service, str(pdf_path), ".pdf", 20, 0)
+    chunks = [chunk for window in windows for chunk in window]
+    assert [(chunk.text, chunk.page_start, chunk.page_end) for chunk in chunks] == [
+        ("first page text", 1, 1),
+        ("third page text", 3, 3),
+        ("fourth page text", 4, 4),
+    ]
+
+    # Units of consecutive pages merge into one chunk spanning both pages.
+    windows = _chunk_windows(service, str(pdf_path), ".pdf", 500, 0, window_size=1)
+    assert windows == [[("first page text\n\nthird page text\n\nfourth page text", 1, 4)]]
+
+
+def test_stream_chunks_cancel_waits_for_extraction_step_before_closing(monkeypatch, tmp_path):
+    import threading
+
+    from src.infrastructure.knowledge import document_processing_service as module
+    from src.infrastructure.knowledge.document_processing_service import DocumentChunk
+
+    step_started = threading.Event()
+    release_step = threading.Event()
+    closed = threading.Event()
+
+    def slow_chunks(*_args):
+        try:
+            yield DocumentChunk("first")
+            step_started.set()
+            release_step.wait(5)
+            yield DocumentChunk("second")
+        finally:
+            closed.set()
+
+    monkeypatch.setattr(module, "iter_document_chunks", slow_chunks)
+    service = _build_service(tmp_path)
+
+    async def consume():
+        windows = []
+        async for window in service._stream_chunks("doc.pdf", ".pdf", 20, 0, window_size=1):
+            windows.append(window)
+        return windows
+
+    async def run():
+        task = asyncio.create_task(consume())
+        await asyncio.to_thread(step_started.wait, 5)
+        task.cancel()
+        asyncio.get_running_loop().call_later(0.05, release_step.set)
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert closed.is_set()
+
+
+def test_extract_chunks_raises_for_documents_without_text(monkeypatch, tmp_path):
+    from src.core.config import settings
+
+    monkeypatch.setattr(settings, "kb_extraction_processes", 0)
+    empty = tmp_path / "empty.txt"
+    empty.write_text("  \n", encoding="utf-8")
+    service = _build_service(tmp_path)
+
+    with pytest.raises(ValueError, match="No text content"):
+        _chunk_windows(service, str(empty), ".txt", 24, 0)
+
+
+def test_store_in_sqlite_vec_writes_streamed_windows_and_rolls_back(tmp_path):
+    from src.infrastructure.knowledge.document_processing_service import DocumentChunk
+    from src.infrastructure.retrieval.bm25_service import Bm25Service
+    from src.infrastructure.retrieval.sqlite_vec_service import SqliteVecService
+
+    service = _build_service(tmp_path)
+    service._sqlite_vec_service = SqliteVecService(db_path=str(tmp_path / "rag_vec.sqlite3"))
+    service.bm25_service = Bm25Service(db_path=str(tmp_path / "rag_vec.sqlite3"))
+
+    def store(windows, fail_after=None):
+        async def stream():
+            for index, window in enumerate(windows):
+                if index == fail_after:
+                    raise ValueError("extraction failed")
+                yield window
+
+        return asyncio.run(
+            service._store_in_sqlite_vec(
+                kb_id="kb1",
+                doc_id="doc1",
+                filename="doc.pdf",
+                file_type=".pdf",
+                chunks=stream(),
+                embedding_fn=_FakeEmbeddingFn(),
+            )
+        )
+
+    windows = [
+        [DocumentChunk("page one", 1, 1), DocumentChunk("pages one-two", 1, 2)],
+        [DocumentChunk("page three", 3, 3)],
+    ]
+    assert store(windows) == {"chunks": 3, "embedded": 3, "reused": 0}
+    rows = service._sqlite_vec_service.list_chunks(kb_id="kb1", doc_id="doc1")
+    assert [(row["chunk_index"], row["page_start"], row["page_end"]) for row in rows] == [
+        (0, 1, 1),
+        (1, 1, 2),
+        (2, 3, 3),
+    ]
+
+    # A failure after the first window drops that window and keeps the old generation.
+    with pytest.raises(ValueError, match="extraction failed"):
+        store([[DocumentChunk("new page", 1, 1)], [DocumentChunk("never", 2, 2)]], fail_after=1)
+    rows = service._sqlite_vec_service.list_chunks(kb_id="kb1", doc_id="doc1")
+    assert [row["content"] for row in rows] == ["page one", "pages one-two", "page three"]
+
+    def bm25_contents():
+        rows = service.bm25_service.list_document_chunks_in_range(
+            kb_id="kb1", doc_id="doc1", start_index=0, end_index=10
+        )
+        return sorted(row["content"] for row in rows)
+
+    assert bm25_contents() == ["page one", "page three", "pages one-two"]
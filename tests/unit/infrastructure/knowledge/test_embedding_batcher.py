@@ -0,0 +1,110 @@
+"""Unit tests for cross-document embedding batches."""
+
+import asyncio
+
+import pytest
+
+from src.infrastructure.knowledge.embedding_batcher import AdaptivePacer, EmbeddingBatcher
+
+
+class _RecordingEmbeddingFn:
+    def __init__(self, failures: list[Exception] | None = None):
+        self.calls: list[list[str]] = []
+        self.failures = list(failures or [])
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        if self.failures:
+            raise self.failures.pop(0)
+        return [[float(len(text))] for text in texts]
+
+
+@pytest.mark.asyncio
+async def test_batcher_packs_slices_of_concurrent_documents():
+    embedding_fn = _RecordingEmbeddingFn()
+    batcher = EmbeddingBatcher(embedding_fn, batch_size=4, linger_seconds=1.0)
+
+    async def document(texts: list[str], delay: float):
+        with batcher.track_document() as token:
+            await asyncio.sleep(delay)
+            return await batcher.embed(texts, token)
+
+    first, second = await asyncio.gather(
+        document(["a", "bb"], 0.0), document(["ccc", "dddd", "eeeee"], 0.01)
+    )
+
+    assert first == [[1.0], [2.0]]
+    assert second == [[3.0], [4.0], [5.0]]
+    # The first document's slice waited for the second instead of going alone.
+    assert embedding_fn.calls == [["a", "bb", "ccc", "dddd"], ["eeeee"]]
+    stats = batcher.stats()
+    assert (stats["batches"], stats["texts"], stats["avg_batch_size"]) == (2, 5, 2.5)
+
+
+@pytest.mark.asyncio
+async def test_batcher_does_not_wait_for_a_single_document():
+    embedding_fn = _RecordingEmbeddingFn()
+    batcher = EmbeddingBatcher(embedding_fn, batch_size=64, linger_seconds=30.0)
+
+    with batcher.track_document() as token:
+        vectors = await asyncio.wait_for(batcher.embed(["a"], token), timeout=5)
+
+    assert vectors == [[1.0]]
+
+
+@pytest.mark.asyncio
+async def test_batcher_retries_with_backoff_and_fails_after_max_retries(monkeypatch):
+    sleeps: list[float] = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(AdaptivePacer, "wait", lambda self: fake_sleep(self.delay))
+    embedding_fn = _RecordingEmbeddingFn(failures=[RuntimeError("429 rate limit, retry-after: 7")])
+    batcher = EmbeddingBatcher(embedding_fn, batch_size=2, max_retries=1, base_delay=0.5)
+
+    assert await batcher.embed(["a"]) == [[1.0]]
+    # Rate limits honour Retry-After; success halves the delay.
+    assert sleeps == [0.0, 7.0]
+    assert batcher.pacer.delay == 3.5
+
+    embedding_fn.failures = [RuntimeError("boom"), RuntimeError("boom again")]
+    with pytest.raises(RuntimeError, match="boom again"):
+        await batcher.embed(["b"])
+    assert sleeps == [0.0, 7.0, 3.5, 7.0]
+    stats = batcher.stats()
+    assert (stats["rate_limited"], stats["failed_batches"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_failed_shared_batch_only_fails_the_document_with_bad_input(monkeypatch):
+    async def no_wait(self):
+        return None
+
+    monkeypatch.setattr(AdaptivePacer, "wait", no_wait)
+
+    class _PoisonEmbeddingFn(_RecordingEmbeddingFn):
+        def embed_documents(self, texts):
+            self.calls.append(list(texts))
+            if "poison" in texts:
+                raise RuntimeError("400 input too long")
+            return [[float(len(text))] for text in texts]
+
+    embedding_fn = _PoisonEmbeddingFn()
+    batcher = EmbeddingBatcher(embedding_fn, batch_size=4, max_retries=1, linger_seconds=1.0)
+
+    async def document(texts: list[str]):
+        with batcher.track_document() as token:
+            return await batcher.embed(texts, token)
+
+    healthy, poisoned = await asyncio.gather(
+        document(["a", "bb"]), document(["poison", "ccc"]), return_exceptions=True
+    )
+
+    assert healthy == [[1.0], [2.0]]
+    assert isinstance(poisoned, RuntimeError)
+    # Two attempts at the shared batch, then each document on its own.
+    assert embedding_fn.calls[:2] == [["a", "bb", "poison", "ccc"]] * 2
+    assert ["a", "bb"] in embedding_fn.calls[2:]
+    stats = batcher.stats()
+    assert stats["failed_batches"] == 1
@@ -0,0 +1,177 @@
+"""Unit tests for the knowledge base ingestion queue."""
+
+import asyncio
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from src.infrastructure.knowledge import ingestion_queue as queue_module
+from src.infrastructure.knowledge.ingestion_queue import (
+    IngestionJob,
+    IngestionQueue,
+    IngestionQueueFullError,
+)
+
+
+def _job_kwargs(kb_id: str, doc_id: str, file_size: int) -> dict:
+    return {
+        "kb_id": kb_id,
+        "doc_id": doc_id,
+        "filename": f"{doc_id}.md",
+        "file_type": ".md",
+        "storage_path": f"/tmp/{doc_id}.md",
+        "file_size": file_size,
+    }
+
+
+@pytest.mark.asyncio
+async def test_queue_is_fair_across_kbs_and_prefers_small_files():
+    order: list[str] = []
+    gate = asyncio.Event()
+    running = 0
+    peak = 0
+
+    async def process(job: IngestionJob):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await gate.wait()
+        order.append(job.doc_id)
+        running -= 1
+        if job.doc_id == "b-fail":
+            raise RuntimeError("boom")
+
+    queue = IngestionQueue(process, workers=1, max_pending=5)
+    await queue.enqueue(**_job_kwargs("kb-a", "a-first", 10))
+    await asyncio.sleep(0)  # the worker picks up a-first and blocks on the gate
+    await queue.enqueue(**_job_kwargs("kb-a", "a-large", 900))
+    await queue.enqueue(**_job_kwargs("kb-a", "a-small", 5))
+    await queue.enqueue(**_job_kwargs("kb-b", "b-fail", 50))
+    assert await queue.enqueue(**_job_kwargs("kb-b", "b-fail", 50)) is False
+    await queue.enqueue(**_job_kwargs("kb-b", "b-next", 60))
+    await queue.enqueue(**_job_kwargs("kb-c", "c-only", 1))
+    with pytest.raises(IngestionQueueFullError):
+        await queue.enqueue(**_job_kwargs("kb-c", "c-extra", 1))
+
+    stats = queue.stats()
+    assert stats["pending"] == 5
+    assert stats["pending_by_kb"] == {"kb-a": 2, "kb-b": 2, "kb-c": 1}
+    assert stats["running"] == 1
+
+    gate.set()
+    await queue.join()
+    await queue.stop()
+
+    assert order == ["a-first", "a-small", "b-fail", "c-only", "a-large", "b-next"]
+    assert peak == 1
+    stats = queue.stats()
+    assert (stats["completed"], stats["failed"], stats["pending"]) == (5, 1, 0)
+    assert stats["docs_per_minute"] > 0
+
+
+@pytest.mark.asyncio
+async def test_resume_unfinished_requeues_pending_documents(tmp_path):
+    processed: list[str] = []
+
+    async def process(job: IngestionJob):
+        processed.append(job.doc_id)
+
+    stored = tmp_path / "doc1_a.md"
+    stored.write_text("content", encoding="utf-8")
+    status_updates = []
+
+    class _KbService:
+        async def get_knowledge_bases(self):
+            return [SimpleNamespace(id="kb1")]
+
+        async def get_documents(self, kb_id):
+            return [
+                SimpleNamespace(
+                    id=doc_id, status=status, filename="a.md", file_type=".md", file_size=7
+                )
+                for doc_id, status in (
+                    ("doc1", "processing"),
+                    ("doc2", "ready"),
+                    ("doc3", "pending"),
+                )
+            ]
+
+        def find_document_file(self, kb_id, doc_id):
+            return stored if doc_id == "doc1" else None
+
+        async def update_document_status(self, kb_id, doc_id, status, **kwargs):
+            status_updates.append((doc_id, status))
+
+    queue = IngestionQueue(process, workers=2)
+    assert await queue.resume_unfinished(_KbService()) == 1
+    await queue.join()
+    await queue.stop()
+
+    assert processed == ["doc1"]
+    assert status_updates == [("doc3", "error")]
+
+
+@pytest.mark.asyncio
+async def test_process_document_job_updates_status_on_failure(monkeypatch):
+    class _Processor:
+        async def process_document(self, *args, **kwargs):
+            raise RuntimeError("process failed")
+
+    status_updates = []
+
+    class _StatusService:
+        async def update_document_status(self, *args, **kwargs):
+            status_updates.append((args, kwargs))
+
+    monkeypatch.setitem(
+        sys.modules,
+        "src.infrastructure.knowledge.document_processing_service",
+        SimpleNamespace(DocumentProcessingService=lambda: _Processor()),
+    )
+    monkeypatch.setattr(
+        "src.infrastructure.knowledge.knowledge_base_service.KnowledgeBaseService",
+        lambda: _StatusService(),
+    )
+
+    job = IngestionJob(file_size=1, kb_id="kb1", doc_id="doc1", filename="doc.md", file_type=".md")
+    with pytest.raises(RuntimeError, match="process failed"):
+        await queue_module.process_document_job(job)
+    assert status_updates[0][0][:3] == ("kb1", "doc1", "error")
+
+
+@pytest.mark.asyncio
+async def test_reserved_slot_counts_towards_capacity():
+    async def process(job: IngestionJob):
+        await asyncio.Event().wait()
+
+    queue = IngestionQueue(process, workers=1, max_pending=1)
+    with queue.reserve():
+        assert queue.is_full()
+        with pytest.raises(IngestionQueueFullError):
+            with queue.reserve():
+                pass
+        with pytest.raises(IngestionQueueFullError):
+            await queue.enqueue(**_job_kwargs("kb-a", "other", 1))
+        assert await queue.enqueue(**_job_kwargs("kb-a", "mine", 1), reserved=True)
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_returns_when_running_job_swallows_cancellation():
+    started = asyncio.Event()
+
+    async def process(job: IngestionJob):
+        started.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            raise ValueError("cleanup failed") from None
+
+    queue = IngestionQueue(process, workers=1, max_pending=5)
+    await queue.enqueue(**_job_kwargs("kb-a", "doc", 1))
+    await started.wait()
+
+    await asyncio.wait_for(queue.stop(), timeout=2)
+
+    assert queue.stats()["running"] == 0
@@ -189,3 +189,83 @@ def test_build_memory_context_respects_enabled_layers(memory_service, monkeypatc
     assert "Respond with concise bullet points." in context
     assert "## User context (relevant background):" not in context
     assert [source["layer"] for source in sources] == ["instruction"]
+
+
+def test_build_memory_context_layers_assistant_memories_over_shared_items(
+    memory_service, monkeypatch
+):
+    searched_scopes: list[str] = []
+
+    def fake_search_scope(**kwargs):
+        scope = kwargs["scope"]
+        searched_scopes.append(scope)
+        if scope == "global":
+            return [
+                MemoryResult(
+                    id="mem_same",
+                    content="Use concise replies.",
+                    score=0.6,
+                    metadata={"scope": "global", "layer": "fact"},
+                ),
+                MemoryResult(
+                    id="mem_global",
+                    content="User is an engineer.",
+                    score=0.7,
+                    metadata={"scope": "global", "layer": "fact"},
+                ),
+            ]
+        return [
+            MemoryResult(
+                id="mem_same",
+                content="Use concise replies.",
+                score=0.9,
+                metadata={"scope": "assistant", "layer": "fact"},
+            )
+        ]
+
+    def fake_load_instruction_memories(**kwargs):
+        results = []
+        if kwargs["include_global"]:
+            results.append(
+                MemoryResult(
+                    id="ins_global",
+                    content="Answer in English.",
+                    score=None,
+                    metadata={"scope": "global", "layer": "instruction"},
+                )
+            )
+        if kwargs["include_assistant"]:
+            results.append(
+                MemoryResult(
+                    id="ins_assistant",
+                    content="Cite sources.",
+                    score=None,
+                    metadata={"scope": "assistant", "layer": "instruction"},
+                )
+            )
+        return results
+
+    monkeypatch.setattr(memory_service, "_search_scope", fake_search_scope)
+    monkeypatch.setattr(memory_service, "_refresh_ids_from_collection", lambda results, _: results)
+    monkeypatch.setattr(
+        memory_service, "_load_instruction_memories", fake_load_instruction_memories
+    )
+
+    expected = memory_service.build_memory_context(query="reply style", assistant_id="assistant-a")
+    shared = memory_service.collect_memory_items(
+        query="reply style", assistant_id=None, include_assistant=False
+    )
+    searched_scopes.clear()
+
+    layered = memory_service.build_memory_context(
+        query="reply style", assistant_id="assistant-a", shared_items=shared
+    )
+
+    assert layered == expected
+    assert searched_scopes == ["assistant"]
+    assert [source["id"] for source in layered[1]] == [
+        "ins_global",
+        "ins_assistant",
+        "mem_same",
+        "mem_global",
+    ]
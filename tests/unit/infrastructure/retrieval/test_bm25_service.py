@@ -1,3 +1,5 @@
+import sqlite3
+
 from src.infrastructure.retrieval.bm25_service import Bm25Service
 
 
@@ -80,3 +82,128 @@ def test_upsert_document_chunks_refreshes_fts_without_duplicates(tmp_path):
         min_term_coverage=0.0,
     )
     assert [row["chunk_id"] for row in rows] == ["c1"]
+
+
+def test_search_is_scoped_to_the_kb_partition(tmp_path):
+    service = Bm25Service(db_path=str(tmp_path / "bm25.sqlite3"))
+    service.upsert_document_chunks(
+        kb_id="kb_big",
+        doc_id="doc_big",
+        filename="big.md",
+        chunks=[
+            {"chunk_id": f"big_{index}", "chunk_index": index, "content": "shared term here"}
+            for index in range(50)
+        ],
+    )
+    service.upsert_document_chunks(
+        kb_id="kb_small",
+        doc_id="doc_small",
+        filename="small.md",
+        chunks=[{"chunk_id": "small_0", "chunk_index": 0, "content": "shared term"}],
+    )
+
+    # Matches in the other KB no longer use up the LIMIT.
+    rows = service.search(kb_id="kb_small", query="shared", top_k=1)
+    assert [row["chunk_id"] for row in rows] == ["small_0"]
+    assert service.search(kb_id="kb_missing", query="shared", top_k=1) == []
+
+    service.delete_document_chunks(kb_id="kb_big", doc_id="doc_big")
+    assert service.search(kb_id="kb_big", query="shared", top_k=5) == []
+    service.delete_kb_chunks(kb_id="kb_small")
+    assert service.search(kb_id="kb_small", query="shared", top_k=5) == []
+
+
+def test_shared_fts_index_is_migrated_to_kb_partitions(tmp_path):
+    db_path = tmp_path / "bm25.sqlite3"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE rag_bm25_chunks (
+                chunk_id TEXT PRIMARY KEY,
+                kb_id TEXT NOT NULL,
+                doc_id TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                chunk_index INTEGER NOT NULL,
+                content TEXT NOT NULL,
+                tokenized TEXT NOT NULL,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        conn.execute(
+            "CREATE VIRTUAL TABLE rag_bm25_fts USING fts5(chunk_id, tokenized, tokenize='unicode61')"
+        )
+        for chunk_id, kb_id in (("a1", "kb_a"), ("b1", "kb_b")):
+            conn.execute(
+                "INSERT INTO rag_bm25_chunks VALUES (?, ?, 'doc', 'doc.md', 0, ?, ?, NULL)",
+                (chunk_id, kb_id, f"legacy {kb_id}", f"legacy {kb_id}"),
+            )
+            conn.execute(
+                "INSERT INTO rag_bm25_fts (chunk_id, tokenized) VALUES (?, ?)",
+                (chunk_id, f"legacy {kb_id}"),
+            )
+    conn.close()
+
+    service = Bm25Service(db_path=str(db_path))
+    assert service.migrate_shared_fts_index() == 2
+    assert service.migrate_shared_fts_index() == 0
+
+    with service._connect() as conn:
+        tables = {
+            str(row[0]) for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        }
+        partitions = conn.execute("SELECT COUNT(*) FROM rag_bm25_kb_fts").fetchone()[0]
+    assert "rag_bm25_fts" not in tables
+    assert partitions == 2
+    assert [row["chunk_id"] for row in service.search(kb_id="kb_b", query="legacy", top_k=5)] == [
+        "b1"
+    ]
+
+    service.upsert_document_chunks(
+        kb_id="kb_a",
+        doc_id="doc",
+        filename="doc.md",
+        chunks=[{"chunk_id": "a1", "chunk_index": 0, "content": "fresh text"}],
+    )
+    assert service.search(kb_id="kb_a", query="legacy", top_k=5) == []
+    assert [row["chunk_id"] for row in service.search(kb_id="kb_a", query="fresh", top_k=5)] == [
+        "a1"
+    ]
+
+
+def test_appended_generations_replace_previous_rows_once_complete(tmp_path):
+    service = Bm25Service(db_path=str(tmp_path / "bm25.sqlite3"))
+    service.upsert_document_chunks(
+        kb_id="kb_a",
+        doc_id="doc_1",
+        filename="doc_1.md",
+        chunks=[{"chunk_id": "old", "chunk_index": 0, "content": "legacy trantor"}],
+    )
+
+    def append(ingest_id, chunk_id, content):
+        service.append_document_chunks(
+            kb_id="kb_a",
+            doc_id="doc_1",
+            filename="doc_1.md",
+            ingest_id=ingest_id,
+            chunks=[{"chunk_id": chunk_id, "chunk_index": 0, "content": content}],
+        )
+
+    def search(query):
+        return {row["chunk_id"] for row in service.search(kb_id="kb_a", query=query, top_k=5)}
+
+    append("gen_a", "a0", "trantor terminus")
+    append("gen_a", "a1", "terminus encyclopedia")
+    # The previous generation keeps serving until the new one is complete.
+    assert search("trantor") == {"old", "a0"}
+
+    append("gen_b", "b0", "trantor anacreon")
+    service.delete_document_generation(kb_id="kb_a", doc_id="doc_1", ingest_id="gen_b")
+    assert search("anacreon") == set()
+
+    assert (
+        service.delete_stale_document_chunks(kb_id="kb_a", doc_id="doc_1", keep_ingest_id="gen_a")
+        == 1
+    )
+    assert search("trantor") == {"a0"}
+    assert search("terminus") == {"a0", "a1"}
@@ -0,0 +1,127 @@
+import sys
+import types
+
+from src.infrastructure.retrieval.chroma_registry import (
+    ChromaRegistry,
+    cosine_relevance_score,
+    search_by_vector_with_relevance,
+)
+
+
+class _FakeClient:
+    def __init__(self, path):
+        self.path = path
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeChroma:
+    def __init__(
+        self,
+        client,
+        collection_name,
+        embedding_function,
+        collection_metadata,
+        relevance_score_fn=None,
+    ):
+        self.client = client
+        self.collection_name = collection_name
+        self.embedding_function = embedding_function
+        self.collection_metadata = collection_metadata
+        self.relevance_score_fn = relevance_score_fn
+
+
+def _install_fake_chroma(monkeypatch):
+    clients = []
+
+    def persistent_client(path):
+        client = _FakeClient(path)
+        clients.append(client)
+        return client
+
+    fake_chromadb = types.ModuleType("chromadb")
+    fake_chromadb.__dict__["PersistentClient"] = persistent_client
+    monkeypatch.setitem(sys.modules, "chromadb", fake_chromadb)
+    fake_langchain_chroma = types.ModuleType("langchain_chroma")
+    fake_langchain_chroma.__dict__["Chroma"] = _FakeChroma
+    monkeypatch.setitem(sys.modules, "langchain_chroma", fake_langchain_chroma)
+    return clients
+
+
+def test_registry_reuses_clients_and_collection_handles(monkeypatch, tmp_path):
+    clients = _install_fake_chroma(monkeypatch)
+    registry = ChromaRegistry()
+    embedding_a, embedding_b = object(), object()
+
+    first = registry.get_vectorstore(tmp_path, "kb_1", embedding_a)
+    assert registry.get_vectorstore(str(tmp_path), "kb_1", embedding_a) is first
+    other_model = registry.get_vectorstore(tmp_path, "kb_1", embedding_b)
+    memory = registry.get_vectorstore(tmp_path, "memory", embedding_a)
+
+    assert other_model is not first and memory is not first
+    assert len(clients) == 1
+    assert first.client is memory.client is registry.get_client(tmp_path)
+    assert first.collection_metadata == {"hnsw:space": "cosine"}
+    assert first.relevance_score_fn is cosine_relevance_score
+
+    # Deleting a collection drops its handles only.
+    registry.evict_collection(tmp_path, "kb_1")
+    assert registry.get_vectorstore(tmp_path, "kb_1", embedding_a) is not first
+    assert registry.get_vectorstore(tmp_path, "memory", embedding_a) is memory
+    assert registry.stats() == {
+        "clients": 1,
+        "handles": 2,
+        "clients_created": 1,
+        "handles_created": 4,
+        "hits": 2,
+        "evictions": 0,
+    }
+
+    registry.close()
+    assert clients[0].closed
+    assert registry.stats()["handles"] == 0
+
+
+def test_registry_bounds_collection_handles(monkeypatch, tmp_path):
+    _install_fake_chroma(monkeypatch)
+    registry = ChromaRegistry(max_handles=2)
+    embedding = object()
+
+    first = registry.get_vectorstore(tmp_path, "kb_1", embedding)
+    registry.get_vectorstore(tmp_path, "kb_2", embedding)
+    registry.get_vectorstore(tmp_path, "kb_3", embedding)
+
+    assert registry.stats()["evictions"] == 1
+    assert registry.get_vectorstore(tmp_path, "kb_1", embedding) is not first
+
+
+def test_search_by_vector_normalizes_cosine_distances():
+    calls = []
+
+    class _Store:
+        def similarity_search_by_vector_with_relevance_scores(self, embedding, **kwargs):
+            calls.append((embedding, kwargs))
+            return [("near", 0.1), ("far", 0.75)]
+
+    results = search_by_vector_with_relevance(_Store(), (1.0, 0.0), k=2, filter={"scope": "global"})
+
+    assert results == [("near", 0.9), ("far", 0.25)]
+    assert calls == [([1.0, 0.0], {"k": 2, "filter": {"scope": "global"}})]
+
+
+def test_invalidating_embedding_instances_drops_collection_handles(monkeypatch, tmp_path):
+    from src.infrastructure.retrieval import chroma_registry, embedding_service
+
+    _install_fake_chroma(monkeypatch)
+    registry = ChromaRegistry()
+    monkeypatch.setattr(chroma_registry, "_chroma_registry", registry)
+    embedding = object()
+
+    first = registry.get_vectorstore(tmp_path, "kb_1", embedding)
+    embedding_service.invalidate_embedding_instances()
+
+    assert registry.stats()["handles"] == 0
+    assert registry.stats()["clients"] == 1
+    assert registry.get_vectorstore(tmp_path, "kb_1", embedding) is not first
@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+from src.infrastructure.config.rag_config_service import EmbeddingConfig
+from src.infrastructure.retrieval.embedding_service import (
+    EmbeddingService,
+    get_embedding_instance_cache,
+    invalidate_embedding_instances,
+)
+
+
+class _FakeRagConfigService:
+    def __init__(self, **embedding_fields):
+        self.config = SimpleNamespace(embedding=EmbeddingConfig(**embedding_fields))
+
+
+def test_embedding_instances_are_cached_by_model_and_config(monkeypatch):
+    created = []
+
+    def fake_local_embeddings(self, model_name, device="cpu"):
+        instance = SimpleNamespace(model_name=model_name, device=device)
+        created.append(instance)
+        return instance
+
+    monkeypatch.setattr(EmbeddingService, "_get_local_embeddings", fake_local_embeddings)
+    invalidate_embedding_instances()
+    rag_config = _FakeRagConfigService(provider="local", local_model="mini")
+
+    first = EmbeddingService(rag_config_service=rag_config).get_embedding_function()
+    second = EmbeddingService(rag_config_service=rag_config).get_embedding_function()
+    assert first is second
+    assert len(created) == 1
+
+    # A different device is a different instance; invalidation drops everything.
+    rag_config.config.embedding.local_device = "cuda"
+    on_cuda = EmbeddingService(rag_config_service=rag_config).get_embedding_function()
+    assert on_cuda is not first and on_cuda.device == "cuda"
+
+    invalidate_embedding_instances()
+    assert EmbeddingService(rag_config_service=rag_config).get_embedding_function() is not on_cuda
+    stats = get_embedding_instance_cache().stats()
+    assert stats["instances"] == 1
+    assert len(created) == 3
+    invalidate_embedding_instances()
+
+
+def test_api_embeddings_share_http_clients():
+    invalidate_embedding_instances()
+    rag_config = _FakeRagConfigService(
+        provider="api", api_model="model-a", api_base_url="http://127.0.0.1:9/v1"
+    )
+    service = EmbeddingService(rag_config_service=rag_config)
+
+    model_a = service.get_embedding_function()
+    model_b = service.get_embedding_function("model-b")
+
+    assert model_a is not model_b
+    assert service.get_embedding_function() is model_a
+    assert model_a.http_client is model_b.http_client
+    assert model_a.http_async_client is model_b.http_async_client
+    invalidate_embedding_instances()
@@ -0,0 +1,55 @@
+import asyncio
+
+from src.infrastructure.retrieval.query_embedding_cache import QueryEmbeddingCache
+
+
+class _CountingEmbeddings:
+    def __init__(self):
+        self.batches: list[list[str]] = []
+
+    def embed_documents(self, texts):
+        self.batches.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+def test_cache_batches_misses_and_normalizes_whitespace():
+    cache = QueryEmbeddingCache(max_entries=8)
+    embeddings = _CountingEmbeddings()
+    loads = []
+
+    def load():
+        loads.append(1)
+        return embeddings
+
+    vectors = cache.embed("model-a", ["hello  world", "other", "hello world"], load)
+    assert vectors == [[11.0, 1.0], [5.0, 1.0], [11.0, 1.0]]
+    assert embeddings.batches == [["hello world", "other"]]
+
+    # Fully cached lookups never load the model.
+    assert cache.embed("model-a", [" hello world "], load) == [[11.0, 1.0]]
+    assert len(loads) == 1
+
+    # Keys are per model.
+    cache.embed("model-b", ["other"], load)
+    assert embeddings.batches[-1] == ["other"]
+    assert cache.stats() == {
+        "entries": 3,
+        "max_entries": 8,
+        "hits": 2,
+        "misses": 3,
+        "evictions": 0,
+        "batches": 2,
+    }
+
+
+def test_cache_evicts_least_recently_used_and_supports_async():
+    cache = QueryEmbeddingCache(max_entries=2)
+    embeddings = _CountingEmbeddings()
+
+    asyncio.run(cache.aembed("model", ["a", "b"], lambda: embeddings))
+    cache.embed("model", ["a"], lambda: embeddings)
+    asyncio.run(cache.aembed("model", ["c"], lambda: embeddings))
+    cache.embed("model", ["a", "b"], lambda: embeddings)
+
+    assert embeddings.batches == [["a", "b"], ["c"], ["b"]]
+    assert cache.stats()["evictions"] == 2
@@ -5,6 +5,8 @@ from types import SimpleNamespace
 
 import pytest
 
+from src.infrastructure.retrieval.embedding_service import EmbeddingService
+from src.infrastructure.retrieval.query_embedding_cache import get_query_embedding_cache
 from src.infrastructure.retrieval.rag_service import RagResult, RagService
 
 
@@ -413,18 +415,27 @@ def test_retrieve_with_diagnostics_caches_sqlite_query_embedding(monkeypatch):
     )
 
     class _FakeEmbeddingFn:
-        def embed_query(self, _query: str):
-            return [1.0, 0.0]
+        def __init__(self):
+            self.batches: list[list[str]] = []
+
+        def embed_documents(self, texts: list[str]):
+            self.batches.append(list(texts))
+            return [[1.0, 0.0] for _ in texts]
 
-    class _FakeEmbeddingService:
+    class _FakeEmbeddingService(EmbeddingService):
         def __init__(self):
             self.calls = 0
+            self.embedding_fn = _FakeEmbeddingFn()
 
         def get_embedding_function(self, override_model=None):
             _ = override_model
             self.calls += 1
-            return _FakeEmbeddingFn()
+            return self.embedding_fn
+
+        def embedding_model_key(self, override_model=None):
+            return f"test-cache-{override_model}"
 
+    get_query_embedding_cache().clear()
     fake_embedding_service = _FakeEmbeddingService()
     service.embedding_service = fake_embedding_service
 
@@ -449,8 +460,13 @@ def test_retrieve_with_diagnostics_caches_sqlite_query_embedding(monkeypatch):
     assert len(results) == 2
     assert diagnostics["vector_raw_count"] == 2
     assert fake_embedding_service.calls == 1
+    assert fake_embedding_service.embedding_fn.batches == [["query"]]
     assert seen_embeddings == [(1.0, 0.0), (1.0, 0.0)]
 
+    # A later request for the same query is served from the process-wide cache.
+    asyncio.run(service.retrieve_with_diagnostics("query", ["kb_a"]))
+    assert fake_embedding_service.calls == 1
+
 
 def test_retrieve_applies_query_transform_with_runtime_model(monkeypatch):
     service = _build_service(
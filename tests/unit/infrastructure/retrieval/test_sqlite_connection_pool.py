@@ -0,0 +1,70 @@
+import sqlite3
+
+import pytest
+
+from src.infrastructure.retrieval.bm25_service import Bm25Service
+from src.infrastructure.retrieval.sqlite_connection_pool import (
+    SqliteConnectionPool,
+    get_sqlite_pool,
+)
+
+
+def test_pool_reuses_connections_and_applies_pragmas(tmp_path):
+    pool = SqliteConnectionPool(tmp_path / "pool.sqlite3", max_idle=1)
+    try:
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE items (value INTEGER)")
+            conn.execute("INSERT INTO items VALUES (1)")
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            first = conn
+        with pool.connection() as conn:
+            assert conn is first
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+
+        # Errors roll back and the connection stays reusable.
+        with pytest.raises(sqlite3.IntegrityError):
+            with pool.connection() as conn:
+                conn.execute("INSERT INTO items VALUES (2)")
+                raise sqlite3.IntegrityError("boom")
+
+        # Only max_idle connections are kept; overflow ones are closed on release.
+        with pool.connection() as outer, pool.connection() as inner:
+            assert outer is not inner
+            assert outer.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+        assert pool.stats() == {
+            "opened": 2,
+            "reused": 3,
+            "closed": 1,
+            "idle": 1,
+            "in_use": 0,
+            "peak_in_use": 2,
+            "max_idle": 1,
+        }
+    finally:
+        pool.close()
+
+
+def test_services_share_one_pool_per_database(tmp_path):
+    db_path = tmp_path / "rag_bm25.sqlite3"
+    try:
+        first = Bm25Service(db_path=str(db_path))
+        first.upsert_document_chunks(
+            kb_id="kb1",
+            doc_id="doc1",
+            filename="doc1.md",
+            chunks=[{"chunk_id": "doc1_0", "chunk_index": 0, "content": "pooled sqlite"}],
+        )
+        pool = get_sqlite_pool(db_path)
+        opened = pool.stats()["opened"]
+
+        for _ in range(5):
+            results = Bm25Service(db_path=str(db_path)).search(kb_id="kb1", query="pooled", top_k=5)
+            assert [item["chunk_id"] for item in results] == ["doc1_0"]
+        assert pool.stats()["opened"] == opened
+        assert pool.has_schema("bm25")
+
+        # A deleted database is recreated instead of served from stale handles.
+        db_path.unlink()
+        assert Bm25Service(db_path=str(db_path)).search(kb_id="kb1", query="pooled", top_k=5) == []
+    finally:
+        get_sqlite_pool(db_path).close()
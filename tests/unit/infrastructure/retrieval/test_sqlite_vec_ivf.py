@@ -0,0 +1,43 @@
+"""Unit tests for IVF helpers used by the sqlite_vec backend."""
+
+import numpy as np
+
+from src.infrastructure.retrieval.sqlite_vec_ivf import (
+    assign_lists,
+    choose_nlist,
+    normalize_rows,
+    probe_lists,
+    train_centroids,
+)
+
+
+def test_train_centroids_separates_clusters_and_probes_nearest_lists():
+    rng = np.random.default_rng(3)
+    centers = np.eye(8, dtype=np.float32)[:4]
+    labels = np.repeat(np.arange(4), 50)
+    vectors = normalize_rows(
+        np, (centers[labels] + 0.05 * rng.normal(size=(200, 8))).astype(np.float32)
+    )
+
+    centroids = train_centroids(np, vectors, 4)
+    assigned = assign_lists(np, centroids, vectors)
+
+    assert centroids.shape == (4, 8)
+    assert np.allclose(np.linalg.norm(centroids, axis=1), 1.0, atol=1e-5)
+    # Every true cluster maps onto exactly one list.
+    for label in range(4):
+        assert len(set(assigned[labels == label].tolist())) == 1
+    assert len(set(assigned.tolist())) == 4
+
+    probed = probe_lists(np, centroids, centers[2], nprobe=1)
+    assert probed == [int(assigned[labels == 2][0])]
+    assert sorted(probe_lists(np, centroids, centers[2], nprobe=10)) == [0, 1, 2, 3]
+
+
+def test_choose_nlist_and_normalize_rows_edge_cases():
+    assert choose_nlist(0) == 1
+    assert choose_nlist(10000) == 100
+
+    matrix = np.asarray([[3.0, 4.0], [0.0, 0.0]], dtype=np.float32)
+    normalize_rows(np, matrix)
+    assert np.allclose(matrix, [[0.6, 0.8], [0.0, 0.0]])
@@ -0,0 +1,43 @@
+import numpy as np
+
+from src.infrastructure.retrieval.sqlite_vec_quantization import (
+    binary_code_size,
+    encode_binary,
+    encode_binary_rows,
+    encode_int8,
+    encode_int8_rows,
+    normalize_quantization,
+    score_binary,
+    score_int8,
+)
+
+
+def test_batch_encoders_match_scalar_encoders():
+    rng = np.random.default_rng(3)
+    matrix = rng.standard_normal((5, 19)).astype(np.float32)
+    matrix[2] = 0.0
+
+    int8_rows = encode_int8_rows(np, matrix)
+    binary_rows = encode_binary_rows(np, matrix)
+
+    assert binary_rows.shape == (5, binary_code_size(19))
+    for index, row in enumerate(matrix.tolist()):
+        assert int8_rows[index].tobytes() == encode_int8(row)
+        assert binary_rows[index].tobytes() == encode_binary(row)
+
+
+def test_quantized_scores_rank_like_cosine():
+    rng = np.random.default_rng(5)
+    matrix = rng.standard_normal((64, 32)).astype(np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    query = matrix[7] + 0.01 * rng.standard_normal(32).astype(np.float32)
+    query /= np.linalg.norm(query)
+
+    int8_scores = score_int8(np, encode_int8_rows(np, matrix), query)
+    binary_scores = score_binary(np, encode_binary_rows(np, matrix), np.packbits(query > 0))
+
+    assert int(np.argmax(int8_scores)) == 7
+    assert int(np.argmax(binary_scores)) == 7
+    assert abs(float(int8_scores[7]) - float(matrix[7] @ query)) < 0.02
+    assert normalize_quantization(" INT8 ") == "int8"
+    assert normalize_quantization("pq") == "none"
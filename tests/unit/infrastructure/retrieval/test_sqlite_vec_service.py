@@ -2,12 +2,15 @@
 
 import math
 import shutil
+import sqlite3
 import struct
 import sys
 import types
 import uuid
 from pathlib import Path
 
+import pytest
+
 from src.infrastructure.retrieval.sqlite_vec_service import SqliteVecService
 
 
@@ -65,7 +68,7 @@ def test_sqlite_vec_upsert_search_and_cleanup():
         deleted = service.delete_stale_document_chunks(
             kb_id="kb1",
             doc_id="doc1",
-            keep_chunk_ids=["doc1_chunk_0"],
+            keep_ingest_id="ingest_b",
         )
         assert deleted == 1
 
@@ -79,53 +82,78 @@ def test_sqlite_vec_upsert_search_and_cleanup():
         shutil.rmtree(tmp_path, ignore_errors=True)
 
 
-def test_sqlite_vec_search_backfills_legacy_blob_columns():
+def test_sqlite_vec_migrates_legacy_json_table_to_quantized_layout():
     tmp_path = Path("data") / "tmp_test_runtime" / f"sqlite_vec_{uuid.uuid4().hex[:8]}"
     tmp_path.mkdir(parents=True, exist_ok=True)
+    # Absolute so the legacy table is written where the service will look.
+    db_path = (tmp_path / "rag_vec.sqlite3").resolve()
 
     try:
-        service = SqliteVecService(db_path=str(tmp_path / "rag_vec.sqlite3"))
-        service.upsert_chunks(
-            kb_id="kb1",
-            doc_id="doc1",
-            filename="doc.md",
-            file_type=".md",
-            ingest_id="ingest_a",
-            chunk_rows=[
-                {
-                    "chunk_id": "doc1_chunk_0",
-                    "chunk_index": 0,
-                    "content": "alpha",
-                    "embedding": [1.0, 0.0],
-                },
-            ],
-        )
-
-        # Simulate a legacy row that predates embedding_blob / embedding_dim.
-        with service._connect() as conn:
+        # Layout written by earlier versions: JSON vectors, blobs only for newer rows.
+        with sqlite3.connect(db_path) as conn:
             conn.execute(
                 """
-                UPDATE rag_vec_chunks
-                SET embedding_blob = NULL, embedding_dim = NULL
-                WHERE chunk_id = 'doc1_chunk_0'
+                CREATE TABLE rag_vec_chunks (
+                    chunk_id TEXT PRIMARY KEY,
+                    kb_id TEXT NOT NULL,
+                    doc_id TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    file_type TEXT NOT NULL,
+                    chunk_index INTEGER NOT NULL,
+                    content TEXT NOT NULL,
+                    embedding_json TEXT NOT NULL,
+                    embedding_blob BLOB,
+                    embedding_dim INTEGER,
+                    ingest_id TEXT DEFAULT '',
+                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+                )
                 """
             )
-            conn.commit()
+            conn.executemany(
+                """
+                INSERT INTO rag_vec_chunks (
+                    chunk_id, kb_id, doc_id, filename, file_type, chunk_index, content,
+                    embedding_json, embedding_blob, embedding_dim
+                ) VALUES (?, 'kb1', 'doc1', 'doc.md', '.md', ?, ?, ?, ?, ?)
+                """,
+                [
+                    ("doc1_chunk_0", 0, "alpha", "[1.0, 0.0]", struct.pack("<2f", 1.0, 0.0), 2),
+                    ("doc1_chunk_1", 1, "beta", "[0.6, 0.8]", None, None),
+                ],
+            )
 
-        results = service.search(kb_id="kb1", query_embedding=[1.0, 0.0], top_k=1)
-        assert len(results) == 1
-        assert results[0]["chunk_id"] == "doc1_chunk_0"
+        service = SqliteVecService(db_path=str(db_path))
+
+        # Construction stays cheap; the rewrite only happens in the explicit step.
+        with service._connect() as conn:
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(rag_vec_chunks)")}
+        assert "embedding_json" in columns
+
+        assert service.migrate_legacy_storage() == 2
+        assert service.migrate_legacy_storage() == 0
 
         with service._connect() as conn:
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(rag_vec_chunks)")}
+            tables = {
+                row["name"]
+                for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            }
             row = conn.execute(
                 """
-                SELECT embedding_blob, embedding_dim
+                SELECT embedding_blob, embedding_dim, embedding_int8, embedding_bit
                 FROM rag_vec_chunks
-                WHERE chunk_id = 'doc1_chunk_0'
+                WHERE chunk_id = 'doc1_chunk_1'
                 """
             ).fetchone()
-        assert row["embedding_blob"] is not None
-        assert int(row["embedding_dim"]) == 2
+        assert "embedding_json" not in columns
+        assert "rag_vec_migration_progress" not in tables
+        assert struct.unpack("<2f", row["embedding_blob"]) == pytest.approx((0.6, 0.8))
+        assert row["embedding_dim"] == 2
+        assert struct.unpack("<2b", row["embedding_int8"]) == (76, 102)
+        assert row["embedding_bit"] == bytes([0b11000000])
+
+        results = service.search(kb_id="kb1", query_embedding=[0.0, 1.0], top_k=2)
+        assert [item["chunk_id"] for item in results] == ["doc1_chunk_1", "doc1_chunk_0"]
     finally:
         shutil.rmtree(tmp_path, ignore_errors=True)
 
@@ -191,3 +219,243 @@ def test_sqlite_vec_search_uses_extension_distance(monkeypatch):
         assert float(results[0]["score"]) > float(results[1]["score"])
     finally:
         shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def test_sqlite_vec_numpy_fallback_tracks_upserts_and_deletes():
+    tmp_path = Path("data") / "tmp_test_runtime" / f"sqlite_vec_{uuid.uuid4().hex[:8]}"
+    tmp_path.mkdir(parents=True, exist_ok=True)
+
+    def _rows(doc_id, vectors):
+        return [
+            {
+                "chunk_id": f"{doc_id}_chunk_{index}",
+                "chunk_index": index,
+                "content": f"{doc_id}-{index}",
+                "embedding": vector,
+            }
+            for index, vector in enumerate(vectors)
+        ]
+
+    try:
+        service = SqliteVecService(db_path=str(tmp_path / "rag_vec.sqlite3"))
+        service._sqlite_vec_available = False
+        service.upsert_chunks(
+            kb_id="kb1",
+            doc_id="doc1",
+            filename="doc.md",
+            file_type=".md",
+            ingest_id="ingest_a",
+            chunk_rows=_rows("doc1", [[1.0, 0.0], [0.6, 0.8], [0.0, 1.0], [0.0, 0.0]]),
+        )
+
+        results = service.search(kb_id="kb1", query_embedding=[2.0, 0.0], top_k=2)
+        assert [item["chunk_id"] for item in results] == ["doc1_chunk_0", "doc1_chunk_1"]
+        assert math.isclose(results[0]["score"], 1.0, rel_tol=1e-6)
+        assert math.isclose(results[1]["score"], 0.6, rel_tol=1e-6)
+        assert results[1]["content"] == "doc1-1"
+
+        # Upserts and deletes invalidate the cached matrix.
+        service.upsert_chunks(
+            kb_id="kb1",
+            doc_id="doc2",
+            filename="doc2.md",
+            file_type=".md",
+            ingest_id="ingest_b",
+            chunk_rows=_rows("doc2", [[0.8, 0.6]]),
+        )
+        results = service.search(kb_id="kb1", query_embedding=[1.0, 0.0], top_k=2)
+        assert [item["chunk_id"] for item in results] == ["doc1_chunk_0", "doc2_chunk_0"]
+
+        service.delete_document_chunks(kb_id="kb1", doc_id="doc1")
+        results = service.search(kb_id="kb1", query_embedding=[1.0, 0.0], top_k=5)
+        assert [item["chunk_id"] for item in results] == ["doc2_chunk_0"]
+
+        # Writes from another service instance (or process) are detected as well.
+        other = SqliteVecService(db_path=str(tmp_path / "rag_vec.sqlite3"))
+        with other._connect() as conn:
+            conn.execute("DELETE FROM rag_vec_chunks WHERE kb_id = 'kb1'")
+            conn.commit()
+        assert service.search(kb_id="kb1", query_embedding=[1.0, 0.0], top_k=5) == []
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def test_sqlite_vec_ivf_index_builds_on_upsert_and_restricts_search():
+    tmp_path = Path("data") / "tmp_test_runtime" / f"sqlite_vec_{uuid.uuid4().hex[:8]}"
+    tmp_path.mkdir(parents=True, exist_ok=True)
+
+    # Four well separated directions with small offsets around each.
+    axes = [[1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0], [0.0, 0.0, 0.0, 1.0]]
+
+    def _rows(doc_id, count):
+        rows = []
+        for index in range(count):
+            vector = list(axes[index % 4])
+            vector[(index + 1) % 4] += 0.01 * (index // 4)
+            rows.append(
+                {
+                    "chunk_id": f"{doc_id}_chunk_{index}",
+                    "chunk_index": index,
+                    "content": f"{doc_id}-{index}",
+                    "embedding": vector,
+                }
+            )
+        return rows
+
+    try:
+        db_path = str(tmp_path / "rag_vec.sqlite3")
+        service = SqliteVecService(db_path=db_path, vector_index="ivf", ivf_min_rows=16)
+        service.upsert_chunks(
+            kb_id="kb1",
+            doc_id="doc1",
+            filename="doc.md",
+            file_type=".md",
+            ingest_id="ingest_a",
+            chunk_rows=_rows("doc1", 16),
+        )
+        with service._connect() as conn:
+            meta = conn.execute("SELECT nlist, trained_rows FROM rag_vec_ivf_meta").fetchone()
+            unassigned = conn.execute(
+                "SELECT COUNT(*) FROM rag_vec_chunks WHERE ivf_list IS NULL"
+            ).fetchone()[0]
+        assert tuple(meta) == (4, 16)
+        assert unassigned == 0
+
+        # Rows added after training are assigned to their nearest list right away.
+        service.upsert_chunks(
+            kb_id="kb1",
+            doc_id="doc2",
+            filename="doc2.md",
+            file_type=".md",
+            ingest_id="ingest_b",
+            chunk_rows=_rows("doc2", 4),
+        )
+        with service._connect() as conn:
+            assert (
+                conn.execute(
+                    "SELECT COUNT(*) FROM rag_vec_chunks WHERE ivf_list IS NULL"
+                ).fetchone()[0]
+                == 0
+            )
+
+        for sqlite_vec_available in (True, False):
+            service._sqlite_vec_available = sqlite_vec_available
+            approximate = service.search(
+                kb_id="kb1", query_embedding=[1.0, 0.0, 0.0, 0.0], top_k=20, nprobe=1
+            )
+            exact = service.search(
+                kb_id="kb1",
+                query_embedding=[1.0, 0.0, 0.0, 0.0],
+                top_k=20,
+                vector_index="exact",
+            )
+            assert len(exact) == 20
+            assert len(approximate) == 5
+            assert [item["chunk_id"] for item in approximate] == [
+                item["chunk_id"] for item in exact[:5]
+            ]
+
+        service.delete_kb_chunks(kb_id="kb1")
+        with service._connect() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM rag_vec_ivf_meta").fetchone()[0] == 0
+            assert conn.execute("SELECT COUNT(*) FROM rag_vec_ivf_centroids").fetchone()[0] == 0
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def test_sqlite_vec_quantized_search_rescores_candidates(monkeypatch):
+    tmp_path = Path("data") / "tmp_test_runtime" / f"sqlite_vec_{uuid.uuid4().hex[:8]}"
+    tmp_path.mkdir(parents=True, exist_ok=True)
+    calls: list[str] = []
+
+    def _cosine_distance(blob_a, blob_b):
+        # 2-dim vectors: float32 blobs are 8 bytes, vec_int8() codes are 2 bytes.
+        fmt = "<2b" if len(blob_a) == 2 else "<2f"
+        a = struct.unpack(fmt, blob_a)
+        b = struct.unpack(fmt, blob_b)
+        dot = sum(x * y for x, y in zip(a, b, strict=True))
+        norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+        return 1.0 - dot / norm if norm > 0 else 1.0
+
+    def _hamming(code_a, code_b):
+        calls.append("hamming")
+        return sum(bin(x ^ y).count("1") for x, y in zip(code_a, code_b, strict=True))
+
+    def _int8(code):
+        calls.append("int8")
+        return code
+
+    def _load_functions(self, conn):
+        conn.create_function("vec_distance_cosine", 2, _cosine_distance)
+        conn.create_function("vec_int8", 1, _int8)
+        conn.create_function("vec_bit", 1, lambda code: code)
+        conn.create_function("vec_distance_hamming", 2, _hamming)
+
+    vectors = [[1.0, 0.0], [0.9, 0.1], [0.7, 0.7], [0.1, 0.9], [-1.0, 0.0], [0.0, -1.0]]
+    rows = [
+        {"chunk_id": f"c{index}", "chunk_index": index, "content": f"v{index}", "embedding": vector}
+        for index, vector in enumerate(vectors)
+    ]
+
+    # Pooled connections load the extension once, so patch before the first one opens.
+    monkeypatch.setattr(SqliteVecService, "_try_load_sqlite_vec", _load_functions)
+
+    try:
+        service = SqliteVecService(
+            db_path=str(tmp_path / "rag_vec.sqlite3"), quantization="binary", rescore_multiplier=2
+        )
+        service._sqlite_vec_available = False
+        service.upsert_chunks(
+            kb_id="kb1",
+            doc_id="doc1",
+            filename="doc.md",
+            file_type=".md",
+            ingest_id="ingest_a",
+            chunk_rows=rows,
+        )
+        exact = service.search(
+            kb_id="kb1", query_embedding=[1.0, 0.1], top_k=2, quantization="none"
+        )
+        assert [item["chunk_id"] for item in exact] == ["c1", "c0"]
+
+        # NumPy path: codes pick candidates, scores come from float32 vectors.
+        for quantization in ("int8", "binary"):
+            results = service.search(
+                kb_id="kb1", query_embedding=[1.0, 0.1], top_k=2, quantization=quantization
+            )
+            assert [item["chunk_id"] for item in results] == ["c1", "c0"]
+            assert [item["score"] for item in results] == pytest.approx(
+                [item["score"] for item in exact], rel=1e-6
+            )
+
+        # SQL path through the extension's code distance functions.
+        service._sqlite_vec_available = True
+        for quantization, marker in (("int8", "int8"), ("binary", "hamming")):
+            calls.clear()
+            results = service.search(
+                kb_id="kb1", query_embedding=[1.0, 0.1], top_k=2, quantization=quantization
+            )
+            assert marker in calls
+            assert service._sqlite_vec_available is True
+            assert [item["chunk_id"] for item in results] == ["c1", "c0"]
+            assert [item["score"] for item in results] == pytest.approx(
+                [item["score"] for item in exact], rel=1e-6
+            )
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def test_sqlite_vec_embedding_store_reuses_and_prunes_vectors(tmp_path):
+    service = SqliteVecService(db_path=str(tmp_path / "rag_vec.sqlite3"))
+
+    service.store_embeddings(model_key="api:m1", vectors={"h1": [1.0, 0.5], "h2": [0.0, 1.0]})
+    found = service.get_stored_embeddings(model_key="api:m1", content_hashes=["h1", "h3", "h1"])
+    assert found == {"h1": [1.0, 0.5]}
+    # Vectors are scoped to the embedding model.
+    assert service.get_stored_embeddings(model_key="api:m2", content_hashes=["h1"]) == {}
+
+    # h1 was just used, so h2 is the least recently used entry and is pruned first.
+    service.store_embeddings(model_key="api:m1", vectors={"h3": [0.5, 0.5]}, max_entries=2)
+    assert set(
+        service.get_stored_embeddings(model_key="api:m1", content_hashes=["h1", "h2", "h3"])
+    ) == {"h1", "h3"}
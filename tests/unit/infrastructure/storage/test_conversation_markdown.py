@@ -0,0 +1,53 @@
+"""Unit tests for the conversation markdown body parser."""
+
+from src.infrastructure.storage.conversation_markdown import parse_messages
+
+BODY = (
+    "## User (2026-01-01 00:00:00)\n"
+    "\n"
+    "first question\n"
+    '<!-- attachment: {"filename": "a.txt"} -->\n'
+    '<!-- attachment: {"filename": "b.txt"} -->\n'
+    '<!-- message_id: "m-1" -->\n'
+    "\n"
+    "## Assistant (2026-01-01 00:00:01)\n"
+    "line one\n"
+    "\n"
+    "  <!-- message_id: not-quoted -->\n"
+    '<!-- usage: {"total_tokens": 3} -->\n'
+    "<!-- cost: {broken -->\n"
+    '<!-- assistant_id: "helper" -->\n'
+    "\n"
+    "## Separator (2026-01-01 00:00:02)\n"
+    "\n"
+    "## User (2026-01-01 00:00:03)\n"
+    "second question\n"
+)
+
+
+def test_parse_messages_reads_content_and_metadata_comments():
+    messages = parse_messages(BODY, "s-1")
+
+    assert [message["role"] for message in messages] == [
+        "user",
+        "assistant",
+        "separator",
+        "user",
+    ]
+    assert messages[0]["content"] == "first question"
+    assert messages[0]["message_id"] == "m-1"
+    assert messages[0]["attachments"] == [{"filename": "a.txt"}, {"filename": "b.txt"}]
+    assert messages[1]["content"] == "line one\n\n  <!-- message_id: not-quoted -->"
+    assert messages[1]["usage"] == {"total_tokens": 3}
+    assert "cost" not in messages[1]
+    assert messages[1]["assistant_id"] == "helper"
+    assert messages[1]["created_at"] == "2026-01-01 00:00:01"
+    assert messages[2]["content"] == ""
+
+
+def test_parse_messages_last_n_keeps_fallback_ids_stable():
+    full = parse_messages(BODY, "s-1")
+
+    assert parse_messages(BODY, "s-1", last_n=2) == full[-2:]
+    assert parse_messages(BODY, "s-1", last_n=10) == full
+    assert parse_messages(BODY, "s-1", last_n=0) == []
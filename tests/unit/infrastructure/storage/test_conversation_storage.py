@@ -5,6 +5,8 @@ from unittest.mock import AsyncMock, Mock, patch
 import pytest
 
 from src.infrastructure.storage.conversation_storage import ConversationStorage
+from src.infrastructure.storage.conversation_storage_meta import read_post
+from src.infrastructure.storage.session_cache import ParsedSessionCache
 from src.providers.types import CostInfo, TokenUsage
 
 
@@ -160,6 +162,149 @@ class TestConversationStorage:
             assert session["total_usage"]["total_tokens"] == 30
             assert session["total_cost"]["total_cost"] == 0.0015
 
+    @pytest.mark.asyncio
+    async def test_append_message_appends_body_and_keeps_counters_in_sidecar(
+        self, temp_conversation_dir, mock_assistant_service
+    ):
+        """Appends leave the frontmatter untouched and track counters in .meta.json."""
+        with patch(
+            "src.infrastructure.config.assistant_config_service.AssistantConfigService",
+            return_value=mock_assistant_service,
+        ):
+            storage = ConversationStorage(temp_conversation_dir)
+            session_id = await storage.create_session(assistant_id="default")
+            session_path = next((temp_conversation_dir / "chat").glob("*.md"))
+            original_text = session_path.read_text(encoding="utf-8")
+
+            await storage.append_message(session_id, "user", "Hello")
+            usage = TokenUsage(prompt_tokens=1, completion_tokens=2, total_tokens=3)
+            await storage.append_message(session_id, "assistant", "Hi", usage=usage)
+
+            session_text = session_path.read_text(encoding="utf-8")
+            assert session_text.startswith(original_text)
+            assert "## User (" in session_text
+            assert "current_step: 0" in session_text
+
+            meta_path = session_path.with_suffix(".meta.json")
+            assert meta_path.exists()
+
+            session = await storage.get_session(session_id)
+            assert session["title"] == "Hello"
+            assert session["state"]["current_step"] == 1
+            assert session["total_usage"]["total_tokens"] == 3
+
+            sessions = await storage.list_sessions()
+            assert sessions[0]["title"] == "Hello"
+
+    @pytest.mark.asyncio
+    async def test_compact_sessions_folds_sidecar_into_frontmatter(
+        self, temp_conversation_dir, mock_assistant_service
+    ):
+        """Compaction rewrites the frontmatter once and removes the sidecar."""
+        with patch(
+            "src.infrastructure.config.assistant_config_service.AssistantConfigService",
+            return_value=mock_assistant_service,
+        ):
+            storage = ConversationStorage(temp_conversation_dir)
+            session_id = await storage.create_session(assistant_id="default")
+            await storage.append_message(session_id, "user", "Hello")
+            await storage.append_message(session_id, "assistant", "Hi")
+            session_path = next((temp_conversation_dir / "chat").glob("*.md"))
+
+            assert await storage.compact_sessions() == 1
+            assert not session_path.with_suffix(".meta.json").exists()
+            session_text = session_path.read_text(encoding="utf-8")
+            assert "current_step: 1" in session_text
+            assert "title: Hello" in session_text
+            assert await storage.compact_sessions() == 0
+
+            session = await storage.get_session(session_id)
+            assert [m["content"] for m in session["state"]["messages"]] == ["Hello", "Hi"]
+
+    @pytest.mark.asyncio
+    async def test_compact_sessions_covers_project_directories(
+        self, temp_conversation_dir, mock_assistant_service
+    ):
+        """Startup compaction also folds sidecars of project conversations."""
+        with patch(
+            "src.infrastructure.config.assistant_config_service.AssistantConfigService",
+            return_value=mock_assistant_service,
+        ):
+            project_root = temp_conversation_dir / "project_roots" / "proj-c"
+            project_root.mkdir(parents=True, exist_ok=True)
+            projects_config = temp_conversation_dir / "projects_config.yaml"
+            projects_config.write_text(
+                f"projects:\n  - id: proj-c\n    root_path: '{project_root.as_posix()}'\n",
+                encoding="utf-8",
+            )
+            storage = ConversationStorage(
+                temp_conversation_dir,
+                project_root_resolver=lambda project_id: (
+                    str(project_root) if project_id == "proj-c" else None
+                ),
+            )
+            session_id = await storage.create_session(
+                assistant_id="default", context_type="project", project_id="proj-c"
+            )
+            await storage.append_message(
+                session_id, "user", "Hello", context_type="project", project_id="proj-c"
+            )
+            session_path = next((project_root / ".lex_mint" / "conversations").glob("*.md"))
+            assert session_path.with_suffix(".meta.json").exists()
+
+            with patch("src.core.config.settings") as mock_settings:
+                mock_settings.projects_config_path = projects_config
+                assert await storage.compact_sessions() == 1
+            assert not session_path.with_suffix(".meta.json").exists()
+            assert "title: Hello" in session_path.read_text(encoding="utf-8")
+
+    @pytest.mark.asyncio
+    async def test_chat_turn_reads_session_file_once(
+        self, temp_conversation_dir, mock_assistant_service
+    ):
+        """A cached session is extended in place by appends instead of re-read."""
+        with patch(
+            "src.infrastructure.config.assistant_config_service.AssistantConfigService",
+            return_value=mock_assistant_service,
+        ):
+            storage = ConversationStorage(temp_conversation_dir, session_cache=ParsedSessionCache())
+            session_id = await storage.create_session(assistant_id="default")
+            await storage.append_message(session_id, "user", "Hello")
+
+            with patch(
+                "src.infrastructure.storage.conversation_storage.read_post",
+                wraps=read_post,
+            ) as read_spy:
+                await storage.get_session(session_id)
+                await storage.append_message(session_id, "user", "Next question")
+                usage = TokenUsage(prompt_tokens=1, completion_tokens=2, total_tokens=3)
+                await storage.append_message(session_id, "assistant", "Answer", usage=usage)
+                cached = await storage.get_session(session_id)
+            assert read_spy.call_count == 1
+
+            stats = storage._session_cache.stats()
+            assert stats["hits"] >= 3
+            assert stats["entries"] == 1
+
+            # The in-place cache state matches a fresh parse of the file.
+            fresh = await ConversationStorage(
+                temp_conversation_dir, session_cache=ParsedSessionCache()
+            ).get_session(session_id)
+            assert cached == fresh
+            assert cached["state"]["current_step"] == 1
+            assert [m["content"] for m in cached["state"]["messages"]] == [
+                "Hello",
+                "Next question",
+                "Answer",
+            ]
+
+            # Edits made outside the storage layer invalidate the entry.
+            session_path = next((temp_conversation_dir / "chat").glob("*.md"))
+            with open(session_path, "a", encoding="utf-8") as f:
+                f.write("\n## User (2026-01-01 00:00:00)\nexternal edit\n")
+            session = await storage.get_session(session_id)
+            assert session["state"]["messages"][-1]["content"] == "external edit"
+
     @pytest.mark.asyncio
     async def test_list_sessions(self, temp_conversation_dir, mock_assistant_service):
         """Test listing all sessions."""
@@ -193,6 +338,31 @@ class TestConversationStorage:
             assert session1_data["message_count"] == 2
             assert session2_data["message_count"] == 1
 
+    @pytest.mark.asyncio
+    async def test_search_sessions_tracks_edits_and_truncation(
+        self, temp_conversation_dir, mock_assistant_service
+    ):
+        """Search results follow append, edit and truncate without rescanning files."""
+        with patch(
+            "src.infrastructure.config.assistant_config_service.AssistantConfigService",
+            return_value=mock_assistant_service,
+        ):
+            storage = ConversationStorage(temp_conversation_dir)
+            session_id = await storage.create_session(assistant_id="default")
+            await storage.append_message(session_id, "user", "Tell me about pelicans")
+            reply_id = await storage.append_message(session_id, "assistant", "Pelicans fish.")
+
+            results = await storage.search_sessions("fish")
+            assert results[0]["session_id"] == session_id
+            assert results[0]["message_id"] == reply_id
+
+            await storage.update_message_content(session_id, reply_id, "Pelicans glide.")
+            assert await storage.search_sessions("fish") == []
+            assert (await storage.search_sessions("glide"))[0]["message_id"] == reply_id
+
+            await storage.truncate_messages_after(session_id, 0)
+            assert await storage.search_sessions("glide") == []
+
     @pytest.mark.asyncio
     async def test_truncate_messages(self, temp_conversation_dir, mock_assistant_service):
         """Test truncating messages after specified index."""
@@ -0,0 +1,70 @@
+"""Unit tests for conversation storage path resolution and the session index."""
+
+import json
+
+import frontmatter
+import pytest
+
+from src.infrastructure.storage.conversation_storage_paths import (
+    SESSION_INDEX_FILENAME,
+    SessionPathIndex,
+    StoragePathResolver,
+)
+
+
+def _write_session(directory, filename, session_id):
+    post = frontmatter.Post("")
+    post.metadata = {"session_id": session_id, "title": "New Chat"}
+    path = directory / filename
+    path.write_text(frontmatter.dumps(post), encoding="utf-8")
+    return path
+
+
+@pytest.mark.asyncio
+async def test_find_session_file_builds_persistent_index(temp_conversation_dir):
+    chat_dir = temp_conversation_dir / "chat"
+    chat_dir.mkdir()
+    path = _write_session(chat_dir, "2026-01-01_00-00-00_aaaaaaaa.md", "aaaaaaaa-1111")
+    resolver = StoragePathResolver(temp_conversation_dir, session_index=SessionPathIndex())
+
+    assert await resolver.find_session_file("aaaaaaaa-1111") == path
+
+    index_data = json.loads((chat_dir / SESSION_INDEX_FILENAME).read_text(encoding="utf-8"))
+    assert index_data["files"] == {path.name: "aaaaaaaa-1111"}
+
+    # A fresh index instance (e.g. after restart) resolves from the persisted file.
+    reloaded = StoragePathResolver(temp_conversation_dir, session_index=SessionPathIndex())
+    assert await reloaded.find_session_file("aaaaaaaa-1111") == path
+
+
+@pytest.mark.asyncio
+async def test_find_session_file_heals_after_external_changes(temp_conversation_dir):
+    chat_dir = temp_conversation_dir / "chat"
+    chat_dir.mkdir()
+    first = _write_session(chat_dir, "a_11111111.md", "11111111-a")
+    resolver = StoragePathResolver(temp_conversation_dir, session_index=SessionPathIndex())
+    assert await resolver.find_session_file("11111111-a") == first
+
+    # Renamed outside the storage layer: stale entry is dropped and rediscovered.
+    renamed = chat_dir / "renamed.md"
+    first.rename(renamed)
+    assert await resolver.find_session_file("11111111-a") == renamed
+
+    # Newly dropped-in file is picked up on the next miss.
+    second = _write_session(chat_dir, "b_22222222.md", "22222222-b")
+    assert await resolver.find_session_file("22222222-b") == second
+
+    renamed.unlink()
+    assert await resolver.find_session_file("11111111-a") is None
+
+
+def test_session_index_record_and_forget(temp_conversation_dir):
+    index = SessionPathIndex()
+    path = _write_session(temp_conversation_dir, "x_33333333.md", "33333333-c")
+
+    index.record(path, "33333333-c")
+    assert index.lookup(temp_conversation_dir, "33333333-c") == path
+
+    path.unlink()
+    index.forget(path)
+    assert index.lookup(temp_conversation_dir, "33333333-c") is None
@@ -0,0 +1,75 @@
+"""Unit tests for the parsed-session LRU cache."""
+
+import os
+
+from src.infrastructure.storage.session_cache import ParsedSessionCache
+
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def _messages(content):
+    return [{"role": "user", "content": content, "message_id": "m-1"}]
+
+
+def test_get_validates_signature_and_counts_hits(tmp_path):
+    cache = ParsedSessionCache(max_bytes=1024 * 1024)
+    path = _write(tmp_path / "a.md", "body")
+    cache.put(path, {"title": "A"}, _messages("hello"))
+
+    metadata, messages = cache.get(path)
+    messages[0]["content"] = "mutated by caller"
+    assert metadata == {"title": "A"}
+    assert cache.get(path)[1][0]["content"] == "hello"
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert cache.get(path) is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["invalidations"] == 1
+    assert stats["entries"] == 0
+
+
+def test_put_evicts_least_recently_used_over_memory_cap(tmp_path):
+    cache = ParsedSessionCache(max_bytes=4000)
+    first = _write(tmp_path / "a.md", "a")
+    second = _write(tmp_path / "b.md", "b")
+    third = _write(tmp_path / "c.md", "c")
+
+    cache.put(first, {}, _messages("x" * 500))
+    cache.put(second, {}, _messages("y" * 500))
+    assert cache.get(first) is not None
+    cache.put(third, {}, _messages("z" * 500))
+
+    assert cache.get(second) is None
+    assert cache.get(first) is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] <= 4000
+
+    cache.put(first, {}, _messages("w" * 10_000))
+    assert cache.get(first) is None
+
+
+def test_apply_append_requires_the_validated_signature(tmp_path):
+    cache = ParsedSessionCache()
+    path = _write(tmp_path / "a.md", "body")
+    cache.put(path, {"current_step": 0}, _messages("hello"))
+    signature, _metadata = cache.get_metadata(path)
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\nmore")
+    appended = [{"role": "assistant", "content": "hi", "message_id": "m-2"}]
+    assert cache.apply_append(path, signature, {"current_step": 1}, appended)
+
+    metadata, messages = cache.get(path)
+    assert metadata == {"current_step": 1}
+    assert [m["content"] for m in messages] == ["hello", "hi"]
+
+    # A stale signature drops the entry instead of extending it.
+    assert not cache.apply_append(path, signature, {}, appended)
+    assert cache.get(path) is None
@@ -0,0 +1,143 @@
+"""Unit tests for the SQLite session summary catalog."""
+
+import os
+
+import frontmatter
+import pytest
+
+from src.infrastructure.storage.session_catalog import SessionCatalog
+
+
+def _write_session(directory, filename, session_id, body="", **metadata):
+    post = frontmatter.Post(body)
+    post.metadata = {
+        "session_id": session_id,
+        "created_at": "2026-01-01T00:00:00",
+        "title": "New Chat",
+        **metadata,
+    }
+    path = directory / filename
+    path.write_text(frontmatter.dumps(post), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    instance = SessionCatalog(tmp_path / "catalog.sqlite3")
+    yield instance
+    instance.close()
+
+
+def test_list_sessions_reconciles_and_counts_messages(catalog, tmp_path):
+    chat_dir = tmp_path / "chat"
+    chat_dir.mkdir()
+    body = "## User (2026-01-01 00:00:00)\nhi\n\n## Assistant (2026-01-01 00:00:01)\nhello\n"
+    _write_session(chat_dir, "a.md", "s-a", body=body, title="Alpha", folder_id="f1")
+    _write_session(chat_dir, "tmp.md", "s-tmp", temporary=True)
+    _write_session(
+        chat_dir,
+        "g.md",
+        "s-g",
+        group_assistants=["a1", "a2"],
+        group_mode="committee",
+    )
+
+    sessions = catalog.list_sessions(chat_dir)
+
+    by_id = {item["session_id"]: item for item in sessions}
+    assert set(by_id) == {"s-a", "s-g"}
+    assert by_id["s-a"]["title"] == "Alpha"
+    assert by_id["s-a"]["folder_id"] == "f1"
+    assert by_id["s-a"]["message_count"] == 2
+    assert by_id["s-g"]["group_assistants"] == ["a1", "a2"]
+    assert by_id["s-g"]["group_mode"] == "committee"
+
+
+def test_reconcile_only_parses_changed_files(catalog, tmp_path):
+    chat_dir = tmp_path / "chat"
+    chat_dir.mkdir()
+    first = _write_session(chat_dir, "a.md", "s-a")
+    _write_session(chat_dir, "b.md", "s-b")
+
+    assert catalog.reconcile(chat_dir, force=True) == 2
+    assert catalog.reconcile(chat_dir, force=True) == 0
+
+    _write_session(chat_dir, "a.md", "s-a", title="Renamed")
+    stat = first.stat()
+    os.utime(first, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+    assert catalog.reconcile(chat_dir, force=True) == 1
+
+    (chat_dir / "b.md").unlink()
+    catalog.reconcile(chat_dir, force=True)
+    assert [item["title"] for item in catalog.list_sessions(chat_dir)] == ["Renamed"]
+
+
+def test_list_sessions_paginates_by_updated_time(catalog, tmp_path):
+    chat_dir = tmp_path / "chat"
+    chat_dir.mkdir()
+    for index in range(5):
+        path = _write_session(chat_dir, f"{index}.md", f"s-{index}")
+        os.utime(path, ns=(1_000_000_000 * index, 1_000_000_000 * (index + 1)))
+
+    first_page = catalog.list_sessions(chat_dir, limit=2)
+    second_page = catalog.list_sessions(chat_dir, limit=2, offset=2)
+
+    assert [item["session_id"] for item in first_page] == ["s-4", "s-3"]
+    assert [item["session_id"] for item in second_page] == ["s-2", "s-1"]
+
+
+def test_list_sessions_rejects_unknown_sort_key(catalog, tmp_path):
+    with pytest.raises(ValueError):
+        catalog.list_sessions(tmp_path, sort_by="title")
+
+
+def test_search_ranks_sessions_and_reports_message_hits(catalog, tmp_path):
+    chat_dir = tmp_path / "chat"
+    chat_dir.mkdir()
+    body = (
+        "## User (2026-01-01 00:00:00)\nhow do I tune sqlite pragmas\n\n"
+        '<!-- message_id: "m-1" -->\n\n'
+        "## Assistant (2026-01-01 00:00:01)\nuse sqlite wal mode and mmap\n\n"
+        '<!-- message_id: "m-2" -->\n'
+    )
+    _write_session(chat_dir, "a.md", "s-a", body=body, title="Database tuning")
+    _write_session(chat_dir, "b.md", "s-b", title="SQLite notes")
+    _write_session(chat_dir, "c.md", "s-c", body=body, temporary=True)
+
+    results = catalog.search(chat_dir, "sqlite wal")
+
+    assert [item["session_id"] for item in results] == ["s-a"]
+    assert results[0]["match_type"] == "content"
+    assert results[0]["message_id"] == "m-2"
+    assert "wal mode" in results[0]["match_context"]
+
+    title_results = catalog.search(chat_dir, "sqlite")
+    assert {item["session_id"] for item in title_results} == {"s-a", "s-b"}
+    title_hit = next(item for item in title_results if item["session_id"] == "s-b")
+    assert title_hit["match_type"] == "title"
+    assert title_hit["match_context"] == "SQLite notes"
+
+    assert len(catalog.search(chat_dir, "sqlite", limit=1)) == 1
+    assert len(catalog.search(chat_dir, "sqlite", limit=1, offset=1)) == 1
+
+
+def test_search_index_follows_append_and_remove(catalog, tmp_path):
+    chat_dir = tmp_path / "chat"
+    chat_dir.mkdir()
+    path = _write_session(chat_dir, "a.md", "s-a")
+    catalog.reconcile(chat_dir, force=True)
+    assert catalog.search(chat_dir, "kubernetes") == []
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n## User (2026-01-01 00:00:00)\nkubernetes question\n")
+    catalog.record_append(
+        path, "user", "kubernetes question", message_id="m-9", content="kubernetes question"
+    )
+
+    results = catalog.search(chat_dir, "kubernetes")
+    assert results[0]["message_id"] == "m-9"
+    assert results[0]["match_type"] == "title"
+
+    path.unlink()
+    catalog.remove(path)
+    assert catalog.search(chat_dir, "kubernetes") == []
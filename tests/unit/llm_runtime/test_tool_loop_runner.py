@@ -1,5 +1,8 @@
 """Tests for ToolLoopRunner message appending behavior."""
 
+import asyncio
+
+import pytest
 from langchain_core.messages import AIMessage, ToolMessage
 
 from src.llm_runtime.tool_loop_runner import ToolLoopRunner, ToolLoopState
@@ -103,3 +106,91 @@ def test_record_round_activity_tracks_stalled_web_research():
     assert forced is True
     assert state.force_finalize_without_tools is True
     assert state.tool_finalize_reason == "stalled_research_force_finalize"
+
+
+@pytest.mark.asyncio
+async def test_execute_tool_calls_runs_calls_concurrently_in_order():
+    active = {"now": 0, "peak": 0, "web_search": 0, "web_search_peak": 0}
+
+    async def _tool_executor(name, args, tool_call_id=""):
+        active["now"] += 1
+        active[name] = active.get(name, 0) + 1
+        active["peak"] = max(active["peak"], active["now"])
+        if name == "web_search":
+            active["web_search_peak"] = max(active["web_search_peak"], active["web_search"])
+        await asyncio.sleep(0.05 if args["n"] == 0 else 0.01)
+        active["now"] -= 1
+        active[name] -= 1
+        return f"{name}:{args['n']}"
+
+    calls = [{"name": "web_search", "args": {"n": n}, "id": f"s{n}"} for n in range(3)]
+    calls += [{"name": "read_webpage", "args": {"n": n}, "id": f"r{n}"} for n in range(2)]
+    timings: list[dict] = []
+
+    results = await ToolLoopRunner.execute_tool_calls(
+        calls,
+        tool_executor=_tool_executor,
+        max_concurrency_per_tool=2,
+        timings=timings,
+    )
+
+    assert [r["tool_call_id"] for r in results] == ["s0", "s1", "s2", "r0", "r1"]
+    assert results[0]["result"] == "web_search:0"
+    assert active["peak"] == 4
+    assert active["web_search_peak"] == 2
+    assert [t["status"] for t in timings] == ["ok"] * 5
+    assert timings[0]["duration_ms"] >= 40
+
+
+@pytest.mark.asyncio
+async def test_execute_tool_calls_answers_calls_past_round_deadline():
+    async def _tool_executor(name, args, tool_call_id=""):
+        await asyncio.sleep(5 if name == "slow" else 0)
+        return "done"
+
+    state = ToolLoopState(current_messages=[], tool_round=1)
+    timings: list[dict] = []
+    results = await ToolLoopRunner.execute_tool_calls(
+        [
+            {"name": "fast", "args": {}, "id": "a"},
+            {"name": "slow", "args": {}, "id": "b"},
+        ],
+        tool_executor=_tool_executor,
+        round_timeout_seconds=0.05,
+        timings=timings,
+    )
+    ToolLoopRunner.record_round_timings(state, call_timings=timings, wall_ms=50.0)
+
+    assert results[0]["result"] == "done"
+    assert results[1]["result"].startswith("Error executing slow: timed out")
+    diagnostics = ToolLoopRunner.build_tool_diagnostics_event(state)
+    assert [t["status"] for t in diagnostics["tool_call_timings"]] == ["ok", "timeout"]
+    assert diagnostics["tool_call_timings"][1]["round"] == 1
+    assert diagnostics["tool_round_wall_ms"] == [50.0]
+
+
+@pytest.mark.asyncio
+async def test_execute_tool_calls_cancels_running_tools_with_the_stream():
+    started = asyncio.Event()
+    tool_cancelled = asyncio.Event()
+
+    async def _tool_executor(name, args, tool_call_id=""):
+        started.set()
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            tool_cancelled.set()
+            raise
+        return "done"
+
+    round_task = asyncio.create_task(
+        ToolLoopRunner.execute_tool_calls(
+            [{"name": "slow", "args": {}, "id": "a"}], tool_executor=_tool_executor
+        )
+    )
+    await started.wait()
+    round_task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await round_task
+
+    assert tool_cancelled.is_set()
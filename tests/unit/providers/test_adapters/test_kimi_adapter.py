@@ -99,7 +99,7 @@ async def test_fetch_models_appends_v1_and_parses_response(monkeypatch):
             seen["headers"] = headers
             return FakeResponse()
 
-    monkeypatch.setattr("httpx.AsyncClient", FakeAsyncClient)
+    monkeypatch.setattr("src.providers.adapters.kimi_adapter.pooled_http_client", FakeAsyncClient)
 
     adapter = KimiAdapter()
     models = await adapter.fetch_models("https://api.moonshot.cn", "test-key")
@@ -124,7 +124,7 @@ async def test_fetch_models_returns_empty_list_on_error(monkeypatch):
         async def get(self, url, headers=None):
             raise RuntimeError("boom")
 
-    monkeypatch.setattr("httpx.AsyncClient", FakeAsyncClient)
+    monkeypatch.setattr("src.providers.adapters.kimi_adapter.pooled_http_client", FakeAsyncClient)
 
     adapter = KimiAdapter()
     models = await adapter.fetch_models("https://api.moonshot.cn/v1", "test-key")
@@ -153,7 +153,7 @@ async def test_test_connection_returns_auth_error_for_unauthorized(monkeypatch):
         async def get(self, url, headers=None):
             return FakeResponse()
 
-    monkeypatch.setattr("httpx.AsyncClient", FakeAsyncClient)
+    monkeypatch.setattr("src.providers.adapters.kimi_adapter.pooled_http_client", FakeAsyncClient)
 
     adapter = KimiAdapter()
     ok, message = await adapter.test_connection("https://api.moonshot.cn/v1", "bad-key")
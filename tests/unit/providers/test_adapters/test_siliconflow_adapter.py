@@ -88,7 +88,9 @@ async def test_fetch_models_uses_text_filter_and_filters_results(monkeypatch):
             seen["params"] = params
             return FakeResponse()
 
-    monkeypatch.setattr("httpx.AsyncClient", FakeAsyncClient)
+    monkeypatch.setattr(
+        "src.providers.adapters.siliconflow_adapter.pooled_http_client", FakeAsyncClient
+    )
 
     adapter = SiliconFlowAdapter()
     models = await adapter.fetch_models("https://api.siliconflow.com/v1", "test-key")
@@ -124,7 +126,9 @@ async def test_test_connection_returns_auth_error_for_unauthorized(monkeypatch):
         async def get(self, url, headers=None, params=None):
             return FakeResponse()
 
-    monkeypatch.setattr("httpx.AsyncClient", FakeAsyncClient)
+    monkeypatch.setattr(
+        "src.providers.adapters.siliconflow_adapter.pooled_http_client", FakeAsyncClient
+    )
 
     adapter = SiliconFlowAdapter()
     ok, message = await adapter.test_connection("https://api.siliconflow.com/v1", "bad-key")
@@ -0,0 +1,91 @@
+"""Unit tests for reusable LLM instances and pooled provider HTTP clients."""
+
+from __future__ import annotations
+
+import pytest
+
+from src.providers import client_cache
+from src.providers.adapters.lmstudio_adapter import LmStudioAdapter
+from src.providers.adapters.openai_adapter import OpenAIAdapter
+from src.providers.client_cache import (
+    LlmClientCache,
+    api_key_fingerprint,
+    create_llm_cached,
+    pooled_http_client,
+)
+
+
+class _CountingAdapter(OpenAIAdapter):
+    def __init__(self):
+        self.created = 0
+
+    def create_llm(self, **kwargs):
+        self.created += 1
+        return object()
+
+
+@pytest.fixture
+def llm_cache(monkeypatch):
+    cache = LlmClientCache(max_entries=2)
+    monkeypatch.setattr(client_cache, "_llm_client_cache", cache)
+    return cache
+
+
+def _create(adapter, **overrides):
+    kwargs = {
+        "model": "gpt-4o-mini",
+        "base_url": "https://api.openai.com/v1",
+        "api_key": "sk-test",
+        "temperature": 0.7,
+        "streaming": True,
+        "call_mode": "auto",
+    }
+    kwargs.update(overrides)
+    return create_llm_cached(adapter, provider_id="openai", **kwargs)
+
+
+def test_create_llm_cached_reuses_instances_for_identical_inputs(llm_cache):
+    adapter = _CountingAdapter()
+
+    first = _create(adapter)
+    assert _create(_CountingAdapter()) is first
+    assert _create(adapter, temperature=0.2) is not first
+    assert _create(adapter, api_key="sk-other") is not first
+
+    assert adapter.created == 3
+    assert llm_cache.stats() == {"instances": 2, "hits": 1, "created": 3, "evictions": 1}
+
+
+def test_cache_keys_do_not_contain_api_keys():
+    key = LlmClientCache.build_key(
+        _CountingAdapter(),
+        provider_id="openai",
+        create_kwargs={"model": "m", "api_key": "sk-secret"},
+    )
+
+    assert "sk-secret" not in repr(key)
+    assert api_key_fingerprint("sk-secret") in key
+    assert api_key_fingerprint("") == ""
+
+
+def test_adapters_can_opt_out_of_instance_reuse(llm_cache, monkeypatch):
+    adapter = LmStudioAdapter()
+    monkeypatch.setattr(adapter, "create_llm", lambda **kwargs: object())
+
+    assert _create(adapter) is not _create(adapter)
+    assert llm_cache.stats()["instances"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pooled_http_client_is_shared_per_timeout():
+    async with pooled_http_client(30.0) as first, pooled_http_client(30.0) as second:
+        assert first is second
+        assert not first.is_closed
+    async with pooled_http_client(15.0) as other:
+        assert other is not first
+
+    await client_cache.close_provider_http_clients()
+    assert first.is_closed
+    async with pooled_http_client(30.0) as fresh:
+        assert fresh is not first
+    await client_cache.close_provider_http_clients()